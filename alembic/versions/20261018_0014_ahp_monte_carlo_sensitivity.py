@@ -0,0 +1,56 @@
+"""Add Monte Carlo AHP sensitivity mode and per-course rank-reversal evidence.
+
+Revision ID: 20261018_0014
+Revises: 20260618_0013
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0014"
+down_revision = "20260618_0013"
+branch_labels = None
+depends_on = None
+
+
+ADDITIONS = {
+    "ahp_sensitivity_results": [
+        sa.Column("analysis_mode", sa.String(), nullable=False, server_default="one_at_a_time"),
+        sa.Column("sample_count", sa.Integer()),
+    ],
+    "ahp_course_sensitivity_items": [
+        sa.Column("base_rank", sa.Integer()),
+        sa.Column("rank_reversal_probability", sa.Float()),
+        sa.Column("decision_change_probability", sa.Float()),
+    ],
+}
+
+
+def _columns(table_name: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table_name not in set(inspector.get_table_names()):
+        return set()
+    return {str(column["name"]) for column in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    for table_name, additions in ADDITIONS.items():
+        columns = _columns(table_name)
+        if not columns:
+            continue
+        for column in additions:
+            if column.name not in columns:
+                op.add_column(table_name, column)
+
+
+def downgrade() -> None:
+    for table_name, additions in ADDITIONS.items():
+        columns = _columns(table_name)
+        with op.batch_alter_table(table_name) as batch:
+            for column in reversed(additions):
+                if column.name in columns:
+                    batch.drop_column(column.name)
@@ -0,0 +1,63 @@
+"""Add content-hashed model artifact metadata to ml_model_runs.
+
+Revision ID: 20261018_0015
+Revises: 20261018_0014
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0015"
+down_revision = "20261018_0014"
+branch_labels = None
+depends_on = None
+
+
+ADDITIONS = {
+    "ml_model_runs": [
+        sa.Column("artifact_sha256", sa.String()),
+        sa.Column("artifact_version", sa.String()),
+        sa.Column("artifact_size_bytes", sa.Integer()),
+        sa.Column("data_fingerprint", sa.String()),
+    ],
+}
+INDEX_NAME = "ix_ml_model_runs_artifact"
+
+
+def _columns(table_name: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table_name not in set(inspector.get_table_names()):
+        return set()
+    return {str(column["name"]) for column in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    for table_name, additions in ADDITIONS.items():
+        columns = _columns(table_name)
+        if not columns:
+            continue
+        for column in additions:
+            if column.name not in columns:
+                op.add_column(table_name, column)
+    if _columns("ml_model_runs"):
+        op.create_index(
+            INDEX_NAME,
+            "ml_model_runs",
+            ["algorithm_key", "feature_schema_version", "data_fingerprint", "status"],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if _columns("ml_model_runs"):
+        op.drop_index(INDEX_NAME, table_name="ml_model_runs", if_exists=True)
+    for table_name, additions in ADDITIONS.items():
+        columns = _columns(table_name)
+        with op.batch_alter_table(table_name) as batch:
+            for column in reversed(additions):
+                if column.name in columns:
+                    batch.drop_column(column.name)
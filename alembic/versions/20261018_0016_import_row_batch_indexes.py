@@ -0,0 +1,36 @@
+"""Index source import rows by batch for the hash-first import diff.
+
+Revision ID: 20261018_0016
+Revises: 20261018_0015
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0016"
+down_revision = "20261018_0015"
+branch_labels = None
+depends_on = None
+
+
+TABLES = ("criteria_import_rows", "survey_import_rows")
+
+
+def _tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    existing = _tables()
+    for table_name in TABLES:
+        if table_name in existing:
+            op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table_name}_batch_row ON {table_name} (import_batch_id, row_no)")
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table_name}_batch_row")
@@ -0,0 +1,64 @@
+"""Track a decision-matrix data version for cached matrix snapshots.
+
+Revision ID: 20261018_0017
+Revises: 20261018_0016
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0017"
+down_revision = "20261018_0016"
+branch_labels = None
+depends_on = None
+
+
+SOURCE_TABLES = ("ders_kriterleri", "performans", "populerlik", "skor", "havuz")
+EVENTS = ("insert", "update", "delete")
+TRIGGER_PREFIX = "trg_decision_matrix_version_"
+
+
+def _tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    existing = _tables()
+    if "decision_matrix_versions" not in existing:
+        op.create_table(
+            "decision_matrix_versions",
+            sa.Column("scope_key", sa.String(), primary_key=True),
+            sa.Column("epoch", sa.String(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("0")),
+            sa.Column("reason", sa.String()),
+            sa.Column("updated_at", sa.String()),
+        )
+    op.execute(
+        "INSERT OR IGNORE INTO decision_matrix_versions (scope_key, epoch, version, reason) "
+        "VALUES ('global', lower(hex(randomblob(8))), 0, 'created')"
+    )
+    for table_name in SOURCE_TABLES:
+        if table_name not in existing:
+            continue
+        for event in EVENTS:
+            op.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {TRIGGER_PREFIX}{table_name}_{event}
+                AFTER {event.upper()} ON {table_name}
+                BEGIN
+                    UPDATE decision_matrix_versions SET version = version + 1 WHERE scope_key = 'global';
+                END
+                """
+            )
+
+
+def downgrade() -> None:
+    for table_name in SOURCE_TABLES:
+        for event in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_PREFIX}{table_name}_{event}")
+    if "decision_matrix_versions" in _tables():
+        op.drop_table("decision_matrix_versions")
@@ -0,0 +1,39 @@
+"""Store the runtime schema-compat fingerprint.
+
+Revision ID: 20261018_0018
+Revises: 20261018_0017
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0018"
+down_revision = "20261018_0017"
+branch_labels = None
+depends_on = None
+
+
+def _tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    # Satir yazilmaz: migration sonrasi ilk baglanti ensure zincirini calistirip
+    # parmak izini kendisi kaydeder.
+    if "schema_compat_state" not in _tables():
+        op.create_table(
+            "schema_compat_state",
+            sa.Column("state_key", sa.String(), primary_key=True),
+            sa.Column("compat_version", sa.Integer(), nullable=False),
+            sa.Column("schema_version", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.String()),
+        )
+
+
+def downgrade() -> None:
+    if "schema_compat_state" in _tables():
+        op.drop_table("schema_compat_state")
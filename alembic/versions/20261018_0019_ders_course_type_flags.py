@@ -0,0 +1,61 @@
+"""Materialize ders.is_elective / ders.is_required with triggers and a backfill.
+
+Revision ID: 20261018_0019
+Revises: 20261018_0018
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0019"
+down_revision = "20261018_0018"
+branch_labels = None
+depends_on = None
+
+
+TRIGGER_PREFIX = "trg_ders_course_type_flags_"
+
+
+def _columns(table_name: str) -> set[str]:
+    return {col["name"] for col in sa.inspect(op.get_bind()).get_columns(table_name)}
+
+
+def _tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    # Tetik ve bayrak ifadesi SQLite'a ozgu; PostgreSQL eski LIKE yolunu kullanir.
+    if op.get_bind().dialect.name != "sqlite" or "ders" not in _tables():
+        return
+    from app.services.course_type import build_course_type_flag_assignment, build_course_type_flag_triggers
+
+    columns = _columns("ders")
+    for flag in ("is_elective", "is_required"):
+        if flag not in columns:
+            op.add_column("ders", sa.Column(flag, sa.Integer(), nullable=False, server_default=sa.text("0")))
+    columns = _columns("ders")
+    index_cols = "is_elective, fakulte_id" if "fakulte_id" in columns else "is_elective"
+    op.execute(f"CREATE INDEX IF NOT EXISTS ix_ders_is_elective ON ders ({index_cols})")
+    for suffix in ("insert", "update"):
+        op.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_PREFIX}{suffix}")
+    for _name, ddl in build_course_type_flag_triggers(columns):
+        op.execute(ddl)
+    op.execute(f"UPDATE ders SET {build_course_type_flag_assignment(columns)}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite" or "ders" not in _tables():
+        return
+    for suffix in ("insert", "update"):
+        op.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_PREFIX}{suffix}")
+    op.execute("DROP INDEX IF EXISTS ix_ders_is_elective")
+    columns = _columns("ders")
+    with op.batch_alter_table("ders") as batch:
+        for flag in ("is_required", "is_elective"):
+            if flag in columns:
+                batch.drop_column(flag)
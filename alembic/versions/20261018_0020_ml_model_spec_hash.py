@@ -0,0 +1,39 @@
+"""Record the estimator hyperparameter hash on ml_model_runs.
+
+Revision ID: 20261018_0020
+Revises: 20261018_0019
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0020"
+down_revision = "20261018_0019"
+branch_labels = None
+depends_on = None
+
+
+COLUMN = sa.Column("model_spec_hash", sa.String())
+
+
+def _columns(table_name: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table_name not in set(inspector.get_table_names()):
+        return set()
+    return {str(column["name"]) for column in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    columns = _columns("ml_model_runs")
+    if columns and COLUMN.name not in columns:
+        op.add_column("ml_model_runs", COLUMN)
+
+
+def downgrade() -> None:
+    if COLUMN.name in _columns("ml_model_runs"):
+        with op.batch_alter_table("ml_model_runs") as batch:
+            batch.drop_column(COLUMN.name)
@@ -0,0 +1,46 @@
+"""Drop per-row decision-matrix version triggers; writers bump the version once per write.
+
+Revision ID: 20261018_0021
+Revises: 20261018_0020
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_0021"
+down_revision = "20261018_0020"
+branch_labels = None
+depends_on = None
+
+
+SOURCE_TABLES = ("ders_kriterleri", "performans", "populerlik", "skor", "havuz")
+EVENTS = ("insert", "update", "delete")
+TRIGGER_PREFIX = "trg_decision_matrix_version_"
+
+
+def upgrade() -> None:
+    for table_name in SOURCE_TABLES:
+        for event in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_PREFIX}{table_name}_{event}")
+    op.execute("UPDATE decision_matrix_versions SET version = version + 1, reason = 'statement_bumps' WHERE scope_key = 'global'")
+
+
+def downgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table_name in SOURCE_TABLES:
+        if table_name not in existing:
+            continue
+        for event in EVENTS:
+            op.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {TRIGGER_PREFIX}{table_name}_{event}
+                AFTER {event.upper()} ON {table_name}
+                BEGIN
+                    UPDATE decision_matrix_versions SET version = version + 1 WHERE scope_key = 'global';
+                END
+                """
+            )
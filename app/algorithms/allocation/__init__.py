@@ -5,6 +5,7 @@ from app.algorithms.allocation.allocators import (
     GaleShapleyAllocator,
     GreedyAllocator,
     MinimumRegretAllocator,
+    OptimalRegretAllocator,
     RandomAllocator,
 )
 
@@ -14,4 +15,5 @@ __all__ = [
     "GreedyAllocator",
     "FCFSAllocator",
     "MinimumRegretAllocator",
+    "OptimalRegretAllocator",
 ]
@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
 import pandas as pd
 
+from app.algorithms.allocation.core import (
+    UNASSIGNED,
+    PreferenceIndex,
+    build_preference_index,
+    gale_shapley,
+    lowest_rank_first,
+    open_seats,
+    student_priorities,
+)
+from app.algorithms.allocation.optimal import REGRET_FUNCTIONS, solve_min_regret
 from app.algorithms.base import AlgorithmOutput, IAllocator
 
 
@@ -47,46 +56,21 @@ class BaseAllocator(IAllocator):
         assigned = sum(1 for a in self.last_assignments if a["course_id"] is not None)
         return f"{self.name} assigned {assigned}/{len(self.last_assignments)} students."
 
-    def _prepare(self, students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> tuple[list[int], dict[int, int], dict[int, list[tuple[int, int]]]]:
-        students_df = students.copy()
-        courses_df = courses.copy()
-        prefs_df = preferences.copy()
-
-        students_df["student_id"] = pd.to_numeric(students_df["student_id"], errors="coerce").astype("Int64")
-        courses_df["course_id"] = pd.to_numeric(courses_df["course_id"], errors="coerce").astype("Int64")
-        courses_df["capacity"] = pd.to_numeric(courses_df.get("capacity", 0), errors="coerce")
-        courses_df["capacity"] = courses_df["capacity"].fillna(0).astype(int)
-
-        prefs_df["student_id"] = pd.to_numeric(prefs_df["student_id"], errors="coerce").astype("Int64")
-        prefs_df["course_id"] = pd.to_numeric(prefs_df["course_id"], errors="coerce").astype("Int64")
-        prefs_df["rank"] = pd.to_numeric(prefs_df.get("rank", 999), errors="coerce")
-        prefs_df["rank"] = prefs_df["rank"].fillna(999).astype(int)
-
-        student_ids = students_df["student_id"].dropna().astype(int).tolist()
-        capacities = {
-            int(row["course_id"]): max(0, int(row["capacity"]))
-            for _, row in courses_df[["course_id", "capacity"]].dropna().iterrows()
-        }
-        preference_map: dict[int, list[tuple[int, int]]] = defaultdict(list)
-        for _, row in prefs_df[["student_id", "course_id", "rank"]].dropna().iterrows():
-            preference_map[int(row["student_id"])].append((int(row["course_id"]), int(row["rank"])))
-        for sid in preference_map:
-            preference_map[sid].sort(key=lambda t: t[1])
-        return student_ids, capacities, preference_map
-
-    def _format_assignments(self, student_ids: list[int], assigned_course: dict[int, int | None], received_rank: dict[int, int | None]) -> list[dict[str, Any]]:
-        rows = []
-        for sid in student_ids:
-            rows.append(
-                {
-                    "student_id": sid,
-                    "course_id": assigned_course.get(sid),
-                    "rank_received": received_rank.get(sid),
-                    "allocated": assigned_course.get(sid) is not None,
-                    "algorithm": self.name,
-                }
-            )
-        return rows
+    def _prepare(self, students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> PreferenceIndex:
+        return build_preference_index(students, courses, preferences)
+
+    def _format_assignments(self, index: PreferenceIndex, assigned: np.ndarray, received: np.ndarray) -> list[dict[str, Any]]:
+        course_ids = index.course_ids.tolist()
+        return [
+            {
+                "student_id": sid,
+                "course_id": course_ids[course] if course != UNASSIGNED else None,
+                "rank_received": rank if course != UNASSIGNED else None,
+                "allocated": course != UNASSIGNED,
+                "algorithm": self.name,
+            }
+            for sid, course, rank in zip(index.student_ids.tolist(), assigned.tolist(), received.tolist())
+        ]
 
     def _output(self, started: float, assignments: list[dict[str, Any]], explanation: str, artifacts: dict[str, Any] | None = None) -> AlgorithmOutput:
         self.last_assignments = assignments
@@ -107,22 +91,25 @@ class RandomAllocator(BaseAllocator):
 
     def allocate(self, students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> AlgorithmOutput:
         started = self._start_timer()
-        student_ids, capacities, pref_map = self._prepare(students, courses, preferences)
-        assigned: dict[int, int | None] = {sid: None for sid in student_ids}
-        rank_received: dict[int, int | None] = {sid: None for sid in student_ids}
-
-        order = student_ids[:]
+        index = self._prepare(students, courses, preferences)
+        assigned, received = _empty_assignment(index)
+        capacities = open_seats(index)
+        offsets = index.offsets.tolist()
+        pref_course = index.pref_course.tolist()
+        pref_rank = index.pref_rank.tolist()
+
+        order = list(range(index.student_count))
         self.rng.shuffle(order)
-        for sid in order:
-            options = [(cid, r) for cid, r in pref_map.get(sid, []) if capacities.get(cid, 0) > 0]
+        for s in order:
+            options = [k for k in range(offsets[s], offsets[s + 1]) if capacities[pref_course[k]] > 0]
             if not options:
                 continue
-            cid, rank = options[self.rng.integers(0, len(options))]
-            assigned[sid] = cid
-            rank_received[sid] = rank
-            capacities[cid] -= 1
+            k = options[self.rng.integers(0, len(options))]
+            assigned[s] = pref_course[k]
+            received[s] = pref_rank[k]
+            capacities[pref_course[k]] -= 1
 
-        assignments = self._format_assignments(student_ids, assigned, rank_received)
+        assignments = self._format_assignments(index, assigned, received)
         return self._output(started, assignments, explanation="Random capacity-constrained allocation baseline.")
 
 
@@ -132,19 +119,9 @@ class FCFSAllocator(BaseAllocator):
 
     def allocate(self, students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> AlgorithmOutput:
         started = self._start_timer()
-        student_ids, capacities, pref_map = self._prepare(students, courses, preferences)
-        assigned: dict[int, int | None] = {sid: None for sid in student_ids}
-        rank_received: dict[int, int | None] = {sid: None for sid in student_ids}
-
-        for sid in student_ids:
-            for cid, rank in pref_map.get(sid, []):
-                if capacities.get(cid, 0) > 0:
-                    assigned[sid] = cid
-                    rank_received[sid] = rank
-                    capacities[cid] -= 1
-                    break
-
-        assignments = self._format_assignments(student_ids, assigned, rank_received)
+        index = self._prepare(students, courses, preferences)
+        assigned, received = _first_available_assignment(index)
+        assignments = self._format_assignments(index, assigned, received)
         return self._output(started, assignments, explanation="FCFS allocation in student iteration order.")
 
 
@@ -154,20 +131,11 @@ class GreedyAllocator(BaseAllocator):
 
     def allocate(self, students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> AlgorithmOutput:
         started = self._start_timer()
-        student_ids, capacities, pref_map = self._prepare(students, courses, preferences)
-        assigned: dict[int, int | None] = {sid: None for sid in student_ids}
-        rank_received: dict[int, int | None] = {sid: None for sid in student_ids}
-
-        for sid in student_ids:
-            candidates = [(cid, rank, 1.0 / max(rank, 1)) for cid, rank in pref_map.get(sid, []) if capacities.get(cid, 0) > 0]
-            if not candidates:
-                continue
-            cid, rank, _ = max(candidates, key=lambda t: t[2])
-            assigned[sid] = cid
-            rank_received[sid] = rank
-            capacities[cid] -= 1
-
-        assignments = self._format_assignments(student_ids, assigned, rank_received)
+        index = self._prepare(students, courses, preferences)
+        # Inverse-rank utility 1 / max(rank, 1) is non-increasing along the
+        # rank-sorted preference list, so the best open option is the first one.
+        assigned, received = _first_available_assignment(index)
+        assignments = self._format_assignments(index, assigned, received)
         return self._output(started, assignments, explanation="Greedy utility maximization using inverse rank utility.")
 
 
@@ -177,27 +145,12 @@ class MinimumRegretAllocator(BaseAllocator):
 
     def allocate(self, students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> AlgorithmOutput:
         started = self._start_timer()
-        student_ids, capacities, pref_map = self._prepare(students, courses, preferences)
-        assigned: dict[int, int | None] = {sid: None for sid in student_ids}
-        rank_received: dict[int, int | None] = {sid: None for sid in student_ids}
-
-        all_pairs = []
-        for sid, pref_list in pref_map.items():
-            for cid, rank in pref_list:
-                all_pairs.append((rank, sid, cid))
-        all_pairs.sort(key=lambda t: t[0])  # lower rank means lower regret
-
-        for rank, sid, cid in all_pairs:
-            if assigned[sid] is not None:
-                continue
-            if capacities.get(cid, 0) <= 0:
-                continue
-            assigned[sid] = cid
-            rank_received[sid] = rank
-            capacities[cid] -= 1
+        index = self._prepare(students, courses, preferences)
+        assigned, received = lowest_rank_first(index)
 
-        assignments = self._format_assignments(student_ids, assigned, rank_received)
-        mean_regret = float(np.mean([r for r in rank_received.values() if r is not None])) if any(rank_received.values()) else 0.0
+        assignments = self._format_assignments(index, assigned, received)
+        ranks = received[assigned != UNASSIGNED]
+        mean_regret = float(np.mean(ranks)) if np.any(ranks) else 0.0
         return self._output(
             started,
             assignments,
@@ -206,65 +159,90 @@ class MinimumRegretAllocator(BaseAllocator):
         )
 
 
-class GaleShapleyAllocator(BaseAllocator):
-    def __init__(self) -> None:
-        super().__init__(name="GaleShapley")
+class OptimalRegretAllocator(BaseAllocator):
+    def __init__(
+        self,
+        regret: str = "linear",
+        time_budget_s: float | None = 30.0,
+        unassigned_penalty: float | None = None,
+        warm_start: bool = True,
+    ) -> None:
+        if regret not in REGRET_FUNCTIONS:
+            raise ValueError(f"Unknown regret function '{regret}'. Use one of {REGRET_FUNCTIONS}.")
+        super().__init__(
+            name="OptimalRegretAllocation",
+            parameters={
+                "regret": regret,
+                "time_budget_s": time_budget_s,
+                "unassigned_penalty": unassigned_penalty,
+                "warm_start": warm_start,
+            },
+        )
 
     def allocate(self, students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> AlgorithmOutput:
         started = self._start_timer()
-        student_ids, capacities, pref_map = self._prepare(students, courses, preferences)
-        gpa_map = (
-            students.set_index("student_id")["gpa"].to_dict() if "gpa" in students.columns else {sid: 0.0 for sid in student_ids}
+        index = self._prepare(students, courses, preferences)
+        solution = solve_min_regret(
+            index,
+            regret=self.parameters["regret"],
+            unassigned_penalty=self.parameters["unassigned_penalty"],
+            time_budget_s=self.parameters["time_budget_s"],
+            warm_start=lowest_rank_first(index) if self.parameters["warm_start"] else _empty_assignment(index),
+        )
+        assignments = self._format_assignments(index, solution.assigned, solution.received)
+        ranks = solution.received[solution.assigned != UNASSIGNED]
+        mean_regret = float(np.mean(ranks)) if ranks.size else 0.0
+        return self._output(
+            started,
+            assignments,
+            explanation=(
+                f"Optimal {self.parameters['regret']} rank-regret transport solution "
+                f"(status={solution.solver_status}, objective={solution.objective:.1f}, "
+                f"warm start={solution.warm_start_objective:.1f}, mean rank={mean_regret:.2f})."
+            ),
+            artifacts={
+                "mean_rank_regret": mean_regret,
+                "objective": solution.objective,
+                "warm_start_objective": solution.warm_start_objective,
+                "solver_status": solution.solver_status,
+                "used_warm_start": solution.used_warm_start,
+            },
         )
 
-        unmatched = set(student_ids)
-        proposal_idx = {sid: 0 for sid in student_ids}
-        course_matches: dict[int, list[int]] = {cid: [] for cid in capacities.keys()}
-        assigned_course: dict[int, int | None] = {sid: None for sid in student_ids}
-        rank_received: dict[int, int | None] = {sid: None for sid in student_ids}
-
-        def student_priority(student_id: int) -> float:
-            value = gpa_map.get(student_id)
-            if value is None or (isinstance(value, float) and np.isnan(value)):
-                return 0.0
-            return float(value)
-
-        while unmatched:
-            sid = unmatched.pop()
-            prefs = pref_map.get(sid, [])
-            if proposal_idx[sid] >= len(prefs):
-                continue
-            cid, rank = prefs[proposal_idx[sid]]
-            proposal_idx[sid] += 1
-            current = course_matches.setdefault(cid, [])
-            cap = capacities.get(cid, 0)
-            if cap <= 0:
-                unmatched.add(sid)
-                continue
 
-            if len(current) < cap:
-                current.append(sid)
-                assigned_course[sid] = cid
-                rank_received[sid] = rank
-            else:
-                worst_current = min(current, key=student_priority)
-                if student_priority(sid) > student_priority(worst_current):
-                    current.remove(worst_current)
-                    assigned_course[worst_current] = None
-                    rank_received[worst_current] = None
-                    if proposal_idx[worst_current] < len(pref_map.get(worst_current, [])):
-                        unmatched.add(worst_current)
-
-                    current.append(sid)
-                    assigned_course[sid] = cid
-                    rank_received[sid] = rank
-                else:
-                    if proposal_idx[sid] < len(prefs):
-                        unmatched.add(sid)
-
-        assignments = self._format_assignments(student_ids, assigned_course, rank_received)
+class GaleShapleyAllocator(BaseAllocator):
+    def __init__(self) -> None:
+        super().__init__(name="GaleShapley")
+
+    def allocate(self, students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> AlgorithmOutput:
+        started = self._start_timer()
+        index = self._prepare(students, courses, preferences)
+        assigned, received = gale_shapley(index, student_priorities(students, index, "gpa"))
+        assignments = self._format_assignments(index, assigned, received)
         return self._output(
             started,
             assignments,
             explanation="Gale-Shapley many-to-one stable matching using student GPA as course-side priority.",
         )
+
+
+def _empty_assignment(index: PreferenceIndex) -> tuple[np.ndarray, np.ndarray]:
+    return np.full(index.student_count, UNASSIGNED, dtype=np.int64), np.full(index.student_count, UNASSIGNED, dtype=np.int64)
+
+
+def _first_available_assignment(index: PreferenceIndex) -> tuple[np.ndarray, np.ndarray]:
+    """Give each student, in input order, their best-ranked course with a free seat."""
+    assigned, received = _empty_assignment(index)
+    capacities = open_seats(index)
+    offsets = index.offsets.tolist()
+    pref_course = index.pref_course.tolist()
+    pref_rank = index.pref_rank.tolist()
+    for s in range(index.student_count):
+        for k in range(offsets[s], offsets[s + 1]):
+            course = pref_course[k]
+            if capacities[course] > 0:
+                assigned[s] = course
+                received[s] = pref_rank[k]
+                capacities[course] -= 1
+                break
+    return assigned, received
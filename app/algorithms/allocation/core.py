@@ -0,0 +1,216 @@
+"""Array-backed allocation core shared by the capacity-constrained allocators.
+
+Preferences are stored CSR-style: the entries of student ``s`` live in
+``pref_course[offsets[s]:offsets[s + 1]]`` (course *indices*, not ids) sorted by
+rank, with the original row order as a stable tie-break. Input preparation is
+fully vectorized, so no ``DataFrame.iterrows`` is involved.
+
+:func:`gale_shapley` keeps a min-heap of admitted students per course keyed by
+``(priority, admission_order)``. Finding and evicting the weakest admitted
+student is therefore ``O(log capacity)`` instead of a linear ``min`` plus
+``list.remove``.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RANK = 999
+UNASSIGNED = -1
+UNKNOWN_COURSE = -1
+
+
+@dataclass(slots=True)
+class PreferenceIndex:
+    """Integer-indexed view of students, course capacities and ranked preferences."""
+
+    student_ids: np.ndarray
+    course_ids: np.ndarray
+    capacities: np.ndarray
+    offsets: np.ndarray
+    pref_course: np.ndarray
+    pref_rank: np.ndarray
+    pref_row: np.ndarray
+    first_pref_row: np.ndarray
+
+    @property
+    def student_count(self) -> int:
+        return int(len(self.student_ids))
+
+    def preferences_of(self, student_index: int) -> tuple[np.ndarray, np.ndarray]:
+        start, stop = self.offsets[student_index], self.offsets[student_index + 1]
+        return self.pref_course[start:stop], self.pref_rank[start:stop]
+
+
+def _numeric(frame: pd.DataFrame, column: str, default: float) -> pd.Series:
+    if column in frame.columns:
+        return pd.to_numeric(frame[column], errors="coerce")
+    return pd.Series(default, index=frame.index, dtype=float)
+
+
+def build_preference_index(students: pd.DataFrame, courses: pd.DataFrame, preferences: pd.DataFrame) -> PreferenceIndex:
+    """Vectorized replacement for the historical dict-of-lists preparation.
+
+    Rows with missing ids are dropped, duplicate course rows keep the last
+    capacity and missing ranks become ``DEFAULT_RANK``. Preferences of unknown
+    students are discarded; preferences for unknown courses are kept as
+    ``UNKNOWN_COURSE`` so Gale-Shapley still spends a proposal on them.
+    """
+    student_ids = _numeric(students, "student_id", np.nan).dropna().astype(np.int64).to_numpy()
+
+    course_frame = pd.DataFrame(
+        {"course_id": _numeric(courses, "course_id", np.nan), "capacity": _numeric(courses, "capacity", 0).fillna(0)}
+    ).dropna()
+    course_frame = course_frame.drop_duplicates(subset="course_id", keep="last")
+    course_ids = course_frame["course_id"].astype(np.int64).to_numpy()
+    capacities = np.maximum(course_frame["capacity"].astype(np.int64).to_numpy(), 0)
+
+    pref_frame = pd.DataFrame(
+        {
+            "student_id": _numeric(preferences, "student_id", np.nan),
+            "course_id": _numeric(preferences, "course_id", np.nan),
+            "rank": _numeric(preferences, "rank", DEFAULT_RANK).fillna(DEFAULT_RANK),
+        }
+    )
+    pref_frame["row"] = np.arange(len(pref_frame), dtype=np.int64)
+    pref_frame = pref_frame.dropna()
+    student_lookup = pd.Index(pd.unique(student_ids))
+    student_pos = student_lookup.get_indexer(pref_frame["student_id"].astype(np.int64).to_numpy())
+    course_pos = pd.Index(course_ids).get_indexer(pref_frame["course_id"].astype(np.int64).to_numpy())
+    first_pref_row = np.full(len(student_lookup), np.iinfo(np.int64).max, dtype=np.int64)
+    known_student = student_pos >= 0
+    np.minimum.at(first_pref_row, student_pos[known_student], pref_frame["row"].to_numpy()[known_student])
+    keep = known_student
+    student_pos = student_pos[keep]
+    course_pos = course_pos[keep]
+    ranks = pref_frame["rank"].astype(np.int64).to_numpy()[keep]
+    rows = pref_frame["row"].to_numpy()[keep]
+
+    # Duplicate student ids share the preference list of their first occurrence.
+    first_position = student_lookup.get_indexer(student_ids)
+    order = np.lexsort((rows, ranks, student_pos))
+    counts = np.bincount(student_pos, minlength=len(student_lookup))
+    unique_offsets = np.concatenate(([0], np.cumsum(counts)))
+    sorted_course = course_pos[order]
+    sorted_rank = ranks[order]
+    sorted_row = rows[order]
+    if len(student_lookup) == len(student_ids):
+        offsets = unique_offsets
+        pref_course, pref_rank, pref_row = sorted_course, sorted_rank, sorted_row
+    else:
+        slices = [np.arange(unique_offsets[p], unique_offsets[p + 1]) for p in first_position]
+        take = np.concatenate(slices) if slices else np.zeros(0, dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum([len(s) for s in slices]))).astype(np.int64)
+        pref_course, pref_rank, pref_row = sorted_course[take], sorted_rank[take], sorted_row[take]
+
+    return PreferenceIndex(
+        student_ids=student_ids,
+        course_ids=course_ids,
+        capacities=capacities,
+        offsets=offsets.astype(np.int64),
+        pref_course=pref_course.astype(np.int64),
+        pref_rank=pref_rank.astype(np.int64),
+        pref_row=pref_row.astype(np.int64),
+        first_pref_row=first_pref_row[first_position],
+    )
+
+
+def open_seats(index: PreferenceIndex) -> list[int]:
+    """Mutable seat counters with a trailing zero slot.
+
+    ``UNKNOWN_COURSE`` (-1) indexes that last slot, so unknown courses always
+    read as full without a separate membership check in the hot loops.
+    """
+    return index.capacities.tolist() + [0]
+
+
+def lowest_rank_first(index: PreferenceIndex) -> tuple[np.ndarray, np.ndarray]:
+    """Global lowest-rank-first fill; returns (course index, rank) per student.
+
+    Equal ranks are served by the student's first preference row, then by row
+    order, matching the historical minimum-regret pair ordering.
+    """
+    assigned = np.full(index.student_count, UNASSIGNED, dtype=np.int64)
+    received = np.full(index.student_count, UNASSIGNED, dtype=np.int64)
+    capacities = open_seats(index)
+    owner = np.repeat(np.arange(index.student_count), np.diff(index.offsets))
+    order = np.lexsort((index.pref_row, index.first_pref_row[owner], index.pref_rank))
+    is_open = [True] * index.student_count
+    for s, course, rank in zip(owner[order].tolist(), index.pref_course[order].tolist(), index.pref_rank[order].tolist()):
+        if not is_open[s] or capacities[course] <= 0:
+            continue
+        is_open[s] = False
+        assigned[s] = course
+        received[s] = rank
+        capacities[course] -= 1
+    return assigned, received
+
+
+def student_priorities(students: pd.DataFrame, index: PreferenceIndex, column: str = "gpa") -> np.ndarray:
+    """Course-side priority per student (missing or NaN values count as 0)."""
+    if column not in students.columns:
+        return np.zeros(index.student_count, dtype=float)
+    frame = pd.DataFrame({"student_id": _numeric(students, "student_id", np.nan), "value": _numeric(students, column, 0.0)})
+    frame = frame.dropna(subset=["student_id"]).drop_duplicates(subset="student_id", keep="last")
+    lookup = pd.Series(frame["value"].to_numpy(), index=frame["student_id"].astype(np.int64).to_numpy())
+    return np.nan_to_num(lookup.reindex(index.student_ids).to_numpy(dtype=float), nan=0.0)
+
+
+def gale_shapley(index: PreferenceIndex, priorities: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Student-proposing deferred acceptance; returns (course index, rank) per student.
+
+    Proposals are drawn from a set of unmatched student ids exactly like the
+    historical implementation, so ties in priority resolve the same way.
+    """
+    n = index.student_count
+    assigned = np.full(n, UNASSIGNED, dtype=np.int64)
+    received = np.full(n, UNASSIGNED, dtype=np.int64)
+    offsets = index.offsets.tolist()
+    pref_course = index.pref_course.tolist()
+    pref_rank = index.pref_rank.tolist()
+    capacities = open_seats(index)
+    priority = [float(p) for p in priorities]
+    ids = index.student_ids.tolist()
+    position = {int(sid): i for i, sid in reversed(list(enumerate(ids)))}
+    next_pref = offsets[:-1]
+    heaps: list[list[tuple[float, int, int]]] = [[] for _ in range(len(index.course_ids))]
+    admissions = 0
+
+    unmatched = set(ids)
+    while unmatched:
+        s = position[unmatched.pop()]
+        cursor = next_pref[s]
+        if cursor >= offsets[s + 1]:
+            continue
+        course = pref_course[cursor]
+        next_pref[s] = cursor + 1
+        cap = capacities[course]
+        if cap <= 0:
+            unmatched.add(ids[s])
+            continue
+        heap = heaps[course]
+        if len(heap) < cap:
+            heapq.heappush(heap, (priority[s], admissions, s))
+            admissions += 1
+            assigned[s] = course
+            received[s] = pref_rank[cursor]
+        elif priority[s] > heap[0][0]:
+            _, _, evicted = heapq.heapreplace(heap, (priority[s], admissions, s))
+            admissions += 1
+            assigned[evicted] = UNASSIGNED
+            received[evicted] = UNASSIGNED
+            if next_pref[evicted] < offsets[evicted + 1]:
+                unmatched.add(ids[evicted])
+            assigned[s] = course
+            received[s] = pref_rank[cursor]
+        elif cursor + 1 < offsets[s + 1]:
+            unmatched.add(ids[s])
+    if len(position) != n:
+        # Duplicate student rows mirror the outcome of their first occurrence.
+        first = np.array([position[sid] for sid in ids], dtype=np.int64)
+        assigned, received = assigned[first], received[first]
+    return assigned, received
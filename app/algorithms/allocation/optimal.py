@@ -0,0 +1,152 @@
+"""Optimal rank-regret allocation as a sparse transportation problem.
+
+Every known (student, course) preference is one flow variable ``x`` in
+``[0, 1]``; students supply at most one unit and courses accept at most
+``capacity`` units. Assigning a student costs ``regret(rank)`` and leaving them
+out costs ``unassigned_penalty``, so the solver minimizes
+
+    sum(regret * x) + unassigned_penalty * (students - sum(x)).
+
+The constraint matrix is the node-arc incidence of the bipartite preference
+graph (totally unimodular), so the HiGHS simplex returns an integral vertex and
+no students x seats matrix is ever built. Only the ``students + courses`` rows
+and ``preferences`` columns of a ``scipy.sparse`` matrix are allocated.
+
+SciPy's HiGHS interface does not accept a starting basis. The greedy
+low-rank solution is therefore used as the incumbent instead: it is returned
+when the time budget expires or the solver fails, and it is kept whenever the
+solver's answer is not strictly better.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.algorithms.allocation.core import UNASSIGNED, PreferenceIndex, lowest_rank_first
+
+REGRET_FUNCTIONS = ("linear", "squared")
+
+
+@dataclass(slots=True)
+class TransportSolution:
+    assigned: np.ndarray
+    received: np.ndarray
+    objective: float
+    warm_start_objective: float
+    solver_status: str
+    used_warm_start: bool
+
+
+def regret_costs(ranks: np.ndarray, regret: str = "linear") -> np.ndarray:
+    if regret not in REGRET_FUNCTIONS:
+        raise ValueError(f"Unknown regret function '{regret}'. Use one of {REGRET_FUNCTIONS}.")
+    base = np.maximum(np.asarray(ranks, dtype=float) - 1.0, 0.0)
+    return base if regret == "linear" else base * base
+
+
+def _edges(index: PreferenceIndex) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Unique usable (student, course) arcs, keeping each pair's best rank."""
+    owner = np.repeat(np.arange(index.student_count, dtype=np.int64), np.diff(index.offsets))
+    course = index.pref_course
+    usable = course >= 0
+    usable[usable] = index.capacities[course[usable]] > 0
+    owner, course, rank = owner[usable], course[usable], index.pref_rank[usable]
+    # CSR slices are rank-sorted, so the first occurrence of a pair is its best rank.
+    _, first = np.unique(owner * max(1, len(index.course_ids)) + course, return_index=True)
+    first.sort()
+    return owner[first], course[first], rank[first]
+
+
+def _objective(assigned: np.ndarray, received: np.ndarray, regret: str, penalty: float) -> float:
+    matched = assigned != UNASSIGNED
+    return float(regret_costs(received[matched], regret).sum() + penalty * np.count_nonzero(~matched))
+
+
+def solve_min_regret(
+    index: PreferenceIndex,
+    *,
+    regret: str = "linear",
+    unassigned_penalty: float | None = None,
+    time_budget_s: float | None = 30.0,
+    warm_start: tuple[np.ndarray, np.ndarray] | None = None,
+    method: str = "highs-ds",
+) -> TransportSolution:
+    """Minimize total rank regret subject to one seat per student and course capacities.
+
+    ``unassigned_penalty`` defaults to the regret of one rank past the worst
+    listed rank, i.e. being left out is worse than any listed choice.
+    """
+    n, m = index.student_count, len(index.course_ids)
+    owner, course, rank = _edges(index)
+    costs = regret_costs(rank, regret)
+    if unassigned_penalty is None:
+        worst = int(index.pref_rank.max()) + 1 if index.pref_rank.size else 1
+        unassigned_penalty = float(regret_costs(np.array([worst]), regret)[0]) + 1.0
+    penalty = float(unassigned_penalty)
+
+    greedy_assigned, greedy_received = warm_start if warm_start is not None else lowest_rank_first(index)
+    greedy_objective = _objective(greedy_assigned, greedy_received, regret, penalty)
+
+    def fallback(status: str) -> TransportSolution:
+        return TransportSolution(
+            assigned=greedy_assigned,
+            received=greedy_received,
+            objective=greedy_objective,
+            warm_start_objective=greedy_objective,
+            solver_status=status,
+            used_warm_start=True,
+        )
+
+    if owner.size == 0:
+        return fallback("empty")
+    try:
+        from scipy.optimize import linprog
+        from scipy.sparse import csr_matrix
+    except ImportError:
+        return fallback("scipy_unavailable")
+
+    edge_count = owner.size
+    columns = np.arange(edge_count, dtype=np.int64)
+    incidence = csr_matrix(
+        (np.ones(2 * edge_count), (np.concatenate([owner, n + course]), np.concatenate([columns, columns]))),
+        shape=(n + m, edge_count),
+    )
+    upper = np.concatenate([np.ones(n), index.capacities.astype(float)])
+    options: dict[str, float | bool] = {"presolve": True}
+    if time_budget_s is not None:
+        options["time_limit"] = max(0.01, float(time_budget_s))
+    try:
+        result = linprog(
+            costs - penalty,
+            A_ub=incidence,
+            b_ub=upper,
+            bounds=(0.0, 1.0),
+            method=method,
+            options=options,
+        )
+    except (ValueError, MemoryError) as exc:
+        return fallback(f"solver_error: {exc}")
+    if result.status != 0 or result.x is None:
+        return fallback("time_limit" if result.status == 1 else f"solver_status_{result.status}")
+
+    chosen = result.x > 0.5
+    assigned = np.full(n, UNASSIGNED, dtype=np.int64)
+    received = np.full(n, UNASSIGNED, dtype=np.int64)
+    assigned[owner[chosen]] = course[chosen]
+    received[owner[chosen]] = rank[chosen]
+    load = np.bincount(course[chosen], minlength=m)
+    if np.bincount(owner[chosen], minlength=n).max(initial=0) > 1 or np.any(load > index.capacities):
+        return fallback("non_integral")
+    objective = _objective(assigned, received, regret, penalty)
+    if objective >= greedy_objective:
+        return fallback("optimal_warm_start")
+    return TransportSolution(
+        assigned=assigned,
+        received=received,
+        objective=objective,
+        warm_start_objective=greedy_objective,
+        solver_status="optimal",
+        used_warm_start=False,
+    )
@@ -1,9 +1,10 @@
 """MCDM algorithms."""
 
+from app.algorithms.mcdm._shared import DecisionMatrix
 from app.algorithms.mcdm.ahp import AHPRanker
 from app.algorithms.mcdm.entropy import EntropyWeightRanker
 from app.algorithms.mcdm.promethee import PROMETHEERanker
 from app.algorithms.mcdm.topsis import TOPSISRanker
 from app.algorithms.mcdm.vikor import VIKORRanker
 
-__all__ = ["AHPRanker", "TOPSISRanker", "VIKORRanker", "PROMETHEERanker", "EntropyWeightRanker"]
+__all__ = ["DecisionMatrix", "AHPRanker", "TOPSISRanker", "VIKORRanker", "PROMETHEERanker", "EntropyWeightRanker"]
@@ -1,23 +1,119 @@
-"""Shared helpers for MCDM rankers."""
+"""Shared helpers for MCDM rankers.
+
+:class:`DecisionMatrix` converts an alternatives frame once: criteria columns
+are detected and coerced to numbers in a single pass and stored as one
+column-major float64 array (the layout ``DataFrame.to_numpy`` produced, so the
+per-criterion reductions give bit-identical scores). Every ranker accepts either a DataFrame or a
+``DecisionMatrix``, so a matrix built once can be ranked by several methods
+without repeating the ``pd.to_numeric`` work.
+"""
 
 from __future__ import annotations
 
-from typing import Iterable
+from dataclasses import dataclass
+from typing import Any, Iterable
 
 import numpy as np
 import pandas as pd
 
 
-def get_criteria_columns(X: pd.DataFrame, *, excluded: Iterable[str] = ("item_id",)) -> list[str]:
+def _numeric_columns(X: pd.DataFrame, excluded: Iterable[str]) -> tuple[list[str], list[np.ndarray]]:
     excluded_set = set(excluded)
-    criteria_cols: list[str] = []
-    for column in X.columns:
+    columns: list[str] = []
+    values: list[np.ndarray] = []
+    for position, column in enumerate(X.columns):
         if column in excluded_set:
             continue
-        numeric_values = pd.to_numeric(X[column], errors="coerce")
+        series = X.iloc[:, position]
+        numeric_values = series if pd.api.types.is_numeric_dtype(series.dtype) else pd.to_numeric(series, errors="coerce")
         if numeric_values.notna().any():
-            criteria_cols.append(column)
-    return criteria_cols
+            columns.append(column)
+            values.append(numeric_values.to_numpy(dtype=float, na_value=np.nan))
+    return columns, values
+
+
+def get_criteria_columns(X: pd.DataFrame, *, excluded: Iterable[str] = ("item_id",)) -> list[str]:
+    if isinstance(X, DecisionMatrix):
+        return list(X.criteria)
+    return _numeric_columns(X, excluded)[0]
+
+
+@dataclass(frozen=True, slots=True)
+class DecisionMatrix:
+    """Alternatives x criteria float64 matrix plus what is needed to label rows."""
+
+    values: np.ndarray
+    criteria: tuple[str, ...]
+    item_ids: np.ndarray | None
+    index: pd.Index
+
+    @classmethod
+    def from_frame(cls, X: pd.DataFrame, *, excluded: Iterable[str] = ("item_id",)) -> "DecisionMatrix":
+        columns, arrays = _numeric_columns(X, excluded)
+        if arrays:
+            values = np.column_stack(arrays)
+            np.nan_to_num(values, copy=False, nan=0.0)
+        else:
+            values = np.zeros((len(X), 0), dtype=float)
+        values = np.asfortranarray(values, dtype=np.float64)
+        values.flags.writeable = False
+        item_ids = X["item_id"].to_numpy(dtype=object) if "item_id" in X.columns else None
+        return cls(values=values, criteria=tuple(columns), item_ids=item_ids, index=X.index)
+
+    def __len__(self) -> int:
+        return int(self.values.shape[0])
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    def item_label(self, row: int) -> Any:
+        """``int(item_id)`` when present, otherwise the row's index label as text."""
+        if self.item_ids is not None:
+            value = self.item_ids[row]
+            if value is not None and pd.notna(value):
+                return int(value)
+        return str(self.index[row])
+
+    def recommendations(
+        self,
+        order_by: np.ndarray,
+        top_k: int,
+        *,
+        ascending: bool = False,
+        scores: np.ndarray | None = None,
+    ) -> list[dict[str, Any]]:
+        """Top-k rows by ``order_by``; ``scores`` (default ``order_by``) is what gets reported."""
+        reported = order_by if scores is None else scores
+        return [
+            {"item_id": self.item_label(row), "score": float(reported[row]), "rank": rank + 1}
+            for rank, row in enumerate(top_k_rows(order_by, top_k, ascending=ascending).tolist())
+        ]
+
+
+def as_decision_matrix(X: pd.DataFrame | DecisionMatrix) -> DecisionMatrix:
+    return X if isinstance(X, DecisionMatrix) else DecisionMatrix.from_frame(X)
+
+
+def top_k_rows(scores: np.ndarray, top_k: int, *, ascending: bool = False) -> np.ndarray:
+    """Row positions of the best ``top_k`` scores, NaN last, ties by row order.
+
+    ``argpartition`` narrows the candidates to the k-th best value in O(n);
+    only those candidates are sorted.
+    """
+    key = np.asarray(scores, dtype=float)
+    key = key if ascending else -key
+    key = np.where(np.isnan(key), np.inf, key)
+    n = key.shape[0]
+    k = max(0, min(int(top_k), n))
+    if k == 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < n:
+        kth = key[np.argpartition(key, k - 1)[k - 1]]
+        candidates = np.flatnonzero(key <= kth)
+    else:
+        candidates = np.arange(n)
+    return candidates[np.lexsort((candidates, key[candidates]))][:k]
 
 
 def normalize_weights(weights: np.ndarray | list[float] | None, criteria_count: int, *, algorithm_name: str) -> np.ndarray:
@@ -8,7 +8,7 @@ import numpy as np
 import pandas as pd
 
 from app.algorithms.base import AlgorithmOutput, IRanker
-from app.algorithms.mcdm._shared import ensure_weight_count, get_criteria_columns
+from app.algorithms.mcdm._shared import DecisionMatrix, as_decision_matrix, ensure_weight_count, get_criteria_columns
 
 RI_TABLE = {
     1: 0.0,
@@ -33,6 +33,8 @@ class AHPFitState:
 
 
 class AHPRanker(IRanker):
+    accepts_decision_matrix = True
+
     def __init__(self, pairwise_matrix: np.ndarray | list[list[float]] | None = None) -> None:
         super().__init__(name="AHP", task_type="ranking")
         if pairwise_matrix is not None:
@@ -54,7 +56,7 @@ class AHPRanker(IRanker):
         if np.any(m <= 0):
             raise ValueError("Pairwise matrix values must be positive")
 
-    def fit(self, X: pd.DataFrame, y: None = None) -> "AHPRanker":
+    def fit(self, X: pd.DataFrame | DecisionMatrix, y: None = None) -> "AHPRanker":
         columns = get_criteria_columns(X)
         n = len(columns)
         if n == 0:
@@ -85,39 +87,23 @@ class AHPRanker(IRanker):
         self.parameters.update({"consistency_ratio": cr, "consistency_index": ci, "lambda_max": lambda_max})
         return self
 
-    def _rank(self, X: pd.DataFrame, top_k: int) -> AlgorithmOutput:
+    def _rank(self, X: pd.DataFrame | DecisionMatrix, top_k: int) -> AlgorithmOutput:
         started = self._start_timer()
+        decision = as_decision_matrix(X)
         if self.state is None:
-            self.fit(X)
+            self.fit(decision)
         assert self.state is not None
 
-        df = X.copy()
-        criteria_cols = get_criteria_columns(df)
         try:
-            ensure_weight_count(self.state.weights, len(criteria_cols), algorithm_name="AHP")
+            ensure_weight_count(self.state.weights, len(decision.criteria), algorithm_name="AHP")
         except ValueError as exc:
             raise ValueError("Criteria count mismatch between pairwise matrix and input data") from exc
-        for col in criteria_cols:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
 
-        norm = np.linalg.norm(df[criteria_cols].to_numpy(dtype=float), axis=0)
+        matrix = decision.values
+        norm = np.linalg.norm(matrix, axis=0)
         norm = np.where(norm <= 1e-10, 1.0, norm)
-        normalized: pd.DataFrame = df[criteria_cols] / norm  # type: ignore[assignment]
-        scores = normalized.to_numpy() @ self.state.weights
-        df["ahp_score"] = scores
-        ranked = df.sort_values("ahp_score", ascending=False).head(top_k)
-        item_key = "item_id" if "item_id" in ranked.columns else ranked.index.name or "index"
-        recommendations = []
-        for rank, (idx, row) in enumerate(ranked.iterrows()):
-            raw_key = row.get(item_key) if item_key in row.index else None
-            item_id_val = int(raw_key) if raw_key is not None and pd.notna(raw_key) else str(idx)
-            recommendations.append(
-                {
-                    "item_id": item_id_val,
-                    "score": float(row["ahp_score"]),
-                    "rank": rank + 1,
-                }
-            )
+        scores = (matrix / norm) @ self.state.weights
+        recommendations = decision.recommendations(scores, top_k)
         explanation = (
             f"AHP weights={self.state.weights.round(4).tolist()}, "
             f"CR={self.state.consistency_ratio:.4f} (acceptable < 0.10)"
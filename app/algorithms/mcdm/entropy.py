@@ -22,12 +22,14 @@ import numpy as np
 import pandas as pd
 
 from app.algorithms.base import AlgorithmOutput, IRanker
-from app.algorithms.mcdm._shared import get_criteria_columns
+from app.algorithms.mcdm._shared import DecisionMatrix, as_decision_matrix
 
 
 class EntropyWeightRanker(IRanker):
     """Veriden objektif agirlik ureten entropi tabanli siralayici."""
 
+    accepts_decision_matrix = True
+
     def __init__(self) -> None:
         super().__init__(name="EntropyWeighting", task_type="ranking")
         self.weights: np.ndarray | None = None
@@ -69,55 +71,36 @@ class EntropyWeightRanker(IRanker):
             return np.ones(n, dtype=float) / float(n)
         return diversity / total
 
-    def fit(self, X: pd.DataFrame, y: None = None) -> "EntropyWeightRanker":
-        self.criteria_cols = get_criteria_columns(X)
+    def fit(self, X: pd.DataFrame | DecisionMatrix, y: None = None) -> "EntropyWeightRanker":
+        decision = as_decision_matrix(X)
+        self.criteria_cols = list(decision.criteria)
         if not self.criteria_cols:
             raise ValueError("Entropi icin sayisal kriter bulunamadi.")
-        matrix = (
-            X[self.criteria_cols]
-            .apply(pd.to_numeric, errors="coerce")
-            .fillna(0.0)
-            .to_numpy(dtype=float)
-        )
-        self.weights = self._entropy_weights(matrix)
+        self.weights = self._entropy_weights(decision.values)
         self.parameters["weights"] = self.weights.tolist()
         self.parameters["criteria"] = list(self.criteria_cols)
         self._is_fitted = True
         return self
 
-    def _rank(self, X: pd.DataFrame, top_k: int) -> AlgorithmOutput:
+    def _rank(self, X: pd.DataFrame | DecisionMatrix, top_k: int) -> AlgorithmOutput:
         started = self._start_timer()
+        decision = as_decision_matrix(X)
         if not self._is_fitted or self.weights is None:
-            self.fit(X)
+            self.fit(decision)
         assert self.weights is not None
 
-        df = X.copy()
-        criteria_cols = get_criteria_columns(df)
+        criteria_cols = list(decision.criteria)
         if len(criteria_cols) != len(self.weights):
             # Egitim ve tahmin kriterleri uyumsuzsa yeniden uyumla
-            self.fit(df)
+            self.fit(decision)
             criteria_cols = self.criteria_cols
-        matrix = (
-            df[criteria_cols]
-            .apply(pd.to_numeric, errors="coerce")
-            .fillna(0.0)
-            .to_numpy(dtype=float)
-        )
+        matrix = decision.values
         norm = np.sqrt(np.sum(np.square(matrix), axis=0))
         norm = np.where(norm <= 1e-10, 1.0, norm)
         normalized = matrix / norm
         scores = normalized @ self.weights
 
-        df["entropy_score"] = scores
-        ranked = df.sort_values("entropy_score", ascending=False).head(top_k)
-        recommendations = [
-            {
-                "item_id": int(row["item_id"]) if "item_id" in row and pd.notna(row["item_id"]) else str(idx),
-                "score": float(row["entropy_score"]),
-                "rank": rank + 1,
-            }
-            for rank, (idx, row) in enumerate(ranked.iterrows())
-        ]
+        recommendations = decision.recommendations(scores, top_k)
         return self._build_output(
             started,
             recommendations=recommendations,
@@ -7,16 +7,47 @@ import pandas as pd
 
 from app.algorithms.base import AlgorithmOutput, IRanker
 from app.algorithms.mcdm._shared import (
+    DecisionMatrix,
+    as_decision_matrix,
     ensure_weight_count,
     get_criteria_columns,
     normalize_weights,
 )
+from app.algorithms.mcdm.promethee_flows import (
+    DEFAULT_MAX_BLOCK_BYTES,
+    PREFERENCE_FUNCTIONS,
+    compute_promethee_flows,
+)
 
 
 class PROMETHEERanker(IRanker):
-    def __init__(self, weights: list[float] | None = None) -> None:
-        super().__init__(name="PROMETHEE_II", task_type="ranking")
+    accepts_decision_matrix = True
+
+    def __init__(
+        self,
+        weights: list[float] | None = None,
+        *,
+        preference_function: str = "difference",
+        q: float | list[float] | None = None,
+        p: float | list[float] | None = None,
+        s: float | list[float] | None = None,
+        max_block_bytes: int = DEFAULT_MAX_BLOCK_BYTES,
+    ) -> None:
+        if preference_function not in PREFERENCE_FUNCTIONS:
+            raise ValueError(
+                f"Unknown PROMETHEE preference function '{preference_function}'. Use one of {PREFERENCE_FUNCTIONS}."
+            )
+        super().__init__(
+            name="PROMETHEE_II",
+            task_type="ranking",
+            parameters={"preference_function": preference_function, "q": q, "p": p, "s": s},
+        )
         self.weights = np.array(weights, dtype=float) if weights is not None else None
+        self.preference_function = preference_function
+        self.q = q
+        self.p = p
+        self.s = s
+        self.max_block_bytes = int(max_block_bytes)
         self._is_fitted = False
 
     def _validate_weights(self, n_criteria: int) -> None:
@@ -32,50 +63,41 @@ class PROMETHEERanker(IRanker):
         if np.all(self.weights == 0):
             raise ValueError("Weights cannot be all zeros")
 
-    def fit(self, X: pd.DataFrame, y: None = None) -> "PROMETHEERanker":
+    def fit(self, X: pd.DataFrame | DecisionMatrix, y: None = None) -> "PROMETHEERanker":
         criteria_cols = get_criteria_columns(X)
         self.weights = normalize_weights(self.weights, len(criteria_cols), algorithm_name="PROMETHEE")
         self.parameters["weights"] = self.weights.tolist()
         self._is_fitted = True
         return self
 
-    def _rank(self, X: pd.DataFrame, top_k: int) -> AlgorithmOutput:
+    def _rank(self, X: pd.DataFrame | DecisionMatrix, top_k: int) -> AlgorithmOutput:
         started = self._start_timer()
+        decision = as_decision_matrix(X)
         if not self._is_fitted or self.weights is None:
-            self.fit(X)
+            self.fit(decision)
         assert self.weights is not None and self._is_fitted
 
-        df = X.copy()
-        criteria_cols = get_criteria_columns(df)
-        ensure_weight_count(self.weights, len(criteria_cols), algorithm_name="PROMETHEE")
-        matrix = df[criteria_cols].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+        ensure_weight_count(self.weights, len(decision.criteria), algorithm_name="PROMETHEE")
+        matrix = decision.values
         n = matrix.shape[0]
         if n == 0:
             return self._build_output(started, recommendations=[], confidence=0.0, explanation="No alternatives provided")
 
-        pref_matrix = np.zeros((n, n), dtype=float)
-        for i in range(n):
-            for j in range(n):
-                if i == j:
-                    continue
-                diff = matrix[i, :] - matrix[j, :]
-                preference = np.clip(diff, a_min=0.0, a_max=None)  # usual criterion preference function
-                pref_matrix[i, j] = float(np.dot(self.weights, preference))
-
-        leaving_flow = np.mean(pref_matrix, axis=1)
-        entering_flow = np.mean(pref_matrix, axis=0)
-        net_flow = leaving_flow - entering_flow
-
-        df["promethee_net_flow"] = net_flow
-        ranked = df.sort_values("promethee_net_flow", ascending=False).head(top_k)
-        recommendations = [
-            {
-                "item_id": int(row["item_id"]) if "item_id" in row and pd.notna(row["item_id"]) else str(idx),
-                "score": float(row["promethee_net_flow"]),
-                "rank": rank + 1,
-            }
-            for rank, (idx, row) in enumerate(ranked.iterrows())
-        ]
+        # divisor=n keeps the historical mean over a matrix row that included
+        # the zero self-comparison on the diagonal.
+        flows = compute_promethee_flows(
+            matrix,
+            self.weights,
+            preference=self.preference_function,
+            q=self.q,
+            p=self.p,
+            s=self.s,
+            divisor=float(n),
+            max_block_bytes=self.max_block_bytes,
+        )
+        leaving_flow, entering_flow, net_flow = flows.leaving, flows.entering, flows.net
+
+        recommendations = decision.recommendations(net_flow, top_k)
         confidence = float(np.clip(np.std(net_flow), 0.0, 1.0))
         return self._build_output(
             started,
@@ -103,4 +125,7 @@ class PROMETHEERanker(IRanker):
         return float(np.mean([r["score"] for r in out.recommendations])) if out.recommendations else 0.0
 
     def explain(self, X: pd.DataFrame | None = None) -> str:
-        return "PROMETHEE-II compares pairwise preference flows and ranks by net flow."
+        return (
+            "PROMETHEE-II compares pairwise preference flows and ranks by net flow "
+            f"(preference_function={self.preference_function})."
+        )
@@ -7,6 +7,8 @@ import pandas as pd
 
 from app.algorithms.base import AlgorithmOutput, IRanker
 from app.algorithms.mcdm._shared import (
+    DecisionMatrix,
+    as_decision_matrix,
     ensure_weight_count,
     get_criteria_columns,
     normalize_weights,
@@ -14,6 +16,8 @@ from app.algorithms.mcdm._shared import (
 
 
 class TOPSISRanker(IRanker):
+    accepts_decision_matrix = True
+
     def __init__(self, weights: list[float] | None = None) -> None:
         super().__init__(name="TOPSIS", task_type="ranking")
         self.weights = np.array(weights, dtype=float) if weights is not None else None
@@ -32,23 +36,22 @@ class TOPSISRanker(IRanker):
         if np.all(self.weights == 0):
             raise ValueError("Weights cannot be all zeros")
 
-    def fit(self, X: pd.DataFrame, y: None = None) -> "TOPSISRanker":
+    def fit(self, X: pd.DataFrame | DecisionMatrix, y: None = None) -> "TOPSISRanker":
         criteria_cols = get_criteria_columns(X)
         self.weights = normalize_weights(self.weights, len(criteria_cols), algorithm_name="TOPSIS")
         self.parameters["weights"] = self.weights.tolist()
         self._is_fitted = True
         return self
 
-    def _rank(self, X: pd.DataFrame, top_k: int) -> AlgorithmOutput:
+    def _rank(self, X: pd.DataFrame | DecisionMatrix, top_k: int) -> AlgorithmOutput:
         started = self._start_timer()
+        decision = as_decision_matrix(X)
         if not self._is_fitted or self.weights is None:
-            self.fit(X)
+            self.fit(decision)
         assert self.weights is not None and self._is_fitted
 
-        df = X.copy()
-        criteria_cols = get_criteria_columns(df)
-        ensure_weight_count(self.weights, len(criteria_cols), algorithm_name="TOPSIS")
-        matrix = df[criteria_cols].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+        ensure_weight_count(self.weights, len(decision.criteria), algorithm_name="TOPSIS")
+        matrix = decision.values
 
         norm = np.sqrt(np.sum(np.square(matrix), axis=0))
         norm = np.where(norm <= 1e-10, 1.0, norm)
@@ -61,16 +64,7 @@ class TOPSISRanker(IRanker):
         dist_worst = np.sqrt(np.sum(np.square(weighted - ideal_worst), axis=1))
         closeness = dist_worst / np.where((dist_best + dist_worst) <= 1e-10, 1.0, dist_best + dist_worst)
 
-        df["topsis_score"] = closeness
-        ranked = df.sort_values("topsis_score", ascending=False).head(top_k)
-        recommendations = [
-            {
-                "item_id": int(row["item_id"]) if "item_id" in row and pd.notna(row["item_id"]) else str(idx),
-                "score": float(row["topsis_score"]),
-                "rank": rank + 1,
-            }
-            for rank, (idx, row) in enumerate(ranked.iterrows())
-        ]
+        recommendations = decision.recommendations(closeness, top_k)
         return self._build_output(
             started,
             recommendations=recommendations,
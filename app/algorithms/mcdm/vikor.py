@@ -7,6 +7,8 @@ import pandas as pd
 
 from app.algorithms.base import AlgorithmOutput, IRanker
 from app.algorithms.mcdm._shared import (
+    DecisionMatrix,
+    as_decision_matrix,
     ensure_weight_count,
     get_criteria_columns,
     normalize_weights,
@@ -14,6 +16,8 @@ from app.algorithms.mcdm._shared import (
 
 
 class VIKORRanker(IRanker):
+    accepts_decision_matrix = True
+
     def __init__(self, weights: list[float] | None = None, v: float = 0.5) -> None:
         super().__init__(name="VIKOR", task_type="ranking", parameters={"v": v})
         self.weights = np.array(weights, dtype=float) if weights is not None else None
@@ -33,23 +37,22 @@ class VIKORRanker(IRanker):
         if np.all(self.weights == 0):
             raise ValueError("Weights cannot be all zeros")
 
-    def fit(self, X: pd.DataFrame, y: None = None) -> "VIKORRanker":
+    def fit(self, X: pd.DataFrame | DecisionMatrix, y: None = None) -> "VIKORRanker":
         criteria_cols = get_criteria_columns(X)
         self.weights = normalize_weights(self.weights, len(criteria_cols), algorithm_name="VIKOR")
         self.parameters["weights"] = self.weights.tolist()
         self._is_fitted = True
         return self
 
-    def _rank(self, X: pd.DataFrame, top_k: int) -> AlgorithmOutput:
+    def _rank(self, X: pd.DataFrame | DecisionMatrix, top_k: int) -> AlgorithmOutput:
         started = self._start_timer()
+        decision = as_decision_matrix(X)
         if not self._is_fitted or self.weights is None:
-            self.fit(X)
+            self.fit(decision)
         assert self.weights is not None and self._is_fitted
 
-        df = X.copy()
-        criteria_cols = get_criteria_columns(df)
-        ensure_weight_count(self.weights, len(criteria_cols), algorithm_name="VIKOR")
-        matrix = df[criteria_cols].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+        ensure_weight_count(self.weights, len(decision.criteria), algorithm_name="VIKOR")
+        matrix = decision.values
         f_star = np.max(matrix, axis=0)
         f_minus = np.min(matrix, axis=0)
         denom = np.where((f_star - f_minus) <= 1e-10, 1.0, f_star - f_minus)
@@ -65,16 +68,7 @@ class VIKORRanker(IRanker):
 
         q_values = self.v * ((s_values - s_min) / s_denom) + (1 - self.v) * ((r_values - r_min) / r_denom)
 
-        df["vikor_q"] = q_values
-        ranked = df.sort_values("vikor_q", ascending=True).head(top_k)
-        recommendations = [
-            {
-                "item_id": int(row["item_id"]) if "item_id" in row and pd.notna(row["item_id"]) else str(idx),
-                "score": float(1.0 - row["vikor_q"]),
-                "rank": rank + 1,
-            }
-            for rank, (idx, row) in enumerate(ranked.iterrows())
-        ]
+        recommendations = decision.recommendations(q_values, top_k, ascending=True, scores=1.0 - q_values)
         return self._build_output(
             started,
             recommendations=recommendations,
@@ -84,11 +84,14 @@ def _public_health_payload(report) -> dict:
 
 @app.get("/health", tags=["health"])
 def health():
-    """Hafif sağlık özeti (public-safe). Teknik detay döndürmez."""
+    """Hafif sağlık özeti (public-safe). Teknik detay döndürmez.
 
-    from app.services.health_service import run_quick_health_check
+    Rapor TTL ile önbelleklenir; ``generated_at`` raporun üretim anını verir.
+    """
 
-    report = run_quick_health_check(config=config)
+    from app.services.health_service import get_cached_quick_health_report
+
+    report = get_cached_quick_health_report(config=config)
     return _public_health_payload(report)
 
 
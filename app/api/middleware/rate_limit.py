@@ -6,7 +6,7 @@ from typing import Dict
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 
-from app.core.config import load_app_config
+from app.core.config import get_app_config
 from app.db.database import SessionLocal
 from app.services.security_audit_service import SecurityAuditService
 
@@ -31,7 +31,7 @@ class RateLimiter:
 limiter = RateLimiter()
 
 async def rate_limit_middleware(request: Request, call_next):
-    config = load_app_config()
+    config = get_app_config()
 
     if not config.rate_limit_enabled:
         return await call_next(request)
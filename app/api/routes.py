@@ -4,16 +4,19 @@
 
 from __future__ import annotations
 
+import contextlib
 import os
 import sqlite3
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from fastapi import APIRouter, Body, Depends, File, Form, HTTPException, UploadFile
 
-from app.core.config import load_app_config
+from app.core.config import get_app_config
+from app.core.result import ServiceResult
 from app.db.backend import is_sqlite_url
 from app.db.schema_compat import ensure_reporting_schema
 from app.db.sqlite_connection import connect_sqlite
+from app.db.sqlite_pool import get_sqlite_pool, sqlite_pool_metrics
 from app.schemas.criteria import (
     CompletionValidateRequest,
     CompletionOverrideApproveRequest,
@@ -94,7 +97,10 @@ from app.services.ahp_profile_service import (
     validate_profile,
 )
 from app.services.ahp_sensitivity_service import (
+    SENSITIVITY_MODE_MONTE_CARLO,
+    SENSITIVITY_MODE_ONE_AT_A_TIME,
     get_latest_sensitivity_for_run,
+    run_monte_carlo_sensitivity,
     run_weight_sensitivity_analysis,
 )
 from app.services.algorithm_data_guard_service import check_data_requirements
@@ -315,7 +321,7 @@ def _donem_key(value: str | None) -> str:
 
 
 def _get_db_path() -> str:
-    settings = load_app_config()
+    settings = get_app_config()
     if not is_sqlite_url(settings.database_url):
         raise HTTPException(
             status_code=503,
@@ -328,10 +334,42 @@ def _get_db_path() -> str:
     return settings.sqlite_db_path
 
 
-def _open_connection() -> sqlite3.Connection:
+def _existing_db_path() -> str:
     path = _get_db_path()
     if not os.path.exists(path):
         raise HTTPException(status_code=503, detail=f"Veritabani bulunamadi: {path}")
+    return path
+
+
+@contextlib.contextmanager
+def _pooled_connection(readonly: bool) -> Iterator[sqlite3.Connection]:
+    """Havuzdan baglanti kiralar.
+
+    Okuyucu ``PRAGMA query_only`` ile aciktir: yalniz SQL okuyan uclar icindir.
+    Servisi sema/tohum yazimi yapabilen uclar ``_open_connection`` ile kalir.
+    """
+    pool = get_sqlite_pool(_existing_db_path())
+    lease = pool.reader() if readonly else pool.writer()
+    try:
+        conn = lease.__enter__()
+    except Exception as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Veritabani baglantisi kurulamadi: {str(e)}"
+        )
+    with contextlib.ExitStack() as stack:
+        stack.push(lease)
+        yield conn
+
+
+def get_read_connection() -> Iterator[sqlite3.Connection]:
+    """FastAPI dependency: havuzdan salt-okunur SQLite baglantisi."""
+    with _pooled_connection(readonly=True) as conn:
+        yield conn
+
+
+def _open_connection() -> sqlite3.Connection:
+    path = _existing_db_path()
     try:
         conn = connect_sqlite(path, row_factory=True)
         ensure_reporting_schema(conn)
@@ -344,15 +382,12 @@ def _open_connection() -> sqlite3.Connection:
 
 
 def _run_query(query: str, params: tuple = ()) -> tuple[list[str], list[list]]:
-    conn = _open_connection()
-    try:
+    with _pooled_connection(readonly=True) as conn:
         cur = conn.cursor()
         cur.execute(query, params)
         rows = cur.fetchall()
         cols = [d[0] for d in cur.description] if cur.description else []
         return cols, [list(r) for r in rows]
-    finally:
-        conn.close()
 
 
 def _havuz_has_donem(conn: sqlite3.Connection) -> bool:
@@ -363,13 +398,10 @@ def _havuz_has_donem(conn: sqlite3.Connection) -> bool:
 
 @router.get("/dersler")
 def ders_listesi(fakulte_id: Optional[int] = None, secmeli_only: bool = False):
-    conn = _open_connection()
-    try:
+    with _pooled_connection(readonly=True) as conn:
         rows = CourseService(conn).list_courses(faculty_id=fakulte_id, elective_only=secmeli_only).unwrap()
-        cols = list(rows[0].keys()) if rows else ["ders_id", "kod", "ad", "kredi", "akts", "fakulte_id", "bolum_id", "course_type"]
-        return {"columns": cols, "data": [[row.get(col) for col in cols] for row in rows]}
-    finally:
-        conn.close()
+    cols = list(rows[0].keys()) if rows else ["ders_id", "kod", "ad", "kredi", "akts", "fakulte_id", "bolum_id", "course_type"]
+    return {"columns": cols, "data": [[row.get(col) for col in cols] for row in rows]}
 
 
 @router.get("/skorlar")
@@ -400,8 +432,7 @@ def havuz_listesi(
     bolum_id: Optional[int] = None,
     donem: Optional[str] = None,
 ):
-    conn = _open_connection()
-    try:
+    with _pooled_connection(readonly=True) as conn:
         use_term = bool(donem) and _havuz_has_donem(conn)
         cur = conn.cursor()
         elective_predicate = build_elective_predicate(cur=cur, alias="d")
@@ -439,8 +470,6 @@ def havuz_listesi(
         rows = cur.fetchall()
         cols = [d[0] for d in cur.description] if cur.description else []
         return {"columns": cols, "data": [list(r) for r in rows]}
-    finally:
-        conn.close()
 
 
 @router.get("/mufredat")
@@ -466,8 +495,7 @@ def mufredat_listesi(akademik_yil: int, bolum_id: Optional[int] = None, donem: O
 
 @router.get("/akademik-plan")
 def akademik_plan(fakulte_id: int, yil: int):
-    conn = _open_connection()
-    try:
+    with _pooled_connection(readonly=True) as conn:
         cur = conn.cursor()
         out = {"fakulte_id": int(fakulte_id), "yil": int(yil), "guz": [], "bahar": [], "overlap_count": 0}
         for term in ("g", "b"):
@@ -498,81 +526,66 @@ def akademik_plan(fakulte_id: int, yil: int):
         out["bahar_count"] = len(bahar_ids)
         out["balanced_4_plus_4"] = out["guz_count"] == 4 and out["bahar_count"] == 4 and out["overlap_count"] == 0
         return out
-    finally:
-        conn.close()
 
 
 @router.get("/fakulteler")
 def fakulte_listesi():
-    conn = _open_connection()
-    try:
+    with _pooled_connection(readonly=True) as conn:
         rows = CourseService(conn).list_faculties().unwrap()
         cols = list(rows[0].keys()) if rows else ["fakulte_id", "ad", "kampus"]
         return {"columns": cols, "data": [[row.get(col) for col in cols] for row in rows]}
-    finally:
-        conn.close()
 
 
 @router.get("/health")
 def health():
-    conn = _open_connection()
-    try:
-        result = SystemService(conn=conn, config=load_app_config()).health()
+    with _pooled_connection(readonly=True) as conn:
+        result = SystemService(conn=conn, config=get_app_config()).health()
         return result.to_api()
-    finally:
-        conn.close()
 
 
 @router.get("/system/info")
 def system_info():
-    conn = _open_connection()
-    try:
-        result = SystemService(conn=conn, config=load_app_config()).health()
+    with _pooled_connection(readonly=True) as conn:
+        result = SystemService(conn=conn, config=get_app_config()).health()
         return result.to_api()
-    finally:
-        conn.close()
 
 
 @router.get("/system/health")
 def system_health():
-    conn = _open_connection()
-    try:
-        result = SystemService(conn=conn, config=load_app_config()).health()
+    with _pooled_connection(readonly=True) as conn:
+        result = SystemService(conn=conn, config=get_app_config()).health()
         return result.to_api()
-    finally:
-        conn.close()
 
 
 @router.get("/system/schema-health")
 def system_schema_health():
-    conn = _open_connection()
-    try:
-        result = SystemService(conn=conn, config=load_app_config()).schema_health()
+    with _pooled_connection(readonly=True) as conn:
+        result = SystemService(conn=conn, config=get_app_config()).schema_health()
         return result.to_api()
-    finally:
-        conn.close()
+
+
+@router.get("/system/db-pool")
+def system_db_pool():
+    return ServiceResult.ok({"pools": sqlite_pool_metrics()}).to_api()
 
 
 @router.get("/system/architecture-audit")
 def system_architecture_audit():
-    result = SystemService(config=load_app_config()).architecture_audit()
+    result = SystemService(config=get_app_config()).architecture_audit()
     return result.to_api()
 
 
 @router.get("/system/config-summary")
 def system_config_summary():
-    result = SystemService(config=load_app_config()).config_summary()
+    result = SystemService(config=get_app_config()).config_summary()
     return result.to_api()
 
 
 @router.get("/system/sql-console/audit-logs")
 def system_sql_console_audit_logs(limit: int = 50):
-    conn = _open_connection()
-    try:
-        result = SystemService(conn=conn, config=load_app_config()).sql_console_audit_logs(limit=limit)
+    with _pooled_connection(readonly=True) as conn:
+        result = SystemService(conn=conn, config=get_app_config()).sql_console_audit_logs(limit=limit)
         return result.to_api()
-    finally:
-        conn.close()
 
 
 @router.get("/kriter/durum")
@@ -2103,7 +2116,18 @@ def ahp_decision_run_impact(run_id: int, course_id: Optional[int] = None):
 def ahp_decision_run_sensitivity(run_id: int, payload: AHPSensitivityRequest = Body(default_factory=AHPSensitivityRequest)):
     conn = _open_connection()
     try:
-        data = run_weight_sensitivity_analysis(conn, int(run_id), variation_percent=float(payload.variation_percent))
+        if payload.mode == SENSITIVITY_MODE_MONTE_CARLO:
+            data = run_monte_carlo_sensitivity(
+                conn,
+                int(run_id),
+                sample_count=int(payload.sample_count),
+                concentration=float(payload.concentration),
+                seed=payload.seed,
+            )
+        elif payload.mode == SENSITIVITY_MODE_ONE_AT_A_TIME:
+            data = run_weight_sensitivity_analysis(conn, int(run_id), variation_percent=float(payload.variation_percent))
+        else:
+            raise ValueError(f"Bilinmeyen sensitivity modu: {payload.mode}")
         return _api_response(data=data, message="AHP sensitivity analizi tamamlandı.")
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
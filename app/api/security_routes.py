@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
-from app.core.config import load_app_config
+from app.core.config import get_app_config
 from app.db.database import get_session
 from app.schemas.auth import (
     ApiClientCreate,
@@ -25,13 +25,13 @@ router = APIRouter(prefix="/security", tags=["security"])
 
 @router.get("/health")
 def security_health():
-    config = load_app_config()
+    config = get_app_config()
     health_service = SecurityHealthService(config)
     return health_service.check_security_configuration()
 
 @router.get("/readiness")
 def security_readiness():
-    config = load_app_config()
+    config = get_app_config()
     health_service = SecurityHealthService(config)
     return health_service.check_security_configuration()
 
@@ -49,7 +49,7 @@ def execute_sql(
     user: UserContext = Depends(require_action("use_sql_console")),
     db: Session = Depends(get_session)
 ):
-    config = load_app_config()
+    config = get_app_config()
     audit_service = SecurityAuditService(db, config)
     sql_service = SqlConsoleService(db, config, audit_service)
 
@@ -67,7 +67,7 @@ async def upload_secure_import(
     user: UserContext = Depends(require_action("import_data")),
     db: Session = Depends(get_session)
 ):
-    config = load_app_config()
+    config = get_app_config()
     upload_security = FileUploadSecurityService(config)
     audit_service = SecurityAuditService(db, config)
     secure_import_service = SecureImportService(db, config, upload_security, audit_service)
@@ -81,7 +81,7 @@ def approve_secure_import(
     user: UserContext = Depends(require_action("approve_import")),
     db: Session = Depends(get_session)
 ):
-    config = load_app_config()
+    config = get_app_config()
     upload_security = FileUploadSecurityService(config)
     audit_service = SecurityAuditService(db, config)
     secure_import_service = SecureImportService(db, config, upload_security, audit_service)
@@ -94,7 +94,7 @@ def verify_audit_chain(
     user: UserContext = Depends(require_action("view_audit_logs")),
     db: Session = Depends(get_session)
 ):
-    config = load_app_config()
+    config = get_app_config()
     audit_service = SecurityAuditService(db, config)
     return audit_service.verify_audit_chain()
 
@@ -104,7 +104,7 @@ def create_backup(
     user: UserContext = Depends(require_action("manage_schema")),
     db: Session = Depends(get_session)
 ):
-    config = load_app_config()
+    config = get_app_config()
     backup_service = BackupRestoreService(db, config)
     snapshot = backup_service.create_sqlite_backup(snapshot_type=snapshot_type, created_by=user.username)
     return {"snapshot_id": snapshot.id, "path": snapshot.snapshot_path}
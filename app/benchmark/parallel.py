@@ -0,0 +1,226 @@
+"""Process-isolated execution of benchmark tasks.
+
+Each (algorithm, seed) pair runs in its own child process so a slow or
+memory-hungry algorithm can be stopped without affecting the others:
+
+* Dataset tables are exported once per run to ``.npy`` files (numeric and
+  boolean columns) plus a pickle for object columns. Children memory-map the
+  numeric columns instead of receiving a pickled copy of the table per task.
+* The parent polls every child: a task past ``timeout_s`` or above
+  ``memory_limit_mb`` resident memory (measured with ``psutil``) is terminated
+  and reported with status ``timeout`` / ``memory_limit``.
+* Outcomes are keyed by task index so the caller can merge them in submission
+  order regardless of completion order.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import pickle
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+try:
+    import psutil
+except Exception:  # pragma: no cover - memory limits need psutil
+    psutil = None
+
+POLL_INTERVAL_S = 0.02
+TASK_STATUSES = ("ok", "failed", "timeout", "memory_limit")
+
+
+@dataclass(slots=True)
+class TableHandle:
+    """Location of one exported table; cheap to pickle into every task."""
+
+    directory: str
+    columns: list[tuple[Any, str]]
+    has_objects: bool = False
+    row_count: int = 0
+
+
+@dataclass(slots=True)
+class BenchmarkTask:
+    task_index: int
+    algorithm_name: str
+    seed: int
+    scenario: Any
+    dataset_name: str
+    tables: dict[tuple[str, str], TableHandle]
+    runner_options: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class TaskOutcome:
+    task_index: int
+    algorithm_name: str
+    seed: int
+    status: str
+    output: dict[str, Any] | None = None
+    metrics: dict[str, dict[str, Any]] = field(default_factory=dict)
+    error: str | None = None
+    wall_ms: float = 0.0
+    peak_rss_mb: float | None = None
+
+
+def export_table(frame: pd.DataFrame, directory: Path) -> TableHandle:
+    """Write ``frame`` column by column; the row index is not preserved."""
+    directory.mkdir(parents=True, exist_ok=True)
+    columns: list[tuple[Any, str]] = []
+    objects: dict[int, list[Any]] = {}
+    for position, column in enumerate(frame.columns):
+        series = frame.iloc[:, position]
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_extension_array_dtype(series.dtype):
+            filename = f"c{position}.npy"
+            np.save(directory / filename, series.to_numpy(), allow_pickle=False)
+            columns.append((column, filename))
+        else:
+            objects[position] = series.tolist()
+            columns.append((column, ""))
+    if objects:
+        with open(directory / "objects.pkl", "wb") as handle:
+            pickle.dump(objects, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    return TableHandle(directory=str(directory), columns=columns, has_objects=bool(objects), row_count=len(frame))
+
+
+def load_table(handle: TableHandle) -> pd.DataFrame:
+    directory = Path(handle.directory)
+    objects: dict[int, list[Any]] = {}
+    if handle.has_objects:
+        with open(directory / "objects.pkl", "rb") as source:
+            objects = pickle.load(source)
+    data = {
+        position: np.load(directory / filename, mmap_mode="r") if filename else objects[position]
+        for position, (_, filename) in enumerate(handle.columns)
+    }
+    frame = pd.DataFrame(data, index=pd.RangeIndex(handle.row_count))
+    frame.columns = [column for column, _ in handle.columns]
+    return frame
+
+
+def _run_task(task: BenchmarkTask, connection) -> None:
+    started = time.perf_counter()
+    try:
+        from app.benchmark.registry import AlgorithmRegistry
+        from app.benchmark.runner import ExperimentRunner
+        from app.datasets.entities import DatasetBundle
+
+        layers: dict[str, dict[str, pd.DataFrame]] = {"raw_real": {}, "derived": {}, "synthetic": {}}
+        for (layer, name), handle in task.tables.items():
+            layers[layer][name] = load_table(handle)
+        dataset = DatasetBundle(dataset_name=task.dataset_name, raw_real=layers["raw_real"], derived=layers["derived"], synthetic=layers["synthetic"])
+        runner = ExperimentRunner(registry=AlgorithmRegistry(), **task.runner_options)
+        algorithm = runner.registry.create(task.algorithm_name)
+        output, metrics = runner._run_algorithm(dataset, task.scenario, algorithm, seed=task.seed)
+        outcome = TaskOutcome(task.task_index, task.algorithm_name, task.seed, "ok", output=output.as_dict(), metrics=metrics)
+    except BaseException as exc:  # noqa: BLE001 - every failure is reported to the parent
+        status = "memory_limit" if isinstance(exc, MemoryError) else "failed"
+        outcome = TaskOutcome(
+            task.task_index,
+            task.algorithm_name,
+            task.seed,
+            status,
+            error=f"{type(exc).__name__}: {exc}\n{traceback.format_exc(limit=5)}",
+        )
+    outcome.wall_ms = (time.perf_counter() - started) * 1000.0
+    connection.send(outcome)
+    connection.close()
+
+
+@dataclass(slots=True)
+class _Running:
+    task: BenchmarkTask
+    process: Any
+    connection: Any
+    started: float
+    peak_rss_mb: float | None = None
+
+
+def run_isolated(
+    tasks: list[BenchmarkTask],
+    *,
+    max_workers: int,
+    timeout_s: float | None = None,
+    memory_limit_mb: float | None = None,
+    mp_context: str | None = None,
+) -> list[TaskOutcome]:
+    """Run ``tasks`` in at most ``max_workers`` child processes; outcomes follow task order."""
+    context = multiprocessing.get_context(mp_context)
+    pending = list(tasks)
+    running: list[_Running] = []
+    outcomes: dict[int, TaskOutcome] = {}
+    workers = max(1, int(max_workers))
+
+    def finish(item: _Running, outcome: TaskOutcome) -> None:
+        if outcome.peak_rss_mb is None:
+            outcome.peak_rss_mb = item.peak_rss_mb
+        outcomes[item.task.task_index] = outcome
+        item.connection.close()
+        item.process.join(timeout=5)
+
+    def stop(item: _Running, status: str, message: str) -> None:
+        item.process.terminate()
+        item.process.join(timeout=5)
+        if item.process.is_alive():  # pragma: no cover - terminate ignored
+            item.process.kill()
+            item.process.join()
+        finish(
+            item,
+            TaskOutcome(
+                item.task.task_index,
+                item.task.algorithm_name,
+                item.task.seed,
+                status,
+                error=message,
+                wall_ms=(time.perf_counter() - item.started) * 1000.0,
+            ),
+        )
+
+    while pending or running:
+        while pending and len(running) < workers:
+            task = pending.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_run_task, args=(task, sender), daemon=True)
+            process.start()
+            sender.close()
+            running.append(_Running(task=task, process=process, connection=receiver, started=time.perf_counter()))
+
+        still_running: list[_Running] = []
+        for item in running:
+            if item.connection.poll():
+                try:
+                    outcome = item.connection.recv()
+                except EOFError:
+                    outcome = None
+                if outcome is not None:
+                    finish(item, outcome)
+                    continue
+            if not item.process.is_alive() and not item.connection.poll():
+                stop(item, "failed", f"Worker exited with code {item.process.exitcode} before reporting a result.")
+                continue
+            elapsed = time.perf_counter() - item.started
+            if timeout_s is not None and elapsed > float(timeout_s):
+                stop(item, "timeout", f"Exceeded wall-clock limit of {float(timeout_s):.1f} s.")
+                continue
+            if psutil is not None:
+                try:
+                    rss_mb = psutil.Process(item.process.pid).memory_info().rss / (1024.0 * 1024.0)
+                except (psutil.Error, ProcessLookupError):
+                    rss_mb = None
+                if rss_mb is not None:
+                    item.peak_rss_mb = max(item.peak_rss_mb or 0.0, rss_mb)
+                    if memory_limit_mb is not None and rss_mb > float(memory_limit_mb):
+                        stop(item, "memory_limit", f"Exceeded memory limit of {float(memory_limit_mb):.0f} MB (rss={rss_mb:.0f} MB).")
+                        continue
+            still_running.append(item)
+        running = still_running
+        if running:
+            time.sleep(POLL_INTERVAL_S)
+
+    return [outcomes[task.task_index] for task in tasks]
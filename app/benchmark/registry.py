@@ -10,6 +10,7 @@ from app.algorithms.allocation import (
     GaleShapleyAllocator,
     GreedyAllocator,
     MinimumRegretAllocator,
+    OptimalRegretAllocator,
     RandomAllocator,
 )
 from app.algorithms.base import IAlgorithm
@@ -68,6 +69,15 @@ class AlgorithmRegistry:
             available = ", ".join(sorted(self._entries.keys()))
             raise KeyError(f"Algorithm '{name}' not found. Available: {available}") from exc
 
+    def is_default(self, name: str) -> bool:
+        """True when ``name`` uses the factory a fresh registry would create (safe to rebuild in a worker)."""
+        entry = self._entries.get(name)
+        default = AlgorithmRegistry()._entries.get(name)
+        if entry is None or default is None:
+            return False
+        code = getattr(entry.factory, "__code__", None)
+        return entry.factory is default.factory or (code is not None and code is getattr(default.factory, "__code__", None))
+
     def list_algorithms(self, group: str | None = None) -> list[dict[str, str]]:
         entries = self._entries.values()
         if group is not None:
@@ -105,3 +115,4 @@ class AlgorithmRegistry:
         self.register("GreedyAllocation", "allocation", lambda: GreedyAllocator())
         self.register("FirstComeFirstServed", "allocation", lambda: FCFSAllocator())
         self.register("MinimumRegretAllocation", "allocation", lambda: MinimumRegretAllocator())
+        self.register("OptimalRegretAllocation", "allocation", lambda: OptimalRegretAllocator())
@@ -1,10 +1,30 @@
-"""Persistence layer for benchmark runs."""
+"""Persistence layer for benchmark runs.
+
+Every run keeps its full JSON document (``<run_id>.json``) for detail views,
+but listing and cross-run analysis never parse those files:
+
+* ``_index.sqlite3`` holds one row of run metadata per run (scenario, status,
+  timestamps, algorithms) and is what :meth:`ResultStore.list_runs` reads.
+* Metric rows (run, algorithm, group, name, value) are appended to a columnar
+  store. With ``pyarrow`` installed this is an Arrow IPC dataset partitioned as
+  ``metrics/scenario=<name>/date=<YYYY-MM-DD>/<run_id>.arrow``; without it the
+  rows go to a ``run_metrics`` table in the same SQLite index.
+
+JSON files written by older versions are indexed lazily on the next listing, or
+in one pass with ``scripts/migrate_benchmark_runs.py``.
+"""
 
 from __future__ import annotations
 
 import json
+import math
+import sqlite3
+from contextlib import closing
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+import pandas as pd
 
 from app.datasets.entities import BenchmarkRun
 
@@ -13,6 +33,55 @@ try:
 except Exception:  # pragma: no cover
     np = None
 
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_dataset
+    import pyarrow.feather as pa_feather
+except Exception:  # pragma: no cover - optional columnar backend
+    pa = None
+    pa_dataset = None
+    pa_feather = None
+
+INDEX_FILENAME = "_index.sqlite3"
+METRICS_DIRNAME = "metrics"
+METRIC_COLUMNS = ["run_id", "scenario_name", "run_date", "algorithm_name", "metric_group", "metric_name", "metric_value", "metric_text"]
+
+_INDEX_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id TEXT PRIMARY KEY,
+        scenario_name TEXT,
+        problem_type TEXT,
+        dataset_name TEXT,
+        status TEXT,
+        started_at TEXT,
+        finished_at TEXT,
+        run_date TEXT,
+        algorithms_json TEXT,
+        scenario_json TEXT,
+        payload_path TEXT NOT NULL,
+        stored_at REAL NOT NULL,
+        metric_count INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_runs_stored_at ON runs (stored_at DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_runs_scenario ON runs (scenario_name, run_date)",
+    """
+    CREATE TABLE IF NOT EXISTS run_metrics (
+        run_id TEXT NOT NULL,
+        scenario_name TEXT,
+        run_date TEXT,
+        algorithm_name TEXT NOT NULL,
+        metric_group TEXT NOT NULL,
+        metric_name TEXT NOT NULL,
+        metric_value REAL,
+        metric_text TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_run_metrics_algorithm ON run_metrics (algorithm_name, metric_name)",
+    "CREATE INDEX IF NOT EXISTS ix_run_metrics_run ON run_metrics (run_id)",
+]
+
 
 def _json_default(value: Any):
     if np is not None:
@@ -32,10 +101,76 @@ def _json_default(value: Any):
     raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
+def _metric_value(value: Any) -> tuple[float | None, str | None]:
+    if isinstance(value, bool):
+        return float(value), None
+    if isinstance(value, (int, float)) or (np is not None and isinstance(value, (np.integer, np.floating))):
+        number = float(value)
+        return (number if math.isfinite(number) else None), None
+    if value is None:
+        return None, None
+    return None, str(value)
+
+
+def _metric_rows(run: dict[str, Any], payload: dict[str, Any], run_date: str) -> list[dict[str, Any]]:
+    run_id = str(run.get("run_id"))
+    scenario_name = run.get("scenario_name")
+    rows: list[dict[str, Any]] = []
+    for algorithm_name, result in (payload.get("results") or {}).items():
+        for metric_group, metric_values in ((result or {}).get("metrics") or {}).items():
+            if not isinstance(metric_values, dict):
+                continue
+            for metric_name, raw_value in metric_values.items():
+                value, text = _metric_value(raw_value)
+                rows.append(
+                    {
+                        "run_id": run_id,
+                        "scenario_name": scenario_name,
+                        "run_date": run_date,
+                        "algorithm_name": str(algorithm_name),
+                        "metric_group": str(metric_group),
+                        "metric_name": str(metric_name),
+                        "metric_value": value,
+                        "metric_text": text,
+                    }
+                )
+    return rows
+
+
+def _run_date(run: dict[str, Any], fallback: float) -> str:
+    started = str(run.get("started_at") or "")
+    if len(started) >= 10:
+        return started[:10]
+    return datetime.fromtimestamp(fallback).strftime("%Y-%m-%d")
+
+
+def _partition_value(value: Any) -> str:
+    text = str(value or "unknown")
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in text)
+
+
 class ResultStore:
-    def __init__(self, root_dir: str = "reports/benchmark_runs") -> None:
+    def __init__(self, root_dir: str = "reports/benchmark_runs", *, columnar_backend: str | None = None) -> None:
         self.root = Path(root_dir)
         self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / INDEX_FILENAME
+        self.metrics_root = self.root / METRICS_DIRNAME
+        if columnar_backend is None:
+            columnar_backend = "arrow" if pa is not None else "sqlite"
+        if columnar_backend not in {"arrow", "sqlite"}:
+            raise ValueError(f"Unknown columnar backend: {columnar_backend}")
+        if columnar_backend == "arrow" and pa is None:
+            raise ImportError("pyarrow is required for the Arrow metrics backend.")
+        self.columnar_backend = columnar_backend
+        with closing(self._connect()) as conn:
+            for ddl in _INDEX_DDL:
+                conn.execute(ddl)
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
 
     def save_run(self, run: BenchmarkRun, payload: dict[str, Any]) -> Path:
         path = self.root / f"{run.run_id}.json"
@@ -44,20 +179,222 @@ class ResultStore:
             "payload": payload,
         }
         path.write_text(json.dumps(data, indent=2, ensure_ascii=False, default=_json_default), encoding="utf-8")
+        # Index/metrikler JSON'a yazilan degerlerden uretilir (numpy tipleri temizlenmis olur).
+        self._index_document(json.loads(json.dumps(data, default=_json_default)), path)
         return path
 
     def load_run(self, run_id: str) -> dict[str, Any]:
         path = self.root / f"{run_id}.json"
+        if not path.exists():
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT payload_path FROM runs WHERE run_id=?", (str(run_id),)).fetchone()
+            if row is not None:
+                path = self.root / row["payload_path"]
         if not path.exists():
             raise FileNotFoundError(f"Run not found: {run_id}")
         return json.loads(path.read_text(encoding="utf-8"))
 
     def list_runs(self, limit: int = 100) -> list[dict[str, Any]]:
-        files = sorted(self.root.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)[:limit]
-        runs = []
-        for path in files:
+        """Newest runs as ``{"run", "payload"}`` summaries built from the index.
+
+        ``payload`` carries the scenario and per-algorithm ``metrics`` only;
+        algorithm outputs stay in the JSON document (see :meth:`load_run`).
+        """
+        self.sync_index()
+        with closing(self._connect()) as conn:
+            runs = conn.execute("SELECT * FROM runs ORDER BY stored_at DESC, run_id DESC LIMIT ?", (int(limit),)).fetchall()
+        if not runs:
+            return []
+        metrics = self.query_metrics(run_ids=[row["run_id"] for row in runs])
+        grouped: dict[str, dict[str, dict[str, dict[str, Any]]]] = {}
+        for record in metrics.to_dict("records"):
+            value = record["metric_text"] if pd.notna(record["metric_text"]) else record["metric_value"]
+            if not isinstance(value, str) and pd.isna(value):
+                value = None
+            algo_metrics = grouped.setdefault(record["run_id"], {}).setdefault(record["algorithm_name"], {})
+            algo_metrics.setdefault(record["metric_group"], {})[record["metric_name"]] = value
+        blobs = []
+        for row in runs:
+            algorithms = json.loads(row["algorithms_json"] or "[]")
+            run_metrics = grouped.get(row["run_id"], {})
+            results = {name: {"metrics": run_metrics.get(name, {})} for name in algorithms}
+            for name, metric_groups in run_metrics.items():
+                results.setdefault(name, {"metrics": metric_groups})
+            blobs.append(
+                {
+                    "run": {
+                        "run_id": row["run_id"],
+                        "scenario_name": row["scenario_name"],
+                        "dataset_name": row["dataset_name"],
+                        "status": row["status"],
+                        "started_at": row["started_at"],
+                        "finished_at": row["finished_at"],
+                        "algorithms": algorithms,
+                    },
+                    "payload": {"scenario": json.loads(row["scenario_json"] or "{}"), "results": results},
+                }
+            )
+        return blobs
+
+    def query_metrics(
+        self,
+        *,
+        run_ids: Iterable[str] | None = None,
+        scenario_name: str | None = None,
+        algorithm_name: str | Iterable[str] | None = None,
+        metric_name: str | Iterable[str] | None = None,
+        metric_group: str | None = None,
+    ) -> pd.DataFrame:
+        """Long-format metric rows filtered without touching run JSON files."""
+        filters: dict[str, list[Any]] = {}
+        if run_ids is not None:
+            filters["run_id"] = [str(r) for r in run_ids]
+        for column, value in (("scenario_name", scenario_name), ("algorithm_name", algorithm_name), ("metric_name", metric_name), ("metric_group", metric_group)):
+            if value is None:
+                continue
+            filters[column] = [value] if isinstance(value, str) else list(value)
+        if self.columnar_backend == "arrow":
+            return self._query_arrow(filters)
+        clauses, params = [], []
+        for column, values in filters.items():
+            if not values:
+                return pd.DataFrame(columns=METRIC_COLUMNS)
+            clauses.append(f"{column} IN ({','.join('?' for _ in values)})")
+            params.extend(values)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(f"SELECT {', '.join(METRIC_COLUMNS)} FROM run_metrics {where}", conn, params=params)
+
+    def aggregate_metrics(
+        self,
+        *,
+        group_by: tuple[str, ...] = ("algorithm_name", "metric_group", "metric_name"),
+        **filters: Any,
+    ) -> pd.DataFrame:
+        """Cross-run mean/std/min/max/count of numeric metrics."""
+        frame = self.query_metrics(**filters)
+        frame = frame[frame["metric_value"].notna()]
+        if frame.empty:
+            return pd.DataFrame(columns=[*group_by, "mean", "std", "min", "max", "count"])
+        grouped = frame.groupby(list(group_by), dropna=False)["metric_value"]
+        return grouped.agg(["mean", "std", "min", "max", "count"]).reset_index()
+
+    def sync_index(self) -> int:
+        """Index JSON documents that are not in the index yet; returns how many were added."""
+        with closing(self._connect()) as conn:
+            known = {row["payload_path"] for row in conn.execute("SELECT payload_path FROM runs")}
+        added = 0
+        for path in sorted(self.root.glob("*.json")):
+            if path.name in known:
+                continue
             try:
-                runs.append(json.loads(path.read_text(encoding="utf-8")))
-            except json.JSONDecodeError:
+                document = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            if not isinstance(document, dict) or not isinstance(document.get("run"), dict):
                 continue
-        return runs
+            self._index_document(document, path)
+            added += 1
+        return added
+
+    def rebuild_index(self) -> int:
+        """Drop index and columnar metrics, then re-index every JSON document."""
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM runs")
+            conn.execute("DELETE FROM run_metrics")
+            conn.commit()
+        if self.metrics_root.exists():
+            for fragment in self.metrics_root.rglob("*.arrow"):
+                fragment.unlink()
+        return self.sync_index()
+
+    def _index_document(self, document: dict[str, Any], path: Path) -> None:
+        run = dict(document.get("run") or {})
+        payload = dict(document.get("payload") or {})
+        run_id = str(run.get("run_id") or path.stem)
+        run["run_id"] = run_id
+        stored_at = path.stat().st_mtime
+        run_date = _run_date(run, stored_at)
+        scenario = payload.get("scenario") or {}
+        algorithms = list(run.get("algorithms") or []) or list((payload.get("results") or {}).keys())
+        rows = _metric_rows(run, payload, run_date)
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM run_metrics WHERE run_id=?", (run_id,))
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO runs (
+                    run_id, scenario_name, problem_type, dataset_name, status, started_at,
+                    finished_at, run_date, algorithms_json, scenario_json, payload_path,
+                    stored_at, metric_count
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    run_id,
+                    run.get("scenario_name") or scenario.get("name"),
+                    scenario.get("problem_type"),
+                    run.get("dataset_name"),
+                    run.get("status"),
+                    run.get("started_at"),
+                    run.get("finished_at"),
+                    run_date,
+                    json.dumps(algorithms, ensure_ascii=False),
+                    json.dumps(scenario, ensure_ascii=False, default=_json_default),
+                    path.name,
+                    stored_at,
+                    len(rows),
+                ),
+            )
+            if self.columnar_backend == "sqlite" and rows:
+                conn.executemany(
+                    f"INSERT INTO run_metrics ({', '.join(METRIC_COLUMNS)}) VALUES ({', '.join('?' for _ in METRIC_COLUMNS)})",
+                    [tuple(row[column] for column in METRIC_COLUMNS) for row in rows],
+                )
+            conn.commit()
+        if self.columnar_backend == "arrow":
+            self._write_arrow_fragment(run_id, run.get("scenario_name"), run_date, rows)
+
+    def _write_arrow_fragment(self, run_id: str, scenario_name: Any, run_date: str, rows: list[dict[str, Any]]) -> None:
+        partition = self.metrics_root / f"scenario={_partition_value(scenario_name)}" / f"date={run_date}"
+        fragment = partition / f"{_partition_value(run_id)}.arrow"
+        # Senaryo/tarih degismis bir kosunun eski bolumdeki parcasi da silinir.
+        for stale in self.metrics_root.glob(f"scenario=*/date=*/{fragment.name}"):
+            stale.unlink()
+            for directory in (stale.parent, stale.parent.parent):
+                if directory != partition and not any(directory.iterdir()):
+                    directory.rmdir()
+        if not rows:
+            return
+        partition.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pylist(
+            [{key: row[key] for key in METRIC_COLUMNS if key not in {"scenario_name", "run_date"}} for row in rows],
+            schema=_ARROW_SCHEMA,
+        )
+        pa_feather.write_feather(table, str(fragment), compression="uncompressed")
+
+    def _query_arrow(self, filters: dict[str, list[Any]]) -> pd.DataFrame:
+        if not self.metrics_root.exists() or not any(self.metrics_root.rglob("*.arrow")):
+            return pd.DataFrame(columns=METRIC_COLUMNS)
+        dataset = pa_dataset.dataset(str(self.metrics_root), format="ipc", partitioning="hive")
+        expression = None
+        for column, values in filters.items():
+            if column == "scenario_name":
+                column, values = "scenario", [_partition_value(v) for v in values]
+            condition = pa_dataset.field(column).isin(values)
+            expression = condition if expression is None else expression & condition
+        frame = dataset.to_table(filter=expression).to_pandas()
+        frame = frame.rename(columns={"scenario": "scenario_name", "date": "run_date"})
+        return frame.reindex(columns=METRIC_COLUMNS)
+
+
+if pa is not None:
+    _ARROW_SCHEMA = pa.schema(
+        [
+            ("run_id", pa.string()),
+            ("algorithm_name", pa.string()),
+            ("metric_group", pa.string()),
+            ("metric_name", pa.string()),
+            ("metric_value", pa.float64()),
+            ("metric_text", pa.string()),
+        ]
+    )
@@ -1,9 +1,19 @@
-"""Benchmark experiment runner."""
+"""Benchmark experiment runner.
+
+By default algorithms run one after another in the calling process. With
+``max_workers`` (or a wall-clock / memory limit) every (algorithm, seed) task
+runs in its own child process via :mod:`app.benchmark.parallel`; failed,
+timed-out or over-budget tasks are recorded instead of aborting the run, and
+results are merged in (algorithm, seed) order so serial and parallel runs
+produce identical metric lists.
+"""
 
 from __future__ import annotations
 
+import tempfile
 from dataclasses import asdict
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
@@ -12,6 +22,8 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 
 from app.algorithms.base import IAllocator, IClusterer, IPredictor, IRanker
+from app.algorithms.mcdm import DecisionMatrix
+from app.benchmark.parallel import BenchmarkTask, TaskOutcome, export_table, run_isolated
 from app.benchmark.registry import AlgorithmRegistry
 from app.benchmark.result_store import ResultStore
 from app.benchmark.scenarios import BenchmarkScenario
@@ -20,26 +32,62 @@ from app.metrics.academic import ranking_similarity_with_ground_truth
 from app.metrics.classification import classification_metrics, top_k_accuracy
 from app.metrics.clustering import clustering_metrics
 from app.metrics.fairness import allocation_fairness_metrics
-from app.metrics.performance import PerformanceTracker
+from app.metrics.performance import DEFAULT_TRACKER_MODE, PerformanceTracker
 from app.metrics.ranking import coverage, diversity, hit_at_k, map_at_k, ndcg_at_k
 from app.services.statistical_comparison_service import bootstrap_confidence_interval
 
+DEFAULT_SEED = 42
+
 
 class ExperimentRunner:
     """Executes comparable multi-algorithm experiments on shared scenarios."""
 
-    def __init__(self, registry: AlgorithmRegistry | None = None, result_store: ResultStore | None = None) -> None:
+    def __init__(
+        self,
+        registry: AlgorithmRegistry | None = None,
+        result_store: ResultStore | None = None,
+        *,
+        max_workers: int | None = None,
+        timeout_s: float | None = None,
+        memory_limit_mb: float | None = None,
+        tracker_mode: str = DEFAULT_TRACKER_MODE,
+        timing_repeats: int = 1,
+        timing_warmup: int = 0,
+    ) -> None:
         self.registry = registry or AlgorithmRegistry()
-        self.result_store = result_store or ResultStore()
+        self._result_store = result_store
+        self.max_workers = max_workers
+        self.timeout_s = timeout_s
+        self.memory_limit_mb = memory_limit_mb
+        self.tracker_mode = tracker_mode
+        self.timing_repeats = timing_repeats
+        self.timing_warmup = timing_warmup
+        self._ranking_cache: dict[tuple, tuple] = {}
+
+    @property
+    def result_store(self) -> ResultStore:
+        # Worker processes only evaluate; the default store is created on first use.
+        if self._result_store is None:
+            self._result_store = ResultStore()
+        return self._result_store
+
+    @result_store.setter
+    def result_store(self, value: ResultStore) -> None:
+        self._result_store = value
 
     def run(
         self,
         dataset: DatasetBundle,
         scenario: BenchmarkScenario,
         algorithm_names: list[str] | None = None,
+        *,
+        seeds: list[int] | None = None,
+        max_workers: int | None = None,
     ) -> dict:
         run_id = f"run_{uuid4().hex[:12]}"
+        self._ranking_cache.clear()
         selected_algorithms = algorithm_names or scenario.algorithm_names
+        seed_list = [int(seed) for seed in (seeds or [DEFAULT_SEED])]
         benchmark_run = BenchmarkRun(
             run_id=run_id,
             scenario_name=scenario.name,
@@ -48,13 +96,23 @@ class ExperimentRunner:
             algorithms=selected_algorithms,
         )
 
+        workers = max_workers if max_workers is not None else self.max_workers
+        isolated = bool(workers and workers > 1) or self.timeout_s is not None or self.memory_limit_mb is not None
+        if isolated:
+            outcomes = self._run_isolated(dataset, scenario, selected_algorithms, seed_list, max(1, int(workers or 1)))
+        else:
+            outcomes = self._run_serial(dataset, scenario, selected_algorithms, seed_list)
+        self._ranking_cache.clear()
+
         results: dict[str, dict] = {}
         for algorithm_name in selected_algorithms:
-            algorithm = self.registry.create(algorithm_name)
-            algo_result, metrics = self._run_algorithm(dataset, scenario, algorithm)
-            results[algorithm_name] = {"output": algo_result.as_dict(), "metrics": metrics}
-            for metric_group, metric_payload in metrics.items():
+            repeats = [outcome for outcome in outcomes if outcome.algorithm_name == algorithm_name]
+            results[algorithm_name] = self._merge_repeats(repeats, isolated)
+            metadata = {"seeds": seed_list} if len(seed_list) > 1 else {}
+            for metric_group, metric_payload in results[algorithm_name]["metrics"].items():
                 for metric_name, metric_value in metric_payload.items():
+                    if isinstance(metric_value, bool) or not isinstance(metric_value, (int, float, np.number)):
+                        continue
                     benchmark_run.metrics.append(
                         MetricResult(
                             run_id=run_id,
@@ -62,6 +120,7 @@ class ExperimentRunner:
                             metric_group=metric_group,
                             metric_name=metric_name,
                             metric_value=float(metric_value),
+                            metadata=dict(metadata),
                         )
                     )
 
@@ -75,9 +134,106 @@ class ExperimentRunner:
         persisted_path = self.result_store.save_run(benchmark_run, payload)
         return {"run": benchmark_run.as_dict(), "results": results, "stored_at": str(persisted_path)}
 
-    def _run_algorithm(self, dataset: DatasetBundle, scenario: BenchmarkScenario, algorithm):
+    def _run_serial(
+        self,
+        dataset: DatasetBundle,
+        scenario: BenchmarkScenario,
+        algorithm_names: list[str],
+        seeds: list[int],
+    ) -> list[TaskOutcome]:
+        outcomes: list[TaskOutcome] = []
+        for algorithm_name in algorithm_names:
+            for seed in seeds:
+                algorithm = self.registry.create(algorithm_name)
+                algo_result, metrics = self._run_algorithm(dataset, scenario, algorithm, seed=seed)
+                outcomes.append(TaskOutcome(len(outcomes), algorithm_name, seed, "ok", output=algo_result.as_dict(), metrics=metrics))
+        return outcomes
+
+    def _run_isolated(
+        self,
+        dataset: DatasetBundle,
+        scenario: BenchmarkScenario,
+        algorithm_names: list[str],
+        seeds: list[int],
+        workers: int,
+    ) -> list[TaskOutcome]:
+        # Child processes rebuild algorithms from the default registry; names only
+        # known to a custom registry cannot cross the process boundary and run here.
+        with tempfile.TemporaryDirectory(prefix="benchmark_tables_") as directory:
+            tables = {
+                key: export_table(frame, Path(directory) / f"t{position}")
+                for position, (key, frame) in enumerate(self._required_tables(dataset, scenario).items())
+            }
+            tasks: list[BenchmarkTask] = []
+            local: list[BenchmarkTask] = []
+            for algorithm_name in algorithm_names:
+                for seed in seeds:
+                    task = BenchmarkTask(
+                        len(tasks) + len(local), algorithm_name, seed, scenario, dataset.dataset_name, tables, self.tracker_options
+                    )
+                    (tasks if self.registry.is_default(algorithm_name) else local).append(task)
+            outcomes = {
+                outcome.task_index: outcome
+                for outcome in run_isolated(tasks, max_workers=workers, timeout_s=self.timeout_s, memory_limit_mb=self.memory_limit_mb)
+            }
+        for task in local:
+            algorithm = self.registry.create(task.algorithm_name)
+            algo_result, metrics = self._run_algorithm(dataset, scenario, algorithm, seed=task.seed)
+            outcomes[task.task_index] = TaskOutcome(task.task_index, task.algorithm_name, task.seed, "ok", output=algo_result.as_dict(), metrics=metrics)
+        return [outcomes[index] for index in sorted(outcomes)]
+
+    def _required_tables(self, dataset: DatasetBundle, scenario: BenchmarkScenario) -> dict[tuple[str, str], pd.DataFrame]:
+        if scenario.problem_type == "allocation":
+            return {("raw_real", name): dataset.raw_real[name] for name in ("students", "courses", "preferences")}
+        if scenario.use_synthetic_tier:
+            return {("synthetic", scenario.use_synthetic_tier): self._get_table(dataset, scenario)}
+        return {(scenario.dataset_layer, scenario.table_name): self._get_table(dataset, scenario)}
+
+    @staticmethod
+    def _merge_repeats(repeats: list[TaskOutcome], isolated: bool) -> dict[str, Any]:
+        completed = [outcome for outcome in repeats if outcome.status == "ok"]
+        first = completed[0] if completed else repeats[0]
+        merged: dict[str, Any] = {"output": first.output, "metrics": first.metrics}
+        if len(repeats) > 1:
+            metrics: dict[str, dict[str, Any]] = {}
+            for group, payload in first.metrics.items():
+                metrics[group] = {}
+                for name, value in payload.items():
+                    values = [outcome.metrics.get(group, {}).get(name) for outcome in completed]
+                    numeric = [float(v) for v in values if isinstance(v, (int, float, np.number)) and not isinstance(v, bool)]
+                    metrics[group][name] = float(np.mean(numeric)) if len(numeric) == len(values) else value
+            merged["metrics"] = metrics
+            merged["repeats"] = [
+                {"seed": outcome.seed, "status": outcome.status, "metrics": outcome.metrics, "error": outcome.error}
+                for outcome in repeats
+            ]
+        if isolated:
+            merged["status"] = "ok" if len(completed) == len(repeats) else first.status
+            merged["error"] = next((outcome.error for outcome in repeats if outcome.error), None)
+            merged["isolation"] = [
+                {"seed": outcome.seed, "status": outcome.status, "wall_ms": outcome.wall_ms, "peak_rss_mb": outcome.peak_rss_mb}
+                for outcome in repeats
+            ]
+        return merged
+
+    @property
+    def tracker_options(self) -> dict[str, Any]:
+        return {"tracker_mode": self.tracker_mode, "timing_repeats": self.timing_repeats, "timing_warmup": self.timing_warmup}
+
+    def _track(self, fn, workload_size: int):
+        """Run the timed section; with repeats > 1 latency is the median of warm runs."""
+        result, tracker = PerformanceTracker.measure(
+            fn,
+            workload_size=workload_size,
+            repeats=self.timing_repeats,
+            warmup=self.timing_warmup,
+            mode=self.tracker_mode,
+        )
+        return result, tracker.snapshot().as_dict()
+
+    def _run_algorithm(self, dataset: DatasetBundle, scenario: BenchmarkScenario, algorithm, seed: int = DEFAULT_SEED):
         if scenario.problem_type == "prediction":
-            return self._run_prediction(dataset, scenario, algorithm)
+            return self._run_prediction(dataset, scenario, algorithm, seed=seed)
         if scenario.problem_type == "ranking":
             return self._run_ranking(dataset, scenario, algorithm)
         if scenario.problem_type == "clustering":
@@ -97,7 +253,7 @@ class ExperimentRunner:
         table_name = scenario.table_name
         return dataset.table(layer, table_name).copy()
 
-    def _run_prediction(self, dataset: DatasetBundle, scenario: BenchmarkScenario, algorithm):
+    def _run_prediction(self, dataset: DatasetBundle, scenario: BenchmarkScenario, algorithm, seed: int = DEFAULT_SEED):
         if not isinstance(algorithm, (IPredictor, IRanker)):
             raise TypeError(f"{algorithm.name} is not compatible with prediction scenario")
 
@@ -111,16 +267,16 @@ class ExperimentRunner:
         X = df.drop(columns=[c for c in drop_cols if c in df.columns], errors="ignore")
         X = pd.get_dummies(X, dummy_na=True).fillna(0.0)
         stratify = y if y.nunique() > 1 else None
-        split_result = train_test_split(X, y, test_size=0.2, random_state=42, stratify=stratify)
+        split_result = train_test_split(X, y, test_size=0.2, random_state=seed, stratify=stratify)
         X_train, X_test, y_train, y_test = split_result  # type: ignore[misc]
         y_train = pd.Series(y_train)
         y_test = pd.Series(y_test)
 
-        with PerformanceTracker(workload_size=len(X_test)) as tracker:
+        def fit_predict():
             algorithm.fit(X_train, y_train)
-            output = algorithm.predict(X_test)
-            ranked_output = algorithm.recommend(X_test, top_k=scenario.top_k)
-        perf = tracker.snapshot().as_dict()
+            return algorithm.predict(X_test), algorithm.recommend(X_test, top_k=scenario.top_k)
+
+        (output, ranked_output), perf = self._track(fit_predict, len(X_test))
 
         y_pred = output.predictions
         y_proba = np.array(algorithm.predict_proba(X_test), dtype=float) if isinstance(algorithm, IPredictor) else None
@@ -150,9 +306,12 @@ class ExperimentRunner:
         }
         return output, {"classification": cls_metrics, "recommendation": rec_metrics, "performance": perf}
 
-    def _run_ranking(self, dataset: DatasetBundle, scenario: BenchmarkScenario, algorithm):
-        if not isinstance(algorithm, IRanker):
-            raise TypeError(f"{algorithm.name} is not a ranker")
+    def _ranking_inputs(self, dataset: DatasetBundle, scenario: BenchmarkScenario):
+        """Aggregated ranking table and its DecisionMatrix, built once per run for all rankers."""
+        key = (id(dataset), scenario.name, scenario.dataset_layer, scenario.table_name, scenario.use_synthetic_tier)
+        cached = self._ranking_cache.get(key)
+        if cached is not None and cached[0] is dataset:
+            return cached[1:]
         df = self._get_table(dataset, scenario)
         if "course_id" in df.columns:
             aggregated = df.groupby("course_id").mean(numeric_only=True).reset_index().rename(columns={"course_id": "item_id"})
@@ -165,11 +324,21 @@ class ExperimentRunner:
         numeric_cols = aggregated.select_dtypes(include=["number"]).columns.tolist()
         numeric_cols = [c for c in numeric_cols if c != "item_id"]
         mcdm_df = aggregated[["item_id", *numeric_cols]].copy()
+        decision = DecisionMatrix.from_frame(mcdm_df)
+        self._ranking_cache[key] = (dataset, df, mcdm_df, decision)
+        return df, mcdm_df, decision
+
+    def _run_ranking(self, dataset: DatasetBundle, scenario: BenchmarkScenario, algorithm):
+        if not isinstance(algorithm, IRanker):
+            raise TypeError(f"{algorithm.name} is not a ranker")
+        df, mcdm_df, decision = self._ranking_inputs(dataset, scenario)
+        ranker_input = decision if getattr(algorithm, "accepts_decision_matrix", False) else mcdm_df.copy()
+
+        def fit_rank():
+            algorithm.fit(ranker_input)
+            return algorithm.recommend(ranker_input, top_k=scenario.top_k)
 
-        with PerformanceTracker(workload_size=len(mcdm_df)) as tracker:
-            algorithm.fit(mcdm_df)
-            output = algorithm.recommend(mcdm_df, top_k=scenario.top_k)
-        perf = tracker.snapshot().as_dict()
+        output, perf = self._track(fit_rank, len(mcdm_df))
 
         predicted_ranking = [r["item_id"] for r in output.recommendations]
         if "course_id" in df.columns:
@@ -197,9 +366,7 @@ class ExperimentRunner:
         X = df.drop(columns=[c for c in drop_cols if c in df.columns], errors="ignore")
         X = pd.get_dummies(X, dummy_na=True).fillna(0.0)
 
-        with PerformanceTracker(workload_size=len(X)) as tracker:
-            output = algorithm.cluster(X)
-        perf = tracker.snapshot().as_dict()
+        output, perf = self._track(lambda: algorithm.cluster(X), len(X))
         labels = output.predictions
         cl_metrics = clustering_metrics(X, labels)
         academic = {"pattern_reproduction": 0.0}
@@ -216,9 +383,7 @@ class ExperimentRunner:
         students = dataset.raw_real["students"]
         courses = dataset.raw_real["courses"]
         preferences = dataset.raw_real["preferences"]
-        with PerformanceTracker(workload_size=len(students)) as tracker:
-            output = algorithm.allocate(students, courses, preferences)
-        perf = tracker.snapshot().as_dict()
+        output, perf = self._track(lambda: algorithm.allocate(students, courses, preferences), len(students))
         self._enrich_allocation_assignments(output.assignments, students, courses)
         assignments_df = pd.DataFrame(output.assignments)
         fairness = allocation_fairness_metrics(assignments_df, courses, top_k=scenario.top_k)
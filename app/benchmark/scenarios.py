@@ -86,7 +86,7 @@ DEFAULT_SCENARIOS: dict[str, BenchmarkScenario] = {
         ),
         display_name="Yerleştirme Adaleti Karşılaştırması",
         purpose_tr=(
-            "Tercih sırasına göre öğrencileri seçmeli derslere yerleştiren 5 farklı "
+            "Tercih sırasına göre öğrencileri seçmeli derslere yerleştiren 6 farklı "
             "algoritmanın (Gale-Shapley, FCFS, Açgözlü, vb.) hem doluluk hem adillik "
             "açısından nasıl davrandığını gösterir."
         ),
@@ -105,6 +105,7 @@ DEFAULT_SCENARIOS: dict[str, BenchmarkScenario] = {
             "GreedyAllocation",
             "FirstComeFirstServed",
             "MinimumRegretAllocation",
+            "OptimalRegretAllocation",
         ],
     ),
     "clustering_exploration": BenchmarkScenario(
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -290,6 +291,81 @@ def load_app_config(config_path: str = "config.json") -> AppConfig:
     )
 
 
+# load_app_config'in okudugu ortam degiskenleri; onbellek anahtarina girer.
+_CONFIG_ENV_KEYS = (
+    "ALLOWED_UPLOAD_EXTENSIONS", "ALLOWED_UPLOAD_MIME_TYPES", "ALLOW_DANGEROUS_SQL",
+    "ALLOW_EXPERIMENTAL_ML_IN_DECISION", "ALLOW_RUNTIME_SCHEMA_MUTATION",
+    "ALLOW_RUNTIME_SCHEMA_MUTATION_IN_PRODUCTION", "API_AUTH_ENABLED", "API_AUTH_TOKEN_SECRET",
+    "API_HOST", "API_KEY_HASHES", "API_PORT", "API_TOKEN_EXPIRE_MINUTES", "APP_MODE", "APP_VERSION",
+    "BACKUP_BEFORE_IMPORT", "CORS_ALLOWED_ORIGINS", "CORS_ALLOW_CREDENTIALS", "DATABASE_URL", "DB_PATH",
+    "DEBUG", "ENABLE_DEVELOPER_TOOLS", "ENABLE_ML_DECISION_INFLUENCE", "ENABLE_SCHEMA_COMPAT",
+    "ENABLE_SQL_CONSOLE", "ENABLE_YEARLY_CRITERIA_WORKFLOW", "ENVIRONMENT", "IMPORT_REQUIRES_APPROVAL",
+    "LOG_LEVEL", "MAX_IMPORT_ROWS", "MAX_UPLOAD_SIZE_MB", "PROJECT_NAME",
+    "RATE_LIMIT_ALGORITHM_RUN_PER_MINUTE", "RATE_LIMIT_ENABLED", "RATE_LIMIT_IMPORT_PER_MINUTE",
+    "RATE_LIMIT_PER_MINUTE", "REQUIRE_HIGH_CONFIDENCE_FOR_ML_INFLUENCE", "REQUIRE_RBAC",
+    "SECURITY_AUDIT_ENABLED", "SQLITE_DB_PATH", "SQL_CONSOLE_READ_ONLY_IN_PRODUCTION",
+)
+_CONFIG_CACHE: dict[str, tuple[tuple[Any, ...], AppConfig]] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+_DOTENV_PATH: list[str] = []
+
+
+def _file_stamp(path: str | os.PathLike[str]) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _dotenv_stamp() -> tuple[int, int] | None:
+    if load_dotenv is None:
+        return None
+    if not _DOTENV_PATH:
+        try:
+            from dotenv import find_dotenv
+
+            _DOTENV_PATH.append(find_dotenv() or "")
+        except Exception:
+            _DOTENV_PATH.append("")
+    return _file_stamp(_DOTENV_PATH[0]) if _DOTENV_PATH[0] else None
+
+
+def get_app_config(config_path: str = "config.json") -> AppConfig:
+    """
+    Surec genelinde paylasilan AppConfig.
+
+    ``load_app_config`` her cagrida .env ve config.json'i yeniden okur; istek
+    basina cagrilan yollar (API baglantisi, rate limit) bunu kullanir. Onbellek
+    config.json / .env mtime'i veya ilgili ortam degiskenleri degisince
+    yenilenir. AppConfig frozen oldugu icin ornek guvenle paylasilir.
+    """
+    config_file = resolve_config_path(config_path)
+    key = (
+        _file_stamp(config_file),
+        _dotenv_stamp(),
+        tuple(os.environ.get(name) for name in _CONFIG_ENV_KEYS),
+    )
+    cache_key = str(config_file)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        config = load_app_config(config_path)
+        # load_dotenv yeni degisken tanimlamis olabilir; anahtar yukleme sonrasi alinir.
+        key = key[:2] + (tuple(os.environ.get(name) for name in _CONFIG_ENV_KEYS),)
+        _CONFIG_CACHE[cache_key] = (key, config)
+        return config
+
+
+def clear_app_config_cache() -> None:
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE.clear()
+
+
 class Settings:
     """Eski importları kırmamak için korunan uyumluluk sınıfı."""
 
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Kaynak dosya tarama sonuçlarını mtime/boyut damgasına göre hafızada tutar.
+
+Sağlık ve mimari taramaları (import toplama, desen arama) her çalışmada
+``app/`` altındaki tüm ``.py`` dosyalarını yeniden okur. Dosya değişmediyse
+(``st_mtime_ns`` + ``st_size`` aynı) önceki ayrıştırma sonucu döndürülür;
+yalnızca değişen dosyalar yeniden okunur. Sonuçlar paylaşıldığı için
+ayrıştırıcılar değişmez tipler (tuple/frozenset) döndürmelidir.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+_CACHE: dict[tuple[str, str], tuple[tuple[int, int], Any]] = {}
+_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0}
+
+
+def scan_file_cached(path: Path | str, scanner_key: str, parse: Callable[[str], T]) -> T | None:
+    """``parse(metin)`` sonucunu döndürür; dosya okunamazsa ``None``.
+
+    ``scanner_key`` aynı dosyayı farklı amaçla tarayan çağıranları ayırır
+    (ör. import toplama ile desen listesi).
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = (str(path), scanner_key)
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None and entry[0] == stamp:
+            _STATS["hits"] += 1
+            return entry[1]
+    try:
+        text = Path(path).read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return None
+    value = parse(text)
+    with _LOCK:
+        _CACHE[key] = (stamp, value)
+        _STATS["misses"] += 1
+    return value
+
+
+def clear_file_scan_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
+        _STATS["hits"] = _STATS["misses"] = 0
+
+
+def file_scan_cache_stats() -> dict[str, int]:
+    with _LOCK:
+        return {"entries": len(_CACHE), **_STATS}
@@ -107,6 +107,9 @@ class Ders(Base):
     bolum_id = Column(Integer, ForeignKey("bolum.bolum_id"), nullable=True)
     DersTipi = Column(String)
     tip = Column(String)
+    # Tip kolonlarindan tetiklerle turetilen bayraklar (bkz. course_type).
+    is_elective = Column(Integer, nullable=False, default=0, server_default="0")
+    is_required = Column(Integer, nullable=False, default=0, server_default="0")
     fakulte_id = Column(Integer, ForeignKey("fakulte.fakulte_id"))
     # Kontenjan kuralı: Varsayılan kontenjan (ders_ogretim veya populerlik ile override)
     kontenjan = Column(Integer)
@@ -1177,6 +1180,8 @@ class AHPSensitivityResult(Base):
     affected_courses_count = Column(Integer, nullable=False, default=0)
     sensitive_courses_json = Column(Text)
     stability_summary_json = Column(Text)
+    analysis_mode = Column(String, nullable=False, default="one_at_a_time")
+    sample_count = Column(Integer)
     created_at = Column(DateTime)
 
 
@@ -1194,6 +1199,9 @@ class AHPCourseSensitivityItem(Base):
     changed_decision = Column(String)
     stability_level = Column(String, nullable=False, default="medium")
     explanation = Column(Text)
+    base_rank = Column(Integer)
+    rank_reversal_probability = Column(Float)
+    decision_change_probability = Column(Float)
     created_at = Column(DateTime)
 
 
@@ -1444,6 +1452,11 @@ class MLModelRun(Base):
     status = Column(String, nullable=False, default="created")
     skip_reason = Column(Text)
     artifact_path = Column(Text)
+    artifact_sha256 = Column(String)
+    artifact_version = Column(String)
+    artifact_size_bytes = Column(Integer)
+    data_fingerprint = Column(String)
+    model_spec_hash = Column(String)
     created_at = Column(DateTime)
     completed_at = Column(DateTime)
     created_by = Column(String)
@@ -2295,3 +2308,22 @@ class DataSnapshot(Base):
     created_by = Column(String, nullable=True)
     created_at = Column(DateTime)
     notes = Column(Text, nullable=True)
+
+
+class DecisionMatrixVersion(Base):
+    __tablename__ = "decision_matrix_versions"
+
+    scope_key = Column(String, primary_key=True)
+    epoch = Column(String, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+    reason = Column(String, nullable=True)
+    updated_at = Column(String, nullable=True)
+
+
+class SchemaCompatState(Base):
+    __tablename__ = "schema_compat_state"
+
+    state_key = Column(String, primary_key=True)
+    compat_version = Column(Integer, nullable=False)
+    schema_version = Column(Integer, nullable=False)
+    updated_at = Column(String, nullable=True)
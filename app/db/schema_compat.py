@@ -1725,6 +1725,8 @@ def ensure_ahp_governance_schema(conn: sqlite3.Connection, commit: bool = True)
                 affected_courses_count INTEGER NOT NULL DEFAULT 0,
                 sensitive_courses_json TEXT,
                 stability_summary_json TEXT,
+                analysis_mode TEXT NOT NULL DEFAULT 'one_at_a_time',
+                sample_count INTEGER,
                 created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
             )
         """,
@@ -1741,6 +1743,9 @@ def ensure_ahp_governance_schema(conn: sqlite3.Connection, commit: bool = True)
                 changed_decision TEXT,
                 stability_level TEXT NOT NULL DEFAULT 'medium',
                 explanation TEXT,
+                base_rank INTEGER,
+                rank_reversal_probability REAL,
+                decision_change_probability REAL,
                 created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
             )
         """,
@@ -1750,6 +1755,23 @@ def ensure_ahp_governance_schema(conn: sqlite3.Connection, commit: bool = True)
             cur.execute(ddl)
             changed["tables_created"] += 1
 
+    # Monte Carlo duyarlilik kolonlari; eski DB'lerde tablolar yukarida zaten vardir.
+    add_columns(
+        "ahp_sensitivity_results",
+        [
+            ("analysis_mode", "TEXT NOT NULL DEFAULT 'one_at_a_time'"),
+            ("sample_count", "INTEGER"),
+        ],
+    )
+    add_columns(
+        "ahp_course_sensitivity_items",
+        [
+            ("base_rank", "INTEGER"),
+            ("rank_reversal_probability", "REAL"),
+            ("decision_change_probability", "REAL"),
+        ],
+    )
+
     index_ddls = [
         "CREATE INDEX IF NOT EXISTS ix_decision_criteria_key ON decision_criteria_definitions (criterion_key, is_active)",
         "CREATE INDEX IF NOT EXISTS ix_ahp_profiles_governance_scope ON ahp_weight_profiles (scope_type, faculty_id, department_id, year, semester, status, is_active)",
@@ -2254,6 +2276,12 @@ def ensure_import_governance_schema(conn: sqlite3.Connection, commit: bool = Tru
     ]
     add_missing_columns("criteria_import_rows", source_row_columns)
     add_missing_columns("survey_import_rows", source_row_columns)
+    for table_name in ("criteria_import_rows", "survey_import_rows"):
+        if _table_exists(cur, table_name):
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{table_name}_batch_row ON {table_name} (import_batch_id, row_no)"
+            )
+            changed["indexes_created"] += 1
 
     if _table_exists(cur, "ders_kriterleri"):
         add_missing_columns(
@@ -2666,6 +2694,11 @@ def ensure_ml_governance_schema(conn: sqlite3.Connection, commit: bool = True) -
                 status TEXT NOT NULL DEFAULT 'created',
                 skip_reason TEXT,
                 artifact_path TEXT,
+                artifact_sha256 TEXT,
+                artifact_version TEXT,
+                artifact_size_bytes INTEGER,
+                data_fingerprint TEXT,
+                model_spec_hash TEXT,
                 created_at TEXT,
                 completed_at TEXT,
                 created_by TEXT,
@@ -2730,6 +2763,18 @@ def ensure_ml_governance_schema(conn: sqlite3.Connection, commit: bool = True) -
             cur.execute(ddl)
             changed["tables_created"] += 1
 
+    changed["columns_added"] += _ensure_columns(
+        cur,
+        "ml_model_runs",
+        [
+            ("artifact_sha256", "TEXT"),
+            ("artifact_version", "TEXT"),
+            ("artifact_size_bytes", "INTEGER"),
+            ("data_fingerprint", "TEXT"),
+            ("model_spec_hash", "TEXT"),
+        ],
+    )
+
     index_ddls = [
         """
         CREATE INDEX IF NOT EXISTS ix_ml_algorithm_registry_key
@@ -2744,6 +2789,10 @@ def ensure_ml_governance_schema(conn: sqlite3.Connection, commit: bool = True) -
         ON ml_model_runs (algorithm_key, status, created_at)
         """,
         """
+        CREATE INDEX IF NOT EXISTS ix_ml_model_runs_artifact
+        ON ml_model_runs (algorithm_key, feature_schema_version, data_fingerprint, status)
+        """,
+        """
         CREATE INDEX IF NOT EXISTS ix_ml_predictions_course
         ON ml_predictions (course_id, year, algorithm_key, created_at)
         """,
@@ -3601,13 +3650,200 @@ def ensure_data_quality_schema(conn: sqlite3.Connection, commit: bool = True) ->
     return changed
 
 
-def ensure_reporting_schema(conn: sqlite3.Connection) -> dict[str, dict[str, int]]:
+# Karar matrisi (ders x kriter) ders_kriterleri, performans ve populerlik
+# tablolarindan okunur. Bu tablolara yazan servisler yazim sonunda bir kez
+# ``bump_decision_matrix_version`` cagirir ki onbellekteki matris goruntuleri
+# bayatlamasin (satir basina tetik yoktur).
+DECISION_MATRIX_VERSION_SCOPE = "global"
+# Eski surumlerin satir basina (FOR EACH ROW) tetikleri; mevcut DB'lerden kaldirilir.
+DECISION_MATRIX_LEGACY_TRIGGER_PREFIX = "trg_decision_matrix_version_"
+
+
+def ensure_decision_matrix_version_schema(conn: sqlite3.Connection, commit: bool = True) -> dict[str, int]:
+    """Karar matrisi veri surumu tablosunu hazirlar, eski satir tetiklerini kaldirir.
+
+    Zincir yalnizca sema degistiginde calisir; onceki ensure_* adimlari kaynak
+    tablolarda toplu normalizasyon yapabildigi icin surum burada bir kez artirilir.
+    """
+    cur = conn.cursor()
+    changed = {"tables_created": 0, "columns_added": 0, "indexes_created": 0, "triggers_dropped": 0}
+    if not _table_exists(cur, "decision_matrix_versions"):
+        cur.execute(
+            """
+            CREATE TABLE decision_matrix_versions (
+                scope_key TEXT PRIMARY KEY,
+                epoch TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0,
+                reason TEXT,
+                updated_at TEXT
+            )
+            """
+        )
+        changed["tables_created"] += 1
+    cur.execute(
+        """
+        INSERT OR IGNORE INTO decision_matrix_versions (scope_key, epoch, version, reason, updated_at)
+        VALUES (?, lower(hex(randomblob(8))), 0, 'created', ?)
+        """,
+        (DECISION_MATRIX_VERSION_SCOPE, _utc_now()),
+    )
+    cur.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE ?",
+        (DECISION_MATRIX_LEGACY_TRIGGER_PREFIX + "%",),
+    )
+    for (trigger_name,) in cur.fetchall():
+        cur.execute(f'DROP TRIGGER IF EXISTS "{trigger_name}"')
+        changed["triggers_dropped"] += 1
+    cur.execute(
+        """
+        UPDATE decision_matrix_versions
+        SET version = version + 1, reason = 'schema_compat', updated_at = ?
+        WHERE scope_key = ?
+        """,
+        (_utc_now(), DECISION_MATRIX_VERSION_SCOPE),
+    )
+    if commit:
+        conn.commit()
+    return changed
+
+
+def ensure_course_type_flag_schema(conn: sqlite3.Connection, commit: bool = True) -> dict[str, int]:
+    """
+    ders.is_elective / ders.is_required bayraklarini, indeksini ve tetiklerini hazirlar.
+
+    Bayraklar course_type tip kuraliyla (DersTipi/ders_tipi/tip/tur, TR
+    normalizasyonu, LIKE '%secmeli%') hesaplanir. Kolon eklendiginde ya da tip
+    kolonu kumesi degistiginde (tetik SQL'i farkli) tum tablo yeniden doldurulur.
+    """
+    from app.services.course_type import (
+        COURSE_TYPE_FLAG_TRIGGER_PREFIX,
+        build_course_type_flag_assignment,
+        build_course_type_flag_triggers,
+    )
+
+    cur = conn.cursor()
+    changed = {"tables_created": 0, "columns_added": 0, "indexes_created": 0, "triggers_created": 0, "rows_backfilled": 0}
+    if not _table_exists(cur, "ders"):
+        return changed
+    changed["columns_added"] = _ensure_columns(
+        cur,
+        "ders",
+        [("is_elective", "INTEGER NOT NULL DEFAULT 0"), ("is_required", "INTEGER NOT NULL DEFAULT 0")],
+    )
+    columns = _column_names(cur, "ders")
+    if "ix_ders_is_elective" not in _index_names(cur, "ders"):
+        index_cols = "is_elective, fakulte_id" if "fakulte_id" in columns else "is_elective"
+        cur.execute(f"CREATE INDEX ix_ders_is_elective ON ders ({index_cols})")
+        changed["indexes_created"] += 1
+
+    cur.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'ders' AND name LIKE ?",
+        (COURSE_TYPE_FLAG_TRIGGER_PREFIX + "%",),
+    )
+    existing = {str(row[0]): str(row[1] or "") for row in cur.fetchall()}
+    desired = dict(build_course_type_flag_triggers(columns))
+    if existing != desired:
+        for name in existing:
+            cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+        for name, ddl in desired.items():
+            cur.execute(ddl)
+            changed["triggers_created"] += 1
+    if changed["columns_added"] or changed["triggers_created"]:
+        cur.execute(f"UPDATE ders SET {build_course_type_flag_assignment(columns)}")
+        changed["rows_backfilled"] = int(cur.rowcount or 0)
+    if commit:
+        conn.commit()
+    return changed
+
+
+# ensure_* zincirine yeni tablo/kolon/index/tetik eklendiginde artirilmali; aksi
+# halde parmak izi kayitli mevcut veritabanlarinda zincir yeniden calismaz.
+SCHEMA_COMPAT_VERSION = 4
+SCHEMA_COMPAT_STATE_KEY = "reporting"
+
+
+def ensure_schema_compat_state_schema(conn: sqlite3.Connection, commit: bool = True) -> dict[str, int]:
+    """Sema uyumluluk parmak izi tablosunu hazirlar."""
+    cur = conn.cursor()
+    changed = {"tables_created": 0, "columns_added": 0, "indexes_created": 0}
+    if not _table_exists(cur, "schema_compat_state"):
+        cur.execute(
+            """
+            CREATE TABLE schema_compat_state (
+                state_key TEXT PRIMARY KEY,
+                compat_version INTEGER NOT NULL,
+                schema_version INTEGER NOT NULL,
+                updated_at TEXT
+            )
+            """
+        )
+        changed["tables_created"] += 1
+    if commit:
+        conn.commit()
+    return changed
+
+
+def schema_compat_fingerprint_matches(conn: sqlite3.Connection) -> bool:
+    """
+    Kayitli parmak izi (SCHEMA_COMPAT_VERSION + PRAGMA schema_version) guncel mi?
+
+    Tek satirlik bir okuma yapar; katalog taramasi ve yazim yoktur. Herhangi bir
+    DDL (migration, baska surecin ALTER'i, yedekten donus) schema_version'i
+    degistirdigi icin parmak izi kendiliginden gecersizlesir.
+    """
+    try:
+        row = conn.execute(
+            """
+            SELECT s.compat_version, s.schema_version, p.schema_version
+            FROM schema_compat_state s, pragma_schema_version p
+            WHERE s.state_key = ?
+            """,
+            (SCHEMA_COMPAT_STATE_KEY,),
+        ).fetchone()
+    except sqlite3.Error:
+        return False
+    if not row:
+        return False
+    return int(row[0]) == SCHEMA_COMPAT_VERSION and int(row[1]) == int(row[2])
+
+
+def _store_schema_compat_fingerprint(conn: sqlite3.Connection) -> None:
+    ensure_schema_compat_state_schema(conn, commit=False)
+    # Tablo olusturma da bir DDL; surum, tum DDL bittikten sonra okunmali.
+    schema_version = int(conn.execute("PRAGMA schema_version").fetchone()[0])
+    conn.execute(
+        """
+        INSERT INTO schema_compat_state (state_key, compat_version, schema_version, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(state_key) DO UPDATE SET
+            compat_version = excluded.compat_version,
+            schema_version = excluded.schema_version,
+            updated_at = excluded.updated_at
+        """,
+        (SCHEMA_COMPAT_STATE_KEY, SCHEMA_COMPAT_VERSION, schema_version, _utc_now()),
+    )
+
+
+def ensure_reporting_schema(conn: sqlite3.Connection, *, force: bool = False) -> dict[str, dict[str, int]]:
     """
     Raporlama icin gereken tum kritik tablolari synchronize eder.
+
+    Parmak izi guncelse (bkz. `schema_compat_fingerprint_matches`) zincir
+    calistirilmaz; her API/rapor baglantisinda katalog sorgusu ve log yazimi
+    olmaz. `force=True` zinciri kosulsuz calistirir.
     """
+    if not force and schema_compat_fingerprint_matches(conn):
+        return {
+            "schema_compat": {
+                "tables_created": 0,
+                "columns_added": 0,
+                "indexes_created": 0,
+                "fingerprint_hit": 1,
+            }
+        }
     if not _schema_mutation_allowed():
-        message = "Runtime schema compatibility mutation config ile kapalı."
-        _log_schema_compat(conn, action_type="skip", table_name="schema_compat", success=True, message=message)
+        # Mutasyon kapaliyken her baglantida "skip" logu yazmak, salt-okuma
+        # isteklerini yazima cevirir; log yalnizca gercek degisiklikte tutulur.
         return {
             "schema_compat": {
                 "tables_created": 0,
@@ -3649,7 +3885,9 @@ def ensure_reporting_schema(conn: sqlite3.Connection) -> dict[str, dict[str, int
 
         result["workflow"] = ensure_yearly_workflow_schema(conn)  # type: ignore[assignment]
         _log_schema_compat_result(conn, "workflow", result["workflow"])
+        workflow_ready = True
     except Exception:
+        workflow_ready = False
         # Workflow semasi kritik raporlama akisini bloklamasin.
         result["workflow"] = {
             "tables_created": 0,
@@ -3674,5 +3912,12 @@ def ensure_reporting_schema(conn: sqlite3.Connection) -> dict[str, dict[str, int
     _log_schema_compat_result(conn, "semester_planning", result["semester_planning"])
     result["data_quality"] = ensure_data_quality_schema(conn)  # type: ignore[assignment]
     _log_schema_compat_result(conn, "data_quality", result["data_quality"])
+    result["decision_matrix_version"] = ensure_decision_matrix_version_schema(conn)  # type: ignore[assignment]
+    _log_schema_compat_result(conn, "decision_matrix_version", result["decision_matrix_version"])
+    result["course_type_flags"] = ensure_course_type_flag_schema(conn)  # type: ignore[assignment]
+    _log_schema_compat_result(conn, "course_type_flags", result["course_type_flags"])
+    if workflow_ready:
+        # Workflow semasi hazirlanamadiysa parmak izi yazilmaz; sonraki baglanti yeniden dener.
+        _store_schema_compat_fingerprint(conn)
     conn.commit()
     return result
@@ -15,14 +15,14 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from app.core.config import AppConfig, load_app_config, resolve_sqlite_db_path
+from app.core.config import AppConfig, get_app_config, resolve_sqlite_db_path
 from app.db.backend import SQLITE_BACKEND, is_sqlite_url, require_sqlite_url
 from app.db.database import Base, get_engine
 from app.db.database import get_session as _get_session
 
 
 def _resolve_sqlite_path(db_path: str | None = None, config: AppConfig | None = None) -> str:
-    cfg = config or load_app_config()
+    cfg = config or get_app_config()
     return str(resolve_sqlite_db_path(db_path or cfg.sqlite_db_path))
 
 
@@ -36,7 +36,7 @@ def open_sqlite_connection(db_path: str | None = None, *, row_factory: bool = Tr
     PostgreSQL aktifken ve açık bir SQLite yolu verilmemişken fail-fast davranır.
     Çağıran kod close() yapmakla yükümlüdür.
     """
-    cfg = load_app_config()
+    cfg = get_app_config()
     if db_path is None and not is_sqlite_url(cfg.database_url):
         require_sqlite_url(cfg.database_url, feature="open_sqlite_connection")
     conn = sqlite3.connect(_resolve_sqlite_path(db_path, cfg))
@@ -83,7 +83,7 @@ def get_db() -> Iterator[Session]:
 
 def init_database(db_path: str | None = None) -> dict[str, object]:
     """Veritabanı şemasını oluşturur/günceller."""
-    cfg = load_app_config()
+    cfg = get_app_config()
     schema_result = {}
 
     if db_path is not None or is_sqlite_url(cfg.database_url):
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""FastAPI katmani icin sinirli, thread-safe SQLite baglanti havuzu.
+
+Her API isteginde ``sqlite3.connect`` + PRAGMA + sema uyumluluk kontrolu
+yapmak yerine onceden ayarlanmis baglantilar yeniden kullanilir:
+
+* Okuyucular: en fazla ``max_readers`` baglanti, ``PRAGMA query_only`` ile
+  yazima kapali. WAL modunda yazici varken de okur.
+* Yazici: tek baglanti, kilitle serilestirilir; SQLite'in tek yazici
+  modeliyle ayni. Sema uyumluluk zinciri (``ensure_reporting_schema``)
+  yalnizca yazici uzerinden calisir.
+
+Baglantilar ``check_same_thread=False`` ile acilir; bir baglanti ayni anda
+tek bir kiralayana verilir, FastAPI'nin thread havuzunda istekler arasi
+gecisi guvenlidir.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterator
+
+from app.db.schema_compat import ensure_reporting_schema, schema_compat_fingerprint_matches
+
+DEFAULT_MAX_READERS = 4
+DEFAULT_ACQUIRE_TIMEOUT_S = 10.0
+
+
+class PoolTimeoutError(RuntimeError):
+    """Havuzdan belirtilen surede baglanti alinamadi."""
+
+
+class SQLitePool:
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        max_readers: int = DEFAULT_MAX_READERS,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT_S,
+        busy_timeout_ms: int = 8000,
+    ) -> None:
+        self.db_path = str(db_path)
+        self.max_readers = max(1, int(max_readers))
+        self.acquire_timeout = float(acquire_timeout)
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        # (baglanti, nesil): dosya degisince (yedekten donus, yeniden olusturma)
+        # nesil artar ve eski inode'a bagli baglantilar havuza geri donmez.
+        self._idle_readers: list[tuple[sqlite3.Connection, int]] = []
+        self._reader_slots = threading.BoundedSemaphore(self.max_readers)
+        self._reader_lock = threading.Lock()
+        self._writer: tuple[sqlite3.Connection, int] | None = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+        self._generation = 0
+        self._file_identity = _file_identity(self.db_path)
+        self._ensured: tuple[int, int] | None = None  # (nesil, schema_version)
+        self._metrics = {
+            "reader_acquired": 0,
+            "writer_acquired": 0,
+            "connections_opened": 0,
+            "connections_discarded": 0,
+            "schema_ensures": 0,
+            "file_changes": 0,
+            "waits": 0,
+            "wait_ms_total": 0.0,
+            "timeouts": 0,
+        }
+        self._metrics_lock = threading.Lock()
+
+    # -- baglanti olusturma -------------------------------------------------
+    def _connect(self, *, readonly: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout_ms}")
+            if not readonly:
+                conn.execute("PRAGMA journal_mode = WAL")
+        except sqlite3.Error:
+            pass
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
+        self._count("connections_opened")
+        return conn
+
+    def _close(self, conn: sqlite3.Connection) -> None:
+        self._count("connections_discarded")
+        with contextlib.suppress(sqlite3.Error):
+            conn.close()
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[name] += amount
+
+    def _acquire_slot(self, lock: Any) -> None:
+        if lock.acquire(blocking=False):
+            return
+        started = time.perf_counter()
+        acquired = lock.acquire(timeout=self.acquire_timeout)
+        self._count("waits")
+        self._count("wait_ms_total", (time.perf_counter() - started) * 1000.0)
+        if not acquired:
+            self._count("timeouts")
+            raise PoolTimeoutError(f"SQLite havuzundan {self.acquire_timeout:.1f} sn icinde baglanti alinamadi.")
+
+    def _current_generation(self) -> int:
+        identity = _file_identity(self.db_path)
+        if identity == self._file_identity:
+            return self._generation
+        with self._reader_lock:
+            if identity != self._file_identity:
+                self._file_identity = identity
+                self._generation += 1
+                self._count("file_changes")
+                stale, self._idle_readers = self._idle_readers, []
+            else:
+                stale = []
+        for conn, _generation in stale:
+            self._close(conn)
+        return self._generation
+
+    # -- yazici -------------------------------------------------------------
+    @contextlib.contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Tek yazici baglanti; basarida commit, hatada rollback."""
+        if self._closed:
+            raise RuntimeError("SQLite havuzu kapatildi.")
+        self._acquire_slot(self._writer_lock)
+        try:
+            generation = self._current_generation()
+            if self._writer is not None and self._writer[1] != generation:
+                self._discard_writer()
+            if self._writer is None:
+                self._writer = (self._connect(readonly=False), generation)
+            conn = self._writer[0]
+            self._count("writer_acquired")
+            self._ensure_schema(conn, generation)
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                try:
+                    conn.rollback()
+                except sqlite3.Error:
+                    self._discard_writer()
+                raise
+        finally:
+            self._writer_lock.release()
+
+    def _ensure_schema(self, conn: sqlite3.Connection, generation: int) -> None:
+        # Parmak izi guncelse tek satir okuma; degilse ensure zinciri calisir.
+        if not schema_compat_fingerprint_matches(conn):
+            ensure_reporting_schema(conn)
+            self._count("schema_ensures")
+        self._ensured = (generation, _schema_version(conn))
+
+    def _discard_writer(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._close(writer[0])
+
+    # -- okuyucular ---------------------------------------------------------
+    @contextlib.contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Salt-okunur baglanti; ``max_readers`` ile sinirli."""
+        if self._closed:
+            raise RuntimeError("SQLite havuzu kapatildi.")
+        self._acquire_slot(self._reader_slots)
+        conn: sqlite3.Connection | None = None
+        healthy = True
+        try:
+            generation = self._current_generation()
+            with self._reader_lock:
+                while self._idle_readers and conn is None:
+                    candidate, candidate_generation = self._idle_readers.pop()
+                    if candidate_generation == generation:
+                        conn = candidate
+                    else:
+                        self._close(candidate)
+            if conn is None:
+                conn = self._connect(readonly=True)
+            if self._ensured != (generation, _schema_version(conn)):
+                # Sema degismis (migration/baska surec), dosya degismis ya da hic
+                # hazirlanmamis: uyumluluk zinciri yazici uzerinden calisir.
+                with self.writer():
+                    pass
+            self._count("reader_acquired")
+            yield conn
+        except (sqlite3.ProgrammingError, sqlite3.InterfaceError):
+            healthy = False
+            raise
+        finally:
+            if conn is not None:
+                self._release_reader(conn, generation if healthy else -1)
+            self._reader_slots.release()
+
+    def _release_reader(self, conn: sqlite3.Connection, generation: int) -> None:
+        healthy = generation == self._generation and not self._closed
+        if healthy:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                healthy = False
+        if not healthy:
+            self._close(conn)
+            return
+        with self._reader_lock:
+            self._idle_readers.append((conn, generation))
+
+    # -- yasam dongusu / metrikler -----------------------------------------
+    def close(self) -> None:
+        self._closed = True
+        with self._reader_lock:
+            idle, self._idle_readers = self._idle_readers, []
+        for conn, _generation in idle:
+            self._close(conn)
+        with self._writer_lock:
+            self._discard_writer()
+
+    def metrics(self) -> dict[str, Any]:
+        with self._metrics_lock:
+            data: dict[str, Any] = dict(self._metrics)
+        with self._reader_lock:
+            idle = len(self._idle_readers)
+        data["wait_ms_total"] = round(float(data["wait_ms_total"]), 3)
+        data.update(
+            {
+                "db_path": self.db_path,
+                "max_readers": self.max_readers,
+                "idle_readers": idle,
+                "writer_open": self._writer is not None,
+                "generation": self._generation,
+                "closed": self._closed,
+            }
+        )
+        return data
+
+
+def _file_identity(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA schema_version").fetchone()[0])
+
+
+_POOLS: dict[str, SQLitePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_sqlite_pool(db_path: str, **kwargs: Any) -> SQLitePool:
+    """Veritabani yolu basina surec genelinde tek havuz."""
+    key = str(db_path)
+    pool = _POOLS.get(key)
+    if pool is not None:
+        return pool
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = SQLitePool(key, **kwargs)
+        return pool
+
+
+def close_sqlite_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def sqlite_pool_metrics() -> list[dict[str, Any]]:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    return [pool.metrics() for pool in pools]
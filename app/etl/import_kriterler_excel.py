@@ -214,6 +214,9 @@ def run_import(excel_path: str, db_path: str | None = None):
             except Exception:
                 result["hata"] += 1
 
+        from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
+
+        bump_decision_matrix_version(conn, "etl_criteria_excel")
         conn.commit()
         try:
             from app.utils.logger import log_operation
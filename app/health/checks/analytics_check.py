@@ -37,6 +37,8 @@ class AnalyticsDependencyCheck(_AnalyticsCheck):
 class ChartGenerationCheck(_AnalyticsCheck):
     name = "Grafik üretimi kontrolü"
     default_severity = HealthSeverity.LOW
+    # pyplot global durum tutar; thread'ler arasında güvenli değil.
+    parallel_safe = False
 
     def run(self, context: HealthContext) -> HealthCheckResult:
         if importlib.util.find_spec("matplotlib") is None:
@@ -89,6 +89,12 @@ class BaseHealthCheck:
     #: Skorlamada hangi kcategory bucket'ına gireceği (registry override edebilir).
     score_bucket: str = "architecture"
     default_severity: HealthSeverity = HealthSeverity.MEDIUM
+    #: Thread havuzunda diğer kontrollerle eşzamanlı çalışabilir mi? Süre ölçen
+    #: ya da süreç geneli durum (matplotlib vb.) kullanan kontroller False olur;
+    #: runner bunları havuz bittikten sonra sırayla çalıştırır.
+    parallel_safe: bool = True
+    #: Kontrol başına zaman aşımı (sn); None ise HealthConfig.check_timeout_s.
+    timeout_s: float | None = None
 
     # -- Sonuç üreticileri --------------------------------------------------------
     def _result(
@@ -188,6 +194,20 @@ class BaseHealthCheck:
         result.duration_ms = (time.perf_counter() - start) * 1000.0
         return result
 
+    def timeout_result(self, timeout_s: float) -> HealthCheckResult:
+        """Süresi içinde bitmeyen kontrol için FAILED sonucu."""
+
+        result = self._result(
+            HealthStatus.FAILED,
+            f"{self.name} {timeout_s:g} sn içinde tamamlanmadı.",
+            severity=HealthSeverity.HIGH,
+            detail="Kontrol zaman aşımına uğradı; arka planda sürüyor olabilir, sonucu rapora alınmadı.",
+            suggestion="Kontrolün beklediği kaynağı (DB kilidi, dosya sistemi, ağ) inceleyin.",
+            metadata={"timed_out": True, "timeout_s": timeout_s},
+        )
+        result.duration_ms = timeout_s * 1000.0
+        return result
+
     def safe_run(self, context: HealthContext) -> HealthCheckResult:
         """Kontrolü izole, süre ölçümlü ve çökertmeyen biçimde çalıştırır."""
 
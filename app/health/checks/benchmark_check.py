@@ -67,6 +67,7 @@ class BenchmarkExecutionCheck(_BenchmarkCheck):
 class RuntimeThresholdCheck(_BenchmarkCheck):
     name = "Benchmark çalışma süresi eşik kontrolü"
     default_severity = HealthSeverity.LOW
+    parallel_safe = False
 
     def run(self, context: HealthContext) -> HealthCheckResult:
         start = time.perf_counter()
@@ -13,6 +13,8 @@ from app.health.models import HealthCheckResult, HealthSeverity
 class _PerfCheck(BaseHealthCheck):
     category = "Performans"
     score_bucket = "database"
+    # Süre ölçümü eşzamanlı kontrollerle çarpışmasın.
+    parallel_safe = False
 
 
 class DatabaseConnectionTimeCheck(_PerfCheck):
@@ -16,6 +16,7 @@ from typing import Any
 # Python 3.10+ standart kütüphane modül adları (false-positive engeller).
 _STDLIB = set(getattr(sys, "stdlib_module_names", set()))
 
+from app.core.file_scan_cache import scan_file_cached
 from app.health.health_config import HealthConfig, default_health_config
 
 # import adı -> requirements'taki dağıtım adı eşlemesi.
@@ -80,18 +81,25 @@ def _parse_requirements(path: Path) -> list[str]:
     return names
 
 
+def _parse_import_roots(text: str) -> frozenset[str]:
+    roots: set[str] = set()
+    for line in text.splitlines():
+        m = _IMPORT_RE.match(line)
+        if m:
+            roots.add(m.group(1))
+    return frozenset(roots)
+
+
 def _collect_imports(app_dir: Path) -> set[str]:
+    # Dosya başına sonuç mtime/boyut damgasıyla hafızada; değişmeyen dosya
+    # yeniden okunmaz (audit/full modda tarama tekrarları ucuzlar).
     found: set[str] = set()
     for py in app_dir.rglob("*.py"):
         if "__pycache__" in py.parts:
             continue
-        try:
-            for line in py.read_text(encoding="utf-8", errors="ignore").splitlines():
-                m = _IMPORT_RE.match(line)
-                if m:
-                    found.add(m.group(1))
-        except OSError:
-            continue
+        roots = scan_file_cached(py, "import_roots", _parse_import_roots)
+        if roots:
+            found.update(roots)
     return found
 
 
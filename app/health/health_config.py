@@ -107,6 +107,15 @@ class HealthConfig:
     backup_max_age_days: int = 7
     slow_query_ms: float = 500.0
 
+    # --- Çalıştırma ---
+    #: Paralel kontrol iş parçacığı sayısı (1 = sıralı);
+    #: None ise min(8, CPU + 1).
+    max_workers: int | None = None
+    #: Kontrol başına zaman aşımı (sn); kontrol ``timeout_s`` ile geçersiz kılabilir.
+    check_timeout_s: float = 30.0
+    #: /health hızlı rapor önbelleğinin tazelik süresi (sn).
+    quick_report_ttl_s: float = 30.0
+
     # --- Import edilebilir kritik modüller ---
     critical_modules: tuple[str, ...] = (
         "app.core.config",
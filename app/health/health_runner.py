@@ -1,13 +1,24 @@
 # -*- coding: utf-8 -*-
-"""Sağlık kontrollerini çalıştıran ve raporu toplayan runner."""
+"""Sağlık kontrollerini çalıştıran ve raporu toplayan runner.
+
+Kontroller birbirinden bağımsızdır (her biri kendi bağlantısını açar), bu
+yüzden ``parallel_safe`` olanlar thread havuzunda eşzamanlı çalışır; her
+birinin başladığı andan itibaren ``timeout_s`` süresi vardır. Süre ölçen
+kontroller havuz boşaldıktan sonra sırayla, aynı zaman aşımıyla çalışır.
+Tüm işçiler daemon thread'dir: zaman aşımındaki bir kontrol yorumlayıcının
+kapanmasını bekletmez. Sonuç sırası her zaman kayıt (registry) sırasıdır.
+"""
 
 from __future__ import annotations
 
+import os
+import queue
+import threading
 import time
 
 from app.core.config import AppConfig
 from app.core.permissions import UserContext
-from app.health.checks.base_check import HealthContext
+from app.health.checks.base_check import BaseHealthCheck, HealthContext
 from app.health.health_registry import all_checks, audit_checks, quick_checks
 from app.health.health_score import (
     build_summary_message,
@@ -18,6 +29,9 @@ from app.health.models import HealthCheckResult, HealthReport, HealthStatus
 
 VALID_MODES = ("quick", "full", "repair", "audit")
 
+# Henüz başlamamış işin zaman aşımı beklemesi için üst sınır (sn).
+_POLL_INTERVAL_S = 0.05
+
 
 class HealthRunner:
     """Kayıtlı kontrolleri quick/full modda çalıştırır, skor üretir."""
@@ -27,10 +41,15 @@ class HealthRunner:
         db_path: str | None = None,
         config: AppConfig | None = None,
         user_context: UserContext | None = None,
+        max_workers: int | None = None,
+        check_timeout_s: float | None = None,
     ):
         self.db_path = db_path
         self.config = config
         self.user_context = user_context
+        # None: HealthConfig (max_workers / check_timeout_s) değerleri.
+        self.max_workers = max_workers
+        self.check_timeout_s = check_timeout_s
 
     def run(self, mode: str = "full") -> HealthReport:
         mode = str(mode).lower()
@@ -59,12 +78,11 @@ class HealthRunner:
                 checks = audit_checks()
             else:
                 checks = all_checks()
-            for check in checks:
-                result = check.safe_run(context)
+            results = self._run_checks(checks, context)
+            for check, result in zip(checks, results):
                 result.metadata.setdefault(
                     "score_bucket", getattr(check, "score_bucket", "architecture")
                 )
-                results.append(result)
         total_ms = (time.perf_counter() - started) * 1000.0
 
         score, category_scores = compute_overall_score(results)
@@ -92,6 +110,136 @@ class HealthRunner:
             category_scores=category_scores,
         )
 
+    # -- Kontrol çalıştırma ---------------------------------------------------
+    def _timeout_for(self, check: BaseHealthCheck, context: HealthContext) -> float:
+        timeout = check.timeout_s
+        if timeout is None:
+            timeout = self.check_timeout_s
+        if timeout is None:
+            timeout = context.health_config.check_timeout_s
+        return max(0.001, float(timeout))
+
+    def _run_checks(
+        self, checks: list[BaseHealthCheck], context: HealthContext
+    ) -> list[HealthCheckResult]:
+        workers = self.max_workers
+        if workers is None:
+            workers = context.health_config.max_workers
+        if workers is None:
+            # Kontrollerin çoğu kısa ve GIL'e bağlı; fazla thread tek çekirdekte
+            # yalnızca bağlam değiştirme maliyeti getirir.
+            workers = min(8, (os.cpu_count() or 1) + 1)
+        workers = max(1, int(workers))
+        parallel = [i for i, check in enumerate(checks) if check.parallel_safe]
+        if workers == 1 or len(parallel) <= 1:
+            return [self._run_serial(check, context) for check in checks]
+
+        results: dict[int, HealthCheckResult] = self._run_parallel(
+            checks, parallel, context, workers
+        )
+        for index, check in enumerate(checks):
+            if index not in results:
+                results[index] = self._run_serial(check, context)
+        return [results[index] for index in range(len(checks))]
+
+    def _run_serial(self, check: BaseHealthCheck, context: HealthContext) -> HealthCheckResult:
+        """Tek kontrolü ayrı bir daemon thread'de çalıştırır, en fazla zaman aşımı kadar bekler."""
+        check_timeout = self._timeout_for(check, context)
+        outcome: list[HealthCheckResult] = []
+        worker = threading.Thread(
+            target=lambda: outcome.append(check.safe_run(context)),
+            name="health-check-serial",
+            daemon=True,
+        )
+        worker.start()
+        worker.join(check_timeout)
+        if not outcome:
+            # Thread durdurulamaz; sonucu beklenmez, arka planda bitebilir.
+            return check.timeout_result(check_timeout)
+        return outcome[0]
+
+    def _run_parallel(
+        self,
+        checks: list[BaseHealthCheck],
+        indexes: list[int],
+        context: HealthContext,
+        workers: int,
+    ) -> dict[int, HealthCheckResult]:
+        started_at: dict[int, float] = {}
+        finished_indexes: set[int] = set()
+        claim_lock = threading.Lock()
+        stopped = threading.Event()
+        todo: queue.SimpleQueue[int | None] = queue.SimpleQueue()
+        finished: queue.SimpleQueue[tuple[int, HealthCheckResult]] = queue.SimpleQueue()
+        pool_size = min(workers, len(indexes))
+        for index in indexes:
+            todo.put(index)
+        for _ in range(pool_size):
+            todo.put(None)
+
+        def _worker() -> None:
+            while True:
+                index = todo.get()
+                if index is None:
+                    return
+                with claim_lock:
+                    if stopped.is_set():
+                        return
+                    started_at[index] = time.perf_counter()
+                result = checks[index].safe_run(context)
+                finished_indexes.add(index)
+                finished.put((index, result))
+
+        for number in range(pool_size):
+            threading.Thread(
+                target=_worker, name=f"health-check_{number}", daemon=True
+            ).start()
+
+        results: dict[int, HealthCheckResult] = {}
+        pending = set(indexes)
+        abandoned: set[int] = set()
+        try:
+            while pending:
+                now = time.perf_counter()
+                deadlines = [
+                    started_at[index] + self._timeout_for(checks[index], context)
+                    for index in pending
+                    if index in started_at
+                ]
+                timeout = min(deadlines) - now if deadlines else _POLL_INTERVAL_S
+                try:
+                    index, result = finished.get(timeout=max(0.0, timeout))
+                except queue.Empty:
+                    pass
+                else:
+                    if index in pending:
+                        results[index] = result
+                        pending.discard(index)
+                now = time.perf_counter()
+                for index in list(pending):
+                    check_timeout = self._timeout_for(checks[index], context)
+                    if index in started_at and now - started_at[index] >= check_timeout:
+                        # Thread durdurulamaz; sonucu beklenmez, arka planda bitebilir.
+                        results[index] = checks[index].timeout_result(check_timeout)
+                        pending.discard(index)
+                        abandoned.add(index)
+                if pending and len(abandoned - finished_indexes) >= pool_size:
+                    # Tüm işçiler zaman aşımındaki kontrollerde takılı; kuyruktakiler
+                    # başlayamaz. Başlamamış olanlar iptal edilip SKIPPED sayılır.
+                    with claim_lock:
+                        stopped.set()
+                        not_started = [index for index in pending if index not in started_at]
+                    for index in not_started:
+                        results[index] = checks[index].skipped(
+                            "Kontrol çalıştırılamadı: işçi thread'ler zaman aşımındaki kontrollerde.",
+                            detail="Önceki kontroller zaman aşımına uğradığı için sıra gelmedi.",
+                            suggestion="Zaman aşımına uğrayan kontrolleri inceleyin.",
+                        )
+                        pending.discard(index)
+        finally:
+            # Boştaki işçiler kuyruktan bir sonraki işi almadan çıkar.
+            stopped.set()
+        return results
 
 def run_health(
     mode: str = "full",
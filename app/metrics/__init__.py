@@ -7,7 +7,7 @@ from app.metrics.academic import (
 from app.metrics.classification import classification_metrics, top_k_accuracy
 from app.metrics.clustering import clustering_metrics
 from app.metrics.fairness import allocation_fairness_metrics
-from app.metrics.performance import PerformanceSnapshot, PerformanceTracker
+from app.metrics.performance import TRACKER_MODES, PerformanceSnapshot, PerformanceTracker
 from app.metrics.ranking import coverage, diversity, hit_at_k, map_at_k, ndcg_at_k
 
 __all__ = [
@@ -22,6 +22,7 @@ __all__ = [
     "allocation_fairness_metrics",
     "PerformanceTracker",
     "PerformanceSnapshot",
+    "TRACKER_MODES",
     "ranking_similarity_with_ground_truth",
     "pattern_reproduction_score",
 ]
@@ -1,48 +1,194 @@
-"""Performance metrics and runtime profiler utilities."""
+"""Performance metrics and runtime profiler utilities.
+
+``PerformanceTracker`` supports three measurement modes:
+
+* ``"timing"``: wall-clock and CPU time only; no memory probe at all.
+* ``"rss"`` (default): timing plus a background thread that samples the
+  process resident set size and reports the peak growth over the baseline as
+  ``rss_peak_mb``. The traced code runs at full speed; short allocation
+  spikes between two samples can be missed.
+* ``"tracemalloc"``: exact Python-level allocation peak as ``memory_peak_mb``.
+  Every allocation is hooked, so numpy/pandas heavy code runs several times
+  slower and the reported latency is not representative of production.
+
+The two memory figures are not comparable, so each one keeps its own field and
+every result carries the ``memory_mode`` it was measured with.
+
+:meth:`PerformanceTracker.measure` repeats a call after warm-up runs and
+reports min / median / p95 latency; ``latency_ms`` is then the median.
+"""
 
 from __future__ import annotations
 
+import threading
 import tracemalloc
 from dataclasses import dataclass
-from time import perf_counter
+from time import perf_counter, process_time
+from typing import Any, Callable
+
+import numpy as np
+
+try:
+    import psutil
+except Exception:  # pragma: no cover - rss mode degrades to timing only
+    psutil = None
+
+TRACKER_MODES = ("timing", "rss", "tracemalloc")
+DEFAULT_TRACKER_MODE = "rss"
+RSS_SAMPLE_INTERVAL_S = 0.005
 
 
 @dataclass(slots=True)
 class PerformanceSnapshot:
     latency_ms: float
     throughput_per_sec: float
-    memory_peak_mb: float
+    memory_peak_mb: float | None = None
+    cpu_ms: float = 0.0
+    mode: str = DEFAULT_TRACKER_MODE
+    rss_peak_mb: float | None = None
+    runs: int = 1
+    latency_min_ms: float | None = None
+    latency_median_ms: float | None = None
+    latency_p95_ms: float | None = None
 
-    def as_dict(self) -> dict[str, float]:
-        return {
+    def as_dict(self) -> dict[str, float | str]:
+        payload: dict[str, float | str] = {
             "latency_ms": self.latency_ms,
             "throughput_per_sec": self.throughput_per_sec,
-            "memory_peak_mb": self.memory_peak_mb,
+            "cpu_ms": self.cpu_ms,
+            "memory_mode": self.mode,
         }
+        if self.memory_peak_mb is not None:
+            payload["memory_peak_mb"] = self.memory_peak_mb
+        if self.rss_peak_mb is not None:
+            payload["rss_peak_mb"] = self.rss_peak_mb
+        if self.runs > 1:
+            payload.update(
+                {
+                    "runs": float(self.runs),
+                    "latency_min_ms": float(self.latency_min_ms or 0.0),
+                    "latency_median_ms": float(self.latency_median_ms or 0.0),
+                    "latency_p95_ms": float(self.latency_p95_ms or 0.0),
+                }
+            )
+        return payload
+
+
+class _RssSampler(threading.Thread):
+    """Polls the current process RSS until stopped; keeps the maximum seen."""
+
+    def __init__(self, interval_s: float) -> None:
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval_s = interval_s
+        self._process = psutil.Process()
+        self._halt = threading.Event()
+        self.baseline = self._process.memory_info().rss
+        self.peak = self.baseline
+
+    def run(self) -> None:
+        while not self._halt.wait(self.interval_s):
+            self.peak = max(self.peak, self._process.memory_info().rss)
+
+    def stop(self) -> int:
+        self._halt.set()
+        self.join()
+        self.peak = max(self.peak, self._process.memory_info().rss)
+        return self.peak - self.baseline
 
 
 class PerformanceTracker:
     """Tracks latency, throughput, and memory usage for benchmarked calls."""
 
-    def __init__(self, workload_size: int = 1) -> None:
+    def __init__(self, workload_size: int = 1, *, mode: str = DEFAULT_TRACKER_MODE, sample_interval_s: float = RSS_SAMPLE_INTERVAL_S) -> None:
+        if mode not in TRACKER_MODES:
+            raise ValueError(f"Unknown tracker mode '{mode}'. Use one of {TRACKER_MODES}.")
         self.workload_size = max(int(workload_size), 1)
+        self.mode = mode
+        self.sample_interval_s = float(sample_interval_s)
         self._start_time = 0.0
         self._stop_time = 0.0
-        self._peak_memory_bytes = 0
+        self._start_cpu = 0.0
+        self._stop_cpu = 0.0
+        self._peak_memory_bytes: int | None = None
+        self._sampler: _RssSampler | None = None
+        self._started_tracemalloc = False
+        self._samples_ms: list[float] = []
 
     def __enter__(self) -> "PerformanceTracker":
-        tracemalloc.start()
+        if self.mode == "tracemalloc":
+            # Zaten calisan bir tracemalloc oturumunu (or. pytest eklentisi) kapatmayalim.
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        elif self.mode == "rss" and psutil is not None:
+            self._sampler = _RssSampler(self.sample_interval_s)
+            self._sampler.start()
+        self._start_cpu = process_time()
         self._start_time = perf_counter()
         return self
 
     def __exit__(self, exc_type, exc, tb) -> None:
         self._stop_time = perf_counter()
-        _, peak = tracemalloc.get_traced_memory()
-        self._peak_memory_bytes = peak
-        tracemalloc.stop()
+        self._stop_cpu = process_time()
+        if self.mode == "tracemalloc":
+            _, peak = tracemalloc.get_traced_memory()
+            self._peak_memory_bytes = peak
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        elif self._sampler is not None:
+            self._peak_memory_bytes = max(self._sampler.stop(), 0)
+            self._sampler = None
 
     def snapshot(self) -> PerformanceSnapshot:
-        latency_ms = (self._stop_time - self._start_time) * 1000.0
-        throughput = self.workload_size / max((self._stop_time - self._start_time), 1e-9)
-        memory_peak_mb = self._peak_memory_bytes / (1024.0 * 1024.0)
-        return PerformanceSnapshot(latency_ms=latency_ms, throughput_per_sec=throughput, memory_peak_mb=memory_peak_mb)
+        elapsed = self._stop_time - self._start_time
+        peak_mb = None if self._peak_memory_bytes is None else self._peak_memory_bytes / (1024.0 * 1024.0)
+        memory = {"memory_peak_mb": peak_mb} if self.mode == "tracemalloc" else {"rss_peak_mb": peak_mb}
+        cpu_ms = (self._stop_cpu - self._start_cpu) * 1000.0
+        if len(self._samples_ms) > 1:
+            samples = np.asarray(self._samples_ms, dtype=float)
+            median = float(np.median(samples))
+            return PerformanceSnapshot(
+                latency_ms=median,
+                throughput_per_sec=self.workload_size / max(median / 1000.0, 1e-9),
+                cpu_ms=cpu_ms / len(samples),
+                mode=self.mode,
+                runs=len(samples),
+                latency_min_ms=float(samples.min()),
+                latency_median_ms=median,
+                latency_p95_ms=float(np.percentile(samples, 95)),
+                **memory,
+            )
+        return PerformanceSnapshot(
+            latency_ms=elapsed * 1000.0,
+            throughput_per_sec=self.workload_size / max(elapsed, 1e-9),
+            cpu_ms=cpu_ms,
+            mode=self.mode,
+            **memory,
+        )
+
+    @classmethod
+    def measure(
+        cls,
+        fn: Callable[[], Any],
+        *,
+        workload_size: int = 1,
+        repeats: int = 1,
+        warmup: int = 0,
+        mode: str = DEFAULT_TRACKER_MODE,
+    ) -> tuple[Any, "PerformanceTracker"]:
+        """Call ``fn`` ``warmup`` times untracked, then ``repeats`` times under one tracker.
+
+        Returns the result of the last call. Memory is the peak across the
+        tracked runs; CPU time is reported per run.
+        """
+        for _ in range(max(0, int(warmup))):
+            fn()
+        tracker = cls(workload_size=workload_size, mode=mode)
+        result = None
+        with tracker:
+            for _ in range(max(1, int(repeats))):
+                started = perf_counter()
+                result = fn()
+                tracker._samples_ms.append((perf_counter() - started) * 1000.0)
+        return result, tracker
@@ -37,7 +37,227 @@ class ReportRepository:
         row = cur.fetchone()
         return int(row[0] or 0) if row else 0
 
+    # -- Tablo tarayıcı (SQL'de filtre/sıralama + keyset sayfalama) -------------
+    def table_columns(self, table: str) -> list[str]:
+        safe_table = validate_identifier(table)
+        cur = self.conn.cursor()
+        cur.execute(f"PRAGMA table_info({safe_table})")
+        return [str(row[1]) for row in cur.fetchall()]
+
+    def has_rowid(self, table: str) -> bool:
+        safe_table = validate_identifier(table)
+        try:
+            self.conn.execute(f"SELECT rowid FROM {safe_table} LIMIT 0")
+        except sqlite3.OperationalError:
+            return False  # WITHOUT ROWID tablo
+        return True
+
+    def table_page(
+        self,
+        table: str,
+        columns: list[str],
+        *,
+        search: str = "",
+        column_filters: dict[str, str] | None = None,
+        sort_col: str | None = None,
+        sort_desc: bool = False,
+        cursor: tuple[Any, ...] | None = None,
+        limit: int = 100,
+        keyset: bool = True,
+        numeric_text: bool = False,
+    ) -> tuple[list[Any], tuple[Any, ...] | None]:
+        """Tek sayfa satır ve sonraki sayfanın imleci (yoksa ``None``).
+
+        ``keyset=True``: sıra anahtarı ``(kolon IS NULL, kolon, rowid)``; imleç
+        son satırın anahtarıdır, sayfa derinliğinden bağımsız indeks/tarama
+        maliyeti. ``keyset=False`` (WITHOUT ROWID) OFFSET'e düşer.
+        ``numeric_text=True`` (bkz. :meth:`is_numeric_text_column`): kolon
+        ``CAST(kolon AS REAL)`` ile sayısal sıralanır; "10" metin olarak "9"dan
+        küçüktür.
+        """
+        safe_table = validate_identifier(table)
+        where, params = build_filter_clause(columns, search, column_filters)
+        sort_col = sort_col if sort_col in columns else None
+        limit = max(1, int(limit))
+        sort_expr = None
+        if sort_col is not None:
+            sort_expr = quote_identifier(sort_col)
+            if numeric_text:
+                sort_expr = f"CAST({sort_expr} AS REAL)"
+        if keyset:
+            # Sayısal sıralamada imleç değeri de CAST sonucudur; SQL'den okunur.
+            sort_select = f", {sort_expr} AS __tb_sort" if numeric_text and sort_expr else ""
+            select_sql = f"SELECT *{sort_select}, rowid AS __tb_rowid FROM {safe_table}"
+            if sort_col is None:
+                direction = "DESC" if sort_desc else "ASC"
+                order_sql = f"rowid {direction}"
+                if cursor is not None:
+                    where.append("rowid < ?" if sort_desc else "rowid > ?")
+                    params.append(cursor[-1])
+            else:
+                col = sort_expr
+                if sort_desc:
+                    order_sql = f"{col} IS NULL DESC, {col} DESC, rowid DESC"
+                else:
+                    order_sql = f"{col} IS NULL, {col}, rowid"
+                if cursor is not None:
+                    clause, clause_params = _keyset_clause(col, cursor, sort_desc)
+                    where.append(clause)
+                    params.extend(clause_params)
+            offset_sql = ""
+        else:
+            select_sql = f"SELECT * FROM {safe_table}"
+            order_sql = ""
+            if sort_expr is not None:
+                col = sort_expr
+                order_sql = f"{col} IS NULL DESC, {col} DESC" if sort_desc else f"{col} IS NULL, {col}"
+            offset_sql = f" OFFSET {int(cursor[0]) if cursor else 0}"
+        sql = select_sql
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order_sql:
+            sql += " ORDER BY " + order_sql
+        sql += f" LIMIT {limit + 1}" + offset_sql
+        cur = self.conn.cursor()
+        cur.execute(sql, params)
+        rows = cur.fetchmany(limit + 1)
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        if not keyset:
+            offset = (int(cursor[0]) if cursor else 0) + len(rows)
+            return [tuple(row) for row in rows], ((offset,) if has_next else None)
+        next_cursor = None
+        if has_next and rows:
+            last = rows[-1]
+            if sort_col is None:
+                next_cursor = (last[-1],)
+            else:
+                value = last[-2] if sort_select else last[columns.index(sort_col)]
+                next_cursor = (1 if value is None else 0, value, last[-1])
+        hidden = 2 if sort_select else 1
+        return [tuple(row)[:-hidden] for row in rows], next_cursor
+
+    def is_numeric_text_column(self, table: str, column: str) -> bool:
+        """Kolonda metin değer var ve NULL olmayan tüm değerler sayı gibi mi?
+
+        TEXT kolonlarda saklanan sayılar SQLite'ta sözlük sırasıyla karşılaştırılır;
+        eski bellek içi sıralama bunları ``float`` olarak karşılaştırıyordu. İlk
+        sayısal olmayan değerde durur.
+        """
+        safe_table = validate_identifier(table)
+        col = quote_identifier(column)
+        numeric = (
+            f"typeof({col}) IN ('integer', 'real') OR (typeof({col}) = 'text' "
+            f"AND trim({col}) GLOB '*[0-9]*' AND trim({col}) NOT GLOB '*[^0-9.+-]*')"
+        )
+        row = self.conn.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {safe_table} WHERE typeof({col}) = 'text'), "
+            f"EXISTS (SELECT 1 FROM {safe_table} WHERE {col} IS NOT NULL AND NOT ({numeric}))"
+        ).fetchone()
+        return bool(row and row[0] and not row[1])
+
+    def count_rows(
+        self,
+        table: str,
+        columns: list[str],
+        *,
+        search: str = "",
+        column_filters: dict[str, str] | None = None,
+        cap: int = 10000,
+    ) -> tuple[int, bool]:
+        """Eşleşen satır sayısı ve kesin mi bilgisi.
+
+        Sayım ``cap`` satırda kesilir; filtresiz ve sınıra ulaşan tablolarda
+        ``sqlite_stat1`` (ANALYZE) ya da ``MAX(rowid)`` tahmini döner.
+        """
+        safe_table = validate_identifier(table)
+        where, params = build_filter_clause(columns, search, column_filters)
+        inner = f"SELECT 1 FROM {safe_table}"
+        if where:
+            inner += " WHERE " + " AND ".join(where)
+        cur = self.conn.cursor()
+        cur.execute(f"SELECT COUNT(*) FROM ({inner} LIMIT ?)", (*params, int(cap) + 1))
+        count = int(cur.fetchone()[0] or 0)
+        if count <= cap:
+            return count, True
+        if not where:
+            estimate = self._estimate_table_rows(safe_table)
+            if estimate is not None and estimate > cap:
+                return estimate, False
+        return int(cap), False
+
+    def _estimate_table_rows(self, safe_table: str) -> int | None:
+        try:
+            row = self.conn.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = ? AND stat IS NOT NULL LIMIT 1", (safe_table,)
+            ).fetchone()
+            if row and str(row[0]).split()[:1]:
+                return int(str(row[0]).split()[0])
+        except (sqlite3.Error, ValueError):
+            pass
+        try:
+            row = self.conn.execute(f"SELECT MAX(rowid) FROM {safe_table}").fetchone()
+        except sqlite3.Error:
+            return None
+        return int(row[0]) if row and row[0] is not None else None
+
     def select_query(self, query: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
         cur = self.conn.cursor()
         cur.execute(query, params)
         return fetch_all_dicts(cur)
+
+
+def quote_identifier(name: str) -> str:
+    """Kolon adını (PRAGMA table_info kaynaklı) SQL'e güvenle gömer."""
+
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _like_pattern(text: str) -> str:
+    escaped = str(text).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def build_filter_clause(
+    columns: list[str],
+    search: str = "",
+    column_filters: dict[str, str] | None = None,
+) -> tuple[list[str], list[Any]]:
+    """Genel arama + kolon filtreleri için WHERE parçaları.
+
+    Eski bellek içi filtre gibi hücrenin metin karşılığında "içerir" araması
+    yapar (``CAST(... AS TEXT) LIKE``); LIKE yalnızca ASCII harflerde büyük/
+    küçük harf duyarsızdır. NULL hücreler eşleşmez.
+    """
+    where: list[str] = []
+    params: list[Any] = []
+    search = (search or "").strip()
+    if search and columns:
+        pattern = _like_pattern(search)
+        where.append(
+            "(" + " OR ".join(f"CAST({quote_identifier(c)} AS TEXT) LIKE ? ESCAPE '\\'" for c in columns) + ")"
+        )
+        params.extend([pattern] * len(columns))
+    for col, value in (column_filters or {}).items():
+        value = (value or "").strip()
+        if not value or col not in columns:
+            continue
+        where.append(f"CAST({quote_identifier(col)} AS TEXT) LIKE ? ESCAPE '\\'")
+        params.append(_like_pattern(value))
+    return where, params
+
+
+def _keyset_clause(col: str, cursor: tuple[Any, ...], sort_desc: bool) -> tuple[str, list[Any]]:
+    # Sıra: artan -> NULL olmayanlar (kolon, rowid) sonra NULL'lar (rowid);
+    # azalan -> NULL'lar (rowid azalan) sonra NULL olmayanlar (kolon, rowid azalan).
+    is_null, value, rowid = cursor
+    if not sort_desc:
+        if is_null:
+            return f"({col} IS NULL AND rowid > ?)", [rowid]
+        return (
+            f"({col} IS NULL OR {col} > ? OR ({col} = ? AND rowid > ?))",
+            [value, value, rowid],
+        )
+    if is_null:
+        return f"({col} IS NOT NULL OR rowid < ?)", [rowid]
+    return f"({col} IS NOT NULL AND ({col} < ? OR ({col} = ? AND rowid < ?)))", [value, value, rowid]
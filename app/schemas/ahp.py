@@ -81,3 +81,7 @@ class AHPCalculateRequest(BaseModel):
 
 class AHPSensitivityRequest(BaseModel):
     variation_percent: float = 0.05
+    mode: str = "one_at_a_time"
+    sample_count: int = Field(default=2000, ge=1, le=200000)
+    concentration: float = Field(default=200.0, gt=0)
+    seed: int | None = None
@@ -111,3 +111,4 @@ class SemesterPlanGenerateRequest(BaseModel):
     persist: bool = True
     generate_alternatives: bool = True
     scenario_type: str = Field(default="score_priority")
+    milp_time_limit_s: float | None = Field(default=None, gt=0)
@@ -13,6 +13,7 @@ import json
 import re
 import shutil
 import sqlite3
+import sys
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
@@ -21,6 +22,10 @@ from typing import Any
 import pandas as pd
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version  # noqa: E402
+
 DEFAULT_SOURCE = PROJECT_ROOT / "data" / "imports" / "files_20260512_2124"
 DEFAULT_DB = PROJECT_ROOT / "data" / "adil_secmeli.db"
 BENCHMARK_RAW_DIR = PROJECT_ROOT / "data" / "benchmark" / "raw_real"
@@ -709,6 +714,7 @@ def integrate(source_dir: Path, db_path: Path, *, backup: bool = True) -> dict[s
         load_criteria(cur, source_dir, stats)
         load_survey_summary(cur, source_dir, stats)
         copy_benchmark_csvs(source_dir, stats)
+        bump_decision_matrix_version(conn, "dataset_bundle_integrated")
         conn.commit()
         after = {
             table: count_table(cur, table)
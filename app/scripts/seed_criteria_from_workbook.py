@@ -12,9 +12,13 @@ from __future__ import annotations
 import argparse
 import os
 import sqlite3
+import sys
 
 ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DEFAULT_DB = os.path.join(ROOT, "data", "adil_secmeli.db")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version  # noqa: E402
 
 
 def _norm(s):
@@ -203,6 +207,7 @@ def main():
             (did, yil, dn, p["kayitli"], p["kontenjan"], p["doluluk_orani"]),
         )
 
+    bump_decision_matrix_version(conn, "seed_criteria_workbook")
     conn.commit()
     conn.close()
     print(f"Tamam: {len(yaz)} kayit yazildi.")
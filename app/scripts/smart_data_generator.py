@@ -6,8 +6,16 @@
 # veritabanı şemasını doldurur ve günceller.
 # =============================================================================
 
+import os
 import random
 import sqlite3
+import sys
+
+# Proje kökünden import için (app/scripts -> proje kökü)
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version  # noqa: E402
 
 DB_PATH = "data/adil_secmeli.db"
 
@@ -162,6 +170,7 @@ def veri_uret_ve_hesapla():
         # Havuz Güncelleme
         cursor.execute("UPDATE havuz SET skor = ? WHERE ders_id = ? AND yil=2022", (final_skor, ders_id))
 
+    bump_decision_matrix_version(conn, "smart_data_generator")
     conn.commit()
     conn.close()
     print(f"\n✅ İşlem Tamamlandı. {len(dersler)} ders işlendi. ({count_elendi} tanesi baraja takıldı)")
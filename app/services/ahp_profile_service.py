@@ -23,6 +23,7 @@ from app.services.ahp_profile_policy_service import (
     should_mark_decisions_stale,
 )
 from app.services.criteria_definition_service import seed_default_decision_criteria
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
 
 DEFAULT_CRITERIA_KEYS = ["basari", "trend", "populerlik", "anket"]
 DEFAULT_WEIGHTS = {
@@ -890,6 +891,8 @@ def _log_profile_action(
         """,
         (int(profile_id), str(action), old_status, new_status, actor, message, _now()),
     )
+    # Her profil durum degisikligi agirlik cozumlemesini etkileyebilir.
+    bump_decision_matrix_version(cur.connection, f"ahp_profile_{action}")
 
 
 def _now() -> str:
@@ -929,5 +932,6 @@ def delete_profile(conn: sqlite3.Connection, profile_id: int) -> dict[str, Any]:
             cur.execute(sql, (pid,))
         except sqlite3.OperationalError:
             pass
+    bump_decision_matrix_version(conn, "ahp_profile_deleted")
 
     return {"id": pid, "deleted": True, "name": ad}
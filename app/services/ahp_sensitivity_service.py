@@ -3,14 +3,33 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
 from app.db.schema_compat import ensure_ahp_governance_schema
 from app.services.ahp_calculation_service import normalize_weights
 
+SENSITIVITY_MODE_ONE_AT_A_TIME = "one_at_a_time"
+SENSITIVITY_MODE_MONTE_CARLO = "monte_carlo"
+# DECISION_THRESHOLDS esiklerine gore artan sirada karar kovalari.
+DECISION_BUCKETS = ("iptal_adayi", "dinlenme", "havuz", "mufredat")
+DECISION_THRESHOLDS = (40.0, 50.0, 70.0)
+MONTE_CARLO_CHUNK_SIZE = 500
+# Bu orneklem sayisinin altinda process havuzu acmak parcalari seri kosmaktan pahalidir.
+MONTE_CARLO_PARALLEL_MIN_SAMPLES = 1000
+
+_POOL_LOCK = threading.Lock()
+_POOL: ProcessPoolExecutor | None = None
+_POOL_WORKERS: int | None = None
+
 
 def perturb_weights(weights: dict[str, float], criterion_key: str, delta: float) -> dict[str, float]:
     adjusted = {key: float(value or 0.0) for key, value in dict(weights or {}).items()}
@@ -28,13 +47,176 @@ def run_weight_sensitivity_analysis(
     ensure_ahp_governance_schema(conn, commit=False)
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
+    run, course_ids, base_scores, criteria, base_weights, matrix = _load_sensitivity_inputs(cur, decision_run_id)
+    variations = []
+    for key in criteria:
+        variations.append({"criterion_key": key, "delta": float(variation_percent)})
+        variations.append({"criterion_key": key, "delta": -float(variation_percent)})
+
+    # courses x criteria matrisi, variations x criteria agirlik matrisiyle tek carpimda skorlanir.
+    weight_matrix = np.array(
+        [
+            [perturb_weights(base_weights, variation["criterion_key"], variation["delta"]).get(key, 0.0) for key in criteria]
+            for variation in variations
+        ],
+        dtype=float,
+    ).reshape(len(variations), len(criteria))
+    varied_scores = np.clip(matrix @ weight_matrix.T, 0.0, 100.0)
+    all_scores = np.column_stack([base_scores, varied_scores])
+    min_scores = all_scores.min(axis=1)
+    max_scores = all_scores.max(axis=1)
+    score_ranges = max_scores - min_scores
+    stability_levels = np.where(score_ranges < 3.0, "high", np.where(score_ranges < 7.0, "medium", "low"))
+    bucket_codes = _decision_bucket_codes(all_scores)
+    reached = np.stack([(bucket_codes == code).any(axis=1) for code in range(len(DECISION_BUCKETS))], axis=1)
+
+    items: list[dict[str, Any]] = []
+    for i, course_id in enumerate(course_ids):
+        base_decision = DECISION_BUCKETS[int(bucket_codes[i, 0])]
+        changed_decision = _changed_decisions(reached[i], int(bucket_codes[i, 0]))
+        explanation = (
+            f"Ağırlıklar ±%{float(variation_percent) * 100:.1f} değiştiğinde skor "
+            f"{min_scores[i]:.2f}-{max_scores[i]:.2f} aralığında kaldı."
+        )
+        if changed_decision:
+            explanation += f" Karar eşiği değişim riski: {changed_decision}."
+        items.append(
+            {
+                "course_id": course_id,
+                "base_score": float(base_scores[i]),
+                "min_score": float(min_scores[i]),
+                "max_score": float(max_scores[i]),
+                "score_range": float(score_ranges[i]),
+                "base_decision": base_decision,
+                "changed_decision": changed_decision,
+                "stability_level": str(stability_levels[i]),
+                "explanation": explanation,
+            }
+        )
+
+    result_id = _persist_sensitivity_result(
+        cur,
+        run,
+        decision_run_id,
+        items,
+        variation_percent=float(variation_percent),
+        tested_variations=variations,
+        analysis_mode=SENSITIVITY_MODE_ONE_AT_A_TIME,
+        sample_count=len(variations),
+    )
+    conn.commit()
+    return get_sensitivity_result(conn, result_id)
+
+
+def run_monte_carlo_sensitivity(
+    conn: sqlite3.Connection,
+    decision_run_id: int,
+    sample_count: int = 2000,
+    concentration: float = 200.0,
+    seed: int | None = None,
+    max_workers: int | None = None,
+) -> dict[str, Any]:
+    """Dirichlet ile bozulan agirlik vektorleri uzerinden sira degisim olasiliklarini hesaplar.
+
+    Agirliklar ``Dirichlet(concentration * w)`` dagilimindan orneklenir; beklenen
+    deger baz agirliktir, ``concentration`` buyudukce ornekler baza yaklasir.
+    Her ders icin baz agirlikli toplam sirasindan sapma olasiligi
+    (rank_reversal_probability) ve karar kovasi degisim olasiligi raporlanir.
+    Ornekler sabit boyutlu parcalara bolunup process havuzunda kosturulur;
+    parca tohumlari ``seed``'den turetildigi icin sonuc isci sayisindan bagimsizdir.
+    """
+    sample_count = int(sample_count)
+    if sample_count <= 0:
+        raise ValueError("Monte Carlo örnek sayısı pozitif olmalıdır.")
+    if float(concentration) <= 0.0:
+        raise ValueError("Dirichlet yoğunluk parametresi pozitif olmalıdır.")
+    ensure_ahp_governance_schema(conn, commit=False)
+    conn.row_factory = sqlite3.Row
+    cur = conn.cursor()
+    run, course_ids, base_scores, criteria, base_weights, matrix = _load_sensitivity_inputs(cur, decision_run_id)
+
+    weights = np.array([float(base_weights.get(key) or 0.0) for key in criteria], dtype=float)
+    weights = weights / weights.sum() if weights.sum() > 0 else np.full(len(criteria), 1.0 / max(1, len(criteria)))
+    alpha = np.maximum(float(concentration) * weights, 1e-6)
+    reference_scores = np.clip(matrix @ weights, 0.0, 100.0)
+    base_ranks = _ranks(reference_scores[None, :])[0]
+    # Esikler agirlikli toplam icin kalibre edildiginden ornekler baz agirlikli toplamla kiyaslanir.
+    base_codes = _decision_bucket_codes(reference_scores)
+
+    chunk_sizes = [
+        min(MONTE_CARLO_CHUNK_SIZE, sample_count - start) for start in range(0, sample_count, MONTE_CARLO_CHUNK_SIZE)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    tasks = [(matrix, alpha, base_ranks, base_codes, size, child) for size, child in zip(chunk_sizes, seeds)]
+    partials = _run_monte_carlo_tasks(tasks, 1 if sample_count < MONTE_CARLO_PARALLEL_MIN_SAMPLES else max_workers)
+
+    rank_changes = sum(part["rank_changes"] for part in partials)
+    decision_changes = sum(part["decision_changes"] for part in partials)
+    reached = np.logical_or.reduce([part["reached"] for part in partials])
+    min_scores = np.minimum(np.min([part["min_scores"] for part in partials], axis=0), base_scores)
+    max_scores = np.maximum(np.max([part["max_scores"] for part in partials], axis=0), base_scores)
+    rank_probability = rank_changes / float(sample_count)
+    decision_probability = decision_changes / float(sample_count)
+    stability_levels = np.where(rank_probability < 0.10, "high", np.where(rank_probability < 0.30, "medium", "low"))
+
+    items: list[dict[str, Any]] = []
+    for i, course_id in enumerate(course_ids):
+        changed_decision = _changed_decisions(reached[i], int(base_codes[i]))
+        explanation = (
+            f"{sample_count} Dirichlet ağırlık örneğinde sıra değişim olasılığı "
+            f"%{rank_probability[i] * 100:.1f}, karar değişim olasılığı %{decision_probability[i] * 100:.1f}; "
+            f"skor {min_scores[i]:.2f}-{max_scores[i]:.2f} aralığında kaldı."
+        )
+        items.append(
+            {
+                "course_id": course_id,
+                "base_score": float(base_scores[i]),
+                "min_score": float(min_scores[i]),
+                "max_score": float(max_scores[i]),
+                "score_range": float(max_scores[i] - min_scores[i]),
+                "base_decision": DECISION_BUCKETS[int(base_codes[i])],
+                "changed_decision": changed_decision,
+                "stability_level": str(stability_levels[i]),
+                "explanation": explanation,
+                "base_rank": int(base_ranks[i]) + 1,
+                "rank_reversal_probability": float(rank_probability[i]),
+                "decision_change_probability": float(decision_probability[i]),
+            }
+        )
+
+    result_id = _persist_sensitivity_result(
+        cur,
+        run,
+        decision_run_id,
+        items,
+        variation_percent=0.0,
+        tested_variations=[
+            {
+                "distribution": "dirichlet",
+                "concentration": float(concentration),
+                "sample_count": sample_count,
+                "seed": seed,
+                "base_weights": {key: float(weights[j]) for j, key in enumerate(criteria)},
+            }
+        ],
+        analysis_mode=SENSITIVITY_MODE_MONTE_CARLO,
+        sample_count=sample_count,
+    )
+    conn.commit()
+    return get_sensitivity_result(conn, result_id)
+
+
+def _load_sensitivity_inputs(
+    cur: sqlite3.Cursor,
+    decision_run_id: int,
+) -> tuple[sqlite3.Row, list[int], np.ndarray, list[str], dict[str, float], np.ndarray]:
     cur.execute("SELECT * FROM decision_runs WHERE id=?", (int(decision_run_id),))
     run = cur.fetchone()
     if not run:
         raise ValueError(f"Karar çalışması bulunamadı: {decision_run_id}")
     cur.execute(
         """
-        SELECT *
+        SELECT course_id, final_score, raw_values_json, weights_json
         FROM course_score_breakdowns
         WHERE decision_run_id=?
         ORDER BY course_id
@@ -49,80 +231,67 @@ def run_weight_sensitivity_analysis(
     if not base_weights:
         base_weights = _json_load(rows[0]["weights_json"], {})
     criteria = list(base_weights.keys())
-    variations = []
-    for key in criteria:
-        variations.append({"criterion_key": key, "delta": float(variation_percent)})
-        variations.append({"criterion_key": key, "delta": -float(variation_percent)})
+    # raw_values_json her ders icin bir kez cozulur; 0-1 araligindaki degerler 0-100'e olceklenir.
+    raw = np.array(
+        [[_safe_float(values.get(key)) for key in criteria] for values in (_json_load(row["raw_values_json"], {}) for row in rows)],
+        dtype=float,
+    ).reshape(len(rows), len(criteria))
+    matrix = np.where(raw <= 1.0, raw * 100.0, raw)
+    course_ids = [int(row["course_id"]) for row in rows]
+    base_scores = np.array([float(row["final_score"] or 0.0) for row in rows], dtype=float)
+    return run, course_ids, base_scores, criteria, base_weights, matrix
 
-    items: list[dict[str, Any]] = []
-    sensitive_courses: list[dict[str, Any]] = []
-    stability_counts = {"high": 0, "medium": 0, "low": 0}
-    for row in rows:
-        raw_values = _json_load(row["raw_values_json"], {})
-        base_score = float(row["final_score"] or 0.0)
-        scores = [base_score]
-        for variation in variations:
-            varied_weights = perturb_weights(base_weights, variation["criterion_key"], variation["delta"])
-            scores.append(_weighted_score(raw_values, varied_weights))
-        min_score = min(scores)
-        max_score = max(scores)
-        score_range = max_score - min_score
-        stability = "high" if score_range < 3.0 else "medium" if score_range < 7.0 else "low"
-        stability_counts[stability] += 1
-        base_decision = _decision_bucket(base_score)
-        changed_decisions = sorted({_decision_bucket(score) for score in scores if _decision_bucket(score) != base_decision})
-        changed_decision = ", ".join(changed_decisions) if changed_decisions else None
-        explanation = (
-            f"Ağırlıklar ±%{float(variation_percent) * 100:.1f} değiştiğinde skor "
-            f"{min_score:.2f}-{max_score:.2f} aralığında kaldı."
-        )
-        if changed_decision:
-            explanation += f" Karar eşiği değişim riski: {changed_decision}."
-        item = {
-            "course_id": int(row["course_id"]),
-            "base_score": base_score,
-            "min_score": min_score,
-            "max_score": max_score,
-            "score_range": score_range,
-            "base_decision": base_decision,
-            "changed_decision": changed_decision,
-            "stability_level": stability,
-            "explanation": explanation,
-        }
-        items.append(item)
-        if stability == "low" or changed_decision:
-            sensitive_courses.append(item)
 
+def _persist_sensitivity_result(
+    cur: sqlite3.Cursor,
+    run: sqlite3.Row,
+    decision_run_id: int,
+    items: list[dict[str, Any]],
+    *,
+    variation_percent: float,
+    tested_variations: list[dict[str, Any]],
+    analysis_mode: str,
+    sample_count: int,
+) -> int:
+    sensitive_courses = [item for item in items if item["stability_level"] == "low" or item["changed_decision"]]
+    stability_counts = {"high": 0, "medium": 0, "low": 0}
+    for item in items:
+        stability_counts[item["stability_level"]] += 1
+    created_at = _now()
     cur.execute(
         """
         INSERT INTO ahp_sensitivity_results (
             decision_run_id, ahp_profile_id, variation_percent, tested_variations_json,
-            affected_courses_count, sensitive_courses_json, stability_summary_json, created_at
+            affected_courses_count, sensitive_courses_json, stability_summary_json,
+            analysis_mode, sample_count, created_at
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (
             int(decision_run_id),
             run["ahp_profile_id"],
             float(variation_percent),
-            _json(variations),
+            _json(tested_variations),
             len(sensitive_courses),
             _json(sensitive_courses),
             _json(stability_counts),
-            _now(),
+            analysis_mode,
+            int(sample_count),
+            created_at,
         ),
     )
     result_id = int(cur.lastrowid or 0)
-    for item in items:
-        cur.execute(
-            """
-            INSERT INTO ahp_course_sensitivity_items (
-                sensitivity_result_id, course_id, base_score, min_score, max_score,
-                score_range, base_decision, changed_decision, stability_level,
-                explanation, created_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    cur.executemany(
+        """
+        INSERT INTO ahp_course_sensitivity_items (
+            sensitivity_result_id, course_id, base_score, min_score, max_score,
+            score_range, base_decision, changed_decision, stability_level,
+            explanation, base_rank, rank_reversal_probability,
+            decision_change_probability, created_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
             (
                 result_id,
                 item["course_id"],
@@ -134,11 +303,81 @@ def run_weight_sensitivity_analysis(
                 item["changed_decision"],
                 item["stability_level"],
                 item["explanation"],
-                _now(),
-            ),
-        )
-    conn.commit()
-    return get_sensitivity_result(conn, result_id)
+                item.get("base_rank"),
+                item.get("rank_reversal_probability"),
+                item.get("decision_change_probability"),
+                created_at,
+            )
+            for item in items
+        ],
+    )
+    return result_id
+
+
+def _run_monte_carlo_tasks(tasks: list[tuple[Any, ...]], max_workers: int | None) -> list[dict[str, np.ndarray]]:
+    if (max_workers is not None and int(max_workers) <= 1) or len(tasks) <= 1:
+        return [_monte_carlo_chunk(task) for task in tasks]
+    try:
+        return list(_monte_carlo_pool(max_workers).map(_monte_carlo_chunk, tasks))
+    except (OSError, BrokenProcessPool):
+        # Process olusturulamayan ortamlarda (kisitli sandbox vb.) ayni parcalar seri kosar.
+        shutdown_monte_carlo_pool()
+        return [_monte_carlo_chunk(task) for task in tasks]
+
+
+def _monte_carlo_pool(max_workers: int | None) -> ProcessPoolExecutor:
+    """Istekler arasinda paylasilan process havuzu; isci sayisi degisirse yeniden kurulur."""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != max_workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = ProcessPoolExecutor(max_workers=max_workers)
+            _POOL_WORKERS = max_workers
+        return _POOL
+
+
+@atexit.register
+def shutdown_monte_carlo_pool() -> None:
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        _POOL = None
+        _POOL_WORKERS = None
+
+
+def _monte_carlo_chunk(task: tuple[Any, ...]) -> dict[str, np.ndarray]:
+    matrix, alpha, base_ranks, base_codes, size, seed_sequence = task
+    rng = np.random.default_rng(seed_sequence)
+    sampled_weights = rng.dirichlet(alpha, size=int(size))
+    scores = np.clip(sampled_weights @ matrix.T, 0.0, 100.0)
+    codes = _decision_bucket_codes(scores)
+    return {
+        "rank_changes": (_ranks(scores) != base_ranks[None, :]).sum(axis=0),
+        "decision_changes": (codes != base_codes[None, :]).sum(axis=0),
+        "reached": np.stack([(codes == code).any(axis=0) for code in range(len(DECISION_BUCKETS))], axis=1),
+        "min_scores": scores.min(axis=0),
+        "max_scores": scores.max(axis=0),
+    }
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """Her satir icin 0 tabanli sira (yuksek skor = 0); esitlikte ders sirasi korunur."""
+    order = np.argsort(-scores, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    ranks[np.arange(scores.shape[0])[:, None], order] = np.arange(scores.shape[1])[None, :]
+    return ranks
+
+
+def _decision_bucket_codes(scores: np.ndarray) -> np.ndarray:
+    """DECISION_THRESHOLDS esiklerine gore DECISION_BUCKETS indeksini dondurur (70+ mufredat, 50+ havuz, 40+ dinlenme)."""
+    return np.digitize(scores, DECISION_THRESHOLDS)
+
+
+def _changed_decisions(reached: np.ndarray, base_code: int) -> str | None:
+    changed = sorted(DECISION_BUCKETS[code] for code in range(len(DECISION_BUCKETS)) if reached[code] and code != base_code)
+    return ", ".join(changed) if changed else None
 
 
 def get_sensitivity_result(conn: sqlite3.Connection, result_id: int) -> dict[str, Any]:
@@ -173,26 +412,6 @@ def get_latest_sensitivity_for_run(conn: sqlite3.Connection, decision_run_id: in
     return get_sensitivity_result(conn, int(row["id"])) if row else None
 
 
-def _weighted_score(raw_values: dict[str, Any], weights: dict[str, float]) -> float:
-    score = 0.0
-    for key, weight in weights.items():
-        value = _safe_float(raw_values.get(key))
-        if value <= 1.0:
-            value *= 100.0
-        score += value * float(weight or 0.0)
-    return max(0.0, min(100.0, score))
-
-
-def _decision_bucket(score: float) -> str:
-    if score >= 70.0:
-        return "mufredat"
-    if score >= 50.0:
-        return "havuz"
-    if score >= 40.0:
-        return "dinlenme"
-    return "iptal_adayi"
-
-
 def _json(value: Any) -> str:
     return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
 
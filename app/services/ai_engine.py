@@ -10,8 +10,10 @@
 # RF: Kesinlesme Puani tahmini (0-100)
 # DT: Statu karari (mufredatta / havuzda / dinlenmede)
 
+import hashlib
 import logging
 import math
+from datetime import datetime
 
 import numpy as np
 import pandas as pd
@@ -22,6 +24,9 @@ from sklearn.tree import DecisionTreeClassifier
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.services.ml_artifact_store import artifact_root_for_db, get_warm_cache
+from app.services.ml_model_cache import CachedModel, ModelCacheKey, get_model_cache
+
 logger = logging.getLogger(__name__)
 
 # sklearn modelleri icin minimum egitim verisi satir sayisi
@@ -30,6 +35,8 @@ ML_ADVISORY_NOTE = (
     "Bu model mevcut veri miktariyla destekleyici/deneysel calistirilir. "
     "Nihai karar AHP/TOPSIS + kurallar + state machine tarafindan verilir."
 )
+# Model paketinin (LR/RF/DT) artifact surumu; hiperparametre degisince artirilir.
+HAVUZ_BUNDLE_VERSION = "havuz-v1"
 
 
 def _sf(val, default=0.0):
@@ -45,6 +52,30 @@ def _sf(val, default=0.0):
         return default
 
 
+def _fit_bundle(X, y_basari, rf_target, y_statu) -> dict:
+    model_lr = LinearRegression()
+    model_lr.fit(X, y_basari)
+
+    model_rf = RandomForestRegressor(
+        n_estimators=100, max_depth=8, random_state=42,
+    )
+    model_rf.fit(X, rf_target)
+
+    model_dt = DecisionTreeClassifier(max_depth=5, random_state=42)
+    model_dt.fit(X, y_statu)
+    return {"lr": model_lr, "rf": model_rf, "dt": model_dt}
+
+
+def _bundle_fingerprint(feature_cols, *arrays) -> str:
+    digest = hashlib.sha1(HAVUZ_BUNDLE_VERSION.encode("utf-8"))
+    digest.update("|".join(feature_cols).encode("utf-8"))
+    for arr in arrays:
+        values = np.ascontiguousarray(np.asarray(arr, dtype=np.float64))
+        digest.update(str(values.shape).encode("ascii"))
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
 class HavuzAIEngine:
     """
     Havuz + performans + populerlik verileri uzerinde ML modelleri.
@@ -201,21 +232,48 @@ class HavuzAIEngine:
         y_statu = df["statu"].values
         y_basari = np.clip(df["basari_orani"].values * 100, 0, 100)
 
-        self.model_lr = LinearRegression()
-        self.model_lr.fit(X, y_basari)
-
-        self.model_rf = RandomForestRegressor(
-            n_estimators=100, max_depth=8, random_state=42,
+        rf_target = np.clip(np.where(y_skor > 0, y_skor, y_basari * 100 / max(y_basari.max(), 1)), 0, 100)
+
+        # Ayni egitim verisi icin paket bir kez egitilir: once surec ici onbellek,
+        # sonra diskteki artifact (mmap ile), en son gercek egitim.
+        fingerprint = _bundle_fingerprint(feat, X, y_basari, rf_target, y_statu)
+        key = ModelCacheKey("havuz_ai", HAVUZ_BUNDLE_VERSION, "", fingerprint)
+        cached, _ = get_model_cache().get_or_train(
+            key,
+            lambda: CachedModel(
+                model=self._load_or_fit_bundle(fingerprint, X, y_basari, rf_target, y_statu),
+                evaluation=None,
+                target_kind="bundle",
+                sample_count=len(X),
+                created_at=datetime.now().isoformat(timespec="seconds"),
+            ),
         )
-        rf_target = np.where(y_skor > 0, y_skor, y_basari * 100 / max(y_basari.max(), 1))
-        self.model_rf.fit(X, np.clip(rf_target, 0, 100))
-
-        self.model_dt = DecisionTreeClassifier(max_depth=5, random_state=42)
-        self.model_dt.fit(X, y_statu)
+        self.model_lr = cached.model["lr"]
+        self.model_rf = cached.model["rf"]
+        self.model_dt = cached.model["dt"]
 
         self._trained = True
         return True
 
+    def _artifact_root(self):
+        try:
+            url = self.db.get_bind().url
+        except Exception:
+            return None
+        if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+            return None
+        return artifact_root_for_db(url.database)
+
+    def _load_or_fit_bundle(self, fingerprint, X, y_basari, rf_target, y_statu) -> dict:
+        def build() -> dict:
+            return _fit_bundle(X, y_basari, rf_target, y_statu)
+
+        root = self._artifact_root()
+        if root is None:
+            return build()
+        path = root / "havuz_ai" / f"bundle_{HAVUZ_BUNDLE_VERSION}_{fingerprint[:24]}.joblib"
+        return get_warm_cache().load_or_build(path, build, version=HAVUZ_BUNDLE_VERSION)
+
     def get_last_training_meta(self) -> dict:
         return dict(self._last_training_meta)
 
@@ -9,6 +9,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable
 
+from app.core.file_scan_cache import scan_file_cached
+
 ROOT = Path(__file__).resolve().parents[2]
 
 UI_DB_ALLOWLIST = {
@@ -24,6 +26,7 @@ API_RAW_SQL_ALLOWLIST = {
 SERVICE_SQLITE_ALLOWLIST = {
     "app/services/db.py": "Legacy DB helper",
     "app/services/report_table_service.py": "Admin tablo görüntüleme servisi repository arkasında çalışır",
+    "app/services/table_data_source.py": "Tablo görüntüleyici veri kaynağı; SQL repository'de, servis salt-okunur işçi bağlantısını yönetir",
     "app/services/system_service.py": "Sistem sağlığı için merkezi adapter",
     "app/services/database_service.py": "Sağlık merkezi için sanctioned DB erişim adapteri (repository arkasında, context-managed)",
 }
@@ -63,6 +66,15 @@ def _relative(path: Path) -> str:
     return path.relative_to(ROOT).as_posix()
 
 
+def _match_patterns(text: str, patterns: tuple[str, ...]) -> tuple[tuple[int, str], ...]:
+    lowered = [(pattern, pattern.lower()) for pattern in patterns]
+    matches: list[tuple[int, str]] = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        line_lower = line.lower()
+        matches.extend((line_number, pattern) for pattern, needle in lowered if needle in line_lower)
+    return tuple(matches)
+
+
 def _scan_patterns(
     relative_dir: str,
     patterns: tuple[str, ...],
@@ -73,30 +85,29 @@ def _scan_patterns(
 ) -> list[ArchitectureFinding]:
     findings: list[ArchitectureFinding] = []
     allowlist = allowlist or {}
+    # Dosya başına eşleşmeler mtime/boyut damgasıyla hafızada tutulur.
+    scanner_key = "architecture_patterns:" + "\x1f".join(patterns)
     for path in _iter_py_files(relative_dir):
         rel = _relative(path)
-        text = path.read_text(encoding="utf-8", errors="ignore")
-        for line_number, line in enumerate(text.splitlines(), start=1):
-            for pattern in patterns:
-                if pattern.lower() not in line.lower():
-                    continue
-                reason = allowlist.get(rel, "")
-                findings.append(
-                    ArchitectureFinding(
-                        layer=layer,
-                        file=rel,
-                        line=line_number,
-                        pattern=pattern,
-                        severity=("info" if reason else severity),
-                        allowlisted=bool(reason),
-                        allowlist_reason=reason,
-                        message=(
-                            "Allowlist kapsamında izlenen legacy kullanım."
-                            if reason
-                            else "Repository/service sınırına taşınması gereken kullanım."
-                        ),
-                    )
+        reason = allowlist.get(rel, "")
+        matches = scan_file_cached(path, scanner_key, lambda text: _match_patterns(text, patterns))
+        for line_number, pattern in matches or ():
+            findings.append(
+                ArchitectureFinding(
+                    layer=layer,
+                    file=rel,
+                    line=line_number,
+                    pattern=pattern,
+                    severity=("info" if reason else severity),
+                    allowlisted=bool(reason),
+                    allowlist_reason=reason,
+                    message=(
+                        "Allowlist kapsamında izlenen legacy kullanım."
+                        if reason
+                        else "Repository/service sınırına taşınması gereken kullanım."
+                    ),
                 )
+            )
     return findings
 
 
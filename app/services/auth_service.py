@@ -11,7 +11,7 @@ from typing import Optional
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
-from app.core.config import AppConfig, load_app_config
+from app.core.config import AppConfig, get_app_config
 from app.core.security import (
     generate_api_key,
     generate_client_id,
@@ -124,7 +124,7 @@ class AuthService:
         )
 
 def get_auth_service(db: Session = Depends(get_session)) -> AuthService:
-    config = load_app_config()
+    config = get_app_config()
     return AuthService(db, config)
 
 def get_current_user(request: Request, auth_service: AuthService = Depends(get_auth_service)) -> UserContext:
@@ -11,6 +11,8 @@ from sqlalchemy.orm import Session
 
 from app.core.config import AppConfig, resolve_sqlite_db_path
 from app.db.models import DataSnapshot
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
+from app.services.incremental_topsis import invalidate_topsis_states
 
 
 def create_manual_file_backup(db_path: str, created_by: str = "desktop-ui") -> dict:
@@ -140,5 +142,15 @@ class BackupRestoreService:
         db_path = resolve_sqlite_db_path(self.config.sqlite_db_path)
         db_path.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(backup_path, str(db_path))
+        # Geri yuklenen dosyada veri surumu sayaci geriye gider; eski karar
+        # matrisi goruntuleriyle cakismamasi icin yeni epoch acilir.
+        restored = sqlite3.connect(str(db_path))
+        try:
+            bump_decision_matrix_version(restored, "backup_restored", new_epoch=True)
+            restored.commit()
+        finally:
+            restored.close()
+        # Artimli TOPSIS durumlari dosya yoluna baglidir; geri yuklenen icerikle gecersizdir.
+        invalidate_topsis_states()
 
         return True
@@ -12,7 +12,9 @@ import math
 import os
 import random
 import sqlite3
+import time
 import traceback
+from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
@@ -27,7 +29,23 @@ from app.services.course_type import (
 )
 from app.services.data_confidence_service import calculate_course_data_confidence
 from app.services.db import get_raw_connection
+from app.services.faculty_parallel_runner import FacultyScoreJob, iter_prescored_faculties
+from app.services.decision_matrix_snapshot_service import (
+    RAW_KEYS as MATRIX_RAW_KEYS,
+    build_decision_matrix_snapshot,
+    bump_decision_matrix_version,
+    get_decision_matrix_data_version,
+    load_decision_matrix_snapshot,
+    save_decision_matrix_snapshot,
+)
 from app.services.havuz_karar import calculate_next_status
+from app.services.incremental_topsis import (
+    IncrementalTopsisState,
+    discard_topsis_state,
+    get_topsis_state,
+    store_topsis_state,
+    topsis_state_keys,
+)
 from app.services.pool_state_machine_service import (
     evaluate_course_state_transition,
     get_governance_flags,
@@ -37,9 +55,12 @@ from app.services.pool_state_policy_service import (
     resolve_policy as resolve_pool_state_policy,
 )
 from app.services.popularity_service import calculate_popularity_score
+from app.services.time_conflict_index import build_slot, find_time_conflicts
 from app.services.trend_analysis_service import (
     analyze_course_finalized_score_trend,
     analyze_course_trend,
+    fetch_finalized_score_values_bulk,
+    has_final_score_tables,
 )
 from app.services.yearly_workflow import (
     ensure_yearly_workflow_schema,
@@ -332,39 +353,9 @@ def ders_cakisma_kontrolu(ders_listesi, conn=None):
     if not ders_listesi or len(ders_listesi) < 2:
         return []
 
-    def _saat_dakika(s):
-        if not s:
-            return 0, 0
-        s = str(s).strip()
-        if ":" in s:
-            p = s.split(":")
-            return int(p[0] or 0), int(p[1] or 0)
-        try:
-            return int(float(s)), 0
-        except (ValueError, TypeError):
-            return 0, 0
-
-    def _cakisma(gun1, b1, e1, gun2, b2, e2):
-        if (gun1 or "").strip() != (gun2 or "").strip():
-            return False
-        sb1, sm1 = _saat_dakika(b1)
-        se1, em1 = _saat_dakika(e1)
-        sb2, sm2 = _saat_dakika(b2)
-        se2, em2 = _saat_dakika(e2)
-        dk1_bas = sb1 * 60 + sm1
-        dk1_bit = se1 * 60 + em1
-        dk2_bas = sb2 * 60 + sm2
-        dk2_bit = se2 * 60 + em2
-        return not (dk1_bit <= dk2_bas or dk2_bit <= dk1_bas)
-
-    cakisanlar = []
-    for i in range(len(ders_listesi)):
-        for j in range(i + 1, len(ders_listesi)):
-            d1, d2 = ders_listesi[i], ders_listesi[j]
-            if len(d1) >= 4 and len(d2) >= 4:
-                if _cakisma(d1[1], d1[2], d1[3], d2[1], d2[2], d2[3]):
-                    cakisanlar.append((d1[0], d2[0]))
-    return cakisanlar
+    gecerli = [d for d in ders_listesi if len(d) >= 4]
+    slotlar = [build_slot(d[0], d[1], d[2], d[3]) for d in gecerli]
+    return [(gecerli[i][0], gecerli[j][0]) for i, j in find_time_conflicts(slotlar)]
 
 
 # =========================================================
@@ -495,6 +486,7 @@ def yukle_gercek_2022_mufredati(conn, excel_path):
 
                 count_ders += 1
 
+    bump_decision_matrix_version(conn, "curriculum_2022_loaded")
     conn.commit()
     print(f"[OK] 2022 hazir: {count_ders} ders islendi (havuz yapisi bozulmadan guncellendi).")
     return True
@@ -923,6 +915,81 @@ def _read_course_metrics(cur, ders_id, yil, donem, motor):
         )
     pop = cur.fetchone()
 
+    cur.execute(
+        """
+        SELECT akademik_yil, basari_orani
+        FROM performans
+        WHERE ders_id = ? AND akademik_yil <= ? AND basari_orani IS NOT NULL
+        ORDER BY akademik_yil DESC
+        LIMIT 3
+        """,
+        (int(ders_id), int(yil)),
+    )
+    gecmis_yillar = [int(r[0]) for r in cur.fetchall()]
+    # H1 duzeltmesi (2026-06-15): Trend kaynagi olarak notr-farkinda
+    # analyze_course_trend kullanilir. Tek yil verisi olan dersler (orn. 2022
+    # baslangic) icin trend=0.5 (notr) doner; legacy gecmis_trend_hesapla 0.0
+    # veya basari'nin kopyasini veriyordu. Boylece trend kriteri basari'nin
+    # kopyasi olmaz ve karar formulu haksiz cezalandirma/odullendirme yapmaz.
+    # bkz. docs/MATEMATIKSEL_INCELEME_RAPORU_2026-06-15.md
+    trend_analysis = analyze_course_finalized_score_trend(cur, int(ders_id), int(yil))
+
+    prev_ortalama_not = None
+    prev_populerlik = None
+    if not dk and not pf and not pop and gecmis_yillar:
+        prev_yil = gecmis_yillar[0]
+        try:
+            cur.execute(
+                """SELECT ortalama_not FROM performans
+                   WHERE ders_id = ? AND akademik_yil = ?
+                   ORDER BY pfrs_id DESC LIMIT 1""",
+                (int(ders_id), prev_yil),
+            )
+            prev_pf = cur.fetchone()
+            prev_ortalama_not = prev_pf[0] if prev_pf else None
+        except Exception:
+            pass
+        try:
+            cur.execute(
+                """SELECT COALESCE(ham_puan, doluluk_orani) FROM populerlik
+                   WHERE ders_id = ? AND akademik_yil = ?
+                   ORDER BY pop_id DESC LIMIT 1""",
+                (int(ders_id), prev_yil),
+            )
+            prev_pop = cur.fetchone()
+            prev_populerlik = prev_pop[0] if prev_pop else None
+        except Exception:
+            pass
+
+    return _compose_course_metrics(
+        ders_id,
+        yil,
+        dk,
+        pf,
+        pop,
+        trend_analysis,
+        has_history=bool(gecmis_yillar),
+        prev_ortalama_not=prev_ortalama_not,
+        prev_populerlik=prev_populerlik,
+    )
+
+
+def _compose_course_metrics(
+    ders_id,
+    yil,
+    dk,
+    pf,
+    pop,
+    trend_analysis,
+    *,
+    has_history,
+    prev_ortalama_not=None,
+    prev_populerlik=None,
+):
+    """
+    Ham kriter/performans/populerlik satirlarindan tek dersin metrik sozlugunu uretir.
+    _read_course_metrics (tek ders) ve _load_course_metrics_bulk (toplu) ayni kurali paylasir.
+    """
     ortalama_not = _safe_float2(pf[0] if pf else None, 0.0)
     basari = _safe_float2(pf[1] if pf else None, 0.0)
     doluluk = _safe_float2(pop[0] if pop else None, 0.0)
@@ -976,67 +1043,307 @@ def _read_course_metrics(cur, ders_id, yil, donem, motor):
 
     basari = max(0.0, min(1.0, basari))
     doluluk = max(0.0, min(1.0, doluluk))
+    trend = max(0.0, min(1.0, _safe_float2(trend_analysis.get("trend_score"), 0.5)))
 
-    cur.execute(
-        """
-        SELECT akademik_yil, basari_orani
+    no_current_year_data = (
+        not dk and not pf and not pop
+    )
+    if no_current_year_data and has_history:
+        basari = trend
+        if prev_ortalama_not is not None and _safe_float2(prev_ortalama_not, 0) > 0:
+            ortalama_not = _safe_float2(prev_ortalama_not, ortalama_not)
+        if prev_populerlik is not None and _safe_float2(prev_populerlik, 0) > 0:
+            doluluk = max(0.0, min(1.0, _safe_float2(prev_populerlik, doluluk)))
+
+    return {
+        "ders_id": int(ders_id),
+        "basari": basari,
+        "trend": trend,
+        "populerlik": doluluk,
+        "anket": max(0.0, min(1.0, _safe_float2(anket, 0.5))),
+        "ortalama_not": max(0.0, min(100.0, _safe_float2(ortalama_not, 0.0))),
+    }
+
+
+COURSE_METRIC_KEYS = ("basari", "trend", "populerlik", "anket")
+_DK_METRIC_COLUMNS = (
+    "toplam_ogrenci",
+    "gecen_ogrenci",
+    "basari_ortalamasi",
+    "kontenjan",
+    "kayitli_ogrenci",
+    "anket_katilimci",
+    "anket_dersi_secen",
+    "katilim_sayisi",
+    "toplam_hafta",
+    "katilim_yuzdesi",
+    "devamsiz_ogrenci_sayisi",
+)
+_BULK_CHUNK_SIZE = 900  # SQLite degisken limitine takilmamak icin.
+
+
+@dataclass(slots=True)
+class CourseMetricColumns:
+    """
+    Aday derslerin metriklerini sutun bazli (numpy) tutar.
+    Satir sirasi ders_ids ile aynidir; matrix() dogrudan TOPSIS girdisi olarak kullanilabilir.
+    """
+
+    ders_ids: np.ndarray
+    basari: np.ndarray
+    trend: np.ndarray
+    populerlik: np.ndarray
+    anket: np.ndarray
+    ortalama_not: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows):
+        rows = list(rows)
+        return cls(
+            ders_ids=np.array([int(r["ders_id"]) for r in rows], dtype=np.int64),
+            **{
+                key: np.array([float(r[key]) for r in rows], dtype=float)
+                for key in (*COURSE_METRIC_KEYS, "ortalama_not")
+            },
+        )
+
+    def __len__(self):
+        return int(self.ders_ids.shape[0])
+
+    def subset(self, ders_ids):
+        position = {int(d): i for i, d in enumerate(self.ders_ids.tolist())}
+        idx = np.array([position[int(d)] for d in ders_ids if int(d) in position], dtype=np.int64)
+        return CourseMetricColumns(
+            ders_ids=self.ders_ids[idx],
+            basari=self.basari[idx],
+            trend=self.trend[idx],
+            populerlik=self.populerlik[idx],
+            anket=self.anket[idx],
+            ortalama_not=self.ortalama_not[idx],
+        )
+
+    def matrix(self, keys=COURSE_METRIC_KEYS):
+        return np.column_stack([getattr(self, key) for key in keys]) if len(self) else np.zeros((0, len(keys)))
+
+    def to_metric_map(self):
+        return {
+            int(d): {
+                "ders_id": int(d),
+                "basari": float(self.basari[i]),
+                "trend": float(self.trend[i]),
+                "populerlik": float(self.populerlik[i]),
+                "anket": float(self.anket[i]),
+                "ortalama_not": float(self.ortalama_not[i]),
+            }
+            for i, d in enumerate(self.ders_ids.tolist())
+        }
+
+    def to_frame(self, names=None):
+        frame = pd.DataFrame(
+            {
+                "ders_id": self.ders_ids.astype(int),
+                "basari": self.basari,
+                "trend": self.trend,
+                "populerlik": self.populerlik,
+                "anket": self.anket,
+                "ortalama_not": self.ortalama_not,
+            }
+        )
+        if names is not None:
+            frame["ders"] = [names.get(int(d), str(int(d))) for d in self.ders_ids.tolist()]
+        return frame
+
+
+def _first_rows_by_course(cur, sql_template, ids, params_after=()):
+    """
+    IN (...) listesini parcalayarak calistirir; ders_id'ye gore ilk satiri tutar.
+    Sorgu ilk sutun olarak ders_id dondurmeli ve ders bazinda oncelik sirasina gore dizilmeli.
+    """
+    out = {}
+    for i in range(0, len(ids), _BULK_CHUNK_SIZE):
+        chunk = ids[i : i + _BULK_CHUNK_SIZE]
+        placeholders = ",".join("?" for _ in chunk)
+        cur.execute(sql_template.format(placeholders=placeholders), (*chunk, *params_after))
+        for row in cur.fetchall():
+            if row[0] is None:
+                continue
+            out.setdefault(int(row[0]), tuple(row[1:]))
+    return out
+
+
+def _table_columns(cur, table_name):
+    cur.execute(f"PRAGMA table_info({table_name})")
+    return {str(row[1]) for row in cur.fetchall()}
+
+
+def _load_course_metrics_bulk(cur, ders_ids, yil, donem):
+    """
+    _read_course_metrics'in toplu karsiligi: tum adaylar icin ders_kriterleri,
+    onceki yil fallback'i, performans ve populerlik satirlarini (ders_id, yil, donem)
+    anahtariyla birkac kume sorgusunda okur ve CourseMetricColumns dondurur.
+    """
+    ids = sorted({int(d) for d in (ders_ids or [])})
+    yil = int(yil)
+    donem = str(donem)
+    if not ids:
+        return CourseMetricColumns.from_rows([])
+
+    dk_cols = _table_columns(cur, "ders_kriterleri")
+    dk_map = {}
+    prev_dk_map = {}
+    if dk_cols:
+        dk_order = "id" if "id" in dk_cols else "rowid"
+        dk_select = ", ".join(c if c in dk_cols else f"NULL AS {c}" for c in _DK_METRIC_COLUMNS)
+        dk_map = _first_rows_by_course(
+            cur,
+            f"""
+            SELECT ders_id, {dk_select}
+            FROM ders_kriterleri
+            WHERE ders_id IN ({{placeholders}}) AND yil = ?
+              AND (COALESCE(TRIM(donem), '') = '' OR LOWER(SUBSTR(TRIM(donem), 1, 1)) = LOWER(SUBSTR(TRIM(?), 1, 1)))
+            ORDER BY ders_id,
+                     CASE WHEN LOWER(SUBSTR(TRIM(COALESCE(donem, '')), 1, 1)) = LOWER(SUBSTR(TRIM(?), 1, 1)) THEN 0 ELSE 1 END,
+                     {dk_order} DESC
+            """,
+            ids,
+            (yil, donem, donem),
+        )
+        missing = [d for d in ids if d not in dk_map]
+        if missing:
+            prev_dk_map = _first_rows_by_course(
+                cur,
+                f"""
+                SELECT ders_id, {dk_select}
+                FROM ders_kriterleri
+                WHERE ders_id IN ({{placeholders}}) AND yil < ?
+                ORDER BY ders_id, yil DESC, {dk_order} DESC
+                """,
+                missing,
+                (yil,),
+            )
+
+    pf_cols = _table_columns(cur, "performans")
+    pf_order = "pfrs_id" if "pfrs_id" in pf_cols else "rowid"
+    pf_map = _first_rows_by_course(
+        cur,
+        f"""
+        SELECT ders_id, ortalama_not, basari_orani
         FROM performans
-        WHERE ders_id = ? AND akademik_yil <= ? AND basari_orani IS NOT NULL
-        ORDER BY akademik_yil DESC
-        LIMIT 3
+        WHERE ders_id IN ({{placeholders}}) AND akademik_yil = ?
+        ORDER BY ders_id, {pf_order} DESC
         """,
-        (int(ders_id), int(yil)),
+        ids,
+        (yil,),
     )
-    gecmis = [{"yil": int(r[0]), "oran": _safe_float2(r[1], basari)} for r in cur.fetchall()]
-    # H1 duzeltmesi (2026-06-15): Trend kaynagi olarak notr-farkinda
-    # analyze_course_trend kullanilir. Tek yil verisi olan dersler (orn. 2022
-    # baslangic) icin trend=0.5 (notr) doner; legacy gecmis_trend_hesapla 0.0
-    # veya basari'nin kopyasini veriyordu. Boylece trend kriteri basari'nin
-    # kopyasi olmaz ve karar formulu haksiz cezalandirma/odullendirme yapmaz.
-    # bkz. docs/MATEMATIKSEL_INCELEME_RAPORU_2026-06-15.md
-    trend_analysis = analyze_course_finalized_score_trend(cur, int(ders_id), int(yil))
-    trend = max(0.0, min(1.0, _safe_float2(trend_analysis.get("trend_score"), 0.5)))
 
-    no_current_year_data = (
-        not dk and not pf and not pop
+    pop_cols = _table_columns(cur, "populerlik")
+    pop_expr = "COALESCE(ham_puan, doluluk_orani)" if "ham_puan" in pop_cols else "doluluk_orani"
+    pop_order = "pop_id" if "pop_id" in pop_cols else "rowid"
+    pop_map = _first_rows_by_course(
+        cur,
+        f"""
+        SELECT ders_id, {pop_expr}
+        FROM populerlik
+        WHERE ders_id IN ({{placeholders}}) AND akademik_yil = ?
+        ORDER BY ders_id, {pop_order} DESC
+        """,
+        ids,
+        (yil,),
     )
-    if no_current_year_data and gecmis:
-        basari = max(0.0, min(1.0, _safe_float2(trend, gecmis[0]["oran"])))
 
-        prev_yil = gecmis[0]["yil"]
+    history_year = {
+        d: int(row[0])
+        for d, row in _first_rows_by_course(
+            cur,
+            """
+            SELECT ders_id, MAX(akademik_yil)
+            FROM performans
+            WHERE ders_id IN ({placeholders}) AND akademik_yil <= ? AND basari_orani IS NOT NULL
+            GROUP BY ders_id
+            ORDER BY ders_id
+            """,
+            ids,
+            (yil,),
+        ).items()
+        if row[0] is not None
+    }
+
+    # Mevcut yil verisi hic olmayan ama gecmisi olan dersler onceki yildan beslenir.
+    propagate = [
+        d for d in ids
+        if d in history_year and (dk_map.get(d) or prev_dk_map.get(d)) is None and d not in pf_map and d not in pop_map
+    ]
+    prev_ortalama = {}
+    prev_populerlik = {}
+    if propagate:
         try:
-            cur.execute(
-                """SELECT ortalama_not FROM performans
-                   WHERE ders_id = ? AND akademik_yil = ?
-                   ORDER BY pfrs_id DESC LIMIT 1""",
-                (int(ders_id), prev_yil),
+            rows = _first_rows_by_course(
+                cur,
+                """
+                SELECT p.ders_id, p.ortalama_not
+                FROM performans p
+                JOIN (
+                    SELECT ders_id, MAX(akademik_yil) AS prev_yil
+                    FROM performans
+                    WHERE ders_id IN ({placeholders}) AND akademik_yil <= ? AND basari_orani IS NOT NULL
+                    GROUP BY ders_id
+                ) g ON g.ders_id = p.ders_id AND g.prev_yil = p.akademik_yil
+                ORDER BY p.ders_id, p.pfrs_id DESC
+                """,
+                propagate,
+                (yil,),
             )
-            prev_pf = cur.fetchone()
-            if prev_pf and _safe_float2(prev_pf[0], 0) > 0:
-                ortalama_not = _safe_float2(prev_pf[0], ortalama_not)
+            prev_ortalama = {d: row[0] for d, row in rows.items()}
         except Exception:
             pass
         try:
-            cur.execute(
-                """SELECT COALESCE(ham_puan, doluluk_orani) FROM populerlik
-                   WHERE ders_id = ? AND akademik_yil = ?
-                   ORDER BY pop_id DESC LIMIT 1""",
-                (int(ders_id), prev_yil),
+            rows = _first_rows_by_course(
+                cur,
+                """
+                SELECT pp.ders_id, COALESCE(pp.ham_puan, pp.doluluk_orani)
+                FROM populerlik pp
+                JOIN (
+                    SELECT ders_id, MAX(akademik_yil) AS prev_yil
+                    FROM performans
+                    WHERE ders_id IN ({placeholders}) AND akademik_yil <= ? AND basari_orani IS NOT NULL
+                    GROUP BY ders_id
+                ) g ON g.ders_id = pp.ders_id AND g.prev_yil = pp.akademik_yil
+                ORDER BY pp.ders_id, pp.pop_id DESC
+                """,
+                propagate,
+                (yil,),
             )
-            prev_pop = cur.fetchone()
-            if prev_pop and _safe_float2(prev_pop[0], 0) > 0:
-                doluluk = max(0.0, min(1.0, _safe_float2(prev_pop[0], doluluk)))
+            prev_populerlik = {d: row[0] for d, row in rows.items()}
         except Exception:
             pass
 
-    return {
-        "ders_id": int(ders_id),
-        "basari": basari,
-        "trend": trend,
-        "populerlik": doluluk,
-        "anket": max(0.0, min(1.0, _safe_float2(anket, 0.5))),
-        "ortalama_not": max(0.0, min(100.0, _safe_float2(ortalama_not, 0.0))),
-    }
+    prefetched_trends = fetch_finalized_score_values_bulk(cur, ids, yil)
+    has_final_score_storage = has_final_score_tables(cur)
+
+    rows = []
+    for d in ids:
+        dk = dk_map.get(d) or prev_dk_map.get(d)
+        trend_analysis = analyze_course_finalized_score_trend(
+            cur,
+            d,
+            yil,
+            prefetched=prefetched_trends.get(d),
+            has_final_score_storage=has_final_score_storage,
+        )
+        rows.append(
+            _compose_course_metrics(
+                d,
+                yil,
+                dk,
+                pf_map.get(d),
+                pop_map.get(d),
+                trend_analysis,
+                has_history=d in history_year,
+                prev_ortalama_not=prev_ortalama.get(d),
+                prev_populerlik=prev_populerlik.get(d),
+            )
+        )
+    return CourseMetricColumns.from_rows(rows)
 
 
 def evaluate_drop_reasons(
@@ -1114,6 +1421,75 @@ def _pool_course_score_anket_only(anket):
     return POOL_DEFAULT_SCORE + (ratio - 0.5) * 2.0 * POOL_ANKET_SCORE_SPREAD
 
 
+def resolve_topsis_weight_context(cur, fakulte_id, akademik_yil, department_id=None, strict_ahp=False):
+    """
+    get_faculty_year_topsis_results'in AHP agirlik / fayda yonu cozumu.
+
+    Profil cozumu varsayilan profili ve kriter tanimlarini tohumlayabilir (yazim).
+    Salt-okunur baglantiyla skorlayan isciler icin yazici bu sonucu onceden
+    hesaplayip `weight_context` olarak gecer. strict_ahp kurallari aynidir.
+    """
+    motor = KararMotoru()
+    ahp_profile = None
+    ahp_fallback_used = False
+    ahp_fallback_reason: str | None = None
+    try:
+        from app.services.ahp_profile_service import (
+            DEFAULT_CRITERIA_KEYS,
+            resolve_ahp_profile,
+        )
+        from app.services.criteria_definition_service import criteria_direction_map
+
+        ahp_profile = resolve_ahp_profile(
+            cur.connection,
+            faculty_id=fakulte_id,
+            department_id=department_id,
+            year=akademik_yil,
+        )
+        benefit_map = criteria_direction_map(cur.connection)
+        profile_weights = ahp_profile.get("weights", {})
+        profile_keys = [key for key in ahp_profile.get("criteria_keys", DEFAULT_CRITERIA_KEYS) if key in DEFAULT_CRITERIA_KEYS]
+        if set(profile_keys) >= {"basari", "trend", "populerlik", "anket"}:
+            agirliklar = [float(profile_weights.get(key, 0.0)) for key in ["basari", "trend", "populerlik", "anket"]]
+        else:
+            ahp_fallback_used = True
+            ahp_fallback_reason = "Profil kriter anahtarlari beklenen 4 kriteri kapsamiyor."
+            agirliklar = motor.ahp_calistir()
+        if strict_ahp and ahp_fallback_used:
+            raise RuntimeError(
+                ahp_fallback_reason
+                or "Aktif AHP profili kullanilamadi; strict mod legacy matrise izin vermez."
+            )
+        # Strict modda tutarsiz profili kabul etme (kullanici aksini istemediyse).
+        if strict_ahp and ahp_profile and not bool(ahp_profile.get("is_consistent", True)):
+            raise RuntimeError(
+                "Aktif AHP profili tutarsiz (CR > 0.10). Strict modda karar uretilemez."
+            )
+    except Exception as ahp_exc:
+        ahp_fallback_used = True
+        ahp_fallback_reason = str(ahp_exc)
+        if strict_ahp:
+            # Karar Merkezi'nden gelen cagri: legacy agirliklara sessizce dusmek
+            # akademik karar acisindan tehlikeli. Acik hata firlat.
+            raise RuntimeError(
+                f"Aktif AHP profili cozumlenemedi (strict_ahp=True): {ahp_exc}"
+            ) from ahp_exc
+        logger.warning(
+            "AHP profili cozumlenemedi, legacy Saaty agirliklari kullaniliyor "
+            "(strict_ahp=False): %s", ahp_exc,
+        )
+        agirliklar = motor.ahp_calistir()
+        ahp_profile = None
+        benefit_map = {"basari": True, "trend": True, "populerlik": True, "anket": True}
+    return {
+        "weights": agirliklar,
+        "benefit_map": benefit_map,
+        "ahp_profile": ahp_profile,
+        "ahp_fallback_used": ahp_fallback_used,
+        "ahp_fallback_reason": ahp_fallback_reason,
+    }
+
+
 def get_faculty_year_topsis_results(
     cur,
     fakulte_id,
@@ -1122,6 +1498,7 @@ def get_faculty_year_topsis_results(
     include_course_ids=None,
     strict_ahp: bool = False,
     department_id: int | None = None,
+    weight_context: dict | None = None,
 ):
     """
     Bir fakulte+yil icin tum adaylarin TOPSIS skorlarini hesaplar.
@@ -1141,6 +1518,8 @@ def get_faculty_year_topsis_results(
       * `strict_ahp=True`: aktif tutarli profil yoksa `RuntimeError` firlatir.
         Karar Merkezi'nden tetiklenen calistirmalarda bunu True yapin ki karar
         kullanicinin secmedigi agirliklarla uretilmesin.
+      * `weight_context`: `resolve_topsis_weight_context` sonucu verilirse AHP
+        profili yeniden cozulmez (salt-okunur isci baglantilari icin).
     """
     fakulte_id = int(fakulte_id)
     akademik_yil = int(akademik_yil)
@@ -1282,62 +1661,33 @@ def get_faculty_year_topsis_results(
                 }
 
     motor = KararMotoru()
-    ahp_profile = None
-    ahp_fallback_used = False
-    ahp_fallback_reason: str | None = None
-    try:
-        from app.services.ahp_profile_service import (
-            DEFAULT_CRITERIA_KEYS,
-            resolve_ahp_profile,
-        )
-        from app.services.criteria_definition_service import criteria_direction_map
-
-        ahp_profile = resolve_ahp_profile(
-            cur.connection,
-            faculty_id=fakulte_id,
-            department_id=department_id,
-            year=akademik_yil,
+    if weight_context is None:
+        weight_context = resolve_topsis_weight_context(
+            cur, fakulte_id, akademik_yil, department_id=department_id, strict_ahp=strict_ahp
         )
-        benefit_map = criteria_direction_map(cur.connection)
-        profile_weights = ahp_profile.get("weights", {})
-        profile_keys = [key for key in ahp_profile.get("criteria_keys", DEFAULT_CRITERIA_KEYS) if key in DEFAULT_CRITERIA_KEYS]
-        if set(profile_keys) >= {"basari", "trend", "populerlik", "anket"}:
-            agirliklar = [float(profile_weights.get(key, 0.0)) for key in ["basari", "trend", "populerlik", "anket"]]
-        else:
-            ahp_fallback_used = True
-            ahp_fallback_reason = "Profil kriter anahtarlari beklenen 4 kriteri kapsamiyor."
-            agirliklar = motor.ahp_calistir()
-        if strict_ahp and ahp_fallback_used:
-            raise RuntimeError(
-                ahp_fallback_reason
-                or "Aktif AHP profili kullanilamadi; strict mod legacy matrise izin vermez."
-            )
-        # Strict modda tutarsiz profili kabul etme (kullanici aksini istemediyse).
-        if strict_ahp and ahp_profile and not bool(ahp_profile.get("is_consistent", True)):
-            raise RuntimeError(
-                "Aktif AHP profili tutarsiz (CR > 0.10). Strict modda karar uretilemez."
-            )
-    except Exception as ahp_exc:
-        ahp_fallback_used = True
-        ahp_fallback_reason = str(ahp_exc)
-        if strict_ahp:
-            # Karar Merkezi'nden gelen cagri: legacy agirliklara sessizce dusmek
-            # akademik karar acisindan tehlikeli. Acik hata firlat.
-            raise RuntimeError(
-                f"Aktif AHP profili cozumlenemedi (strict_ahp=True): {ahp_exc}"
-            ) from ahp_exc
-        logger.warning(
-            "AHP profili cozumlenemedi, legacy Saaty agirliklari kullaniliyor "
-            "(strict_ahp=False): %s", ahp_exc,
-        )
-        agirliklar = motor.ahp_calistir()
-        ahp_profile = None
-        benefit_map = {"basari": True, "trend": True, "populerlik": True, "anket": True}
-    metric_map = {}
-    for ders_id in sorted(aday_dersler):
-        m = _read_course_metrics(cur, ders_id, akademik_yil, donem, motor)
-        m["ders"] = ders_meta.get(ders_id, {}).get("ad", str(ders_id))
-        metric_map[ders_id] = m
+    agirliklar = weight_context["weights"]
+    benefit_map = weight_context["benefit_map"]
+    ahp_profile = weight_context["ahp_profile"]
+    ahp_fallback_used = bool(weight_context["ahp_fallback_used"])
+    ahp_fallback_reason = weight_context["ahp_fallback_reason"]
+    course_names = {d: ders_meta.get(d, {}).get("ad", str(d)) for d in aday_dersler}
+    # Karar matrisi goruntusu: ayni veri surumunde ayni aday evreni icin
+    # kriterler SQLite'tan yeniden okunmaz (bkz. decision_matrix_snapshot_service).
+    matrix_term_key = _snapshot_term_key(donem)
+    matrix_version = get_decision_matrix_data_version(cur)
+    matrix_snapshot = None
+    if matrix_version is not None:
+        matrix_snapshot = load_decision_matrix_snapshot(cur, fakulte_id, akademik_yil, matrix_term_key, matrix_version)
+        if matrix_snapshot is not None and not matrix_snapshot.covers(aday_dersler):
+            matrix_snapshot = None
+    snapshot_hit = matrix_snapshot is not None
+    if matrix_snapshot is not None:
+        metric_columns = CourseMetricColumns(ders_ids=matrix_snapshot.ders_ids, **matrix_snapshot.raw_columns())
+    else:
+        metric_columns = _load_course_metrics_bulk(cur, aday_dersler, akademik_yil, donem)
+    metric_map = metric_columns.to_metric_map()
+    for ders_id, m in metric_map.items():
+        m["ders"] = course_names[ders_id]
 
     # H7: Evren fakulte capinda; bolum filtresi cikti tarafinda uygulanir.
     curriculum_course_ids = _get_curriculum_course_ids(
@@ -1348,6 +1698,26 @@ def get_faculty_year_topsis_results(
     curriculum_courses = sorted(d for d in aday_dersler if d in curriculum_course_ids)
     pool_courses = sorted(d for d in aday_dersler if d not in curriculum_course_ids)
 
+    if matrix_version is not None and (
+        matrix_snapshot is None
+        or matrix_snapshot.curriculum_ids() != set(curriculum_courses)
+        or matrix_snapshot.weights != [float(w) for w in agirliklar]
+        or matrix_snapshot.benefit_map != dict(benefit_map)
+    ):
+        matrix_snapshot = build_decision_matrix_snapshot(
+            fakulte_id,
+            akademik_yil,
+            matrix_term_key,
+            matrix_version,
+            metric_columns.ders_ids,
+            {key: getattr(metric_columns, key) for key in MATRIX_RAW_KEYS},
+            curriculum_courses,
+            weights=agirliklar,
+            benefit_map=benefit_map,
+            ahp_profile=ahp_profile,
+        )
+        save_decision_matrix_snapshot(cur, matrix_snapshot)
+
     skor_map = {}
     # score_methods: hangi dersin skoru hangi yontemle uretildi (audit/UI icin).
     # Onceki surumde curriculum/pool skorlari ayni `topsis_score` kolonuna yaziliyordu
@@ -1355,10 +1725,13 @@ def get_faculty_year_topsis_results(
     score_methods: dict[int, str] = {}
     df_sonuc = pd.DataFrame()
     meta = {}
+    state_key = None
+    incremental_state = None
 
     # Mufredattaki dersler: sadece bunlar TOPSIS pipeline'ina girer.
     if curriculum_courses:
-        df_cur = pd.DataFrame([metric_map[cid] for cid in curriculum_courses])
+        curriculum_columns = metric_columns.subset(curriculum_courses)
+        df_cur = curriculum_columns.to_frame(names=course_names)
         if not df_cur.empty:
             df_sonuc, meta = motor.topsis_calistir(
                 df_cur,
@@ -1366,6 +1739,17 @@ def get_faculty_year_topsis_results(
                 criteria_keys=["basari", "trend", "populerlik", "anket"],
                 benefit_map=benefit_map,
             )
+            # Tek ders duzenlemelerinde tam yeniden hesap yerine artimli yenileme
+            # (refresh_faculty_year_topsis_scores) bu durumdan devam eder.
+            state_key = _topsis_state_key(cur, fakulte_id, akademik_yil, donem)
+            if state_key is not None and meta.get("sutunlar"):
+                incremental_state = IncrementalTopsisState(
+                    curriculum_columns.ders_ids,
+                    curriculum_columns.matrix(tuple(meta["sutunlar"])),
+                    meta["agirliklar"],
+                    [meta["benefit_map"][c] for c in meta["sutunlar"]],
+                    criteria_keys=meta["sutunlar"],
+                )
             if ahp_profile:
                 meta["ahp_profile_id"] = ahp_profile.get("id")
                 meta["ahp_profile_version"] = ahp_profile.get("version")
@@ -1382,6 +1766,9 @@ def get_faculty_year_topsis_results(
     else:
         # Fallback: bu fakulte+yil icin mufredatta hic aday ders yok; TOPSIS calismaz,
         # tum adaylar havuz mantigi (anket-only) ile puanlanir.
+        state_key = _topsis_state_key(cur, fakulte_id, akademik_yil, donem)
+        if state_key is not None:
+            discard_topsis_state(state_key)
         logger.debug(
             "get_faculty_year_topsis_results: TOPSIS evreni bos (mufredatta aday yok); "
             "fakulte_id=%s yil=%s, pool_only=%s ders",
@@ -1396,6 +1783,16 @@ def get_faculty_year_topsis_results(
         skor_map[d_id] = _pool_course_score_anket_only(anket_val)
         score_methods[d_id] = "pool_anket_only"
 
+    if incremental_state is not None:
+        store_topsis_state(
+            state_key,
+            incremental_state,
+            pool_scores={d_id: skor_map[d_id] for d_id in pool_courses},
+            weight_signature=_topsis_weight_signature(agirliklar, benefit_map),
+            department_id=department_id,
+            ders_meta={d_id: ders_meta[d_id] for d_id in aday_dersler if d_id in ders_meta},
+        )
+
     logger.debug(
         "get_faculty_year_topsis_results: TOPSIS=%s ders, pool_anket=%s ders (fakulte_id=%s yil=%s)",
         len(curriculum_courses),
@@ -1429,8 +1826,182 @@ def get_faculty_year_topsis_results(
         # H7: Bolum filtresi yalniz cikti kapsamini belirler; A+ / A- evrenini degistirmez.
         "department_curriculum_ids": sorted(int(d) for d in department_curriculum_ids),
         "faculty_curriculum_ids": sorted(int(d) for d in curriculum_courses),
+        "decision_matrix_snapshot": {
+            "data_version": matrix_version.token if matrix_version is not None else None,
+            "hit": snapshot_hit,
+        },
+    }
+
+
+def _snapshot_term_key(donem):
+    """_load_course_metrics_bulk donemi ilk harfiyle eslestirir; goruntu anahtari da oyle."""
+    return str(donem or "").strip().lower()[:1] or "_"
+
+
+def _topsis_database_token(cur):
+    """Artimli TOPSIS durumunu DB dosyasina baglar; bellek ici DB icin None (durum tutulmaz)."""
+    try:
+        cur.execute("PRAGMA database_list")
+        for row in cur.fetchall():
+            if str(row[1]) == "main" and row[2]:
+                return os.path.realpath(str(row[2]))
+    except sqlite3.Error:
+        pass
+    return None
+
+
+def _topsis_state_key(cur, fakulte_id, akademik_yil, donem):
+    database = _topsis_database_token(cur)
+    if database is None:
+        return None
+    return (database, int(fakulte_id), int(akademik_yil), _normalize_term_key(donem))
+
+
+def _topsis_weight_signature(agirliklar, benefit_map):
+    return (tuple(float(w) for w in agirliklar), tuple(sorted((str(k), bool(v)) for k, v in dict(benefit_map).items())))
+
+
+def _topsis_state_is_current(cur, key, entry):
+    """Durum, son tam hesaptan bu yana AHP agirliklari ve mufredat dersleri degismediyse gecerlidir."""
+    _, fakulte_id, akademik_yil, term_key = key
+    try:
+        context = resolve_topsis_weight_context(cur, fakulte_id, akademik_yil, department_id=entry.get("department_id"))
+    except Exception:
+        return False
+    if _topsis_weight_signature(context["weights"], context["benefit_map"]) != entry.get("weight_signature"):
+        return False
+    curriculum_ids = _get_curriculum_course_ids(cur, fakulte_id, akademik_yil, term_key)
+    if curriculum_ids and build_elective_predicate(cur=cur, alias="d") != "0=1":
+        curriculum_ids = filter_elective_course_ids(cur, curriculum_ids)
+    return {int(d) for d in curriculum_ids} == set(entry["state"].ders_ids.tolist())
+
+
+def refresh_faculty_year_topsis_scores(cur, fakulte_id, akademik_yil, ders_ids, donem=None, persist=False):
+    """
+    Kriterleri degisen dersler icin fakulte+yil TOPSIS skorlarini artimli yeniler.
+
+    Son `get_faculty_year_topsis_results` cagrisinin biraktigi durum kullanilir:
+    yalniz degisen derslerin metrikleri okunur, sutun normlari O(m) ile
+    guncellenir ve tum mufredat dersleri tek vektorel geciste yeniden puanlanir.
+    Havuz dersleri anket-only puanla yenilenir. `donem=None` ise o fakulte+yil
+    icin hazir olan tum donem durumlari yenilenir; `ders_ids=None` ise durumdaki
+    tum dersler (toplu yukleme/aktivasyon sonrasi) tek sorguyla yeniden okunur.
+
+    `persist=True` ise her donemin tam skor haritasi
+    `persist_faculty_year_topsis_scores` ile havuz tablosuna yazilir. Bolum
+    filtresiyle kurulmus durumlar fakulte evreninin tamamini kapsamadigi icin
+    yazilmaz (`persisted=False`).
+
+    Durum, kuruldugundan bu yana AHP agirliklari (profil/kriter yonu) ya da
+    mufredat ders kumesi degistiyse atilir; boyle durumlar yenilenmez.
+    Hazir gecerli durum yoksa (ya da DB bellek iciyse) `None` doner; caller tam
+    hesaba (`get_faculty_year_topsis_results`) dusmelidir.
+    """
+    started = time.perf_counter()
+    wanted = None if ders_ids is None else sorted({int(d) for d in ders_ids if d is not None})
+    database = _topsis_database_token(cur)
+    if database is None:
+        return None
+    if donem is None:
+        keys = topsis_state_keys(database, fakulte_id, akademik_yil)
+    else:
+        keys = [_topsis_state_key(cur, fakulte_id, akademik_yil, donem)]
+    entries = [(key, get_topsis_state(key)) for key in keys]
+    entries = [(key, entry) for key, entry in entries if entry is not None]
+    current = []
+    for key, entry in entries:
+        if _topsis_state_is_current(cur, key, entry):
+            current.append((key, entry))
+        else:
+            discard_topsis_state(key)
+    entries = current
+    if not entries:
+        return None
+
+    terms = {}
+    for key, entry in entries:
+        state = entry["state"]
+        pool_scores = entry["pool_scores"]
+        if wanted is None:
+            targets = sorted(set(state.ders_ids.tolist()) | set(pool_scores))
+        else:
+            targets = [d for d in wanted if d in state or d in pool_scores]
+        with entry["lock"]:
+            changed_ideals = set()
+            if targets:
+                columns = _load_course_metrics_bulk(cur, set(targets), int(akademik_yil), key[3])
+                for row, d_id in enumerate(columns.ders_ids.tolist()):
+                    if d_id in state:
+                        values = [float(getattr(columns, c)[row]) for c in state.criteria_keys]
+                        changed_ideals.update(state.update(d_id, values))
+                    else:
+                        pool_scores[int(d_id)] = _pool_course_score_anket_only(float(columns.anket[row]))
+            scores = state.score_map()
+            pool_snapshot = dict(pool_scores)
+        score_methods = {d_id: "topsis" for d_id in scores}
+        for d_id, score in pool_snapshot.items():
+            scores[d_id] = score
+            score_methods[d_id] = "pool_anket_only"
+        persisted = False
+        if persist and entry.get("department_id") is None:
+            persist_faculty_year_topsis_scores(
+                cur=cur,
+                fakulte_id=int(fakulte_id),
+                akademik_yil=int(akademik_yil),
+                skor_map=scores,
+                ders_meta=entry.get("ders_meta") or {},
+                donem=key[3],
+            )
+            persisted = True
+        terms[key[3]] = {
+            "scores": scores,
+            "score_methods": score_methods,
+            "updated_course_ids": targets,
+            "ideal_changed_criteria": sorted(changed_ideals),
+            "persisted": persisted,
+        }
+
+    return {
+        "ok": True,
+        "mode": "incremental",
+        "fakulte_id": int(fakulte_id),
+        "akademik_yil": int(akademik_yil),
+        "terms": terms,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 3),
     }
 
+
+def refresh_topsis_scores_after_change(conn, fakulte_id, akademik_yil, ders_ids=None, donem=None):
+    """
+    Override onayi ve import aktivasyonu sonrasi artimli TOPSIS yenilemesi.
+
+    Skorlar `refresh_faculty_year_topsis_scores(persist=True)` ile havuz
+    tablosuna yazilir. Yenileme bir optimizasyondur: hata olursa kendi
+    savepoint'i geri alinir ve onay/aktivasyon akisi durdurulmaz; skorlar bir
+    sonraki tam hesapta uretilir. Commit cagirana aittir.
+    """
+    if fakulte_id is None or akademik_yil is None:
+        return None
+    cur = conn.cursor()
+    cur.execute("SAVEPOINT topsis_incremental_refresh")
+    try:
+        result = refresh_faculty_year_topsis_scores(
+            cur, int(fakulte_id), int(akademik_yil), ders_ids, donem=donem, persist=True
+        )
+    except Exception:
+        cur.execute("ROLLBACK TO SAVEPOINT topsis_incremental_refresh")
+        cur.execute("RELEASE SAVEPOINT topsis_incremental_refresh")
+        logger.warning(
+            "Artimli TOPSIS yenilemesi basarisiz (fakulte_id=%s yil=%s); tam hesap bekleniyor.",
+            fakulte_id,
+            akademik_yil,
+            exc_info=True,
+        )
+        return None
+    cur.execute("RELEASE SAVEPOINT topsis_incremental_refresh")
+    return result
+
+
 def _get_curriculum_course_ids(
     cur, fakulte_id, akademik_yil, donem="G", department_id: int | None = None
 ):
@@ -1725,6 +2296,7 @@ def generate_next_year_curricula(
     drop_average_grade_threshold=DROP_AVERAGE_GRADE_THRESHOLD,
     require_decision_governance: bool = False,
     strict_ahp: bool = False,
+    score_pack=None,
 ):
     """
     Faculty + year + term icin bolum bazli sonraki yil mufredati olusturur.
@@ -1741,6 +2313,9 @@ def generate_next_year_curricula(
             Merkezi'nden tetiklenen calistirmada kullanin — kullanici "yeni
             karar calistir" derken sessiz governance hatasi gormesin. Otomatik
             arka plan uretiminde False kalmasi guvenli (default).
+        score_pack: Ayni fakulte+yil+donem icin onceden (ornegin salt-okunur bir
+            isci surecte) hesaplanmis `get_faculty_year_topsis_results` sonucu.
+            Verilirse TOPSIS yeniden calistirilmaz; `ok` degilse yok sayilir.
     """
     if fakulte_id is None or akademik_yil is None:
         return {
@@ -2027,13 +2602,14 @@ def generate_next_year_curricula(
                 len(eksik_kriter), fakulte_id, akademik_yil,
             )
 
-        score_pack = get_faculty_year_topsis_results(
-            cur=cur,
-            fakulte_id=fakulte_id,
-            akademik_yil=akademik_yil,
-            donem=donem,
-            strict_ahp=strict_ahp,
-        )
+        if not (score_pack and score_pack.get("ok")):
+            score_pack = get_faculty_year_topsis_results(
+                cur=cur,
+                fakulte_id=fakulte_id,
+                akademik_yil=akademik_yil,
+                donem=donem,
+                strict_ahp=strict_ahp,
+            )
         if not score_pack.get("ok"):
             return {
                 "ok": False,
@@ -2758,12 +3334,195 @@ def generate_next_year_curricula(
             conn.close()
 
 
+def _build_faculty_score_jobs(db_path, targets, donem, strict_ahp):
+    """
+    Paralel skorlama isleri: AHP agirlik baglami (profil tohumlama yazimlari dahil)
+    yazici baglantida onceden cozulur. targets: [(fakulte_id, akademik_yil)].
+    """
+    jobs = []
+    conn = get_raw_connection(db_path)
+    try:
+        for fid, yil in targets:
+            try:
+                context = resolve_topsis_weight_context(conn.cursor(), int(fid), int(yil), strict_ahp=bool(strict_ahp))
+            except Exception:
+                # strict modda cozulemeyen profil: uretim kendi hatasini raporlar.
+                context = None
+            jobs.append(FacultyScoreJob(int(fid), int(yil), str(donem), bool(strict_ahp), context))
+        conn.commit()
+    finally:
+        conn.close()
+    return jobs
+
+
+def _run_faculty_year_step(db_path, yil, donem, fakulte_id_iter, fakulte_adi, strict_ahp, score_pack=None):
+    """
+    run_all_algorithms_for_year icin tek fakulte: kriter kapisi, mufredat uretimi
+    ve workflow durum yazimi. Donen kismi ozet (ok/processed/skipped/errors/messages)
+    ana ozete fakulte sirasiyla eklenir.
+    """
+    step = {"ok": True, "processed": [], "skipped": [], "errors": [], "messages": []}
+    status_conn = get_raw_connection(db_path)
+    status_conn.row_factory = sqlite3.Row
+    try:
+        ensure_yearly_workflow_schema(status_conn)
+        try:
+            from app.services.criteria_completion_service import can_run_algorithm
+
+            gate = can_run_algorithm(
+                status_conn,
+                year=yil,
+                faculty_id=fakulte_id_iter,
+                semester=donem,
+                scope_type="faculty",
+            )
+            complete = bool(gate.get("can_run"))
+        except Exception as gate_exc:
+            logger.warning("Gelismis kriter tamlik kapisi kullanilamadi: %s", gate_exc)
+            gate = {}
+            complete = is_faculty_criteria_complete(
+                status_conn,
+                yil=yil,
+                fakulte_id=fakulte_id_iter,
+                refresh=True,
+            )
+        faculty_status = get_faculty_year_status(
+            status_conn,
+            fakulte_id=fakulte_id_iter,
+            yil=yil,
+            refresh=False,
+        )
+        if not complete:
+            gate_summary = gate.get("summary") or {}
+            if gate_summary.get("matrix"):
+                missing = [
+                    {
+                        "ders_id": row.get("course_id"),
+                        "ders": row.get("course_name"),
+                        "criterion_key": row.get("criterion_key"),
+                        "missing_reason": row.get("missing_reason"),
+                        "invalid_reason": row.get("invalid_reason"),
+                    }
+                    for row in gate_summary.get("matrix", [])
+                    if row.get("is_required") and (not row.get("is_present") or not row.get("is_valid"))
+                ]
+            else:
+                missing = get_missing_criteria(
+                    status_conn,
+                    yil=yil,
+                    fakulte_id=fakulte_id_iter,
+                )
+            legacy_skip = (
+                f"{fakulte_adi} fakultesi icin {yil} yili kriter girisi eksik oldugundan hesaplama yapilmadi."
+            )
+            skip_msg = legacy_skip
+            if gate.get("blocking_reason"):
+                skip_msg = f"{legacy_skip} {gate.get('blocking_reason')}"
+            step["skipped"].append(
+                {
+                    "fakulte_id": fakulte_id_iter,
+                    "fakulte": fakulte_adi,
+                    "year": yil,
+                    "reason": skip_msg,
+                    "criteria_status": faculty_status.get("criteria_status", "not_started"),
+                    "completion_ratio": gate.get("completion_ratio"),
+                    "completion_level": gate.get("completion_level"),
+                    "override_active": gate.get("override_active"),
+                    "missing_criteria": missing,
+                }
+            )
+            step["messages"].append(skip_msg)
+            return step
+    finally:
+        status_conn.close()
+
+    result = generate_next_year_curricula(
+        db_path=db_path,
+        fakulte_id=fakulte_id_iter,
+        akademik_yil=yil,
+        donem=donem,
+        strict_ahp=strict_ahp,
+        score_pack=score_pack,
+    )
+
+    status_conn = get_raw_connection(db_path)
+    status_conn.row_factory = sqlite3.Row
+    try:
+        if result.get("ok"):
+            mark_algorithm_run(
+                conn=status_conn,
+                fakulte_id=fakulte_id_iter,
+                source_year=yil,
+                generated_year=yil + 1,
+                success=True,
+            )
+            ok_msg = (
+                f"{fakulte_adi} fakultesi {yil} yili verileri islendi, {yil + 1} yili mufredati olusturuldu."
+            )
+            step["processed"].append({**result, "message": ok_msg})
+            step["messages"].append(ok_msg)
+        else:
+            mark_algorithm_run(
+                conn=status_conn,
+                fakulte_id=fakulte_id_iter,
+                source_year=yil,
+                generated_year=None,
+                success=False,
+            )
+            err_msg = result.get("error", "Bilinmeyen hata")
+            try:
+                from app.services.decision_run_service import (
+                    record_failed_decision_run,
+                )
+
+                record_failed_decision_run(
+                    db_path=db_path,
+                    year=yil,
+                    faculty_id=fakulte_id_iter,
+                    semester=donem,
+                    error_message=err_msg,
+                )
+            except Exception as governance_exc:
+                logger.warning(
+                    "run_all_algorithms_for_year: failed decision_run yazilamadi "
+                    "(fakulte=%s yil=%s): %s",
+                    fakulte_id_iter,
+                    yil,
+                    governance_exc,
+                )
+            step["ok"] = False
+            step["errors"].append(
+                {
+                    "fakulte_id": fakulte_id_iter,
+                    "fakulte": fakulte_adi,
+                    "year": yil,
+                    "error": err_msg,
+                }
+            )
+            step["messages"].append(
+                f"{fakulte_adi} fakultesi icin {yil} yili hesaplama hatasi: {err_msg}"
+            )
+    finally:
+        status_conn.close()
+    return step
+
+
+def _merge_faculty_step(summary, step):
+    if not step.get("ok", True):
+        summary["ok"] = False
+    for key in ("processed", "skipped", "errors", "messages"):
+        summary[key].extend(step.get(key) or [])
+
+
 def run_all_algorithms_for_year(
     yil: int,
     db_path: str | None = None,
     donem: str = "G",
     fakulte_id: int | None = None,
     strict_ahp: bool = False,
+    parallel: bool = False,
+    max_workers: int | None = None,
+    progress_callback=None,
 ) -> dict:
     """
     Algoritma kontrol merkezi icin yil bazli manuel calistirma.
@@ -2783,15 +3542,23 @@ def run_all_algorithms_for_year(
     - db_path: Veritabanı dosyası yolu
     - donem: Dönem kodu ("G"=Güz, "B"=Bahar)
     - fakulte_id: Belirli bir fakülte için çalıştır (None=tüm fakülteler)
+    - parallel: True ise fakultelerin TOPSIS skorlamasi salt-okunur baglantili
+      surec havuzunda yapilir (bkz. faculty_parallel_runner); tum yazimlar bu
+      surecte fakulte sirasiyla kalir, sonuc sirasi seri modla aynidir.
+    - max_workers: Paralel modda surec sayisi (None=CPU sayisi).
+    - progress_callback: Her fakulte bittiginde {done, total, fakulte_id, status,
+      score_ms, write_ms, ...} ile cagrilir. Zamanlamalar ``timings`` altinda da doner.
     """
     yil = int(yil)
     summary = {
         "ok": True,
         "year": yil,
+        "mode": "parallel" if parallel else "sequential",
         "processed": [],
         "skipped": [],
         "errors": [],
         "messages": [],
+        "timings": [],
     }
     resolved_db_path = resolve_sqlite_db_path(db_path)
 
@@ -2819,148 +3586,50 @@ def run_all_algorithms_for_year(
     faculties = [(int(r[0]), str(r[1] or "")) for r in cur.fetchall()]
     conn.close()
 
-    for fakulte_id_iter, fakulte_adi in faculties:
-        status_conn = get_raw_connection(db_path)
-        status_conn.row_factory = sqlite3.Row
-        try:
-            ensure_yearly_workflow_schema(status_conn)
+    timings = summary["timings"]
+    total = len(faculties)
+
+    def _finish(fakulte_id_iter, fakulte_adi, step, write_started, scored=None):
+        _merge_faculty_step(summary, step)
+        status = "error" if step["errors"] else ("skipped" if step["skipped"] else "processed")
+        timing = {
+            "fakulte_id": fakulte_id_iter,
+            "fakulte": fakulte_adi,
+            "status": status,
+            "prescored": bool(scored is not None and scored.score_pack is not None),
+            "score_ms": scored.score_ms if scored is not None else None,
+            "write_ms": round((time.perf_counter() - write_started) * 1000.0, 3),
+        }
+        timings.append(timing)
+        if progress_callback is not None:
             try:
-                from app.services.criteria_completion_service import can_run_algorithm
-
-                gate = can_run_algorithm(
-                    status_conn,
-                    year=yil,
-                    faculty_id=fakulte_id_iter,
-                    semester=donem,
-                    scope_type="faculty",
-                )
-                complete = bool(gate.get("can_run"))
-            except Exception as gate_exc:
-                logger.warning("Gelismis kriter tamlik kapisi kullanilamadi: %s", gate_exc)
-                gate = {}
-                complete = is_faculty_criteria_complete(
-                    status_conn,
-                    yil=yil,
-                    fakulte_id=fakulte_id_iter,
-                    refresh=True,
-                )
-            faculty_status = get_faculty_year_status(
-                status_conn,
-                fakulte_id=fakulte_id_iter,
-                yil=yil,
-                refresh=False,
-            )
-            if not complete:
-                gate_summary = gate.get("summary") or {}
-                if gate_summary.get("matrix"):
-                    missing = [
-                        {
-                            "ders_id": row.get("course_id"),
-                            "ders": row.get("course_name"),
-                            "criterion_key": row.get("criterion_key"),
-                            "missing_reason": row.get("missing_reason"),
-                            "invalid_reason": row.get("invalid_reason"),
-                        }
-                        for row in gate_summary.get("matrix", [])
-                        if row.get("is_required") and (not row.get("is_present") or not row.get("is_valid"))
-                    ]
-                else:
-                    missing = get_missing_criteria(
-                        status_conn,
-                        yil=yil,
-                        fakulte_id=fakulte_id_iter,
-                    )
-                legacy_skip = (
-                    f"{fakulte_adi} fakultesi icin {yil} yili kriter girisi eksik oldugundan hesaplama yapilmadi."
-                )
-                skip_msg = legacy_skip
-                if gate.get("blocking_reason"):
-                    skip_msg = f"{legacy_skip} {gate.get('blocking_reason')}"
-                summary["skipped"].append(
-                    {
-                        "fakulte_id": fakulte_id_iter,
-                        "fakulte": fakulte_adi,
-                        "year": yil,
-                        "reason": skip_msg,
-                        "criteria_status": faculty_status.get("criteria_status", "not_started"),
-                        "completion_ratio": gate.get("completion_ratio"),
-                        "completion_level": gate.get("completion_level"),
-                        "override_active": gate.get("override_active"),
-                        "missing_criteria": missing,
-                    }
-                )
-                summary["messages"].append(skip_msg)
-                continue
-        finally:
-            status_conn.close()
-
-        result = generate_next_year_curricula(
-            db_path=db_path,
-            fakulte_id=fakulte_id_iter,
-            akademik_yil=yil,
-            donem=donem,
-            strict_ahp=strict_ahp,
-        )
+                progress_callback({"done": len(timings), "total": total, **timing})
+            except Exception:
+                logger.debug("run_all_algorithms_for_year: ilerleme geri cagrisi hata verdi.", exc_info=True)
 
-        status_conn = get_raw_connection(db_path)
-        status_conn.row_factory = sqlite3.Row
+    if parallel:
+        # Okuma agirlikli skorlama surec havuzunda; tek yazici bu surec, fakulte sirasiyla.
+        # Iscilerin gordugu mufredat fakulte eslesmesi uretimdekiyle ayni olsun.
+        prep_conn = get_raw_connection(db_path)
         try:
-            if result.get("ok"):
-                mark_algorithm_run(
-                    conn=status_conn,
-                    fakulte_id=fakulte_id_iter,
-                    source_year=yil,
-                    generated_year=yil + 1,
-                    success=True,
-                )
-                ok_msg = (
-                    f"{fakulte_adi} fakultesi {yil} yili verileri islendi, {yil + 1} yili mufredati olusturuldu."
-                )
-                summary["processed"].append({**result, "message": ok_msg})
-                summary["messages"].append(ok_msg)
-            else:
-                mark_algorithm_run(
-                    conn=status_conn,
-                    fakulte_id=fakulte_id_iter,
-                    source_year=yil,
-                    generated_year=None,
-                    success=False,
-                )
-                err_msg = result.get("error", "Bilinmeyen hata")
-                try:
-                    from app.services.decision_run_service import (
-                        record_failed_decision_run,
-                    )
-
-                    record_failed_decision_run(
-                        db_path=db_path,
-                        year=yil,
-                        faculty_id=fakulte_id_iter,
-                        semester=donem,
-                        error_message=err_msg,
-                    )
-                except Exception as governance_exc:
-                    logger.warning(
-                        "run_all_algorithms_for_year: failed decision_run yazilamadi "
-                        "(fakulte=%s yil=%s): %s",
-                        fakulte_id_iter,
-                        yil,
-                        governance_exc,
-                    )
-                summary["ok"] = False
-                summary["errors"].append(
-                    {
-                        "fakulte_id": fakulte_id_iter,
-                        "fakulte": fakulte_adi,
-                        "year": yil,
-                        "error": err_msg,
-                    }
-                )
-                summary["messages"].append(
-                    f"{fakulte_adi} fakultesi icin {yil} yili hesaplama hatasi: {err_msg}"
-                )
+            _normalize_mufredat_faculty_ids(prep_conn.cursor())
+            prep_conn.commit()
         finally:
-            status_conn.close()
+            prep_conn.close()
+        jobs = _build_faculty_score_jobs(db_path, [(fid, yil) for fid, _ in faculties], donem, strict_ahp)
+        names = dict(faculties)
+        for scored in iter_prescored_faculties(db_path, jobs, max_workers=max_workers):
+            fakulte_id_iter = scored.job.fakulte_id
+            write_started = time.perf_counter()
+            step = _run_faculty_year_step(
+                db_path, yil, donem, fakulte_id_iter, names[fakulte_id_iter], strict_ahp, score_pack=scored.score_pack
+            )
+            _finish(fakulte_id_iter, names[fakulte_id_iter], step, write_started, scored)
+    else:
+        for fakulte_id_iter, fakulte_adi in faculties:
+            write_started = time.perf_counter()
+            step = _run_faculty_year_step(db_path, yil, donem, fakulte_id_iter, fakulte_adi, strict_ahp)
+            _finish(fakulte_id_iter, fakulte_adi, step, write_started)
 
     if not summary["processed"] and not summary["errors"]:
         summary["messages"].append("Calistirilacak uygun fakulte bulunamadi.")
@@ -3077,9 +3746,10 @@ def run_all_algorithms_for_year_dual(
     }
 
 
-def auto_generate_next_year_curricula(db_path=None, donem="G"):
+def auto_generate_next_year_curricula(db_path=None, donem="G", parallel=False, max_workers=None):
     """
     Tum fakulteler icin otomatik sonraki yil mufredat uretimini tetikler. Her fakultenin en son mufredatli yilini bulur ve bir sonraki yili uretir.
+    parallel=True ise fakulte skorlamasi surec havuzunda yapilir (bkz. run_all_algorithms_for_year).
     """
     summary = {
         "ok": True,
@@ -3151,6 +3821,7 @@ def auto_generate_next_year_curricula(db_path=None, donem="G"):
 
         return None, "Sonraki yil zaten mevcut"
 
+    candidates = []
     for fakulte_id, fakulte_adi in faculties:
         conn = get_raw_connection(db_path)
         conn.row_factory = sqlite3.Row
@@ -3163,7 +3834,21 @@ def auto_generate_next_year_curricula(db_path=None, donem="G"):
             donem=donem,
         )
         conn.close()
+        candidates.append((fakulte_id, fakulte_adi, aday_yil, reason))
+
+    # Paralel modda skorlar surec havuzunda onceden hesaplanir; uretim (yazim)
+    # yine bu surecte fakulte sirasiyla yapilir.
+    prescored = None
+    if parallel:
+        prescored = iter_prescored_faculties(
+            db_path,
+            _build_faculty_score_jobs(
+                db_path, [(fid, aday_yil) for fid, _, aday_yil, _ in candidates if aday_yil is not None], donem, True
+            ),
+            max_workers=max_workers,
+        )
 
+    for fakulte_id, fakulte_adi, aday_yil, reason in candidates:
         if aday_yil is None:
             summary["skipped"].append(
                 {"fakulte_id": fakulte_id, "fakulte": fakulte_adi, "reason": reason}
@@ -3176,6 +3861,7 @@ def auto_generate_next_year_curricula(db_path=None, donem="G"):
             akademik_yil=aday_yil,
             donem=donem,
             strict_ahp=True,
+            score_pack=next(prescored).score_pack if prescored is not None else None,
         )
 
         if result.get("ok"):
@@ -3326,10 +4012,11 @@ def _write_curriculum_generation_log(db_path, overall):
             conn.close()
 
 
-def generate_curricula_until_stable(db_path=None, donem="G", max_rounds=8):
+def generate_curricula_until_stable(db_path=None, donem="G", max_rounds=8, parallel=False, max_workers=None):
     """
     Otomatik uretimi birden fazla tur calistirir.
     Ayni (fakulte, yil_from, yil_to) ciftleri tekrar etmeye basladiginda durur.
+    parallel/max_workers her tura aynen gecer.
     """
     overall = {
         "ok": True,
@@ -3343,7 +4030,9 @@ def generate_curricula_until_stable(db_path=None, donem="G", max_rounds=8):
     seen_error_keys = set()
 
     for idx in range(int(max_rounds)):
-        summary = auto_generate_next_year_curricula(db_path=db_path, donem=donem)
+        summary = auto_generate_next_year_curricula(
+            db_path=db_path, donem=donem, parallel=parallel, max_workers=max_workers
+        )
         overall["rounds"].append({"round": idx + 1, "summary": summary})
 
         gen_list = summary.get("generated", []) or []
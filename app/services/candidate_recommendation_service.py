@@ -10,6 +10,10 @@ import sqlite3
 from datetime import datetime, timezone
 from typing import Any
 
+import numpy as np
+
+from app.algorithms.mcdm.promethee_flows import compute_promethee_flows
+
 CRITERIA = (
     "academic_fit",
     "curriculum_gap",
@@ -91,31 +95,30 @@ def promethee_ii_rank(
         only.update({"phi_plus": 0.0, "phi_minus": 0.0, "net_flow": 0.0, "rank": 1})
         return [only]
 
-    preference = [[0.0 for _ in range(n)] for _ in range(n)]
-    for i, alternative in enumerate(alternatives):
-        values_a = dict(alternative.get("criteria") or {})
-        for j, other in enumerate(alternatives):
-            if i == j:
-                continue
-            values_b = dict(other.get("criteria") or {})
-            total = 0.0
-            for key in CRITERIA:
-                q, p = threshold_map.get(key, DEFAULT_THRESHOLDS[key])
-                diff = _finite(values_a.get(key)) - _finite(values_b.get(key))
-                total += normalized_weights[key] * v_shape_preference(diff, float(q), float(p))
-            preference[i][j] = total
+    q_values = np.array([float(threshold_map.get(key, DEFAULT_THRESHOLDS[key])[0]) for key in CRITERIA], dtype=float)
+    p_values = np.array([float(threshold_map.get(key, DEFAULT_THRESHOLDS[key])[1]) for key in CRITERIA], dtype=float)
+    if np.any(p_values <= q_values):
+        raise ValueError("PROMETHEE tercih esigi p, kayitsizlik esigi q'dan buyuk olmalidir.")
+    matrix = np.array(
+        [[_finite(dict(alternative.get("criteria") or {}).get(key)) for key in CRITERIA] for alternative in alternatives],
+        dtype=float,
+    )
+    flows = compute_promethee_flows(
+        matrix,
+        np.array([normalized_weights[key] for key in CRITERIA], dtype=float),
+        preference="linear",
+        q=q_values,
+        p=p_values,
+    )
 
     ranked: list[dict[str, Any]] = []
-    denominator = float(n - 1)
     for i, alternative in enumerate(alternatives):
-        phi_plus = sum(preference[i][j] for j in range(n) if j != i) / denominator
-        phi_minus = sum(preference[j][i] for j in range(n) if j != i) / denominator
         row = dict(alternative)
         row.update(
             {
-                "phi_plus": phi_plus,
-                "phi_minus": phi_minus,
-                "net_flow": phi_plus - phi_minus,
+                "phi_plus": float(flows.leaving[i]),
+                "phi_minus": float(flows.entering[i]),
+                "net_flow": float(flows.net[i]),
                 "weights": normalized_weights,
             }
         )
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import re
 import sqlite3
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from functools import cached_property
 
 from app.services.course_type import build_elective_predicate
 
@@ -13,6 +16,15 @@ class CourseCandidate:
     ders_kodu: str
     ders_adi: str
     in_year_scope: bool
+    is_elective: bool = False
+
+
+@dataclass(frozen=True)
+class CourseSuggestion:
+    ders_id: int
+    ders_kodu: str
+    ders_adi: str
+    score: float
 
 
 @dataclass(frozen=True)
@@ -23,6 +35,7 @@ class CourseMatchResult:
     ders_adi: str | None = None
     match_method: str | None = None
     error: str | None = None
+    suggestions: tuple[CourseSuggestion, ...] = field(default_factory=tuple)
 
 
 def normalize_course_text(value: str | None) -> str:
@@ -46,6 +59,184 @@ def normalize_course_key(value: str | None) -> str:
     return re.sub(r"[^a-z0-9]+", "", text)
 
 
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def sqlite_casefold(value: str | None) -> str:
+    """SQLite ``lower(trim(x))`` esdegeri: yalnizca ASCII harfler kuculur, yalnizca bosluk kirpilir."""
+    return str(value or "").strip(" ").translate(_ASCII_LOWER)
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"^{key}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+FUZZY_MIN_SCORE = 0.75
+FUZZY_MAX_SUGGESTIONS = 3
+
+
+class CourseMatchIndex:
+    """Bir kapsamin ders adaylari icin bir kez kurulan esleme indeksi.
+
+    Aday basina normalize anahtarlar yalnizca kurulumda hesaplanir; satir
+    eslemesi uc hash aramasina (kod, tam ad, gevsek ad) iner. Hicbiri
+    tutmazsa trigram indeksi uzerinden benzer ders onerileri uretilir
+    (otomatik eslestirme yapilmaz, yalnizca oneridir).
+    """
+
+    def __init__(self, candidates: list[CourseCandidate]) -> None:
+        self.candidates = list(candidates)
+        self._by_code: dict[str, list[CourseCandidate]] = defaultdict(list)
+        self._by_name: dict[str, list[CourseCandidate]] = defaultdict(list)
+        self._by_loose_name: dict[str, list[CourseCandidate]] = defaultdict(list)
+        self._loose_names: list[str] = []
+        for item in self.candidates:
+            self._by_code[normalize_course_text(item.ders_kodu)].append(item)
+            self._by_name[normalize_course_text(item.ders_adi)].append(item)
+            loose = normalize_course_key(item.ders_adi)
+            self._by_loose_name[loose].append(item)
+            self._loose_names.append(loose)
+
+    @classmethod
+    def for_faculty(cls, cur: sqlite3.Cursor, faculty_id: int, year: int) -> "CourseMatchIndex":
+        return cls(load_faculty_course_candidates(cur=cur, faculty_id=faculty_id, year=year))
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def __bool__(self) -> bool:
+        return bool(self.candidates)
+
+    def match(self, ders_kodu: str | None, ders_adi: str | None, *, suggest: bool = True) -> CourseMatchResult:
+        tiers = (
+            (normalize_course_text(ders_kodu), self._by_code, "ders_kodu", "Ders kodu eslemesi belirsiz"),
+            (normalize_course_text(ders_adi), self._by_name, "ders_adi", "Ders adi eslemesi belirsiz"),
+            (normalize_course_key(ders_adi), self._by_loose_name, "ders_adi_normalized", "Normalize ders adi eslemesi belirsiz"),
+        )
+        for key, lookup, method, ambiguous in tiers:
+            if not key:
+                continue
+            selected, error = _select_candidate(lookup.get(key, []))
+            if selected:
+                return CourseMatchResult(
+                    matched=True,
+                    ders_id=selected.ders_id,
+                    ders_kodu=selected.ders_kodu,
+                    ders_adi=selected.ders_adi,
+                    match_method=method,
+                )
+            if error:
+                return CourseMatchResult(matched=False, error=f"{ambiguous}: {error}")
+
+        error = "Sistemde eslesen ders bulunamadi."
+        suggestions = tuple(self.suggest(ders_adi)) if suggest else ()
+        if suggestions:
+            hints = ", ".join(f"{item.ders_kodu.strip()} {item.ders_adi.strip()}".strip() for item in suggestions)
+            error = f"{error} Benzer ders(ler): {hints}"
+        return CourseMatchResult(matched=False, error=error, suggestions=suggestions)
+
+    @cached_property
+    def _trigram_postings(self) -> dict[str, list[int]]:
+        postings: dict[str, list[int]] = defaultdict(list)
+        for position, loose in enumerate(self._loose_names):
+            if loose:
+                for gram in _trigrams(loose):
+                    postings[gram].append(position)
+        return postings
+
+    def suggest(
+        self,
+        ders_adi: str | None,
+        *,
+        limit: int = FUZZY_MAX_SUGGESTIONS,
+        min_score: float = FUZZY_MIN_SCORE,
+    ) -> list[CourseSuggestion]:
+        """Trigram on-filtresi + SequenceMatcher orani ile en benzer adaylar."""
+        key = normalize_course_key(ders_adi)
+        if not key or limit <= 0:
+            return []
+        grams = _trigrams(key)
+        shared: dict[int, int] = defaultdict(int)
+        postings = self._trigram_postings
+        for gram in grams:
+            for position in postings.get(gram, ()):
+                shared[position] += 1
+
+        scored: list[tuple[float, int]] = []
+        seen_ids: set[int] = set()
+        for position, overlap in shared.items():
+            loose = self._loose_names[position]
+            # Dice katsayisi ust siniri dusukse pahali edit-distance hesabina girme.
+            if 2.0 * overlap / (len(grams) + len(loose)) < min_score * 0.6:
+                continue
+            ratio = SequenceMatcher(None, key, loose, autojunk=False).ratio()
+            if ratio >= min_score:
+                scored.append((ratio, position))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        suggestions: list[CourseSuggestion] = []
+        for ratio, position in scored:
+            item = self.candidates[position]
+            if item.ders_id in seen_ids:
+                continue
+            seen_ids.add(item.ders_id)
+            suggestions.append(CourseSuggestion(item.ders_id, item.ders_kodu, item.ders_adi, round(float(ratio), 4)))
+            if len(suggestions) >= limit:
+                break
+        return suggestions
+
+    # SQLite ``lower(trim(...))`` / ``LIKE`` semantigiyle aramalar (mufredat importu icin).
+    @cached_property
+    def _by_code_casefold(self) -> dict[str, list[CourseCandidate]]:
+        lookup: dict[str, list[CourseCandidate]] = defaultdict(list)
+        for item in self.candidates:
+            lookup[sqlite_casefold(item.ders_kodu)].append(item)
+        return lookup
+
+    @cached_property
+    def _names_casefold(self) -> list[str]:
+        return [str(item.ders_adi or "").translate(_ASCII_LOWER) for item in self.candidates]
+
+    @cached_property
+    def _by_name_casefold(self) -> dict[str, list[CourseCandidate]]:
+        lookup: dict[str, list[CourseCandidate]] = defaultdict(list)
+        for item in self.candidates:
+            lookup[sqlite_casefold(item.ders_adi)].append(item)
+        return lookup
+
+    @cached_property
+    def _name_trigram_postings(self) -> dict[str, set[int]]:
+        postings: dict[str, set[int]] = defaultdict(set)
+        for position, name in enumerate(self._names_casefold):
+            for i in range(len(name) - 2):
+                postings[name[i : i + 3]].add(position)
+        return postings
+
+    def by_code_casefold(self, ders_kodu: str | None) -> list[CourseCandidate]:
+        return list(self._by_code_casefold.get(sqlite_casefold(ders_kodu), []))
+
+    def by_name_casefold(self, ders_adi: str | None) -> list[CourseCandidate]:
+        return list(self._by_name_casefold.get(sqlite_casefold(ders_adi), []))
+
+    def name_contains(self, fragment: str | None) -> list[CourseCandidate]:
+        """``lower(ad) LIKE lower('%fragment%')`` esdegeri; aday sirasi korunur."""
+        needle = str(fragment or "").translate(_ASCII_LOWER)
+        names = self._names_casefold
+        if len(needle) < 3:
+            positions: range | list[int] = range(len(names))
+        else:
+            postings = self._name_trigram_postings
+            grams = sorted({needle[i : i + 3] for i in range(len(needle) - 2)}, key=lambda g: len(postings.get(g, ())))
+            narrowed = set(postings.get(grams[0], ()))
+            for gram in grams[1:]:
+                narrowed &= postings.get(gram, set())
+                if not narrowed:
+                    break
+            positions = sorted(narrowed)
+        return [self.candidates[position] for position in positions if needle in names[position]]
+
+
 def _load_candidates(
     cur: sqlite3.Cursor,
     faculty_id: int,
@@ -149,54 +340,10 @@ def _select_candidate(matches: list[CourseCandidate]) -> tuple[CourseCandidate |
 
 
 def match_course_row(
-    candidates: list[CourseCandidate],
+    candidates: list[CourseCandidate] | CourseMatchIndex,
     ders_kodu: str | None,
     ders_adi: str | None,
 ) -> CourseMatchResult:
-    code_key = normalize_course_text(ders_kodu)
-    name_key = normalize_course_text(ders_adi)
-    loose_name_key = normalize_course_key(ders_adi)
-
-    if code_key:
-        code_matches = [item for item in candidates if normalize_course_text(item.ders_kodu) == code_key]
-        selected, error = _select_candidate(code_matches)
-        if selected:
-            return CourseMatchResult(
-                matched=True,
-                ders_id=selected.ders_id,
-                ders_kodu=selected.ders_kodu,
-                ders_adi=selected.ders_adi,
-                match_method="ders_kodu",
-            )
-        if error:
-            return CourseMatchResult(matched=False, error=f"Ders kodu eslemesi belirsiz: {error}")
-
-    if name_key:
-        exact_matches = [item for item in candidates if normalize_course_text(item.ders_adi) == name_key]
-        selected, error = _select_candidate(exact_matches)
-        if selected:
-            return CourseMatchResult(
-                matched=True,
-                ders_id=selected.ders_id,
-                ders_kodu=selected.ders_kodu,
-                ders_adi=selected.ders_adi,
-                match_method="ders_adi",
-            )
-        if error:
-            return CourseMatchResult(matched=False, error=f"Ders adi eslemesi belirsiz: {error}")
-
-    if loose_name_key:
-        normalized_matches = [item for item in candidates if normalize_course_key(item.ders_adi) == loose_name_key]
-        selected, error = _select_candidate(normalized_matches)
-        if selected:
-            return CourseMatchResult(
-                matched=True,
-                ders_id=selected.ders_id,
-                ders_kodu=selected.ders_kodu,
-                ders_adi=selected.ders_adi,
-                match_method="ders_adi_normalized",
-            )
-        if error:
-            return CourseMatchResult(matched=False, error=f"Normalize ders adi eslemesi belirsiz: {error}")
-
-    return CourseMatchResult(matched=False, error="Sistemde eslesen ders bulunamadi.")
+    """Tek satir esleme. Cok satirli importlar indeksi bir kez kurup gecirmelidir."""
+    index = candidates if isinstance(candidates, CourseMatchIndex) else CourseMatchIndex(candidates)
+    return index.match(ders_kodu, ders_adi)
@@ -5,6 +5,11 @@ Course-type compatibility helpers.
 Different databases may keep the course type in different columns
 (`DersTipi`, `ders_tipi`, `tip`, `tur`). This module provides a single
 rule for elective/required detection and SQL predicate generation.
+
+On SQLite the rule is materialized into `ders.is_elective` / `ders.is_required`
+(kept current by triggers, see `ensure_course_type_flag_schema`); when those
+are present the predicate builders emit an indexable flag comparison instead
+of the per-row REPLACE/LIKE chain.
 """
 
 from __future__ import annotations
@@ -13,6 +18,9 @@ import sqlite3
 from typing import Iterable
 
 COURSE_TYPE_COLUMNS: tuple[str, ...] = ("DersTipi", "ders_tipi", "tip", "tur")
+ELECTIVE_FLAG_COLUMN = "is_elective"
+REQUIRED_FLAG_COLUMN = "is_required"
+COURSE_TYPE_FLAG_TRIGGER_PREFIX = "trg_ders_course_type_flags_"
 ELECTIVE_KEYWORDS: tuple[str, ...] = ("secmeli", "elective")
 REQUIRED_KEYWORDS: tuple[str, ...] = ("zorunlu", "mandatory", "required", "core", "mecburi")
 
@@ -50,8 +58,52 @@ def is_required_value(value: str | None) -> bool:
     return any(keyword in normalized for keyword in REQUIRED_KEYWORDS)
 
 
+# ders tablosunun sqlite_master imzasi -> (tip kolonlari, bayraklar bakimli mi).
+_SQLITE_LAYOUT_CACHE: dict[str, tuple[list[str], bool]] = {}
+
+
+def _is_sqlite_cursor(cur) -> bool:
+    return isinstance(getattr(cur, "connection", None), sqlite3.Connection)
+
+
+def _sqlite_course_type_layout(cur: sqlite3.Cursor) -> tuple[list[str], bool]:
+    """
+    SQLite `ders` tablosu icin tip kolonlari ve bayrak kullanilabilirligi.
+
+    Her cagrida PRAGMA table_info yerine tablo+tetik DDL imzasi okunur
+    (sqlite_master, bellekteki sema); imza degismedikce sonuc onbellekten gelir.
+    """
+    cur.execute(
+        "SELECT group_concat(type || ':' || name || ':' || COALESCE(sql, ''), ';') "
+        "FROM sqlite_master WHERE tbl_name = 'ders' AND type IN ('table', 'trigger')"
+    )
+    row = cur.fetchone()
+    signature = str(row[0] or "") if row else ""
+    cached = _SQLITE_LAYOUT_CACHE.get(signature)
+    if cached is not None:
+        return cached
+    cur.execute("PRAGMA table_info(ders)")
+    cols = {str(r[1]) for r in cur.fetchall()}
+    cur.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'ders' AND name LIKE ?",
+        (COURSE_TYPE_FLAG_TRIGGER_PREFIX + "%",),
+    )
+    triggers = {str(r[0]): str(r[1] or "") for r in cur.fetchall()}
+    type_columns = [col for col in COURSE_TYPE_COLUMNS if col in cols]
+    # Tetikler mevcut tip kolonu kumesiyle kurulmus olmali; aksi halde bayrak eskimis olabilir.
+    has_flags = {ELECTIVE_FLAG_COLUMN, REQUIRED_FLAG_COLUMN} <= cols and triggers == dict(
+        build_course_type_flag_triggers(type_columns)
+    )
+    if len(_SQLITE_LAYOUT_CACHE) > 64:
+        _SQLITE_LAYOUT_CACHE.clear()
+    _SQLITE_LAYOUT_CACHE[signature] = (type_columns, has_flags)
+    return type_columns, has_flags
+
+
 def get_existing_type_columns(cur, table_name: str = "ders") -> list[str]:
     """Tablodaki kolon isimlerini alır (PostgreSQL ve SQLite uyumlu)."""
+    if table_name == "ders" and _is_sqlite_cursor(cur):
+        return list(_sqlite_course_type_layout(cur)[0])
     try:
         # PostgreSQL information_schema sorgusu
         cur.execute(
@@ -99,7 +151,18 @@ def _build_normalized_sql_text_expr(expr: str) -> str:
     return normalized
 
 
+def _flag_predicate(alias: str, column: str) -> str:
+    # IS 1: indeksi "= 1" gibi kullanir; LEFT JOIN'de eslesmeyen satirda NULL yerine
+    # false verir, boylece NOT (...) eski LIKE zinciriyle ayni anlamda kalir.
+    return f"{alias}.{column} IS 1"
+
+
 def build_elective_predicate(cur: sqlite3.Cursor, alias: str = "d") -> str:
+    if _is_sqlite_cursor(cur):
+        type_columns, has_flags = _sqlite_course_type_layout(cur)
+        if has_flags and type_columns:
+            return _flag_predicate(alias, ELECTIVE_FLAG_COLUMN)
+        return build_elective_predicate_from_columns(type_columns, alias=alias)
     return build_elective_predicate_from_columns(get_existing_type_columns(cur), alias=alias)
 
 
@@ -118,6 +181,11 @@ def build_elective_predicate_from_columns(column_names: Iterable[str], alias: st
 
 
 def build_required_predicate(cur: sqlite3.Cursor, alias: str = "d") -> str:
+    if _is_sqlite_cursor(cur):
+        type_columns, has_flags = _sqlite_course_type_layout(cur)
+        if has_flags and type_columns:
+            return _flag_predicate(alias, REQUIRED_FLAG_COLUMN)
+        return build_required_predicate_from_columns(type_columns, alias=alias)
     return build_required_predicate_from_columns(get_existing_type_columns(cur), alias=alias)
 
 
@@ -137,6 +205,44 @@ def build_required_predicate_from_columns(column_names: Iterable[str], alias: st
     )
 
 
+def build_course_type_flag_triggers(type_columns: Iterable[str], table: str = "ders") -> list[tuple[str, str]]:
+    """
+    `is_elective` / `is_required` bayraklarini guncel tutan SQLite tetikleri.
+
+    Bayrak ifadesi predicate builder'larin eski yoluyla birebir aynidir; tip
+    kolonu kumesi degisirse tetik SQL'i de degisir ve yeniden kurulur.
+    """
+    cols = get_existing_type_columns_from_names(type_columns)
+    assignment = build_course_type_flag_assignment(cols, alias=table)
+    body = f"UPDATE {table} SET {assignment} WHERE rowid = NEW.rowid;"
+    triggers = [
+        (
+            f"{COURSE_TYPE_FLAG_TRIGGER_PREFIX}insert",
+            f"CREATE TRIGGER {COURSE_TYPE_FLAG_TRIGGER_PREFIX}insert AFTER INSERT ON {table} "
+            f"BEGIN {body} END",
+        )
+    ]
+    if cols:
+        watched = ", ".join(f'"{col}"' for col in cols)
+        triggers.append(
+            (
+                f"{COURSE_TYPE_FLAG_TRIGGER_PREFIX}update",
+                f"CREATE TRIGGER {COURSE_TYPE_FLAG_TRIGGER_PREFIX}update AFTER UPDATE OF {watched} ON {table} "
+                f"BEGIN {body} END",
+            )
+        )
+    return triggers
+
+
+def build_course_type_flag_assignment(type_columns: Iterable[str], alias: str = "ders") -> str:
+    elective = build_elective_predicate_from_columns(type_columns, alias=alias)
+    required = build_required_predicate_from_columns(type_columns, alias=alias)
+    return (
+        f"{ELECTIVE_FLAG_COLUMN} = CASE WHEN {elective} THEN 1 ELSE 0 END, "
+        f"{REQUIRED_FLAG_COLUMN} = CASE WHEN {required} THEN 1 ELSE 0 END"
+    )
+
+
 def filter_elective_course_ids(cur, course_ids: Iterable[int]) -> set[int]:
     normalized_ids = sorted({int(course_id) for course_id in course_ids if course_id is not None})
     if not normalized_ids:
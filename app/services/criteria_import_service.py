@@ -6,7 +6,7 @@ import tempfile
 import sqlite3
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import pandas as pd
 from openpyxl.styles import Font
@@ -16,12 +16,15 @@ from app.db.schema_compat import ensure_criteria_import_schema, ensure_reporting
 from app.db.sqlite_connection import connect_sqlite, is_database_locked_error
 from app.services.course_matcher import (
     CourseCandidate,
+    CourseMatchIndex,
     load_faculty_course_candidates,
-    match_course_row,
     normalize_course_key,
     normalize_course_text,
 )
 from app.services.course_type import build_elective_predicate
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
+from app.services.excel_stream_reader import ExcelRowSource, ExcelStreamReader, SheetStream, open_excel_stream
+from app.services.excel_stream_reader import excel_column_letter as _excel_column_letter
 from app.services.import_audit_service import (
     calculate_row_hash,
     create_import_batch,
@@ -168,17 +171,6 @@ def _clean_text(value: Any) -> str | None:
     return text or None
 
 
-def _excel_column_letter(index_1_based: int) -> str:
-    if index_1_based < 1:
-        raise ValueError("Excel kolon indeksi 1 veya daha buyuk olmali.")
-    out = ""
-    current = int(index_1_based)
-    while current > 0:
-        current, remainder = divmod(current - 1, 26)
-        out = chr(65 + remainder) + out
-    return out
-
-
 def _is_summary_row(ders_kodu: str | None, ders_adi: str | None) -> bool:
     if _clean_text(ders_kodu):
         return False
@@ -186,21 +178,21 @@ def _is_summary_row(ders_kodu: str | None, ders_adi: str | None) -> bool:
     return normalized_name in {"toplam", "geneltoplam"}
 
 
-def _read_meta_sheet(xls: pd.ExcelFile) -> dict[str, Any]:
-    meta_sheet = next((name for name in xls.sheet_names if normalize_course_text(str(name)) == "meta"), None)
+def _read_meta_sheet(reader: ExcelStreamReader) -> dict[str, Any]:
+    meta_sheet = next((name for name in reader.sheet_names if normalize_course_text(str(name)) == "meta"), None)
     if not meta_sheet:
         return {}
-    df = pd.read_excel(xls, sheet_name=meta_sheet)
-    if df.empty:
+    stream = reader.sheet(meta_sheet)
+    row = next(stream.rows(skip_blank=False), None)
+    if row is None:
         return {}
-    df.columns = [str(col).strip() for col in df.columns]
-    row = df.iloc[0].to_dict()
+    columns = stream.columns
     return {
-        "fakulte_adi": _clean_text(row.get(_find_col(list(df.columns), "fakulte_adi", "fakulte", "faculty"))),
-        "bolum_adi": _clean_text(row.get(_find_col(list(df.columns), "bolum_adi", "bolum", "department"))),
-        "yil": _parse_year(row.get(_find_col(list(df.columns), "yil", "akademik_yil", "year"))),
-        "donem": normalize_term_label(row.get(_find_col(list(df.columns), "donem", "term", "semester"))),
-        "aciklama": _clean_text(row.get(_find_col(list(df.columns), "aciklama", "not", "notes"))),
+        "fakulte_adi": _clean_text(row.get(_find_col(columns, "fakulte_adi", "fakulte", "faculty"))),
+        "bolum_adi": _clean_text(row.get(_find_col(columns, "bolum_adi", "bolum", "department"))),
+        "yil": _parse_year(row.get(_find_col(columns, "yil", "akademik_yil", "year"))),
+        "donem": normalize_term_label(row.get(_find_col(columns, "donem", "term", "semester"))),
+        "aciklama": _clean_text(row.get(_find_col(columns, "aciklama", "not", "notes"))),
     }
 
 
@@ -208,26 +200,36 @@ def parse_criteria_excel(excel_path: str) -> dict[str, Any]:
     if not os.path.exists(excel_path):
         raise FileNotFoundError(f"Kriter dosyasi bulunamadi: {excel_path}")
 
-    with pd.ExcelFile(excel_path) as xls:
-        meta = _read_meta_sheet(xls)
+    with open_excel_stream(excel_path) as reader:
+        meta = _read_meta_sheet(reader)
         data_sheet = next(
             (
                 name
-                for name in xls.sheet_names
+                for name in reader.sheet_names
                 if normalize_course_text(str(name)) in {"kriter", "kriterler", "criteria", "criterion"}
             ),
             None,
         )
         if data_sheet is None:
-            non_meta = [name for name in xls.sheet_names if normalize_course_text(str(name)) != "meta"]
+            non_meta = [name for name in reader.sheet_names if normalize_course_text(str(name)) != "meta"]
             if not non_meta:
                 raise ValueError("Kriter veri sayfasi bulunamadi.")
             data_sheet = non_meta[0]
 
-        df = pd.read_excel(xls, sheet_name=data_sheet)
-    df.columns = [str(col).strip() for col in df.columns]
-    columns = list(df.columns)
 
+    # Satirlar bellekte tutulmaz; scan() kolonlari dogrular, sayar ve uyarilari toplar.
+    rows = ExcelRowSource(excel_path, [data_sheet], _parse_criteria_stream).scan()
+    return {
+        "meta": meta,
+        "rows": rows,
+        "warnings": rows.warnings,
+        "sheet_name": data_sheet,
+        "template_version": CRITERIA_TEMPLATE_VERSION,
+    }
+
+
+def _parse_criteria_stream(stream: SheetStream, warnings: list[str]) -> Iterator[CriteriaRow]:
+    columns = stream.columns
     col_code = _find_col(columns, "ders_kodu", "ders kodu", "kod", "course_code")
     col_name = _find_col(columns, "ders_adi", "ders adi", "course_name")
     col_total = _find_col(columns, "toplam_ogrenci", "toplam ogrenci", "dersi_alan_toplam_ogrenci")
@@ -263,80 +265,78 @@ def parse_criteria_excel(excel_path: str) -> dict[str, Any]:
     if not (col_code or col_name):
         raise ValueError("Ders tanimlayici gerekli: ders_kodu veya ders_adi")
 
-    rows: list[CriteriaRow] = []
-    warnings: list[str] = []
-    for idx, row in df.iterrows():
-        ders_kodu = _clean_text(row.get(col_code)) if col_code else None
-        ders_adi = _clean_text(row.get(col_name)) if col_name else None
-        if not ders_kodu and not ders_adi:
-            continue
-        if _is_summary_row(ders_kodu=ders_kodu, ders_adi=ders_adi):
-            continue
+    for chunk in stream.iter_chunks():
+        for row in chunk:
+            ders_kodu = _clean_text(row.get(col_code)) if col_code else None
+            ders_adi = _clean_text(row.get(col_name)) if col_name else None
+            if not ders_kodu and not ders_adi:
+                continue
+            if _is_summary_row(ders_kodu=ders_kodu, ders_adi=ders_adi):
+                continue
 
-        toplam = _safe_int(row.get(col_total))
-        gecen = _safe_int(row.get(col_pass))
-        ortalama = _safe_float(row.get(col_avg))
-        kontenjan = _safe_int(row.get(col_quota))
-        kayitli = _safe_int(row.get(col_enrolled)) if col_enrolled else None
-        if kayitli is None:
-            kayitli = toplam
-
-        devamsiz_count = _safe_int(row.get(col_absent_count)) if col_absent_count else None
-        if devamsiz_count is None and col_absent_count:
-            absent_text = normalize_course_text(_clean_text(row.get(col_absent_count)))
-            if absent_text in {"evet", "yes", "true"}:
-                devamsiz_count = 1
-            elif absent_text in {"hayir", "no", "false"}:
-                devamsiz_count = 0
-
-        criteria_row = CriteriaRow(
-            row_no=int(str(idx)) + 2,
-            ders_kodu=ders_kodu,
-            ders_adi=ders_adi,
-            toplam_ogrenci=toplam,
-            gecen_ogrenci=gecen,
-            basari_ortalamasi=ortalama,
-            kontenjan=kontenjan,
-            kayitli_ogrenci=kayitli,
-            katilim_sayisi=(
-                _safe_float(row.get(col_attendance_count)) if col_attendance_count else None
-            ),
-            toplam_hafta=_safe_int(row.get(col_total_weeks)) if col_total_weeks else None,
-            katilim_yuzdesi=(
-                _safe_float(row.get(col_attendance_percentage))
-                if col_attendance_percentage
-                else None
-            ),
-            devamsiz_ogrenci_sayisi=devamsiz_count,
-            aciklama=_clean_text(row.get(col_note)) if col_note else None,
-            fakulte_adi=_clean_text(row.get(col_faculty)) if col_faculty else None,
-            bolum_adi=_clean_text(row.get(col_department)) if col_department else None,
-            yil=_parse_year(row.get(col_year)) if col_year else None,
-            donem=normalize_term_label(row.get(col_term)) if col_term else None,
-        )
-        if any(
-            value is None
-            for value in (
-                criteria_row.toplam_ogrenci,
-                criteria_row.gecen_ogrenci,
-                criteria_row.basari_ortalamasi,
-                criteria_row.kontenjan,
+            toplam = _safe_int(row.get(col_total))
+            gecen = _safe_int(row.get(col_pass))
+            ortalama = _safe_float(row.get(col_avg))
+            kontenjan = _safe_int(row.get(col_quota))
+            kayitli = _safe_int(row.get(col_enrolled)) if col_enrolled else None
+            if kayitli is None:
+                kayitli = toplam
+
+            devamsiz_count = _safe_int(row.get(col_absent_count)) if col_absent_count else None
+            if devamsiz_count is None and col_absent_count:
+                absent_text = normalize_course_text(_clean_text(row.get(col_absent_count)))
+                if absent_text in {"evet", "yes", "true"}:
+                    devamsiz_count = 1
+                elif absent_text in {"hayir", "no", "false"}:
+                    devamsiz_count = 0
+
+            criteria_row = CriteriaRow(
+                row_no=row.row_no,
+                ders_kodu=ders_kodu,
+                ders_adi=ders_adi,
+                toplam_ogrenci=toplam,
+                gecen_ogrenci=gecen,
+                basari_ortalamasi=ortalama,
+                kontenjan=kontenjan,
+                kayitli_ogrenci=kayitli,
+                katilim_sayisi=(
+                    _safe_float(row.get(col_attendance_count)) if col_attendance_count else None
+                ),
+                toplam_hafta=_safe_int(row.get(col_total_weeks)) if col_total_weeks else None,
+                katilim_yuzdesi=(
+                    _safe_float(row.get(col_attendance_percentage))
+                    if col_attendance_percentage
+                    else None
+                ),
+                devamsiz_ogrenci_sayisi=devamsiz_count,
+                aciklama=_clean_text(row.get(col_note)) if col_note else None,
+                fakulte_adi=_clean_text(row.get(col_faculty)) if col_faculty else None,
+                bolum_adi=_clean_text(row.get(col_department)) if col_department else None,
+                yil=_parse_year(row.get(col_year)) if col_year else None,
+                donem=normalize_term_label(row.get(col_term)) if col_term else None,
             )
-        ):
-            warnings.append(f"Satir {criteria_row.row_no}: zorunlu sayisal alanlardan biri bos veya gecersiz.")
-        rows.append(criteria_row)
-
-    return {
-        "meta": meta,
-        "rows": rows,
-        "warnings": warnings,
-        "sheet_name": data_sheet,
-        "template_version": CRITERIA_TEMPLATE_VERSION,
-    }
+            if any(
+                value is None
+                for value in (
+                    criteria_row.toplam_ogrenci,
+                    criteria_row.gecen_ogrenci,
+                    criteria_row.basari_ortalamasi,
+                    criteria_row.kontenjan,
+                )
+            ):
+                invalid_cells = ", ".join(
+                    stream.cell_ref(col, row.row_no)
+                    for col, value in zip(required_numeric_cols, (toplam, gecen, ortalama, kontenjan))
+                    if value is None
+                )
+                warnings.append(
+                    f"Satir {criteria_row.row_no}: zorunlu sayisal alanlardan biri bos veya gecersiz ({invalid_cells})."
+                )
+            yield criteria_row
 
 
 def validate_criteria_rows(
-    rows: list[CriteriaRow],
+    rows: Iterable[CriteriaRow],
     faculty_name: str | None = None,
     department_name: str | None = None,
     year: int | None = None,
@@ -743,7 +743,7 @@ def _load_scope_candidates(
 
 def match_criteria_rows(
     conn: sqlite3.Connection,
-    rows: list[CriteriaRow],
+    rows: Iterable[CriteriaRow],
     faculty_id: int,
     year: int,
     term: str,
@@ -768,13 +768,14 @@ def match_criteria_rows(
             "scope_courses": scope_courses,
         }
 
+    index = CourseMatchIndex(candidates)
     matched_rows: list[CriteriaImportRowResult] = []
     unmatched_rows: list[CriteriaImportRowResult] = []
     seen_course_ids: dict[int, int] = {}
     errors: list[str] = []
 
     for row in rows:
-        result = match_course_row(candidates=candidates, ders_kodu=row.ders_kodu, ders_adi=row.ders_adi)
+        result = index.match(row.ders_kodu, row.ders_adi)
         row_result = CriteriaImportRowResult(
             row_no=row.row_no,
             ders_kodu=row.ders_kodu,
@@ -1007,6 +1008,7 @@ def replace_existing_criteria_scope(
             """,
             tuple(int(import_id) for import_id in import_ids),
         )
+    bump_decision_matrix_version(conn, "criteria_scope_replaced")
 
     return {
         "previous_imports_superseded": len(import_ids),
@@ -1471,6 +1473,7 @@ def apply_criteria_import(
                 )
 
     if apply_to_live:
+        bump_decision_matrix_version(conn, "criteria_import_applied")
         status_result = mark_criteria_status(
             conn=conn,
             yil=int(year),
@@ -1740,7 +1743,7 @@ def import_criteria_excel(
             metadata = {
                 "sheet_names": [str(parsed.get("sheet_name") or "Kriter")],
                 "columns": [],
-                "row_count": len(parsed.get("rows") or []),
+                "row_count": len(parsed.get("rows") or ()),
                 "column_count": 0,
             }
         batch = create_import_batch(
@@ -1750,7 +1753,7 @@ def import_criteria_excel(
             file_path=excel_path,
             sheet_names=list(metadata.get("sheet_names") or []),
             columns=list(metadata.get("columns") or []),
-            row_count=int(metadata.get("row_count") or len(parsed.get("rows") or [])),
+            row_count=int(metadata.get("row_count") or len(parsed.get("rows") or ())),
             column_count=int(metadata.get("column_count") or 0),
             faculty_id=int(faculty_id),
             department_id=int(department_id) if department_id is not None else None,
@@ -1778,7 +1781,7 @@ def import_criteria_excel(
         department_name = _resolve_department_name(cur, int(department_id)) if department_id is not None else None
 
         validation = validate_criteria_rows(
-            rows=list(parsed.get("rows") or []),
+            rows=parsed.get("rows") or [],
             faculty_name=faculty_name,
             department_name=department_name,
             year=int(year),
@@ -1816,7 +1819,7 @@ def import_criteria_excel(
 
         matched = match_criteria_rows(
             conn=conn,
-            rows=list(parsed.get("rows") or []),
+            rows=parsed.get("rows") or [],
             faculty_id=int(faculty_id),
             year=int(year),
             term=normalize_term_label(term),
@@ -2069,6 +2072,15 @@ def apply_pending_criteria_import(
         recalculate_import_impact(conn, int(import_batch_id))
     except Exception:
         pass
+    from app.services.calculation import refresh_topsis_scores_after_change
+
+    refresh_topsis_scores_after_change(
+        conn,
+        faculty_id,
+        year,
+        [row.matched_ders_id for row in rows if row.matched_ders_id is not None],
+        donem=term,
+    )
     return {
         "ok": True,
         "message": f"Kriterler uygulandi ve aktive edildi. Uygulanan ders: {int(applied.get('applied_course_count') or 0)}.",
@@ -31,6 +31,7 @@ from typing import Any
 
 from app.db.schema_compat import ensure_criteria_completion_governance_schema
 from app.services.criteria_completion_policy_service import resolve_policy
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
 
 logger = logging.getLogger(__name__)
 
@@ -391,10 +392,20 @@ def approve_override(
             raise ValueError(
                 f"Override durumu eş zamanlı olarak değişti (id={override_id}); onay uygulanamadı."
             )
+        bump_decision_matrix_version(conn, "criteria_override_approved")
     except Exception:
         if commit:
             conn.rollback()
         raise
+    # Onaylanan kapsamin skorlari artimli TOPSIS durumundan yenilenip havuza yazilir.
+    from app.services.calculation import refresh_topsis_scores_after_change
+
+    refresh_topsis_scores_after_change(
+        conn,
+        override.get("faculty_id"),
+        override.get("year"),
+        donem=override.get("semester"),
+    )
     if commit:
         conn.commit()
     return get_override(conn, int(override_id)) or {}
@@ -446,6 +457,7 @@ def reject_override(
             raise ValueError(
                 f"Override durumu eş zamanlı olarak değişti (id={override_id}); red uygulanamadı."
             )
+        bump_decision_matrix_version(conn, "criteria_override_rejected")
     except Exception:
         if commit:
             conn.rollback()
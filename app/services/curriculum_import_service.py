@@ -1,12 +1,11 @@
 from __future__ import annotations
 
+import math
 import os
 import re
 import sqlite3
 from dataclasses import asdict, dataclass
-from typing import Any
-
-import pandas as pd
+from typing import Any, Iterator
 
 from app.core.config import resolve_sqlite_db_path
 from app.db.schema_compat import (
@@ -14,7 +13,10 @@ from app.db.schema_compat import (
     ensure_reporting_schema,
 )
 from app.db.sqlite_connection import connect_sqlite
+from app.services.course_matcher import CourseCandidate, CourseMatchIndex
 from app.services.course_type import build_elective_predicate
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
+from app.services.excel_stream_reader import ExcelRowSource, SheetStream, open_excel_stream
 from app.services.import_audit_service import (
     create_import_batch,
     extract_excel_metadata,
@@ -67,80 +69,70 @@ def _find_col(columns: list[str], *candidates: str) -> str | None:
     return None
 
 
-def _extract_rows_from_df(df: pd.DataFrame, sheet_name: str) -> tuple[list[dict[str, Any]], list[str]]:
-    warnings: list[str] = []
-    rows: list[dict[str, Any]] = []
+def _extract_rows_from_sheet(stream: SheetStream, warnings: list[str]) -> Iterator[dict[str, Any]]:
+    sheet_name = stream.name
+    columns = stream.columns
 
-    col_fak = _find_col(list(df.columns), "Fakulte", "Fakülte", "Faculty")
-    col_bol = _find_col(list(df.columns), "Bolum", "Bölüm", "Department")
-    col_yil = _find_col(list(df.columns), "Yil", "Yıl", "Akademik Yil", "Akademik Yıl", "Year")
-    col_don = _find_col(list(df.columns), "Donem", "Dönem", "Term", "Semester")
-    col_ders_adi = _find_col(list(df.columns), "Ders Adi", "Ders Adı", "Course Name")
-    col_ders_kod = _find_col(list(df.columns), "Ders Kodu", "Kod", "Course Code")
+    col_fak = _find_col(columns, "Fakulte", "Fakülte", "Faculty")
+    col_bol = _find_col(columns, "Bolum", "Bölüm", "Department")
+    col_yil = _find_col(columns, "Yil", "Yıl", "Akademik Yil", "Akademik Yıl", "Year")
+    col_don = _find_col(columns, "Donem", "Dönem", "Term", "Semester")
+    col_ders_adi = _find_col(columns, "Ders Adi", "Ders Adı", "Course Name")
+    col_ders_kod = _find_col(columns, "Ders Kodu", "Kod", "Course Code")
 
     if not (col_fak and col_bol and col_yil):
         warnings.append(f"{sheet_name}: gerekli kolonlar yok (fakulte/bolum/yil)")
-        return rows, warnings
+        return
+
+    default_term = DONEM_BAHAR if "bahar" in _normalize_text(sheet_name) else DONEM_GUZ
+    # wide format fallback: secmeli ders 1..12
+    ders_cols = [] if (col_ders_adi or col_ders_kod) else [col for col in columns if "ders" in _normalize_text(col)]
 
-    # row-based format
-    if col_ders_adi or col_ders_kod:
-        for idx, row in df.iterrows():
+    for chunk in stream.iter_chunks():
+        for row in chunk:
+            # Uyari konumu eski DataFrame indeksiyle ayni kalir (Excel satiri - 2).
+            idx = row.row_no - 2
             fakulte = row.get(col_fak)
             bolum = row.get(col_bol)
             yil = row.get(col_yil)
             term = row.get(col_don) if col_don else None
-            ders_adi = row.get(col_ders_adi) if col_ders_adi else None
-            ders_kodu = row.get(col_ders_kod) if col_ders_kod else None
-
-            if pd.isna(fakulte) or pd.isna(bolum) or pd.isna(yil):
-                continue
-            if pd.isna(ders_adi) and pd.isna(ders_kodu):
+            if fakulte is None or bolum is None or yil is None:
                 continue
 
+            if not ders_cols:
+                # row-based format
+                ders_adi = row.get(col_ders_adi) if col_ders_adi else None
+                ders_kodu = row.get(col_ders_kod) if col_ders_kod else None
+                if ders_adi is None and ders_kodu is None:
+                    continue
+
             yil_num = _parse_year(yil)
             if yil_num is None:
-                warnings.append(f"{sheet_name}[{idx}]: yil parse edilemedi -> {yil}")
+                warnings.append(
+                    f"{sheet_name}[{idx}]: yil parse edilemedi -> {yil} ({stream.cell_ref(col_yil, row.row_no)})"
+                )
                 continue
-
-            if pd.isna(term):
+            if term is None:
                 # Sheet adindan term cikar.
-                term = DONEM_BAHAR if "bahar" in _normalize_text(sheet_name) else DONEM_GUZ
+                term = default_term
 
-            rows.append(
-                {
+            if not ders_cols:
+                yield {
                     "fakulte": str(fakulte).strip(),
                     "bolum": str(bolum).strip(),
                     "yil": yil_num,
                     "donem": normalize_term(str(term)),
-                    "ders_adi": None if pd.isna(ders_adi) else str(ders_adi).strip(),
-                    "ders_kodu": None if pd.isna(ders_kodu) else str(ders_kodu).strip(),
+                    "ders_adi": None if ders_adi is None else str(ders_adi).strip(),
+                    "ders_kodu": None if ders_kodu is None else str(ders_kodu).strip(),
                     "sheet": sheet_name,
                 }
-            )
-        return rows, warnings
-
-    # wide format fallback: secmeli ders 1..12
-    ders_cols = [col for col in df.columns if "ders" in _normalize_text(col)]
-    for idx, row in df.iterrows():
-        fakulte = row.get(col_fak)
-        bolum = row.get(col_bol)
-        yil = row.get(col_yil)
-        term = row.get(col_don) if col_don else None
-        if pd.isna(fakulte) or pd.isna(bolum) or pd.isna(yil):
-            continue
-        yil_num = _parse_year(yil)
-        if yil_num is None:
-            warnings.append(f"{sheet_name}[{idx}]: yil parse edilemedi -> {yil}")
-            continue
-        if pd.isna(term):
-            term = DONEM_BAHAR if "bahar" in _normalize_text(sheet_name) else DONEM_GUZ
-
-        for dc in ders_cols:
-            ders_adi = row.get(dc)
-            if pd.isna(ders_adi) or str(ders_adi).strip() == "":
                 continue
-            rows.append(
-                {
+
+            for dc in ders_cols:
+                ders_adi = row.get(dc)
+                if ders_adi is None or str(ders_adi).strip() == "":
+                    continue
+                yield {
                     "fakulte": str(fakulte).strip(),
                     "bolum": str(bolum).strip(),
                     "yil": yil_num,
@@ -149,12 +141,10 @@ def _extract_rows_from_df(df: pd.DataFrame, sheet_name: str) -> tuple[list[dict[
                     "ders_kodu": None,
                     "sheet": sheet_name,
                 }
-            )
-    return rows, warnings
 
 
 def _parse_year(raw: Any) -> int | None:
-    if raw is None or (isinstance(raw, float) and pd.isna(raw)):
+    if raw is None or (isinstance(raw, float) and math.isnan(raw)):
         return None
     text = str(raw).strip()
     found = re.search(r"(19|20)\d{2}", text)
@@ -167,23 +157,19 @@ def _parse_year(raw: Any) -> int | None:
     return None
 
 
-def parse_curriculum_excel(excel_path: str) -> tuple[list[dict[str, Any]], list[str]]:
+def parse_curriculum_excel(excel_path: str) -> tuple[ExcelRowSource[dict[str, Any]], list[str]]:
     if not os.path.exists(excel_path):
         raise FileNotFoundError(f"Excel dosyasi bulunamadi: {excel_path}")
-    all_rows: list[dict[str, Any]] = []
-    warnings: list[str] = []
     # Windows'ta seçilen dosyanın import sonrasında kilitli kalmaması için
-    # ExcelFile tanıtıcısını deterministik olarak kapat.
-    with pd.ExcelFile(excel_path) as xls:
-        for sheet in xls.sheet_names:
-            df = pd.read_excel(xls, sheet_name=str(sheet))
-            rows, warns = _extract_rows_from_df(df, sheet_name=str(sheet))
-            all_rows.extend(rows)
-            warnings.extend(warns)
-    return all_rows, warnings
+    # çalışma kitabı tanıtıcısını deterministik olarak kapat.
+    with open_excel_stream(excel_path) as reader:
+        sheet_names = [str(sheet) for sheet in reader.sheet_names]
+    # Satirlar bellekte tutulmaz; her iterasyon sayfalari yeniden akis olarak okur.
+    rows = ExcelRowSource(excel_path, sheet_names, _extract_rows_from_sheet).scan()
+    return rows, rows.warnings
 
 
-def parse_excel(excel_path: str) -> tuple[list[dict[str, Any]], list[str]]:
+def parse_excel(excel_path: str) -> tuple[ExcelRowSource[dict[str, Any]], list[str]]:
     """
     Backward-compatible alias:
     Kullanici senaryosundaki parse_excel(...) adini dogrudan destekler.
@@ -241,17 +227,13 @@ def _find_department_id(cur: sqlite3.Cursor, faculty_id: int, department_name: s
     return int(row[0]) if row else None
 
 
-def _find_course_id(
+def _load_course_index(
     cur: sqlite3.Cursor,
-    ders_adi: str | None,
-    ders_kodu: str | None,
     *,
     faculty_id: int | None = None,
     department_id: int | None = None,
-) -> int | None:
-    code = str(ders_kodu or "").strip()
-    name = str(ders_adi or "").strip()
-
+) -> CourseMatchIndex:
+    """Kapsamdaki dersleri tek sorguda yukler; siralama eski satir-bazli sorgularla aynidir."""
     scope_clauses: list[str] = []
     scope_params: list[int] = []
     if faculty_id is not None:
@@ -260,58 +242,88 @@ def _find_course_id(
     if department_id is not None:
         scope_clauses.append("d.bolum_id = ?")
         scope_params.append(int(department_id))
-    scope_sql = f" AND {' AND '.join(scope_clauses)}" if scope_clauses else ""
+    scope_sql = f"WHERE {' AND '.join(scope_clauses)}" if scope_clauses else ""
 
     try:
         elective_predicate = build_elective_predicate(cur=cur, alias="d")
     except Exception:
         elective_predicate = "0=1"
 
-    def select_best(match_sql: str, match_params: tuple[Any, ...]) -> int | None:
-        cur.execute(
-            f"""
-            SELECT d.ders_id,
-                   CASE WHEN {elective_predicate} THEN 1 ELSE 0 END AS is_elective,
-                   COALESCE(d.kod, '') AS ders_kodu
-            FROM ders d
-            WHERE {match_sql}
-              {scope_sql}
-            ORDER BY is_elective DESC, d.ders_id
-            """,
-            (*match_params, *scope_params),
-        )
-        rows = [
-            (int(row[0]), bool(row[1]), str(row[2] or "").strip())
+    cur.execute(
+        f"""
+        SELECT d.ders_id,
+               CASE WHEN {elective_predicate} THEN 1 ELSE 0 END AS is_elective,
+               COALESCE(d.kod, '') AS ders_kodu,
+               COALESCE(d.ad, '') AS ders_adi
+        FROM ders d
+        {scope_sql}
+        ORDER BY is_elective DESC, d.ders_id
+        """,
+        tuple(scope_params),
+    )
+    return CourseMatchIndex(
+        [
+            CourseCandidate(
+                ders_id=int(row[0]),
+                ders_kodu=str(row[2] or ""),
+                ders_adi=str(row[3] or ""),
+                in_year_scope=False,
+                is_elective=bool(row[1]),
+            )
             for row in cur.fetchall()
             if row and row[0] is not None
         ]
-        if not rows:
-            return None
-        preferred_rows = [row for row in rows if row[1]] or rows
-        if len(preferred_rows) == 1:
-            return preferred_rows[0][0]
-
-        # Eski ana veri setlerinde ayni secmeli ders hem aciklama tabanli uzun
-        # kodla ("Fizyoterapi ve RehabilitasyonSEC2") hem de standart kisa
-        # kodla ("FTR611S") bulunabiliyor. Isim ayniysa standart akademik kodu
-        # tekil olarak tercih et; iki standart kod varsa sessizce keyfi secme.
-        standard_code_rows = [
-            row
-            for row in preferred_rows
-            if re.fullmatch(r"[A-Za-zÇĞİÖŞÜçğıöşü]{2,8}\d{2,4}[A-Za-z]?", row[2])
-        ]
-        return standard_code_rows[0][0] if len(standard_code_rows) == 1 else None
+    )
+
+
+def _select_best_course(matches: list[CourseCandidate]) -> int | None:
+    if not matches:
+        return None
+    preferred = [item for item in matches if item.is_elective] or matches
+    if len(preferred) == 1:
+        return preferred[0].ders_id
+
+    # Eski ana veri setlerinde ayni secmeli ders hem aciklama tabanli uzun
+    # kodla ("Fizyoterapi ve RehabilitasyonSEC2") hem de standart kisa
+    # kodla ("FTR611S") bulunabiliyor. Isim ayniysa standart akademik kodu
+    # tekil olarak tercih et; iki standart kod varsa sessizce keyfi secme.
+    standard_code_rows = [
+        item
+        for item in preferred
+        if re.fullmatch(r"[A-Za-zÇĞİÖŞÜçğıöşü]{2,8}\d{2,4}[A-Za-z]?", item.ders_kodu.strip())
+    ]
+    return standard_code_rows[0].ders_id if len(standard_code_rows) == 1 else None
+
+
+def _find_course_id(
+    cur: sqlite3.Cursor,
+    ders_adi: str | None,
+    ders_kodu: str | None,
+    *,
+    faculty_id: int | None = None,
+    department_id: int | None = None,
+    index: CourseMatchIndex | None = None,
+) -> int | None:
+    """Kod -> tam ad -> ad icerir sirasiyla ders arar (SQLite lower/LIKE semantigi).
+
+    Cok satirli importlarda ``index`` kapsam basina bir kez kurulup verilmelidir;
+    verilmezse tek seferlik indeks olusturulur.
+    """
+    code = str(ders_kodu or "").strip()
+    name = str(ders_adi or "").strip()
+    if index is None:
+        index = _load_course_index(cur, faculty_id=faculty_id, department_id=department_id)
 
     if code:
-        course_id = select_best("lower(trim(d.kod)) = lower(trim(?))", (code,))
+        course_id = _select_best_course(index.by_code_casefold(code))
         if course_id is not None:
             return course_id
 
     if name:
-        course_id = select_best("lower(trim(d.ad)) = lower(trim(?))", (name,))
+        course_id = _select_best_course(index.by_name_casefold(name))
         if course_id is not None:
             return course_id
-        course_id = select_best("lower(d.ad) LIKE lower(?)", (f"%{name}%",))
+        course_id = _select_best_course(index.name_contains(name))
         if course_id is not None:
             return course_id
     return None
@@ -469,6 +481,7 @@ def reset_criteria_for_import(
                     (target_year, *chunk),
                 )
                 stats["score_rows_deleted"] += int(cur.rowcount or 0)
+        bump_decision_matrix_version(conn, "curriculum_criteria_reset")
 
     if _table_exists(cur, "havuz"):
         for fid in scoped_faculty_ids:
@@ -664,6 +677,7 @@ def import_curriculum_excel(
     errors: list[str] = []
     scope_courses: dict[tuple[int, int, int, str], set[int]] = {}
     scope_names: dict[tuple[int, int, int, str], tuple[str, str]] = {}
+    course_indexes: dict[tuple[int, int], CourseMatchIndex] = {}
 
     try:
         ensure_reporting_schema(conn)
@@ -737,12 +751,14 @@ def import_curriculum_excel(
                     suggestion="Bolum adini secili fakulte altindaki bolum kaydi ile uyumlu hale getirin.",
                 )
                 continue
+            index_key = (int(faculty_id), int(department_id))
+            if index_key not in course_indexes:
+                course_indexes[index_key] = _load_course_index(cur, faculty_id=index_key[0], department_id=index_key[1])
             course_id = _find_course_id(
                 cur,
                 item.get("ders_adi"),
                 item.get("ders_kodu"),
-                faculty_id=int(faculty_id),
-                department_id=int(department_id),
+                index=course_indexes[index_key],
             )
             if course_id is None:
                 message = f"Ders bulunamadi: kod={item.get('ders_kodu')} ad={item.get('ders_adi')}"
@@ -846,7 +862,7 @@ def import_curriculum_excel(
                 }
                 for (f_id, d_id, year, term), course_ids in sorted(scope_courses.items())
             ]
-            staged_rows = [
+            staged_rows = (
                 {
                     "row_no": index,
                     "course_id": course_id,
@@ -855,14 +871,15 @@ def import_curriculum_excel(
                 }
                 for index, scope in enumerate(staged_scopes, start=1)
                 for course_id in scope["course_ids"]
-            ]
-            stage_import(
+            )
+            staged = stage_import(
                 conn,
                 import_batch_id=import_batch_id,
                 import_type="curriculum",
                 payload={"target_year": int(target_year), "scopes": staged_scopes},
                 rows=staged_rows,
             )
+            staged_count = int(staged["staged_row_count"])
             quality = evaluate_import_quality(conn, import_batch_id)
             update_import_status(
                 conn,
@@ -872,14 +889,14 @@ def import_curriculum_excel(
                     "ok": True,
                     "staged": True,
                     "scope_count": len(scope_courses),
-                    "course_count": len(staged_rows),
+                    "course_count": staged_count,
                     "warnings": warnings,
                 },
             )
             conn.commit()
             return ImportResult(
                 True,
-                f"Müfredat doğrulandı; {len(staged_rows)} ders onay kuyruğuna alındı. Canlı müfredat değiştirilmedi.",
+                f"Müfredat doğrulandı; {staged_count} ders onay kuyruğuna alındı. Canlı müfredat değiştirilmedi.",
                 target_year=target_year,
                 scopes_total=len(scope_courses),
                 warnings=warnings,
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""Fakulte+yil+donem karar matrisinin (ders x kriter) diskteki goruntuleri.
+
+TOPSIS, karar calistirmasi, hassasiyet analizi ve raporlar ayni aday ders
+evreni icin ayni kriter matrisini SQLite'tan tekrar tekrar kurar. Bu modul
+matrisi bir kez kurulduktan sonra:
+
+* ``<kok>/f<fakulte>_y<yil>_<donem>.npy`` dosyasina float64 dizisi olarak
+  yazar (sutunlar: ``ders_id``, ham kriterler, mufredat maskesi, vektor
+  normalize kriterler) ve ``np.load(mmap_mode="r")`` ile kopyalamadan okur,
+* yaninda ``.json`` ile veri surumunu, agirlik/fayda yonu ve AHP profil
+  ozetini tutar,
+* son kullanilanlari surec icinde kucuk bir LRU'da saklar.
+
+Gecerlilik ``decision_matrix_versions`` tablosundaki (epoch, version)
+ciftine baglidir. Kaynak tablolara (ders_kriterleri, performans, populerlik)
+yazan servisler, import aktivasyonu, kriter tamamlama override'lari ve AHP
+profil degisiklikleri yazim sonunda bir kez ``bump_decision_matrix_version``
+cagirir; satir basina tetik kullanilmaz, boylece toplu yazimlar surum satirini
+her satirda guncellemez. Surum tablosu yoksa goruntu kullanilmaz. Varsayilan kok SQLite dosyasinin
+yanindaki ``decision_matrix_snapshots/`` dizinidir
+(``DECISION_SNAPSHOT_DIR`` ile degistirilebilir); bellek ici DB icin
+goruntu tutulmaz.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from app.db.schema_compat import DECISION_MATRIX_VERSION_SCOPE
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_DIRNAME = "decision_matrix_snapshots"
+SNAPSHOT_DIR_ENV = "DECISION_SNAPSHOT_DIR"
+MEMORY_CACHE_SIZE = 16
+
+RAW_KEYS = ("basari", "trend", "populerlik", "anket", "ortalama_not")
+CRITERIA_KEYS = ("basari", "trend", "populerlik", "anket")
+# Dizi sutun yerlesimi: [ders_id | RAW_KEYS | mufredat maskesi | normalize CRITERIA_KEYS]
+_RAW_SLICE = slice(1, 1 + len(RAW_KEYS))
+_MASK_COLUMN = 1 + len(RAW_KEYS)
+_NORMALIZED_SLICE = slice(_MASK_COLUMN + 1, _MASK_COLUMN + 1 + len(CRITERIA_KEYS))
+_COLUMN_COUNT = _NORMALIZED_SLICE.stop
+
+
+@dataclass(frozen=True)
+class DecisionMatrixDataVersion:
+    epoch: str
+    version: int
+
+    @property
+    def token(self) -> str:
+        return f"{self.epoch}:{self.version}"
+
+
+@dataclass
+class DecisionMatrixSnapshot:
+    """Bir fakulte+yil+donem icin aday derslerin kriter matrisi."""
+
+    fakulte_id: int
+    akademik_yil: int
+    term_key: str
+    data_version: DecisionMatrixDataVersion
+    array: np.ndarray
+    weights: list[float] = field(default_factory=list)
+    benefit_map: dict[str, bool] = field(default_factory=dict)
+    ahp_profile_id: int | None = None
+    ahp_profile_version: int | None = None
+    created_at: str = ""
+
+    @property
+    def ders_ids(self) -> np.ndarray:
+        return self.array[:, 0].astype(np.int64)
+
+    @property
+    def raw(self) -> np.ndarray:
+        return self.array[:, _RAW_SLICE]
+
+    @property
+    def curriculum_mask(self) -> np.ndarray:
+        return self.array[:, _MASK_COLUMN] > 0.5
+
+    @property
+    def normalized(self) -> np.ndarray:
+        """Mufredat satirlari icin TOPSIS vektor normalizasyonu; havuz satirlari NaN."""
+        return self.array[:, _NORMALIZED_SLICE]
+
+    def __len__(self) -> int:
+        return int(self.array.shape[0])
+
+    def covers(self, ders_ids: Iterable[int]) -> bool:
+        wanted = sorted({int(d) for d in ders_ids})
+        return len(wanted) == len(self) and wanted == self.ders_ids.tolist()
+
+    def curriculum_ids(self) -> set[int]:
+        return {int(d) for d in self.ders_ids[self.curriculum_mask].tolist()}
+
+    def raw_columns(self) -> dict[str, np.ndarray]:
+        raw = self.raw
+        return {key: raw[:, j] for j, key in enumerate(RAW_KEYS)}
+
+    def metadata(self) -> dict[str, Any]:
+        return {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "fakulte_id": self.fakulte_id,
+            "akademik_yil": self.akademik_yil,
+            "term_key": self.term_key,
+            "epoch": self.data_version.epoch,
+            "version": self.data_version.version,
+            "rows": len(self),
+            "weights": [float(w) for w in self.weights],
+            "benefit_map": {str(k): bool(v) for k, v in self.benefit_map.items()},
+            "ahp_profile_id": self.ahp_profile_id,
+            "ahp_profile_version": self.ahp_profile_version,
+            "created_at": self.created_at,
+        }
+
+
+def _cursor(conn_or_cur: sqlite3.Connection | sqlite3.Cursor) -> sqlite3.Cursor:
+    return conn_or_cur.cursor() if isinstance(conn_or_cur, sqlite3.Connection) else conn_or_cur
+
+
+def get_decision_matrix_data_version(conn_or_cur: sqlite3.Connection | sqlite3.Cursor) -> DecisionMatrixDataVersion | None:
+    """Guncel veri surumu; surum tablosu yoksa None."""
+    cur = _cursor(conn_or_cur)
+    try:
+        cur.execute(
+            "SELECT epoch, version FROM decision_matrix_versions WHERE scope_key = ?",
+            (DECISION_MATRIX_VERSION_SCOPE,),
+        )
+        row = cur.fetchone()
+    except sqlite3.Error:
+        return None
+    if not row or row[0] is None:
+        return None
+    return DecisionMatrixDataVersion(epoch=str(row[0]), version=int(row[1] or 0))
+
+
+def bump_decision_matrix_version(
+    conn: sqlite3.Connection,
+    reason: str,
+    *,
+    new_epoch: bool = False,
+) -> DecisionMatrixDataVersion | None:
+    """Karar matrisi goruntulerini gecersiz kilar. Caller commit eder; tablo yoksa no-op.
+
+    ``new_epoch=True`` veritabani dosyasi yedekten geri yuklendiginde kullanilir:
+    surum sayaci geri gittiginden ayni sayinin eski goruntuyle cakismasini onler.
+    """
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    try:
+        conn.execute(
+            f"""
+            UPDATE decision_matrix_versions
+            SET version = version + 1,
+                epoch = {'lower(hex(randomblob(8)))' if new_epoch else 'epoch'},
+                reason = ?,
+                updated_at = ?
+            WHERE scope_key = ?
+            """,
+            (str(reason), now, DECISION_MATRIX_VERSION_SCOPE),
+        )
+    except sqlite3.Error:
+        return None
+    return get_decision_matrix_data_version(conn)
+
+
+def snapshot_root_for_db(db_path: str | os.PathLike[str] | None) -> Path | None:
+    override = os.getenv(SNAPSHOT_DIR_ENV)
+    if override:
+        return Path(override)
+    if not db_path:
+        return None
+    return Path(db_path).resolve().parent / SNAPSHOT_DIRNAME
+
+
+def snapshot_root(conn_or_cur: sqlite3.Connection | sqlite3.Cursor) -> Path | None:
+    """Ana veritabani dosyasina gore goruntu koku; bellek ici DB icin None."""
+    try:
+        rows = _cursor(conn_or_cur).execute("PRAGMA database_list").fetchall()
+    except sqlite3.Error:
+        return None
+    main = next((row for row in rows if row[1] == "main"), None)
+    if not main or not main[2]:
+        return None
+    return snapshot_root_for_db(main[2])
+
+
+def build_decision_matrix_snapshot(
+    fakulte_id: int,
+    akademik_yil: int,
+    term_key: str,
+    data_version: DecisionMatrixDataVersion,
+    ders_ids: Iterable[int],
+    raw_columns: dict[str, Iterable[float]],
+    curriculum_ids: Iterable[int] = (),
+    *,
+    weights: Iterable[float] = (),
+    benefit_map: dict[str, bool] | None = None,
+    ahp_profile: dict[str, Any] | None = None,
+) -> DecisionMatrixSnapshot:
+    ids = np.array([int(d) for d in ders_ids], dtype=np.int64)
+    order = np.argsort(ids, kind="stable")
+    array = np.full((len(ids), _COLUMN_COUNT), np.nan, dtype=np.float64)
+    array[:, 0] = ids[order]
+    for j, key in enumerate(RAW_KEYS):
+        array[:, _RAW_SLICE.start + j] = np.nan_to_num(np.asarray(list(raw_columns[key]), dtype=float)[order], nan=0.0)
+    curriculum = {int(d) for d in curriculum_ids}
+    mask = np.array([int(d) in curriculum for d in array[:, 0].astype(np.int64).tolist()], dtype=bool)
+    array[:, _MASK_COLUMN] = mask.astype(float)
+    if mask.any():
+        criteria = array[mask][:, _RAW_SLICE.start : _RAW_SLICE.start + len(CRITERIA_KEYS)]
+        norms = np.sqrt(np.sum(np.square(criteria), axis=0))
+        # topsis_calistir ile ayni kural: norm <= 1e-10 ise 1.
+        norms = np.where(norms > 1e-10, norms, 1.0)
+        array[np.flatnonzero(mask), _NORMALIZED_SLICE] = criteria / norms
+    profile = ahp_profile or {}
+    return DecisionMatrixSnapshot(
+        fakulte_id=int(fakulte_id),
+        akademik_yil=int(akademik_yil),
+        term_key=str(term_key),
+        data_version=data_version,
+        array=array,
+        weights=[float(w) for w in weights],
+        benefit_map=dict(benefit_map or {}),
+        ahp_profile_id=profile.get("id"),
+        ahp_profile_version=profile.get("version"),
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+
+
+_MEMORY: OrderedDict[tuple[str, int, int, str], DecisionMatrixSnapshot] = OrderedDict()
+_MEMORY_LOCK = threading.Lock()
+
+
+def _memory_key(root: Path, fakulte_id: int, akademik_yil: int, term_key: str) -> tuple[str, int, int, str]:
+    return (str(root), int(fakulte_id), int(akademik_yil), str(term_key))
+
+
+def _remember(key: tuple[str, int, int, str], snapshot: DecisionMatrixSnapshot) -> None:
+    with _MEMORY_LOCK:
+        _MEMORY[key] = snapshot
+        _MEMORY.move_to_end(key)
+        while len(_MEMORY) > MEMORY_CACHE_SIZE:
+            _MEMORY.popitem(last=False)
+
+
+def clear_snapshot_memory_cache() -> None:
+    with _MEMORY_LOCK:
+        _MEMORY.clear()
+
+
+def snapshot_paths(root: Path, fakulte_id: int, akademik_yil: int, term_key: str) -> tuple[Path, Path]:
+    stem = f"f{int(fakulte_id)}_y{int(akademik_yil)}_{term_key}"
+    return root / f"{stem}.npy", root / f"{stem}.json"
+
+
+def save_decision_matrix_snapshot(
+    conn_or_cur: sqlite3.Connection | sqlite3.Cursor,
+    snapshot: DecisionMatrixSnapshot,
+) -> Path | None:
+    """Atomik yazim (gecici dosya + os.replace); kalici kok yoksa ya da yazilamazsa None."""
+    root = snapshot_root(conn_or_cur)
+    if root is None:
+        return None
+    array_path, meta_path = snapshot_paths(root, snapshot.fakulte_id, snapshot.akademik_yil, snapshot.term_key)
+    suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp_array = array_path.with_name(f".{array_path.name}{suffix}")
+    tmp_meta = meta_path.with_name(f".{meta_path.name}{suffix}")
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        with open(tmp_array, "wb") as handle:
+            np.save(handle, np.ascontiguousarray(snapshot.array, dtype=np.float64))
+        tmp_meta.write_text(json.dumps(snapshot.metadata(), ensure_ascii=False), encoding="utf-8")
+        # Once dizi, sonra surumu tasiyan meta: okuyucu yeni meta ile eski diziyi
+        # goremez (satir sayisi ve ders kumesi ayrica dogrulanir).
+        os.replace(tmp_array, array_path)
+        os.replace(tmp_meta, meta_path)
+    except OSError:
+        for tmp in (tmp_array, tmp_meta):
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        return None
+    _remember(_memory_key(root, snapshot.fakulte_id, snapshot.akademik_yil, snapshot.term_key), snapshot)
+    return array_path
+
+
+def _read_snapshot_files(root: Path, fakulte_id: int, akademik_yil: int, term_key: str) -> DecisionMatrixSnapshot | None:
+    array_path, meta_path = snapshot_paths(root, fakulte_id, akademik_yil, term_key)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        array = np.load(array_path, mmap_mode="r", allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(meta, dict)
+        or meta.get("format_version") != SNAPSHOT_FORMAT_VERSION
+        or array.ndim != 2
+        or array.shape != (int(meta.get("rows") or 0), _COLUMN_COUNT)
+    ):
+        return None
+    return DecisionMatrixSnapshot(
+        fakulte_id=int(fakulte_id),
+        akademik_yil=int(akademik_yil),
+        term_key=str(term_key),
+        data_version=DecisionMatrixDataVersion(epoch=str(meta.get("epoch")), version=int(meta.get("version") or 0)),
+        array=array,
+        weights=[float(w) for w in meta.get("weights") or []],
+        benefit_map={str(k): bool(v) for k, v in (meta.get("benefit_map") or {}).items()},
+        ahp_profile_id=meta.get("ahp_profile_id"),
+        ahp_profile_version=meta.get("ahp_profile_version"),
+        created_at=str(meta.get("created_at") or ""),
+    )
+
+
+def load_decision_matrix_snapshot(
+    conn_or_cur: sqlite3.Connection | sqlite3.Cursor,
+    fakulte_id: int,
+    akademik_yil: int,
+    term_key: str,
+    data_version: DecisionMatrixDataVersion | None = None,
+) -> DecisionMatrixSnapshot | None:
+    """Guncel veri surumuyle uyumlu goruntu; yoksa ya da bayatsa None."""
+    if data_version is None:
+        data_version = get_decision_matrix_data_version(conn_or_cur)
+    root = snapshot_root(conn_or_cur)
+    if data_version is None or root is None:
+        return None
+    key = _memory_key(root, fakulte_id, akademik_yil, term_key)
+    with _MEMORY_LOCK:
+        cached = _MEMORY.get(key)
+        if cached is not None:
+            _MEMORY.move_to_end(key)
+    if cached is not None and cached.data_version == data_version:
+        return cached
+    snapshot = _read_snapshot_files(root, fakulte_id, akademik_yil, term_key)
+    if snapshot is None or snapshot.data_version != data_version:
+        return None
+    _remember(key, snapshot)
+    return snapshot
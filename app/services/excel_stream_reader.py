@@ -0,0 +1,296 @@
+"""Excel sayfalarini DataFrame olusturmadan satir satir okuma.
+
+``.xlsx``/``.xlsm`` dosyalari openpyxl read-only modunda acilir; hucreler
+XML'den akis halinde okunur ve her satir bir ``SheetRow`` demeti olarak
+parcalar (chunk) halinde uretilir. Bellek kullanimi sayfa boyutundan
+bagimsiz olarak bir parca ile sinirli kalir.
+
+Deger donusumu ``pd.read_excel`` ile ayni sonuclari verecek sekilde yapilir:
+
+* ilk satir baslik kabul edilir; basliklar kirpilir (strip), bos baslik
+  ``Unnamed: <i>``, tekrar eden baslik ``<ad>.1``, ``<ad>.2`` olur,
+* tam sayiya esit float degerler ``int`` olur (``2022.0`` -> ``2022``),
+* bos hucre, Excel hata degerleri ve pandas'in varsayilan NA metinleri
+  (``""``, ``"NA"``, ``"N/A"``, ``"null"`` ...) ``None`` olur,
+* ``row_no`` Excel satir numarasidir (baslik 1. satir, ilk veri 2. satir),
+  yani mevcut ``idx + 2`` numaralandirmasiyla birebir aynidir.
+
+openpyxl'in okuyamadigi bicimler (``.xls``, ``.ods``) icin pandas'a geri
+donulur; bu yolda akis yoktur ama ayni ``SheetRow`` arayuzu korunur.
+
+Import servisleri ayristirilmis satirlari liste olarak tutmaz; ``ExcelRowSource``
+her gecista calisma kitabini yeniden akis olarak okur, boylece dogrulama,
+eslestirme ve staging adimlari satirlari parca parca isler.
+"""
+
+from __future__ import annotations
+
+import os
+from itertools import islice
+from typing import Any, Callable, Generic, Iterator, NamedTuple, TypeVar
+
+import pandas as pd
+from openpyxl import load_workbook
+
+DEFAULT_CHUNK_SIZE = 1000
+STREAMING_SUFFIXES = {".xlsx", ".xlsm", ".xltx", ".xltm"}
+
+T = TypeVar("T")
+
+# pandas.read_excel varsayilan na_values kumesi + Excel hata hucreleri.
+NA_TEXT_VALUES = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+        "#DIV/0!",
+        "#VALUE!",
+        "#REF!",
+        "#NAME?",
+        "#NUM!",
+        "#NULL!",
+    }
+)
+
+
+def excel_column_letter(index_1_based: int) -> str:
+    if index_1_based < 1:
+        raise ValueError("Excel kolon indeksi 1 veya daha buyuk olmali.")
+    out = ""
+    current = int(index_1_based)
+    while current > 0:
+        current, remainder = divmod(current - 1, 26)
+        out = chr(65 + remainder) + out
+    return out
+
+
+def normalize_cell_value(value: Any) -> Any:
+    """Tek hucre degerini pandas'in okuyacagi Python degerine cevirir."""
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return None
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in NA_TEXT_VALUES:
+        return None
+    return value
+
+
+def _header_names(raw_header: tuple[Any, ...]) -> list[str]:
+    names: list[str] = []
+    seen: set[str] = set()
+    counts: dict[str, int] = {}
+    for pos, value in enumerate(raw_header):
+        value = normalize_cell_value(value)
+        base = f"Unnamed: {pos}" if value is None else str(value).strip()
+        name = base
+        if name in seen:
+            suffix = counts.get(base, 1)
+            while f"{base}.{suffix}" in seen:
+                suffix += 1
+            counts[base] = suffix + 1
+            name = f"{base}.{suffix}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+class SheetRow(NamedTuple):
+    """Tek veri satiri: Excel satir numarasi ve baslik genisligindeki degerler."""
+
+    row_no: int
+    values: tuple[Any, ...]
+    positions: dict[str, int]
+
+    def get(self, column: str | None, default: Any = None) -> Any:
+        if column is None:
+            return default
+        pos = self.positions.get(column)
+        return default if pos is None else self.values[pos]
+
+    def is_blank(self) -> bool:
+        return all(value is None for value in self.values)
+
+
+class SheetStream:
+    """Bir sayfanin basligi + veri satirlarinin tek gecislik akisi."""
+
+    def __init__(self, name: str, columns: list[str], rows: Iterator[tuple[int, tuple[Any, ...]]]) -> None:
+        self.name = name
+        self.columns = columns
+        self.positions = {col: pos for pos, col in enumerate(columns)}
+        self._rows = rows
+
+    def column_letter(self, column: str) -> str:
+        return excel_column_letter(self.positions[column] + 1)
+
+    def cell_ref(self, column: str, row_no: int) -> str:
+        """Hata mesajlari icin hucre konumu, ornegin ``C5``."""
+        return f"{self.column_letter(column)}{int(row_no)}"
+
+    def __iter__(self) -> Iterator[SheetRow]:
+        width = len(self.columns)
+        positions = self.positions
+        for row_no, raw in self._rows:
+            values = tuple(normalize_cell_value(value) for value in raw[:width])
+            if len(values) < width:
+                values = values + (None,) * (width - len(values))
+            yield SheetRow(row_no, values, positions)
+
+    def rows(self, *, skip_blank: bool = True) -> Iterator[SheetRow]:
+        for row in self:
+            if skip_blank and row.is_blank():
+                continue
+            yield row
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE, *, skip_blank: bool = True) -> Iterator[list[SheetRow]]:
+        size = max(1, int(chunk_size))
+        chunk: list[SheetRow] = []
+        for row in self.rows(skip_blank=skip_blank):
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class ExcelStreamReader:
+    """Calisma kitabini bir kez acar; sayfalar ``sheet(ad)`` ile akis olarak okunur.
+
+    Windows'ta dosyanin kilitli kalmamasi icin ``with`` blogu ile kullanilmali.
+    """
+
+    def __init__(self, excel_path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(excel_path)
+        self._workbook = None
+        self._pandas_file = None
+        if os.path.splitext(self.path)[1].lower() in STREAMING_SUFFIXES:
+            self._workbook = load_workbook(self.path, read_only=True, data_only=True)
+            self.sheet_names = [str(name) for name in self._workbook.sheetnames]
+        else:
+            self._pandas_file = pd.ExcelFile(self.path)
+            self.sheet_names = [str(name) for name in self._pandas_file.sheet_names]
+
+    def __enter__(self) -> "ExcelStreamReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        if self._pandas_file is not None:
+            self._pandas_file.close()
+            self._pandas_file = None
+
+    def sheet(self, name: str) -> SheetStream:
+        if self._workbook is not None:
+            worksheet = self._workbook[name]
+            # Bazi ureticiler yanlis <dimension> yazar; read-only modda gercek hucrelere guven.
+            worksheet.reset_dimensions()
+            raw_rows = enumerate(worksheet.iter_rows(values_only=True), start=1)
+            header_row = next(raw_rows, None)
+            header = header_row[1] if header_row is not None else ()
+            return SheetStream(name, _header_names(tuple(header)), raw_rows)
+        return self._pandas_sheet(name)
+
+    def _pandas_sheet(self, name: str) -> SheetStream:
+        df = pd.read_excel(self._pandas_file, sheet_name=name, header=None, dtype=object)
+        header = tuple(df.iloc[0].tolist()) if len(df) else ()
+
+        def raw_rows() -> Iterator[tuple[int, tuple[Any, ...]]]:
+            for pos, values in enumerate(df.iloc[1:].itertuples(index=False, name=None)):
+                yield pos + 2, tuple(None if pd.isna(value) else value for value in values)
+
+        return SheetStream(name, _header_names(header), raw_rows())
+
+
+def open_excel_stream(excel_path: str | os.PathLike[str]) -> ExcelStreamReader:
+    return ExcelStreamReader(excel_path)
+
+
+def iter_chunks(items, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[Any]]:
+    """Herhangi bir iterable'i en fazla ``chunk_size`` elemanlik listeler halinde uretir."""
+    iterator = iter(items)
+    size = max(1, int(chunk_size))
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class ExcelRowSource(Generic[T]):
+    """Bir veya daha fazla sayfanin ayristirilmis satirlari; liste olarak tutulmaz.
+
+    Her iterasyon calisma kitabini yeniden acar ve ``parse_sheet`` ile satirlari
+    akis halinde uretir. ``scan()`` tek bir sayim gecisi yapar: satir sayisini
+    ve ayristirma uyarilarini toplar. ``filter()`` ayni dosya uzerinde suzulmus
+    yeni bir kaynak dondurur.
+    """
+
+    def __init__(
+        self,
+        excel_path: str | os.PathLike[str],
+        sheet_names: list[str],
+        parse_sheet: Callable[[SheetStream, list[str]], Iterator[T]],
+        predicate: Callable[[T], bool] | None = None,
+    ) -> None:
+        self.path = os.fspath(excel_path)
+        self.sheet_names = list(sheet_names)
+        self._parse_sheet = parse_sheet
+        self._predicate = predicate
+        self._count: int | None = None
+        self.warnings: list[str] = []
+
+    def _iter(self, warnings: list[str]) -> Iterator[T]:
+        with open_excel_stream(self.path) as reader:
+            for name in self.sheet_names:
+                for row in self._parse_sheet(reader.sheet(name), warnings):
+                    if self._predicate is None or self._predicate(row):
+                        yield row
+
+    def __iter__(self) -> Iterator[T]:
+        return self._iter([])
+
+    def scan(self) -> "ExcelRowSource[T]":
+        warnings: list[str] = []
+        self._count = sum(1 for _ in self._iter(warnings))
+        self.warnings = warnings
+        return self
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self.scan()
+        return int(self._count or 0)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def filter(self, predicate: Callable[[T], bool]) -> "ExcelRowSource[T]":
+        if self._predicate is not None:
+            previous = self._predicate
+            combined: Callable[[T], bool] = lambda row: previous(row) and predicate(row)  # noqa: E731
+        else:
+            combined = predicate
+        return ExcelRowSource(self.path, self.sheet_names, self._parse_sheet, combined)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[T]]:
+        return iter_chunks(self, chunk_size)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Tum fakulteler icin yillik calistirmada okuma agirlikli skorlamayi paralellestirir.
+
+Fakulteler birbirinden bagimsizdir: bir fakultenin (yil -> yil+1) uretimi
+baska bir fakultenin kaynak yil kriter matrisini degistirmez. Bu nedenle
+``get_faculty_year_topsis_results`` (kriter matrisi + AHP + TOPSIS) her
+fakulte icin ayri bir surecte, salt-okunur (``mode=ro``) WAL baglantisiyla
+calisir. Yazimlar (kapi durum tablolari, mufredat/havuz, karar kaydi) tek
+yazici olan cagiran surecte fakulte sirasiyla yapilir; boylece SQLite yazma
+kilidi icin yarisilmaz ve sonuc sirasi deterministiktir.
+
+Surec havuzu acilamazsa (kisitli ortam) ya da isci skoru guvenle
+uretemezse ilgili paket ``None`` doner ve yazici skoru kendisi hesaplar.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+
+@dataclass(frozen=True)
+class FacultyScoreJob:
+    fakulte_id: int
+    akademik_yil: int
+    donem: str = "G"
+    strict_ahp: bool = False
+    # Yazicinin onceden cozdugu AHP agirlik baglami (resolve_topsis_weight_context).
+    weight_context: dict[str, Any] | None = None
+
+
+@dataclass
+class FacultyScoreResult:
+    job: FacultyScoreJob
+    score_pack: dict[str, Any] | None
+    score_ms: float
+    error: str | None = None
+
+
+def open_readonly_connection(db_path: str) -> sqlite3.Connection:
+    """Isci baglantisi: URI ``mode=ro``; WAL'da yazici varken de okur."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout = 8000")
+    return conn
+
+
+def score_faculty_year_readonly(payload: tuple[str, FacultyScoreJob]) -> FacultyScoreResult:
+    """Tek fakulte+yil icin TOPSIS skor paketi; yaziciya aynen gecilebilir."""
+    db_path, job = payload
+    from app.services.calculation import get_faculty_year_topsis_results
+
+    started = time.perf_counter()
+    conn = None
+    try:
+        conn = open_readonly_connection(db_path)
+        pack = get_faculty_year_topsis_results(
+            conn.cursor(),
+            fakulte_id=job.fakulte_id,
+            akademik_yil=job.akademik_yil,
+            donem=job.donem,
+            strict_ahp=job.strict_ahp,
+            weight_context=job.weight_context,
+        )
+    except Exception as exc:  # noqa: BLE001 - yazici skoru kendisi hesaplar
+        return FacultyScoreResult(job, None, _elapsed_ms(started), error=f"{type(exc).__name__}: {exc}")
+    finally:
+        if conn is not None:
+            conn.close()
+    # Salt-okunur baglanti AHP profil/kriter tanimi tohumlamasini yapamaz; baglam
+    # verilmeden legacy agirliga dusmus paketi kullanma, yazici yeniden hesaplasin.
+    if not pack.get("ok") or (job.weight_context is None and pack.get("ahp_fallback_used")):
+        reason = pack.get("ahp_fallback_reason") or pack.get("error")
+        return FacultyScoreResult(job, None, _elapsed_ms(started), error=str(reason or "skor paketi kullanilamadi"))
+    return FacultyScoreResult(job, pack, _elapsed_ms(started))
+
+
+def iter_prescored_faculties(
+    db_path: str,
+    jobs: Iterable[FacultyScoreJob],
+    max_workers: int | None = None,
+) -> Iterator[FacultyScoreResult]:
+    """Isleri surec havuzuna dagitir, sonuclari ``jobs`` sirasinda uretir.
+
+    Tuketici (yazici) bir fakulteyi yazarken sonraki fakultelerin skorlamasi
+    arka planda surer. Havuz kurulamazsa skor paketi ``None`` olan sonuclar
+    doner.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    if (max_workers is not None and int(max_workers) <= 1) or len(jobs) <= 1:
+        for job in jobs:
+            yield score_faculty_year_readonly((db_path, job))
+        return
+    try:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    except (OSError, NotImplementedError):
+        for job in jobs:
+            yield FacultyScoreResult(job, None, 0.0, error="process pool kullanilamadi")
+        return
+    with executor:
+        try:
+            futures: list[Future] = [executor.submit(score_faculty_year_readonly, (db_path, job)) for job in jobs]
+        except (OSError, BrokenProcessPool):
+            futures = []
+        for index, job in enumerate(jobs):
+            if index >= len(futures):
+                yield FacultyScoreResult(job, None, 0.0, error="process pool kullanilamadi")
+                continue
+            try:
+                yield futures[index].result()
+            except (OSError, BrokenProcessPool) as exc:
+                yield FacultyScoreResult(job, None, 0.0, error=f"{type(exc).__name__}: {exc}")
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 3)
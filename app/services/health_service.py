@@ -2,19 +2,25 @@
 """Sağlık merkezi backend servisi (UI ve API için tek giriş noktası).
 
 UI doğrudan health_runner'a değil bu servise bağlanır. Son rapor
-hafızada tutulur; JSON/TXT olarak dışa aktarılabilir.
+hafızada tutulur; JSON/TXT olarak dışa aktarılabilir. API'nin ``/health``
+ucu her istekte kontrolleri çalıştırmaz: hızlı rapor veritabanı yolu başına
+TTL ile önbelleklenir, süresi dolunca eski rapor dönülürken arka planda
+yenilenir.
 """
 
 from __future__ import annotations
 
 import json
+import logging
 import os
 import threading
+import time
 from typing import Any
 
 from app.core.config import AppConfig, load_app_config
 from app.core.permissions import UserContext
 from app.core.result import ServiceResult
+from app.health.health_config import default_health_config
 from app.health.health_formatter import format_algorithm_catalog, format_report
 from app.health.health_registry import algorithm_catalog
 from app.health.health_runner import HealthRunner
@@ -23,6 +29,14 @@ from app.health.models import HealthReport
 _LAST_REPORT: HealthReport | None = None
 _LOCK = threading.Lock()
 
+# db_path -> (monotonic üretim zamanı, hızlı rapor)
+_QUICK_CACHE: dict[str, tuple[float, HealthReport]] = {}
+_QUICK_REFRESHING: set[str] = set()
+_QUICK_LOCK = threading.Lock()
+_QUICK_BUILD_LOCK = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
 
 class HealthService:
     """Sağlık kontrollerini çalıştırır ve raporu yönetir."""
@@ -65,6 +79,51 @@ class HealthService:
 
         return self._run("audit")
 
+    def get_cached_quick_health_report(self, ttl_s: float | None = None) -> HealthReport:
+        """TTL önbellekli hızlı rapor.
+
+        Taze rapor varsa doğrudan döner. Süresi dolmuşsa eski rapor döner ve
+        arka planda tek bir yenileme başlatılır; hiç rapor yoksa eşzamanlı
+        istekler tek bir çalıştırmayı bekler.
+        """
+
+        ttl = default_health_config().quick_report_ttl_s if ttl_s is None else float(ttl_s)
+        key = str(self.db_path)
+        with _QUICK_LOCK:
+            entry = _QUICK_CACHE.get(key)
+        if entry is None:
+            with _QUICK_BUILD_LOCK:
+                with _QUICK_LOCK:
+                    entry = _QUICK_CACHE.get(key)
+                if entry is None:
+                    return self._refresh_quick_cache(key)
+        if time.monotonic() - entry[0] >= ttl:
+            self._schedule_quick_refresh(key)
+        return entry[1]
+
+    def _refresh_quick_cache(self, key: str) -> HealthReport:
+        report = self._run("quick")
+        with _QUICK_LOCK:
+            _QUICK_CACHE[key] = (time.monotonic(), report)
+        return report
+
+    def _schedule_quick_refresh(self, key: str) -> None:
+        with _QUICK_LOCK:
+            if key in _QUICK_REFRESHING:
+                return
+            _QUICK_REFRESHING.add(key)
+
+        def _refresh() -> None:
+            try:
+                self._refresh_quick_cache(key)
+            except Exception:  # noqa: BLE001 - eski rapor sunulmaya devam eder
+                logger.exception("Hızlı sağlık raporu arka planda yenilenemedi.")
+            finally:
+                with _QUICK_LOCK:
+                    _QUICK_REFRESHING.discard(key)
+
+        threading.Thread(target=_refresh, name="health-quick-refresh", daemon=True).start()
+
     def get_last_health_report(self) -> HealthReport | None:
         with _LOCK:
             return _LAST_REPORT
@@ -141,6 +200,20 @@ def run_quick_health_check(
     return HealthService(db_path, config, user_context).run_quick_health_check()
 
 
+def get_cached_quick_health_report(
+    db_path: str | None = None,
+    config: AppConfig | None = None,
+    user_context: UserContext | None = None,
+    ttl_s: float | None = None,
+) -> HealthReport:
+    return HealthService(db_path, config, user_context).get_cached_quick_health_report(ttl_s)
+
+
+def clear_quick_health_cache() -> None:
+    with _QUICK_LOCK:
+        _QUICK_CACHE.clear()
+
+
 def run_full_health_check(
     db_path: str | None = None,
     config: AppConfig | None = None,
@@ -16,6 +16,7 @@ import pandas as pd
 
 from app.db.schema_compat import ensure_import_governance_schema
 from app.db.sqlite_connection import connect_sqlite
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
 
 VALID_IMPORT_TYPES = {"criteria", "survey", "curriculum", "other"}
 VALID_STATUSES = {
@@ -104,7 +105,12 @@ def calculate_column_signature(columns: list[str] | tuple[str, ...] | None) -> s
 
 
 def calculate_row_hash(row_payload: dict[str, Any]) -> str:
-    return hashlib.sha256(_json_dumps(row_payload).encode("utf-8")).hexdigest()
+    return row_hash_from_json(_json_dumps(row_payload))
+
+
+def row_hash_from_json(row_json: str) -> str:
+    """``calculate_row_hash`` ile ayni deger; satir zaten ayni bicimde serilestirildiyse tekrar dump etmez."""
+    return hashlib.sha256(row_json.encode("utf-8")).hexdigest()
 
 
 def extract_excel_metadata(excel_path: str) -> dict[str, Any]:
@@ -466,6 +472,7 @@ def activate_import(conn: sqlite3.Connection, import_batch_id: int, user: str |
         """,
         (user, now, now, int(import_batch_id)),
     )
+    bump_decision_matrix_version(conn, f"import_activated:{int(import_batch_id)}")
     return get_import_batch(conn, import_batch_id) or {"id": import_batch_id, "status": "active"}
 
 
@@ -9,7 +9,12 @@ from datetime import datetime, timezone
 from typing import Any
 
 from app.db.schema_compat import ensure_import_governance_schema
-from app.services.import_audit_service import get_import_batch, list_import_rows
+from app.services.import_audit_service import (
+    _column_names,
+    _source_row_table,
+    _table_exists,
+    get_import_batch,
+)
 
 IGNORED_FIELDS = {
     "row_id",
@@ -100,34 +105,181 @@ def find_previous_import_batch(conn: sqlite3.Connection, import_batch_id: int) -
     return int(row[0]) if row and row[0] is not None else None
 
 
+_ROW_COLUMNS = ("rid", "row_no", "matched_ders_id", "ders_kodu", "ders_adi", "row_id", "row_hash", "normalized_row_json")
+
+
+def _sql_entity_key(matched_ders_id: Any, ders_kodu: Any, ders_adi: Any, row_no: Any, row_id: Any) -> str:
+    return _entity_key(
+        {"matched_ders_id": matched_ders_id, "ders_kodu": ders_kodu, "ders_adi": ders_adi, "row_no": row_no, "row_id": row_id}
+    )
+
+
+def _batch_row_source(conn: sqlite3.Connection, import_batch_id: int) -> tuple[str, tuple[Any, ...], str | None] | None:
+    """Batch satirlarini standart kolonlarla veren alt sorgu.
+
+    Kaynak secimi ``list_import_rows`` ile aynidir: import tipinin satir tablosu,
+    orada satir yoksa staging tablosu. Ucuncu eleman tam satirin okunacagi tablodur.
+    """
+    batch = get_import_batch(conn, import_batch_id)
+    if not batch:
+        return None
+    cur = conn.cursor()
+    table = _source_row_table(batch.get("import_type"))
+    if table is not None and _table_exists(cur, table):
+        cols = _column_names(cur, table)
+        if "import_batch_id" in cols:
+            where, param = "import_batch_id = ?", int(import_batch_id)
+        elif batch.get("source_import_id") is not None:
+            where, param = "import_id = ?", int(batch["source_import_id"])
+        else:
+            return None
+        cur.execute(f"SELECT 1 FROM {table} WHERE {where} LIMIT 1", (param,))
+        if cur.fetchone():
+            select = ", ".join(
+                f"{name} AS {name}" if name in cols else f"NULL AS {name}" for name in _ROW_COLUMNS[1:]
+            )
+            return f"SELECT rowid AS rid, {select} FROM {table} WHERE {where}", (param,), table
+    if not _table_exists(cur, "import_staging_rows"):
+        return None
+    return (
+        """
+        SELECT id AS rid, row_number AS row_no, matched_ders_id, NULL AS ders_kodu, NULL AS ders_adi,
+               NULL AS row_id, row_hash, normalized_row_json
+        FROM import_staging_rows
+        WHERE import_batch_id = ?
+        """,
+        (int(import_batch_id),),
+        None,
+    )
+
+
+def _latest_per_entity(source_sql: str) -> str:
+    # Ayni entity key'e sahip birden fazla satir varsa (eski dict davranisi gibi) son satir kazanir.
+    return f"""
+        SELECT * FROM (
+            SELECT s.*,
+                   import_entity_key(s.matched_ders_id, s.ders_kodu, s.ders_adi, s.row_no, s.row_id) AS entity_key,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY import_entity_key(s.matched_ders_id, s.ders_kodu, s.ders_adi, s.row_no, s.row_id)
+                       ORDER BY s.row_no DESC, s.rid DESC
+                   ) AS entity_rank
+            FROM ({source_sql}) s
+        )
+        WHERE entity_rank = 1
+    """
+
+
+def _pair_rows(
+    conn: sqlite3.Connection,
+    current_source: tuple[str, tuple[Any, ...], str | None] | None,
+    previous_source: tuple[str, tuple[Any, ...], str | None] | None,
+) -> list[tuple[Any, ...]]:
+    """Faz 1: iki batch'i SQL'de entity key uzerinden eslestirir, row_hash esitligini isaretler."""
+    empty = ("SELECT " + ", ".join(f"NULL AS {name}" for name in _ROW_COLUMNS) + " WHERE 0", ())
+    conn.create_function("import_entity_key", 5, _sql_entity_key, deterministic=True)
+    cur = conn.cursor()
+    sides = (("import_diff_current", current_source), ("import_diff_previous", previous_source))
+    try:
+        for name, source in sides:
+            source_sql, params = source[:2] if source else empty
+            cur.execute(f"DROP TABLE IF EXISTS temp.{name}")
+            cur.execute(f"CREATE TEMP TABLE {name} AS {_latest_per_entity(source_sql)}", params)
+            cur.execute(f"CREATE INDEX temp.ix_{name}_key ON {name} (entity_key)")
+        cur.execute(
+            """
+            SELECT c.entity_key,
+                   c.rid, c.matched_ders_id, c.normalized_row_json,
+                   p.rid, p.matched_ders_id, p.normalized_row_json,
+                   CASE WHEN c.row_hash IS NOT NULL AND c.row_hash = p.row_hash THEN 1 ELSE 0 END AS same_hash
+            FROM temp.import_diff_current c
+            LEFT JOIN temp.import_diff_previous p ON p.entity_key = c.entity_key
+            UNION ALL
+            SELECT p.entity_key,
+                   NULL, NULL, NULL,
+                   p.rid, p.matched_ders_id, p.normalized_row_json,
+                   0
+            FROM temp.import_diff_previous p
+            WHERE NOT EXISTS (SELECT 1 FROM temp.import_diff_current c WHERE c.entity_key = p.entity_key)
+            """
+        )
+        return [tuple(row) for row in cur.fetchall()]
+    finally:
+        for name, _source in sides:
+            cur.execute(f"DROP TABLE IF EXISTS temp.{name}")
+
+
+def _full_row(conn: sqlite3.Connection, table: str | None, rid: Any) -> dict[str, Any]:
+    if table is None or rid is None:
+        return {}
+    cur = conn.cursor()
+    cur.execute(f"SELECT * FROM {table} WHERE rowid = ?", (rid,))
+    row = cur.fetchone()
+    if row is None:
+        return {}
+    return {desc[0]: row[idx] for idx, desc in enumerate(cur.description)}
+
+
+def _normalized_side(
+    conn: sqlite3.Connection,
+    source: tuple[str, tuple[Any, ...], str | None] | None,
+    rid: Any,
+    raw_json: Any,
+    matched_ders_id: Any,
+) -> tuple[dict[str, Any], str]:
+    """(normalize satir, JSON metni). JSON zaten saklandiysa yeniden uretilmez."""
+    if raw_json:
+        try:
+            data = json.loads(str(raw_json))
+            if isinstance(data, dict):
+                return data, str(raw_json)
+        except Exception:
+            pass
+    table = source[2] if source else None
+    row = _full_row(conn, table, rid) if table else {"matched_ders_id": matched_ders_id, "normalized_row_json": raw_json}
+    normalized = _load_normalized_row(row)
+    return normalized, _json_dumps(normalized)
+
+
+def _stored_json(
+    conn: sqlite3.Connection,
+    source: tuple[str, tuple[Any, ...], str | None] | None,
+    rid: Any,
+    raw_json: Any,
+    matched_ders_id: Any,
+) -> str:
+    if raw_json:
+        return str(raw_json)
+    return _normalized_side(conn, source, rid, raw_json, matched_ders_id)[1]
+
+
 def recalculate_import_diff(
     conn: sqlite3.Connection,
     import_batch_id: int,
     compared_to_import_batch_id: int | None = None,
 ) -> dict[str, Any]:
+    """Iki fazli diff: SQL'de entity key + row_hash eslestirmesi, yalnizca hash'i farkli
+    satirlarda alan bazli karsilastirma; diff kalemleri toplu yazilir."""
     ensure_import_governance_schema(conn, commit=False)
     current_batch = get_import_batch(conn, int(import_batch_id))
     if not current_batch:
         raise ValueError("Import batch bulunamadi.")
     compared_to_import_batch_id = compared_to_import_batch_id or find_previous_import_batch(conn, int(import_batch_id))
 
-    current_rows = list_import_rows(conn, int(import_batch_id), limit=100000)
-    previous_rows = (
-        list_import_rows(conn, int(compared_to_import_batch_id), limit=100000)
+    current_source = _batch_row_source(conn, int(import_batch_id))
+    previous_source = (
+        _batch_row_source(conn, int(compared_to_import_batch_id))
         if compared_to_import_batch_id is not None
-        else []
+        else None
     )
-    current_map = {_entity_key(row): row for row in current_rows}
-    previous_map = {_entity_key(row): row for row in previous_rows}
-    all_keys = sorted(set(current_map) | set(previous_map))
+    pairs = sorted(_pair_rows(conn, current_source, previous_source), key=lambda pair: str(pair[0]))
 
     items: list[dict[str, Any]] = []
     added = removed = changed = unchanged = 0
-    for key in all_keys:
-        before = previous_map.get(key)
-        after = current_map.get(key)
-        course_id = (after or before or {}).get("matched_ders_id")
-        if before is None and after is not None:
+    for key, after_rid, after_course, after_raw, before_rid, before_course, before_raw, same_hash in pairs:
+        has_after = after_rid is not None
+        has_before = before_rid is not None
+        course_id = after_course if has_after else before_course
+        if has_after and not has_before:
             added += 1
             items.append(
                 {
@@ -135,27 +287,42 @@ def recalculate_import_diff(
                     "entity_key": key,
                     "course_id": course_id,
                     "before_row_json": None,
-                    "after_row_json": _json_dumps(_load_normalized_row(after)),
+                    "after_row_json": _stored_json(conn, current_source, after_rid, after_raw, after_course),
                     "message": f"{key} yeni importta eklendi.",
                 }
             )
             continue
-        if after is None and before is not None:
+        if has_before and not has_after:
             removed += 1
             items.append(
                 {
                     "change_type": "removed",
                     "entity_key": key,
                     "course_id": course_id,
-                    "before_row_json": _json_dumps(_load_normalized_row(before)),
+                    "before_row_json": _stored_json(conn, previous_source, before_rid, before_raw, before_course),
                     "after_row_json": None,
                     "message": f"{key} yeni dosyada bulunmuyor.",
                 }
             )
             continue
 
-        before_norm = _load_normalized_row(before or {})
-        after_norm = _load_normalized_row(after or {})
+        if same_hash and before_raw and after_raw:
+            # Faz 1 sonucu: ayni row_hash => normalize satirlar ayni, alan karsilastirmasi gereksiz.
+            unchanged += 1
+            items.append(
+                {
+                    "change_type": "unchanged",
+                    "entity_key": key,
+                    "course_id": course_id,
+                    "before_row_json": str(before_raw),
+                    "after_row_json": str(after_raw),
+                    "message": f"{key} degismedi.",
+                }
+            )
+            continue
+
+        before_norm, before_json = _normalized_side(conn, previous_source, before_rid, before_raw, before_course)
+        after_norm, after_json = _normalized_side(conn, current_source, after_rid, after_raw, after_course)
         changed_fields = []
         for field in sorted(set(before_norm) | set(after_norm)):
             if field in IGNORED_FIELDS:
@@ -175,8 +342,8 @@ def recalculate_import_diff(
                         "field_name": field,
                         "before_value": None if before_value is None else str(before_value),
                         "after_value": None if after_value is None else str(after_value),
-                        "before_row_json": _json_dumps(before_norm),
-                        "after_row_json": _json_dumps(after_norm),
+                        "before_row_json": before_json,
+                        "after_row_json": after_json,
                         "message": f"{key} icin {field} degeri degisti.",
                     }
                 )
@@ -187,8 +354,8 @@ def recalculate_import_diff(
                     "change_type": "unchanged",
                     "entity_key": key,
                     "course_id": course_id,
-                    "before_row_json": _json_dumps(before_norm),
-                    "after_row_json": _json_dumps(after_norm),
+                    "before_row_json": before_json,
+                    "after_row_json": after_json,
                     "message": f"{key} degismedi.",
                 }
             )
@@ -224,15 +391,15 @@ def recalculate_import_diff(
         ),
     )
     diff_id = int(cur.lastrowid or 0)
-    for item in items:
-        cur.execute(
-            """
-            INSERT INTO import_diff_items (
-                import_diff_id, change_type, entity_key, course_id, field_name,
-                before_value, after_value, before_row_json, after_row_json, message
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+    cur.executemany(
+        """
+        INSERT INTO import_diff_items (
+            import_diff_id, change_type, entity_key, course_id, field_name,
+            before_value, after_value, before_row_json, after_row_json, message
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
             (
                 diff_id,
                 item.get("change_type"),
@@ -244,8 +411,10 @@ def recalculate_import_diff(
                 item.get("before_row_json"),
                 item.get("after_row_json"),
                 item.get("message"),
-            ),
-        )
+            )
+            for item in items
+        ),
+    )
     return {"id": diff_id, **summary, "items": items}
 
 
@@ -6,9 +6,12 @@ from __future__ import annotations
 import json
 import sqlite3
 from datetime import datetime, timezone
-from typing import Any
+from itertools import islice
+from typing import Any, Iterable
 
-from app.services.import_audit_service import calculate_row_hash
+from app.services.import_audit_service import row_hash_from_json
+
+STAGING_CHUNK_SIZE = 5000
 
 
 def _now() -> str:
@@ -51,8 +54,13 @@ def stage_import(
     import_batch_id: int,
     import_type: str,
     payload: dict[str, Any],
-    rows: list[dict[str, Any]],
+    rows: Iterable[dict[str, Any]],
 ) -> dict[str, Any]:
+    """Payload'u ve satirlari stage eder; ``rows`` herhangi bir iterable olabilir.
+
+    Satirlar ``STAGING_CHUNK_SIZE`` parcalar halinde tuketilir, boylece bir
+    generator verildiginde belgenin tamami bellege alinmaz.
+    """
     ensure_import_staging_schema(conn)
     batch_id = int(import_batch_id)
     conn.execute("DELETE FROM import_staging_rows WHERE import_batch_id = ?", (batch_id,))
@@ -65,28 +73,39 @@ def stage_import(
         """,
         (batch_id, str(import_type), json.dumps(payload, ensure_ascii=False, default=str), _now()),
     )
-    for index, row in enumerate(rows, start=1):
-        normalized = dict(row)
-        row_number = int(normalized.get("row_no") or normalized.get("row_number") or index)
-        conn.execute(
+    created_at = _now()
+
+    def staged_values(chunk_start: int, chunk: list[dict[str, Any]]):
+        for index, row in enumerate(chunk, start=chunk_start):
+            normalized = dict(row)
+            row_json = json.dumps(normalized, ensure_ascii=False, sort_keys=True, default=str)
+            yield (
+                batch_id,
+                str(import_type),
+                int(normalized.get("row_no") or normalized.get("row_number") or index),
+                row_json,
+                row_hash_from_json(row_json),
+                str(normalized.get("row_status") or "matched"),
+                normalized.get("matched_ders_id") or normalized.get("course_id"),
+                created_at,
+            )
+
+    # Parca parca executemany: satir basina Python->SQLite gidis-donusu yerine parca basina bir cagri.
+    # Transaction sinirini cagiran belirler (import akisi tek atomik birim olarak commit/rollback eder).
+    iterator = iter(rows)
+    staged_count = 0
+    while chunk := list(islice(iterator, STAGING_CHUNK_SIZE)):
+        conn.executemany(
             """
             INSERT INTO import_staging_rows
                 (import_batch_id, import_type, row_number, normalized_row_json,
                  row_hash, row_status, matched_ders_id, created_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                batch_id,
-                str(import_type),
-                row_number,
-                json.dumps(normalized, ensure_ascii=False, sort_keys=True, default=str),
-                calculate_row_hash(normalized),
-                str(normalized.get("row_status") or "matched"),
-                normalized.get("matched_ders_id") or normalized.get("course_id"),
-                _now(),
-            ),
+            staged_values(staged_count + 1, chunk),
         )
-    return {"ok": True, "import_batch_id": batch_id, "staged_row_count": len(rows)}
+        staged_count += len(chunk)
+    return {"ok": True, "import_batch_id": batch_id, "staged_row_count": staged_count}
 
 
 def get_staged_payload(conn: sqlite3.Connection, import_batch_id: int) -> dict[str, Any] | None:
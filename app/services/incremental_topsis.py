@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""Tek ders kriteri degistiginde TOPSIS skorlarini artimli yeniler.
+
+TOPSIS'te bir dersin degismesi yalnizca iki ortak buyuklugu etkiler:
+
+* sutun normlari ``sqrt(sum(x_ij^2))`` -> sutun kare toplamlari tutulur,
+  duzenleme O(m) ile guncellenir (m = kriter sayisi);
+* ideal en iyi/en kotu -> her kriter icin sirali deger listesi tutulur;
+  ``w_j / norm_j >= 0`` oldugundan agirlikli matrisin uc degerleri ham uc
+  degerlerden olcekle elde edilir. Uc deger yalnizca duzenlenen ders uc
+  noktadaysa ya da uc noktaya gelirse degisir.
+
+Skorlar ardindan tek bir vektorel geciste yeniden hesaplanir; ders evreni,
+meta bilgiler ve AHP profili yeniden sorgulanmaz. Hesap
+``KararMotoru.topsis_calistir`` ile birebir ayni kurallari izler (bos deger 0,
+norm <= 1e-10 ise 1, payda <= 1e-10 ise yakinlik 0).
+
+Durumlar surec icinde (veritabani, fakulte, yil, donem) anahtariyla tutulur;
+tam hesap (``get_faculty_year_topsis_results``) her calistiginda durumu
+yeniden kurar. Durumla birlikte kuruldugu agirlik baglaminin imzasi, bolum,
+havuz derslerinin anket-only skorlari ve ders meta bilgileri saklanir; boylece
+artimli yenileme tam skor haritasini havuz tablosuna yazabilir. Artimli
+yenileme oncesinde agirliklar ve mufredat ders kumesi bunlarla karsilastirilir,
+farkliysa durum atilir.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Hashable, Iterable, Mapping, Sequence
+
+import numpy as np
+
+# Artimli kare toplamlarinda biriken yuvarlama hatasini sinirlamak icin bu
+# kadar guncellemede bir sutun toplamlari bastan hesaplanir.
+EXACT_REFRESH_INTERVAL = 4096
+
+
+class IncrementalTopsisState:
+    """Ders x kriter matrisi, sutun kare toplamlari ve kriter basina sirali degerler."""
+
+    def __init__(
+        self,
+        ders_ids: Iterable[int],
+        matrix: np.ndarray,
+        weights: Sequence[float],
+        benefit: Sequence[bool],
+        criteria_keys: Sequence[str] = ("basari", "trend", "populerlik", "anket"),
+    ) -> None:
+        self.criteria_keys = tuple(criteria_keys)
+        self.ders_ids = np.array([int(d) for d in ders_ids], dtype=np.int64)
+        values = np.array(matrix, dtype=float).reshape(len(self.ders_ids), len(self.criteria_keys))
+        self.matrix = np.nan_to_num(values, nan=0.0)
+        raw_weights = [float(w) for w in weights]
+        total = sum(raw_weights) or 1.0
+        self.weights = np.array([w / total for w in raw_weights], dtype=float)
+        self.benefit = np.array([bool(b) for b in benefit], dtype=bool)
+        self._position = {int(d): i for i, d in enumerate(self.ders_ids.tolist())}
+        self.update_count = 0
+        self.ideal_recompute_count = 0
+        self._rebuild_aggregates()
+
+    def __len__(self) -> int:
+        return int(self.ders_ids.shape[0])
+
+    def __contains__(self, ders_id: object) -> bool:
+        try:
+            return int(ders_id) in self._position  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            return False
+
+    def _rebuild_aggregates(self) -> None:
+        self.sum_squares = np.sum(np.square(self.matrix), axis=0) if len(self) else np.zeros(len(self.criteria_keys))
+        self._sorted = [sorted(self.matrix[:, j].tolist()) for j in range(len(self.criteria_keys))]
+        self._updates_since_exact = 0
+
+    def _extremes(self) -> tuple[np.ndarray, np.ndarray]:
+        lows = np.array([col[0] if col else 0.0 for col in self._sorted], dtype=float)
+        highs = np.array([col[-1] if col else 0.0 for col in self._sorted], dtype=float)
+        return lows, highs
+
+    def update(self, ders_id: int, values: Sequence[float]) -> list[str]:
+        """Bir dersin kriter degerlerini degistirir; uc degeri degisen kriterleri dondurur."""
+        row = self._position[int(ders_id)]
+        new = np.nan_to_num(np.array(values, dtype=float).reshape(len(self.criteria_keys)), nan=0.0)
+        old = self.matrix[row].copy()
+        changed_ideals: list[str] = []
+        for j, key in enumerate(self.criteria_keys):
+            if new[j] == old[j]:
+                continue
+            column = self._sorted[j]
+            low, high = column[0], column[-1]
+            del column[bisect_left(column, float(old[j]))]
+            insort(column, float(new[j]))
+            if column[0] != low or column[-1] != high:
+                changed_ideals.append(key)
+        self.sum_squares = np.maximum(self.sum_squares + np.square(new) - np.square(old), 0.0)
+        self.matrix[row] = new
+        self.update_count += 1
+        self._updates_since_exact += 1
+        if changed_ideals:
+            self.ideal_recompute_count += 1
+        if self._updates_since_exact >= EXACT_REFRESH_INTERVAL:
+            self.sum_squares = np.sum(np.square(self.matrix), axis=0)
+            self._updates_since_exact = 0
+        return changed_ideals
+
+    def closeness(self) -> np.ndarray:
+        """Tum dersler icin yakinlik katsayisi (0-1), ``ders_ids`` sirasinda."""
+        if not len(self):
+            return np.zeros(0)
+        norms = np.where(self.sum_squares > 1e-10, np.sqrt(self.sum_squares), 1.0)
+        scale = self.weights / norms
+        weighted = self.matrix * scale
+        lows, highs = self._extremes()
+        ideal_best = np.where(self.benefit, highs, lows) * scale
+        ideal_worst = np.where(self.benefit, lows, highs) * scale
+        dist_best = np.sqrt(np.sum(np.square(weighted - ideal_best), axis=1))
+        dist_worst = np.sqrt(np.sum(np.square(weighted - ideal_worst), axis=1))
+        denom = dist_best + dist_worst
+        return np.where(denom > 1e-10, dist_worst / np.where(denom > 1e-10, denom, 1.0), 0.0)
+
+    def score_map(self) -> dict[int, float]:
+        """{ders_id: Kesinlesme_Puani} (yakinlik x 100)."""
+        return {int(d): float(c) * 100.0 for d, c in zip(self.ders_ids.tolist(), self.closeness().tolist())}
+
+
+# (veritabani kimligi, fakulte_id, akademik_yil, donem anahtari)
+StateKey = tuple[str, int, int, str]
+
+_STATES: dict[StateKey, dict[str, Any]] = {}
+_STATES_LOCK = threading.Lock()
+
+
+def store_topsis_state(
+    key: StateKey,
+    state: IncrementalTopsisState,
+    pool_scores: Mapping[int, float] | None = None,
+    *,
+    weight_signature: Hashable = None,
+    department_id: int | None = None,
+    ders_meta: Mapping[int, Any] | None = None,
+) -> None:
+    with _STATES_LOCK:
+        _STATES[key] = {
+            "state": state,
+            "pool_scores": {int(d): float(v) for d, v in dict(pool_scores or {}).items()},
+            "weight_signature": weight_signature,
+            "department_id": department_id,
+            "ders_meta": dict(ders_meta or {}),
+            "lock": threading.Lock(),
+        }
+
+
+def get_topsis_state(key: StateKey) -> dict[str, Any] | None:
+    with _STATES_LOCK:
+        return _STATES.get(key)
+
+
+def discard_topsis_state(key: StateKey) -> None:
+    with _STATES_LOCK:
+        _STATES.pop(key, None)
+
+
+def topsis_state_keys(database: str, fakulte_id: int, akademik_yil: int) -> list[StateKey]:
+    with _STATES_LOCK:
+        return [key for key in _STATES if key[:3] == (database, int(fakulte_id), int(akademik_yil))]
+
+
+def invalidate_topsis_states(fakulte_id: int | None = None, akademik_yil: int | None = None) -> int:
+    """Durumlari atar (ör. veritabani dosyasi yedekten geri yuklendiginde); atilan sayiyi dondurur."""
+    with _STATES_LOCK:
+        keys = [
+            key
+            for key in _STATES
+            if (fakulte_id is None or key[1] == int(fakulte_id)) and (akademik_yil is None or key[2] == int(akademik_yil))
+        ]
+        for key in keys:
+            del _STATES[key]
+    return len(keys)
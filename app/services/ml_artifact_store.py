@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""Eğitilmiş ML modellerinin joblib artifact deposu.
+
+Model ``joblib.dump`` ile sıkıştırmadan yazılır; böylece içindeki numpy
+dizileri ``joblib.load(mmap_mode="r")`` ile belleğe kopyalanmadan
+memory-map edilir. Her artifact:
+
+* sürümlüdür: ``<algorithm_key>/run_<id>_<feature_schema_version>_<veri_izi>.joblib``,
+* içerik hash'lidir: dosyanın SHA-256 özeti ``ml_model_runs`` satırına (kayıtsız,
+  içerik adresli paketlerde yanındaki ``.sha256`` dosyasına) yazılır ve her
+  yüklemede doğrulanır (bozuk/değişmiş dosya sessizce kullanılmaz),
+* kayıt satırının yanında durur: varsayılan kök, SQLite dosyasının bulunduğu
+  klasördeki ``ml_artifacts/`` dizinidir (``ML_ARTIFACT_DIR`` ile değiştirilebilir).
+
+Her algoritma için en yeni ``ARTIFACT_RETENTION`` artifact diskte tutulur; daha
+eskileri yeni kayıttan sonra silinir.
+
+API süreci modeli ilk kullanımda diskteki en güncel uygun artifact'tan tembel
+(lazy) yükler ve sınırlı bir LRU önbellekte yeniden kullanır; tahmin yolu bir
+arama ve ``predict`` çağrısına iner.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import joblib
+
+from app.db.schema_compat import ensure_ml_governance_schema
+
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_DIRNAME = "ml_artifacts"
+ARTIFACT_DIR_ENV = "ML_ARTIFACT_DIR"
+ARTIFACT_RETENTION = 5
+DEFAULT_WARM_CACHE_SIZE = 8
+
+
+class ArtifactIntegrityError(ValueError):
+    """Artifact dosyasının hash'i kayıttaki değerle uyuşmuyor."""
+
+
+@dataclass(frozen=True)
+class ArtifactRecord:
+    path: str
+    sha256: str
+    version: str
+    size_bytes: int
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def artifact_root_for_db(db_path: str | os.PathLike[str] | None) -> Path | None:
+    override = os.getenv(ARTIFACT_DIR_ENV)
+    if override:
+        return Path(override)
+    if not db_path:
+        return None
+    return Path(db_path).resolve().parent / ARTIFACT_DIRNAME
+
+
+def artifact_root(conn: sqlite3.Connection) -> Path | None:
+    """Bağlantının ana veritabanı dosyasına göre artifact kökü; bellek içi DB için None."""
+    try:
+        rows = conn.execute("PRAGMA database_list").fetchall()
+    except sqlite3.Error:
+        return None
+    main = next((row for row in rows if row[1] == "main"), None)
+    return artifact_root_for_db(main[2] if main and main[2] else None)
+
+
+def file_sha256(path: str | os.PathLike[str]) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_artifact(path: Path, payload: dict[str, Any], *, version: str) -> ArtifactRecord:
+    """Atomik yazım: geçici dosyaya dump, sonra yerine taşı."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    joblib.dump({"format_version": ARTIFACT_FORMAT_VERSION, **payload}, tmp_path, compress=0)
+    os.replace(tmp_path, path)
+    return ArtifactRecord(path=str(path), sha256=file_sha256(path), version=version, size_bytes=path.stat().st_size)
+
+
+def read_artifact(path: str | os.PathLike[str], *, sha256: str | None = None, mmap: bool = True) -> dict[str, Any]:
+    if sha256 and file_sha256(path) != sha256:
+        raise ArtifactIntegrityError(f"Artifact hash uyuşmuyor: {path}")
+    payload = joblib.load(path, mmap_mode="r" if mmap else None)
+    if not isinstance(payload, dict) or payload.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ArtifactIntegrityError(f"Desteklenmeyen artifact formatı: {path}")
+    return payload
+
+
+def save_model_artifact(
+    conn: sqlite3.Connection,
+    run_id: int,
+    payload: dict[str, Any],
+    *,
+    algorithm_key: str,
+    feature_schema_version: str,
+    data_fingerprint: str = "",
+) -> ArtifactRecord | None:
+    """Model yükünü kaydeder ve ml_model_runs satırına bağlar; kalıcı kök yoksa None."""
+    root = artifact_root(conn)
+    if root is None:
+        return None
+    version = f"{algorithm_key}-run{int(run_id)}-{feature_schema_version}-f{ARTIFACT_FORMAT_VERSION}"
+    filename = f"run_{int(run_id):06d}_{feature_schema_version}_{data_fingerprint[:12] or 'nofp'}.joblib"
+    record = write_artifact(root / algorithm_key / filename, payload, version=version)
+    attach_artifact(conn, run_id, record)
+    prune_superseded_artifacts(conn, algorithm_key)
+    return record
+
+
+def attach_artifact(conn: sqlite3.Connection, run_id: int, record: ArtifactRecord) -> None:
+    ensure_ml_governance_schema(conn, commit=False)
+    conn.execute(
+        """
+        UPDATE ml_model_runs
+        SET artifact_path = ?, artifact_sha256 = ?, artifact_version = ?, artifact_size_bytes = ?
+        WHERE id = ?
+        """,
+        (record.path, record.sha256, record.version, int(record.size_bytes), int(run_id)),
+    )
+
+
+def find_latest_artifact_run(
+    conn: sqlite3.Connection,
+    algorithm_key: str,
+    *,
+    feature_schema_version: str | None = None,
+    training_scope_json: str | None = None,
+    data_fingerprint: str | None = None,
+    model_spec_hash: str | None = None,
+) -> dict | None:
+    """Verilen filtrelere uyan, artifact'ı olan en yeni 'trained' run."""
+    ensure_ml_governance_schema(conn, commit=False)
+    sql = [
+        "SELECT id, artifact_path, artifact_sha256, artifact_version, artifact_size_bytes",
+        "FROM ml_model_runs",
+        "WHERE algorithm_key = ? AND status = 'trained' AND artifact_path IS NOT NULL AND artifact_sha256 IS NOT NULL",
+    ]
+    params: list[Any] = [algorithm_key]
+    for column, value in (
+        ("feature_schema_version", feature_schema_version),
+        ("training_scope_json", training_scope_json),
+        ("data_fingerprint", data_fingerprint),
+        ("model_spec_hash", model_spec_hash),
+    ):
+        if value is not None:
+            sql.append(f"AND {column} = ?")
+            params.append(value)
+    sql.append("ORDER BY id DESC LIMIT 1")
+    row = conn.execute(" ".join(sql), tuple(params)).fetchone()
+    if not row:
+        return None
+    return {"run_id": int(row[0]), "record": ArtifactRecord(path=row[1], sha256=row[2], version=row[3] or "", size_bytes=int(row[4] or 0))}
+
+
+def prune_superseded_artifacts(conn: sqlite3.Connection, algorithm_key: str, *, keep: int = ARTIFACT_RETENTION) -> int:
+    """Algoritmanın en yeni ``keep`` artifact dosyası dışındakileri siler; silinen dosya sayısını döndürür.
+
+    Silinen dosyaya bağlı run satırlarının artifact kolonları boşaltılır; böylece
+    find_latest_artifact_run artık var olmayan bir dosyayı önermez.
+    """
+    ensure_ml_governance_schema(conn, commit=False)
+    rows = conn.execute(
+        "SELECT id, artifact_path FROM ml_model_runs WHERE algorithm_key = ? AND artifact_path IS NOT NULL ORDER BY id DESC",
+        (algorithm_key,),
+    ).fetchall()
+    kept: list[str] = []
+    stale_ids: list[int] = []
+    stale_paths: set[str] = set()
+    for run_id, path in rows:
+        if path in kept:
+            continue
+        if len(kept) < max(1, int(keep)):
+            kept.append(path)
+            continue
+        stale_ids.append(int(run_id))
+        stale_paths.add(path)
+    if not stale_ids:
+        return 0
+    conn.executemany(
+        """
+        UPDATE ml_model_runs
+        SET artifact_path = NULL, artifact_sha256 = NULL, artifact_version = NULL, artifact_size_bytes = NULL
+        WHERE id = ?
+        """,
+        [(run_id,) for run_id in stale_ids],
+    )
+    removed = 0
+    for path in stale_paths:
+        _WARM_CACHE.discard(path)
+        try:
+            Path(path).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+    return removed
+
+
+def _sidecar_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.sha256")
+
+
+class WarmArtifactCache:
+    """Süreç içi yüklenmiş artifact'lar için sınırlı LRU; dosya (yol + hash) değişmedikçe tekrar okunmaz."""
+
+    def __init__(self, maxsize: int = DEFAULT_WARM_CACHE_SIZE) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self._loaded: OrderedDict[str, tuple[str, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, sha256: str | None = None) -> dict[str, Any] | None:
+        with self._lock:
+            cached = self._loaded.get(key)
+            if cached is None or (sha256 is not None and cached[0] != sha256):
+                return None
+            self._loaded.move_to_end(key)
+            return cached[1]
+
+    def _put(self, key: str, sha256: str, payload: dict[str, Any]) -> None:
+        with self._lock:
+            self._loaded[key] = (sha256, payload)
+            self._loaded.move_to_end(key)
+            while len(self._loaded) > self.maxsize:
+                self._loaded.popitem(last=False)
+
+    def load(self, record: ArtifactRecord) -> dict[str, Any]:
+        cached = self._get(record.path, record.sha256)
+        if cached is not None:
+            return cached
+        payload = read_artifact(record.path, sha256=record.sha256)
+        self._put(record.path, record.sha256, payload)
+        return payload
+
+    def load_or_build(
+        self,
+        path: Path,
+        build: Callable[[], dict[str, Any]],
+        *,
+        version: str,
+        keep: int = ARTIFACT_RETENTION,
+    ) -> dict[str, Any]:
+        """İçerik adresli artifact (dosya adı = parmak izi): varsa hash'ini doğrulayıp oku, yoksa üret ve yaz.
+
+        Hash, artifact'ın yanındaki ``<ad>.sha256`` dosyasında tutulur; bu dosya
+        yoksa veya uyuşmazsa artifact yeniden üretilir. Yazımdan sonra aynı
+        klasörde en yeni ``keep`` artifact dışındakiler silinir.
+        """
+        key = str(path)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+        sidecar = _sidecar_path(path)
+        payload: dict[str, Any] | None = None
+        sha256 = ""
+        if path.exists() and sidecar.exists():
+            try:
+                sha256 = sidecar.read_text(encoding="ascii").strip()
+                payload = read_artifact(path, sha256=sha256)
+            except Exception:
+                payload = None
+        if payload is None:
+            payload = build()
+            try:
+                record = write_artifact(path, payload, version=version)
+                sidecar.write_text(record.sha256, encoding="ascii")
+                sha256 = record.sha256
+                self._prune_directory(path, keep)
+            except OSError:
+                sha256 = ""
+        self._put(key, sha256, payload)
+        return payload
+
+    def _prune_directory(self, current: Path, keep: int) -> None:
+        siblings = sorted(
+            (item for item in current.parent.glob("*.joblib") if item != current),
+            key=lambda item: item.stat().st_mtime,
+            reverse=True,
+        )
+        for stale in siblings[max(0, int(keep) - 1):]:
+            self.discard(str(stale))
+            stale.unlink(missing_ok=True)
+            _sidecar_path(stale).unlink(missing_ok=True)
+
+    def discard(self, path: str) -> None:
+        with self._lock:
+            self._loaded.pop(str(path), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._loaded.clear()
+
+    def __len__(self) -> int:
+        return len(self._loaded)
+
+
+_WARM_CACHE = WarmArtifactCache()
+
+
+def get_warm_cache() -> WarmArtifactCache:
+    return _WARM_CACHE
@@ -391,15 +391,24 @@ def save_feature_snapshot(
 
 
 def extract_features_for_course(conn: sqlite3.Connection, course_id: int, year: int) -> dict:
+    return extract_features_for_courses(conn, [int(course_id)], int(year)).get(int(course_id), {})
+
+
+def extract_features_for_courses(conn: sqlite3.Connection, course_ids: list[int], year: int) -> dict[int, dict]:
+    """Birden çok ders için feature satırları; yıl veri seti yalnızca bir kez kurulur.
+
+    Bulunamayan dersler sonuçta yer almaz. Bir ders birden fazla satırda
+    geçiyorsa ilk satır kullanılır.
+    """
     dataset = build_course_feature_dataset(conn, year=year)
     if dataset.X.empty:
         return {}
     raw = _load_raw_course_rows(conn, year=year, faculty_id=None, department_id=None)
     if "ders_id" not in raw.columns:
         return {}
-    raw = raw.reset_index(drop=True)
-    matches = raw.index[raw["ders_id"].astype(int) == int(course_id)].tolist()
-    if not matches:
-        return {}
-    idx = matches[0]
-    return dataset.X.iloc[idx].to_dict()
+    raw_ids = raw["ders_id"].astype(int).reset_index(drop=True)
+    first_row = raw_ids.drop_duplicates(keep="first")
+    positions = pd.Series(first_row.index.to_numpy(), index=first_row.to_numpy())
+    wanted = [int(course_id) for course_id in course_ids]
+    found = positions.reindex(wanted).dropna().astype(int)
+    return {int(course_id): dataset.X.iloc[int(row)].to_dict() for course_id, row in found.items()}
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""Süreç içi eğitilmiş model önbelleği (train-once, predict-many).
+
+Aynı algoritma, aynı feature şeması, aynı eğitim kapsamı ve bit-bit aynı
+eğitim verisi için model bir kez eğitilir ve değerlendirilir; sonraki tahmin
+çağrıları önbellekteki modeli kullanır. Anahtar:
+
+    (algorithm_key, feature_schema_version, training_scope_hash, data_fingerprint, model_spec_hash)
+
+``data_fingerprint`` X ve y içeriğinin hash'idir; veritabanındaki veri
+değişince parmak izi de değişir ve eski girdi kendiliğinden kullanılmaz olur.
+``model_spec_hash`` kurulan tahmincinin hiperparametrelerinin hash'idir; aynı
+algoritma anahtarı farklı ayarlarla kurulduğunda eski model kullanılmaz.
+Kapasite dolunca en uzun süredir kullanılmayan (LRU) girdi atılır.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import pandas as pd
+
+DEFAULT_MODEL_CACHE_SIZE = 16
+
+
+@dataclass(frozen=True)
+class ModelCacheKey:
+    algorithm_key: str
+    feature_schema_version: str
+    training_scope_hash: str
+    data_fingerprint: str
+    model_spec_hash: str = ""
+
+
+@dataclass
+class CachedModel:
+    model: Any
+    evaluation: Any
+    target_kind: str
+    sample_count: int
+    created_at: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+def training_scope_hash(scope: dict[str, Any]) -> str:
+    payload = json.dumps(scope, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def model_spec_hash(model: Any) -> str:
+    """Tahmincinin sınıf adı + ``get_params(deep=True)`` çıktısı üzerinden kararlı bir hash."""
+    params = model.get_params(deep=True) if hasattr(model, "get_params") else {}
+    payload = json.dumps(
+        {"class": f"{type(model).__module__}.{type(model).__qualname__}", "params": params},
+        sort_keys=True,
+        default=repr,
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_fingerprint(X: pd.DataFrame, y: pd.Series | None) -> str:
+    """Kolon adları + satır içerikleri üzerinden kararlı bir hash."""
+    digest = hashlib.sha1()
+    digest.update(json.dumps([str(c) for c in X.columns]).encode("utf-8"))
+    if len(X):
+        digest.update(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+    if y is not None and len(y):
+        digest.update(pd.util.hash_pandas_object(pd.Series(y), index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class MLModelCache:
+    """Thread-safe LRU model önbelleği."""
+
+    def __init__(self, maxsize: int = DEFAULT_MODEL_CACHE_SIZE) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self._entries: OrderedDict[ModelCacheKey, CachedModel] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: ModelCacheKey) -> CachedModel | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: ModelCacheKey, entry: CachedModel) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_train(self, key: ModelCacheKey, train: Callable[[], CachedModel]) -> tuple[CachedModel, bool]:
+        """(girdi, önbellekten_mi) döndürür. Eğitim kilit dışında yapılır."""
+        entry = self.get(key)
+        if entry is not None:
+            return entry, True
+        entry = train()
+        self.put(key, entry)
+        return entry, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+_MODEL_CACHE = MLModelCache()
+
+
+def get_model_cache() -> MLModelCache:
+    return _MODEL_CACHE
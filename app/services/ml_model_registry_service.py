@@ -47,6 +47,8 @@ def create_model_run(
     status: str = "created",
     created_by: str | None = None,
     notes: str | None = None,
+    data_fingerprint: str | None = None,
+    model_spec_hash: str | None = None,
 ) -> int:
     ensure_ml_governance_schema(conn, commit=False)
     cur = conn.cursor()
@@ -56,9 +58,10 @@ def create_model_run(
             algorithm_key, model_name, model_type, usage_role, model_version,
             feature_schema_version, training_scope_json, training_sample_count,
             target_column, class_distribution_json, parameters_json, readiness_level,
-            readiness_warnings_json, status, created_at, created_by, notes
+            readiness_warnings_json, status, created_at, created_by, notes, data_fingerprint,
+            model_spec_hash
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (
             algorithm_key,
@@ -78,6 +81,8 @@ def create_model_run(
             _now(),
             created_by,
             notes,
+            data_fingerprint,
+            model_spec_hash,
         ),
     )
     return int(cur.lastrowid or 0)
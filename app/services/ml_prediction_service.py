@@ -8,14 +8,18 @@ import sqlite3
 from datetime import datetime
 from typing import Any
 
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.naive_bayes import GaussianNB
-from sklearn.tree import DecisionTreeClassifier
 
 from app.db.schema_compat import ensure_ml_governance_schema
 from app.services.ml_algorithm_registry_service import get_algorithm_config
+from app.services.ml_artifact_store import (
+    ArtifactIntegrityError,
+    attach_artifact,
+    find_latest_artifact_run,
+    get_warm_cache,
+    save_model_artifact,
+)
 from app.services.ml_confidence_service import estimate_prediction_confidence
 from app.services.ml_evaluation_service import (
     evaluate_classification_model,
@@ -27,7 +31,15 @@ from app.services.ml_explainability_service import (
 )
 from app.services.ml_feature_pipeline import (
     build_course_feature_dataset,
-    extract_features_for_course,
+    extract_features_for_courses,
+)
+from app.services.ml_model_cache import (
+    CachedModel,
+    ModelCacheKey,
+    dataset_fingerprint,
+    get_model_cache,
+    model_spec_hash,
+    training_scope_hash,
 )
 from app.services.ml_model_registry_service import (
     create_model_run,
@@ -36,6 +48,7 @@ from app.services.ml_model_registry_service import (
     mark_trained,
 )
 from app.services.ml_readiness_service import check_model_readiness
+from app.services.ml_training_service import _build_model
 
 
 def _now() -> str:
@@ -57,10 +70,65 @@ def predict_course(
     prediction_type: str = "status",
 ) -> dict:
     """Tek ders için destekleyici ML tahmini üretir ve ml_predictions tablosuna yazar."""
+    return predict_batch(
+        conn,
+        algorithm_key=algorithm_key,
+        course_ids=[int(course_id)],
+        year=year,
+        faculty_id=faculty_id,
+        department_id=department_id,
+        prediction_type=prediction_type,
+    )[0]
+
+
+def predict_batch(
+    conn: sqlite3.Connection,
+    *,
+    algorithm_key: str,
+    course_ids: list[int],
+    year: int,
+    faculty_id: int | None = None,
+    department_id: int | None = None,
+    prediction_type: str = "status",
+) -> list[dict]:
+    """Ders listesi için tek model çalıştırması: bir kez eğit/değerlendir, hepsini tek seferde skorla.
+
+    Eğitilmiş model süreç içi LRU önbellekte tutulur (bkz. ml_model_cache);
+    aynı kapsam ve aynı veri için sonraki çağrılar yeniden eğitim yapmaz.
+    Önbellekte yoksa önce diskteki en güncel uygun artifact yüklenir (bkz.
+    ml_artifact_store); o da yoksa model eğitilip artifact olarak kaydedilir.
+    ml_model_runs tablosuna çağrı başına tek satır yazılır.
+    """
     ensure_ml_governance_schema(conn, commit=False)
     cfg = get_algorithm_config(conn, algorithm_key)
+    year = int(year)
+    course_ids = [int(course_id) for course_id in course_ids]
+    if not course_ids:
+        return []
+    scope = {"year": year, "faculty_id": faculty_id, "department_id": department_id}
     dataset = build_course_feature_dataset(conn, year=year, faculty_id=faculty_id, department_id=department_id)
     readiness = check_model_readiness(conn, cfg.algorithm_key, dataset, target_column="target_status")
+
+    def fallback(course_id: int, method: str, reason: str) -> dict:
+        return fallback_prediction(
+            conn,
+            algorithm_key=cfg.algorithm_key,
+            course_id=course_id,
+            year=year,
+            faculty_id=faculty_id,
+            department_id=department_id,
+            prediction_type=prediction_type,
+            fallback_method=method,
+            fallback_reason=reason,
+        )
+
+    cache_key = ModelCacheKey(
+        algorithm_key=cfg.algorithm_key,
+        feature_schema_version=dataset.feature_schema_version,
+        training_scope_hash=training_scope_hash(scope),
+        data_fingerprint=dataset_fingerprint(dataset.X, dataset.y),
+        model_spec_hash=model_spec_hash(_build_model(cfg.algorithm_key, n_samples=len(dataset.X))),
+    )
     model_run_id = create_model_run(
         conn,
         algorithm_key=cfg.algorithm_key,
@@ -71,160 +139,239 @@ def predict_course(
         feature_schema_version=dataset.feature_schema_version,
         training_sample_count=dataset.sample_count,
         target_column="target_status",
-        training_scope={"year": year, "faculty_id": faculty_id, "department_id": department_id},
+        training_scope=scope,
         class_distribution=readiness.samples_per_class,
-        parameters={"advisory_only": True},
+        parameters={"advisory_only": True, "batch_size": len(course_ids)},
         readiness_level=readiness.readiness_level,
         readiness_warnings=readiness.warnings + readiness.blocking_reasons,
+        data_fingerprint=cache_key.data_fingerprint,
+        model_spec_hash=cache_key.model_spec_hash,
     )
 
     if not readiness.is_ready or not readiness.can_train:
         reason = "; ".join(readiness.blocking_reasons or readiness.warnings or ["Model readiness koşulları sağlanmadı."])
         mark_skipped(conn, model_run_id, reason)
-        return fallback_prediction(
-            conn,
-            algorithm_key=cfg.algorithm_key,
-            course_id=course_id,
-            year=year,
-            faculty_id=faculty_id,
-            department_id=department_id,
-            prediction_type=prediction_type,
-            fallback_method="rule_based_status_estimator" if prediction_type == "status" else "historical_average",
-            fallback_reason=reason,
-        )
+        method = "rule_based_status_estimator" if prediction_type == "status" else "historical_average"
+        return [fallback(course_id, method, reason) for course_id in course_ids]
 
     try:
-        X = dataset.X
-        y = dataset.y
-        course_features = extract_features_for_course(conn, int(course_id), int(year))
-        if not course_features:
+        course_features = extract_features_for_courses(conn, course_ids, year)
+        scored_ids = [course_id for course_id in dict.fromkeys(course_ids) if course_features.get(course_id)]
+        if not scored_ids:
             reason = "Seçili ders için feature satırı bulunamadı."
             mark_skipped(conn, model_run_id, reason)
-            return fallback_prediction(
+            return [fallback(course_id, "no_prediction", reason) for course_id in course_ids]
+        X_rows = pd.DataFrame([course_features[course_id] for course_id in scored_ids], columns=dataset.feature_names).fillna(0.0)
+        cached, cache_hit = get_model_cache().get_or_train(
+            cache_key, lambda: _load_or_train_model(conn, cfg, dataset, scope, cache_key)
+        )
+        model = cached.model
+        raw_predictions: Any = model.predict(X_rows)
+        probabilities: list[float | None] = [None] * len(scored_ids)
+        if cached.target_kind == "classification" and hasattr(model, "predict_proba"):
+            try:
+                probabilities = [float(p) for p in np.max(model.predict_proba(X_rows), axis=1)]
+            except Exception:
+                probabilities = [None] * len(scored_ids)
+        artifact = _persist_artifact(conn, model_run_id, cfg, dataset, cached, cache_key.data_fingerprint)
+        marked = mark_trained(
+            conn,
+            model_run_id,
+            train_metrics=cached.evaluation.train_metrics,
+            validation_metrics=cached.evaluation.validation_metrics,
+            cross_validation=cached.evaluation.cross_validation,
+            overfitting_report=cached.evaluation.overfitting_report,
+            artifact_path=artifact.path if artifact else None,
+        )
+        marked = marked | {"model_cache_hit": cache_hit, "artifact_loaded": bool(cached.metadata.get("loaded_from_artifact"))}
+    except Exception as exc:
+        mark_failed(conn, model_run_id, str(exc))
+        return [fallback(course_id, "no_prediction", f"Model tahmini çalışmadı: {exc}") for course_id in course_ids]
+
+    by_course: dict[int, dict] = {}
+    for position, course_id in enumerate(scored_ids):
+        try:
+            by_course[course_id] = _save_model_prediction(
                 conn,
-                algorithm_key=cfg.algorithm_key,
+                cfg=cfg,
+                model=model,
+                model_run_id=model_run_id,
+                marked=marked,
+                dataset=dataset,
+                readiness=readiness,
+                evaluation=cached.evaluation,
+                target_kind=cached.target_kind,
+                raw_prediction=raw_predictions[position],
+                probability=probabilities[position],
+                X_row=X_rows.iloc[[position]],
                 course_id=course_id,
                 year=year,
                 faculty_id=faculty_id,
                 department_id=department_id,
                 prediction_type=prediction_type,
-                fallback_method="no_prediction",
-                fallback_reason=reason,
             )
-        X_row = pd.DataFrame([course_features], columns=dataset.feature_names).fillna(0.0)
-        model = _build_model(cfg.algorithm_key)
-        if cfg.algorithm_type == "regression":
-            target = X["previous_topsis_score"].astype(float) if "previous_topsis_score" in X.columns else dataset.y
-            if target is None or len(pd.Series(target).dropna()) < 2:
-                raise ValueError("Regresyon hedef değişkeni yetersiz.")
-            evaluation = evaluate_regression_model(model, X, target)
-            model.fit(X, target)
-            reg_predictions: Any = model.predict(X_row)
-            predicted_numeric = float(reg_predictions[0])
-            predicted_text = f"{predicted_numeric:.2f}"
-        else:
-            if y is None or pd.Series(y).nunique() < 2:
-                raise ValueError("Sınıflandırma hedef değişkeni yetersiz.")
-            evaluation = evaluate_classification_model(model, X, y)
-            model.fit(X, y)
-            cls_predictions: Any = model.predict(X_row)
-            pred = cls_predictions[0]
-            predicted_numeric = float(pred) if str(pred).lstrip("-").isdigit() else None
-            predicted_text = str(pred)
+        except Exception as exc:
+            by_course[course_id] = fallback(course_id, "no_prediction", f"Model tahmini çalışmadı: {exc}")
+    missing_reason = "Seçili ders için feature satırı bulunamadı."
+    return [
+        by_course[course_id] if course_id in by_course else fallback(course_id, "no_prediction", missing_reason)
+        for course_id in course_ids
+    ]
 
-        marked = mark_trained(
+
+def _load_or_train_model(conn: sqlite3.Connection, cfg, dataset, scope: dict, cache_key: ModelCacheKey) -> CachedModel:
+    """Aynı şema/kapsam/veri/model ayarı için kaydedilmiş artifact varsa onu yükler, yoksa eğitir."""
+    latest = find_latest_artifact_run(
+        conn,
+        cfg.algorithm_key,
+        feature_schema_version=dataset.feature_schema_version,
+        training_scope_json=json.dumps(scope, ensure_ascii=False, sort_keys=True),
+        data_fingerprint=cache_key.data_fingerprint,
+        model_spec_hash=cache_key.model_spec_hash,
+    )
+    if latest is not None:
+        record = latest["record"]
+        try:
+            payload = get_warm_cache().load(record)
+            return CachedModel(
+                model=payload["model"],
+                evaluation=payload["evaluation"],
+                target_kind=str(payload["target_kind"]),
+                sample_count=int(payload.get("sample_count") or dataset.sample_count),
+                created_at=str(payload.get("created_at") or _now()),
+                metadata={"artifact": record, "source_run_id": latest["run_id"], "loaded_from_artifact": True},
+            )
+        except (OSError, KeyError, ArtifactIntegrityError):
+            pass
+    return _train_cached_model(cfg, dataset)
+
+
+def _persist_artifact(conn: sqlite3.Connection, model_run_id: int, cfg, dataset, cached: CachedModel, fingerprint: str):
+    """Modeli ilk kez kaydeder; daha önce kaydedildiyse aynı artifact'ı bu run'a bağlar."""
+    record = cached.metadata.get("artifact")
+    if record is not None:
+        attach_artifact(conn, model_run_id, record)
+        return record
+    try:
+        record = save_model_artifact(
             conn,
             model_run_id,
-            train_metrics=evaluation.train_metrics,
-            validation_metrics=evaluation.validation_metrics,
-            cross_validation=evaluation.cross_validation,
-            overfitting_report=evaluation.overfitting_report,
-        )
-        confidence = estimate_prediction_confidence(
-            model,
-            predicted_text,
-            X_row,
             {
-                "sample_count": dataset.sample_count,
-                "required_min_samples": cfg.min_training_samples,
-                "validation_metrics": evaluation.validation_metrics,
-                "model_type": cfg.algorithm_type,
-                "readiness_level": readiness.readiness_level,
-                "overfitting_report": evaluation.overfitting_report,
-                "missing_feature_ratio": _dataset_missing_ratio(dataset),
+                "model": cached.model,
+                "evaluation": cached.evaluation,
+                "target_kind": cached.target_kind,
+                "sample_count": cached.sample_count,
+                "created_at": cached.created_at,
             },
-        )
-        # Registry rolü production_decision değilse tahmin karara etki edemez.
-        should_influence = confidence.should_influence_decision and cfg.usage_role == "production_decision"
-        explanation = (
-            f"{cfg.display_name} destekleyici tahmini: {predicted_text}. "
-            f"Güven: {confidence.confidence_score:.2f} / {confidence.confidence_level}. "
-            "Bu tahmin nihai karara etki etmemiştir; nihai karar AHP/TOPSIS + kurallar + state machine ile verilir."
-        )
-        prediction_id = save_prediction(
-            conn,
-            model_run_id=model_run_id,
-            algorithm_key=cfg.algorithm_key,
-            course_id=course_id,
-            year=year,
-            faculty_id=faculty_id,
-            department_id=department_id,
-            prediction_type=prediction_type,
-            predicted_value_text=predicted_text,
-            predicted_value_numeric=predicted_numeric,
-            confidence_score=confidence.confidence_score,
-            confidence_level=confidence.confidence_level,
-            uncertainty_reasons=confidence.uncertainty_reasons,
-            fallback_used=False,
-            advisory_only=True,
-            should_influence_decision=should_influence,
-            explanation=explanation,
-        )
-        ml_explanation = explain_model_prediction(
-            model,
-            X_row,
-            dataset.feature_names,
-            cfg.algorithm_key,
-            readiness_level=readiness.readiness_level,
-            sample_count=dataset.sample_count,
-        )
-        save_prediction_explanation(conn, prediction_id, ml_explanation)
-        return get_prediction(conn, prediction_id) | {"model_run": marked, "readiness": readiness.as_dict(), "ml_explanation": ml_explanation.as_dict()}
-    except Exception as exc:
-        mark_failed(conn, model_run_id, str(exc))
-        return fallback_prediction(
-            conn,
             algorithm_key=cfg.algorithm_key,
-            course_id=course_id,
-            year=year,
-            faculty_id=faculty_id,
-            department_id=department_id,
-            prediction_type=prediction_type,
-            fallback_method="no_prediction",
-            fallback_reason=f"Model tahmini çalışmadı: {exc}",
+            feature_schema_version=dataset.feature_schema_version,
+            data_fingerprint=fingerprint,
         )
+    except OSError:
+        return None
+    if record is not None:
+        cached.metadata["artifact"] = record
+    return record
+
+
+def _train_cached_model(cfg, dataset) -> CachedModel:
+    X = dataset.X
+    model = _build_model(cfg.algorithm_key, n_samples=len(X))
+    if cfg.algorithm_type == "regression":
+        target = X["previous_topsis_score"].astype(float) if "previous_topsis_score" in X.columns else dataset.y
+        if target is None or len(pd.Series(target).dropna()) < 2:
+            raise ValueError("Regresyon hedef değişkeni yetersiz.")
+        evaluation = evaluate_regression_model(model, X, target)
+        model.fit(X, target)
+        target_kind = "regression"
+    else:
+        y = dataset.y
+        if y is None or pd.Series(y).nunique() < 2:
+            raise ValueError("Sınıflandırma hedef değişkeni yetersiz.")
+        evaluation = evaluate_classification_model(model, X, y)
+        model.fit(X, y)
+        target_kind = "classification"
+    return CachedModel(model=model, evaluation=evaluation, target_kind=target_kind, sample_count=dataset.sample_count, created_at=_now())
 
 
-def predict_batch(
+def _save_model_prediction(
     conn: sqlite3.Connection,
     *,
-    algorithm_key: str,
-    course_ids: list[int],
+    cfg,
+    model,
+    model_run_id: int,
+    marked: dict,
+    dataset,
+    readiness,
+    evaluation,
+    target_kind: str,
+    raw_prediction: Any,
+    probability: float | None,
+    X_row: pd.DataFrame,
+    course_id: int,
     year: int,
-    faculty_id: int | None = None,
-    department_id: int | None = None,
-) -> list[dict]:
-    return [
-        predict_course(
-            conn,
-            algorithm_key=algorithm_key,
-            course_id=int(course_id),
-            year=int(year),
-            faculty_id=faculty_id,
-            department_id=department_id,
-        )
-        for course_id in course_ids
-    ]
+    faculty_id: int | None,
+    department_id: int | None,
+    prediction_type: str,
+) -> dict:
+    if target_kind == "regression":
+        predicted_numeric: float | None = float(raw_prediction)
+        predicted_text = f"{predicted_numeric:.2f}"
+    else:
+        predicted_numeric = float(raw_prediction) if str(raw_prediction).lstrip("-").isdigit() else None
+        predicted_text = str(raw_prediction)
+
+    confidence = estimate_prediction_confidence(
+        model,
+        predicted_text,
+        X_row,
+        {
+            "sample_count": dataset.sample_count,
+            "required_min_samples": cfg.min_training_samples,
+            "validation_metrics": evaluation.validation_metrics,
+            "model_type": cfg.algorithm_type,
+            "readiness_level": readiness.readiness_level,
+            "overfitting_report": evaluation.overfitting_report,
+            "missing_feature_ratio": _dataset_missing_ratio(dataset),
+            "probability": probability,
+        },
+    )
+    # Registry rolü production_decision değilse tahmin karara etki edemez.
+    should_influence = confidence.should_influence_decision and cfg.usage_role == "production_decision"
+    explanation = (
+        f"{cfg.display_name} destekleyici tahmini: {predicted_text}. "
+        f"Güven: {confidence.confidence_score:.2f} / {confidence.confidence_level}. "
+        "Bu tahmin nihai karara etki etmemiştir; nihai karar AHP/TOPSIS + kurallar + state machine ile verilir."
+    )
+    prediction_id = save_prediction(
+        conn,
+        model_run_id=model_run_id,
+        algorithm_key=cfg.algorithm_key,
+        course_id=course_id,
+        year=year,
+        faculty_id=faculty_id,
+        department_id=department_id,
+        prediction_type=prediction_type,
+        predicted_value_text=predicted_text,
+        predicted_value_numeric=predicted_numeric,
+        confidence_score=confidence.confidence_score,
+        confidence_level=confidence.confidence_level,
+        uncertainty_reasons=confidence.uncertainty_reasons,
+        fallback_used=False,
+        advisory_only=True,
+        should_influence_decision=should_influence,
+        explanation=explanation,
+    )
+    ml_explanation = explain_model_prediction(
+        model,
+        X_row,
+        dataset.feature_names,
+        cfg.algorithm_key,
+        readiness_level=readiness.readiness_level,
+        sample_count=dataset.sample_count,
+    )
+    save_prediction_explanation(conn, prediction_id, ml_explanation)
+    return get_prediction(conn, prediction_id) | {"model_run": marked, "readiness": readiness.as_dict(), "ml_explanation": ml_explanation.as_dict()}
 
 
 def fallback_prediction(
@@ -374,24 +521,6 @@ def get_predictions_for_course(conn: sqlite3.Connection, course_id: int, year: i
     return [_prediction_row(row, keys) for row in cur.fetchall()]
 
 
-def _build_model(algorithm_key: str):
-    if algorithm_key == "linear_regression":
-        return LinearRegression()
-    if algorithm_key == "decision_tree":
-        return DecisionTreeClassifier(max_depth=5, random_state=42)
-    if algorithm_key == "random_forest":
-        return RandomForestClassifier(n_estimators=100, max_depth=8, random_state=42, class_weight="balanced_subsample")
-    if algorithm_key == "logistic_regression":
-        return LogisticRegression(max_iter=2000)
-    if algorithm_key == "naive_bayes":
-        return GaussianNB()
-    if algorithm_key in {"xgboost", "gradient_boosting"}:
-        from sklearn.ensemble import GradientBoostingClassifier
-
-        return GradientBoostingClassifier(random_state=42)
-    return DecisionTreeClassifier(max_depth=3, random_state=42)
-
-
 def _dataset_missing_ratio(dataset) -> float:
     summary = dataset.missing_features_summary or {}
     if not summary:
@@ -13,11 +13,13 @@ from sklearn.naive_bayes import GaussianNB
 from sklearn.tree import DecisionTreeClassifier
 
 from app.services.ml_algorithm_registry_service import get_algorithm_config
+from app.services.ml_artifact_store import save_model_artifact
 from app.services.ml_evaluation_service import (
     evaluate_classification_model,
     evaluate_regression_model,
 )
 from app.services.ml_feature_pipeline import build_course_feature_dataset
+from app.services.ml_model_cache import dataset_fingerprint, model_spec_hash
 from app.services.ml_model_registry_service import (
     create_model_run,
     mark_failed,
@@ -39,6 +41,9 @@ def train_model_run(
     cfg = get_algorithm_config(conn, algorithm_key)
     dataset = build_course_feature_dataset(conn, year=year, faculty_id=faculty_id, department_id=department_id, save_snapshot=True)
     readiness = check_model_readiness(conn, cfg.algorithm_key, dataset, target_column="target_status")
+    fingerprint = dataset_fingerprint(dataset.X, dataset.y)
+    n_samples = int(len(dataset.X)) if dataset.X is not None else 0
+    model = _build_model(cfg.algorithm_key, n_samples=n_samples)
     run_id = create_model_run(
         conn,
         algorithm_key=cfg.algorithm_key,
@@ -55,22 +60,42 @@ def train_model_run(
         readiness_level=readiness.readiness_level,
         readiness_warnings=readiness.warnings + readiness.blocking_reasons,
         created_by=created_by,
+        data_fingerprint=fingerprint,
+        model_spec_hash=model_spec_hash(model),
     )
     if not readiness.is_ready:
         reason = "; ".join(readiness.blocking_reasons or ["Readiness koşulu sağlanmadı."])
         return mark_skipped(conn, run_id, reason) | {"readiness": readiness.as_dict()}
     try:
-        n_samples = int(len(dataset.X)) if dataset.X is not None else 0
-        model = _build_model(cfg.algorithm_key, n_samples=n_samples)
         if cfg.algorithm_type == "regression":
             y = dataset.X["previous_topsis_score"].astype(float)
             if len(pd.Series(y).dropna()) < 2:
                 raise ValueError("Regresyon hedef verisi yetersiz.")
             evaluation = evaluate_regression_model(model, dataset.X, y)
+            target_kind = "regression"
         else:
             if dataset.y is None or pd.Series(dataset.y).nunique() < 2:
                 raise ValueError("Sınıflandırma hedef verisi yetersiz.")
-            evaluation = evaluate_classification_model(model, dataset.X, dataset.y)
+            y = dataset.y
+            evaluation = evaluate_classification_model(model, dataset.X, y)
+            target_kind = "classification"
+        # Değerlendirme sonrası tüm veriyle fit edilen model artifact olarak saklanır;
+        # tahmin servisi aynı şema/kapsam/veri için yeniden eğitmek yerine bunu yükler.
+        model.fit(dataset.X, y)
+        artifact = save_model_artifact(
+            conn,
+            run_id,
+            {
+                "model": model,
+                "evaluation": evaluation,
+                "target_kind": target_kind,
+                "sample_count": dataset.sample_count,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+            },
+            algorithm_key=cfg.algorithm_key,
+            feature_schema_version=dataset.feature_schema_version,
+            data_fingerprint=fingerprint,
+        )
         result = mark_trained(
             conn,
             run_id,
@@ -78,6 +103,7 @@ def train_model_run(
             validation_metrics=evaluation.validation_metrics,
             cross_validation=evaluation.cross_validation,
             overfitting_report=evaluation.overfitting_report,
+            artifact_path=artifact.path if artifact else None,
         )
         result["readiness"] = readiness.as_dict()
         result["warnings"] = evaluation.warnings
@@ -2,7 +2,7 @@
 
 from fastapi import Depends, HTTPException, status
 
-from app.core.config import AppConfig, load_app_config
+from app.core.config import AppConfig, get_app_config
 from app.schemas.auth import UserContext
 
 # Role definitions
@@ -98,7 +98,7 @@ class PermissionService:
             )
 
 def get_permission_service() -> PermissionService:
-    config = load_app_config()
+    config = get_app_config()
     return PermissionService(config)
 
 # Helper dependency generator
@@ -108,7 +108,7 @@ def get_course_resource_requirements(conn: sqlite3.Connection, course_id: int) -
     return list_resource_requirements(conn, int(course_id))
 
 
-def _resource_capacity_for_type(conn: sqlite3.Connection, resource_type: str, year: int, semester: str) -> tuple[int, float]:
+def get_semester_resource_capacity(conn: sqlite3.Connection, resource_type: str, year: int, semester: str) -> tuple[int, float]:
     sem = normalize_semester(semester)
     cur = conn.cursor()
     cur.execute(
@@ -147,7 +147,7 @@ def check_resource_feasibility(
     violations = []
     for req in get_course_resource_requirements(conn, int(course_id)):
         resource_type = str(req.get("resource_type") or "")
-        available_capacity, available_hours = _resource_capacity_for_type(conn, resource_type, int(year), sem)
+        available_capacity, available_hours = get_semester_resource_capacity(conn, resource_type, int(year), sem)
         used = usage.get((resource_type, sem), {"capacity": 0.0, "hours": 0.0})
         required_capacity = float(req.get("required_capacity") or 0.0)
         required_hours = float(req.get("required_hours") or 0.0)
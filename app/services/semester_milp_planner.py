@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""Guz/Bahar atamasi icin karma tamsayili program (SciPy ``milp``).
+
+Degiskenler ``x[e, s]`` (aday e, s donemine yerlesir mi) ikili; strict
+ogretim uyesi kontrolunde ``y[e, i, s]`` (dersi i hocasi verir) ikili;
+min hedef acigi ``u_s`` ve donem dengesi ``d`` surekli degiskenlerdir.
+
+Kisitlar:
+
+* her aday en fazla bir doneme, ayni ders politika izin vermedikce bir kez,
+* ``fall_max`` / ``spring_max`` ve ``total_elective_target`` ust sinirlari,
+* ``fall_min`` / ``spring_min`` alt sinirlari agir cezali slack ile (yetersiz
+  adayda model infeasible olmaz, mumkun oldugunca doldurur),
+* hoca basina donemlik kalan kapasite, kaynak turu basina donemlik
+  kapasite/saat, hard on kosul (on kosul bahar + ders guz yasak).
+
+Amac: skor ve talep agirlikli degerin toplamini en buyuk, donem farkini en
+kucuk yapmak. Cozucu zaman sinirina takilir ya da uygun cozum bulamazsa
+``None`` doner; cagiran greedy plana geri duser.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+MILP_SCENARIO_TYPE = "milp_optimal"
+DEFAULT_MILP_TIME_LIMIT_S = 10.0
+SEMESTERS = ("fall", "spring")
+
+
+@dataclass
+class MilpPlanningProblem:
+    """Veritabanindan bagimsiz problem tanimi; ``candidates`` sirasi aday indeksidir."""
+
+    candidates: list[dict[str, Any]]
+    allowed: dict[tuple[int, str], bool]
+    fall_min: int = 0
+    fall_max: int = 0
+    spring_min: int = 0
+    spring_max: int = 0
+    total_target: int = 0
+    course_limits: dict[int, int] = field(default_factory=dict)
+    score_weight: float = 0.40
+    demand_weight: float = 0.15
+    balance_weight: float = 0.20
+    # True ise her yerlesim ``instructor_options`` icinden bir hocaya baglanir.
+    require_instructor: bool = False
+    # (aday, donem) -> uygun hoca id listesi
+    instructor_options: dict[tuple[int, str], list[int]] = field(default_factory=dict)
+    instructor_capacity: dict[tuple[int, str], int] = field(default_factory=dict)
+    # aday -> [(kaynak_turu, gereken_kapasite, gereken_saat)]
+    resource_demand: dict[int, list[tuple[str, float, float]]] = field(default_factory=dict)
+    # (kaynak_turu, donem) -> (kapasite, saat); 0 sinirsiz demektir.
+    resource_limits: dict[tuple[str, str], tuple[float, float]] = field(default_factory=dict)
+    # (ders_id, on_kosul_ders_id) hard on kosul ciftleri
+    prerequisite_pairs: list[tuple[int, int]] = field(default_factory=list)
+
+
+@dataclass
+class MilpPlanSolution:
+    semesters: dict[int, str]
+    instructors: dict[int, int]
+    status: str
+    objective: float
+    elapsed_ms: float
+
+
+def _course_values(problem: MilpPlanningProblem) -> np.ndarray:
+    scores = np.array([max(0.0, float(c.get("course_score") or 0.0)) for c in problem.candidates])
+    demand = np.array([max(0.0, float(c.get("expected_demand") or 0.0)) for c in problem.candidates])
+    score_part = scores / scores.max() if scores.size and scores.max() > 0 else np.zeros_like(scores)
+    demand_part = demand / demand.max() if demand.size and demand.max() > 0 else np.zeros_like(demand)
+    # Esitlikte aday sirasi (greedy siralamasi) belirleyici olsun.
+    order_bonus = 1e-6 * (len(problem.candidates) - np.arange(len(problem.candidates)))
+    return problem.score_weight * score_part + problem.demand_weight * demand_part + order_bonus
+
+
+def solve_semester_milp(problem: MilpPlanningProblem, time_limit_s: float = DEFAULT_MILP_TIME_LIMIT_S) -> MilpPlanSolution | None:
+    try:
+        from scipy.optimize import Bounds, LinearConstraint, milp
+        from scipy.sparse import coo_matrix
+    except ImportError:
+        return None
+
+    started = time.perf_counter()
+    values = _course_values(problem)
+    x_index: dict[tuple[int, str], int] = {}
+    for entry in range(len(problem.candidates)):
+        for sem in SEMESTERS:
+            if problem.allowed.get((entry, sem)):
+                x_index[(entry, sem)] = len(x_index)
+    if not x_index:
+        return None
+
+    n_vars = len(x_index)
+    y_index: dict[tuple[int, int, str], int] = {}
+    for (entry, sem), options in problem.instructor_options.items():
+        if (entry, sem) not in x_index:
+            continue
+        for instructor_id in options:
+            y_index[(entry, int(instructor_id), sem)] = n_vars
+            n_vars += 1
+    slack = {sem: n_vars + pos for pos, sem in enumerate(SEMESTERS)}
+    balance_var = n_vars + len(SEMESTERS)
+    n_vars = balance_var + 1
+
+    preferred_bonus = 1e-3
+    cost = np.zeros(n_vars)
+    for (entry, sem), col in x_index.items():
+        preferred = str((problem.candidates[entry].get("availability") or {}).get("preferred_semester") or "either")
+        cost[col] = -(values[entry] + (preferred_bonus if preferred == sem else 0.0))
+    slack_penalty = float(values.sum()) + 1.0
+    for col in slack.values():
+        cost[col] = slack_penalty
+    cost[balance_var] = problem.balance_weight / max(1, problem.total_target)
+
+    rows: list[int] = []
+    cols: list[int] = []
+    data: list[float] = []
+    lower: list[float] = []
+    upper: list[float] = []
+
+    def add_row(terms: list[tuple[int, float]], lb: float, ub: float) -> None:
+        row = len(lower)
+        for col, coef in terms:
+            rows.append(row)
+            cols.append(col)
+            data.append(coef)
+        lower.append(lb)
+        upper.append(ub)
+
+    for entry in range(len(problem.candidates)):
+        terms = [(x_index[(entry, sem)], 1.0) for sem in SEMESTERS if (entry, sem) in x_index]
+        if len(terms) > 1:
+            add_row(terms, 0.0, 1.0)
+
+    by_course: dict[int, list[int]] = {}
+    for entry, candidate in enumerate(problem.candidates):
+        by_course.setdefault(int(candidate["course_id"]), []).append(entry)
+    for course_id, entries in by_course.items():
+        limit = int(problem.course_limits.get(course_id, 1))
+        if len(entries) > limit:
+            members = set(entries)
+            add_row([(col, 1.0) for (entry, _), col in x_index.items() if entry in members], 0.0, float(limit))
+
+    semester_terms = {sem: [(col, 1.0) for (entry, s), col in x_index.items() if s == sem] for sem in SEMESTERS}
+    limits = {"fall": (problem.fall_min, problem.fall_max), "spring": (problem.spring_min, problem.spring_max)}
+    for sem in SEMESTERS:
+        minimum, maximum = limits[sem]
+        add_row(semester_terms[sem], -np.inf, float(maximum))
+        add_row(semester_terms[sem] + [(slack[sem], 1.0)], float(minimum), np.inf)
+    add_row(semester_terms["fall"] + semester_terms["spring"], -np.inf, float(problem.total_target))
+    # d >= |fall - spring|
+    add_row([(balance_var, 1.0)] + semester_terms["fall"] + [(col, -1.0) for col, _ in semester_terms["spring"]], 0.0, np.inf)
+    add_row([(balance_var, 1.0)] + [(col, -1.0) for col, _ in semester_terms["fall"]] + semester_terms["spring"], 0.0, np.inf)
+
+    if problem.require_instructor:
+        options_by_slot: dict[tuple[int, str], list[int]] = {}
+        for (entry, _, sem), y_col in y_index.items():
+            options_by_slot.setdefault((entry, sem), []).append(y_col)
+        for key, col in x_index.items():
+            add_row([(y_col, 1.0) for y_col in options_by_slot.get(key, [])] + [(col, -1.0)], 0.0, 0.0)
+        load: dict[tuple[int, str], list[tuple[int, float]]] = {}
+        for (entry, instructor_id, sem), y_col in y_index.items():
+            load.setdefault((instructor_id, sem), []).append((y_col, 1.0))
+        for key, terms in load.items():
+            add_row(terms, -np.inf, float(problem.instructor_capacity.get(key, 0)))
+
+    for sem in SEMESTERS:
+        usage: dict[str, tuple[list[tuple[int, float]], list[tuple[int, float]]]] = {}
+        for (entry, s), col in x_index.items():
+            if s != sem:
+                continue
+            for resource_type, need_capacity, need_hours in problem.resource_demand.get(entry, []):
+                cap_terms, hour_terms = usage.setdefault(resource_type, ([], []))
+                cap_terms.append((col, float(need_capacity)))
+                hour_terms.append((col, float(need_hours)))
+        for resource_type, (cap_terms, hour_terms) in usage.items():
+            capacity, hours = problem.resource_limits.get((resource_type, sem), (0.0, 0.0))
+            if capacity:
+                add_row(cap_terms, -np.inf, float(capacity))
+            if hours:
+                add_row(hour_terms, -np.inf, float(hours))
+
+    for course_id, prerequisite_id in problem.prerequisite_pairs:
+        for course_entry in by_course.get(int(course_id), []):
+            for pre_entry in by_course.get(int(prerequisite_id), []):
+                fall_col = x_index.get((course_entry, "fall"))
+                spring_col = x_index.get((pre_entry, "spring"))
+                if fall_col is not None and spring_col is not None:
+                    add_row([(fall_col, 1.0), (spring_col, 1.0)], 0.0, 1.0)
+
+    matrix = coo_matrix((data, (rows, cols)), shape=(len(lower), n_vars)).tocsr()
+    integrality = np.zeros(n_vars)
+    integrality[: balance_var - len(SEMESTERS)] = 1
+    bounds_upper = np.ones(n_vars)
+    bounds_upper[balance_var - len(SEMESTERS) :] = np.inf
+    try:
+        result = milp(
+            cost,
+            constraints=LinearConstraint(matrix, np.array(lower), np.array(upper)),
+            integrality=integrality,
+            bounds=Bounds(np.zeros(n_vars), bounds_upper),
+            options={"time_limit": max(0.01, float(time_limit_s)), "disp": False},
+        )
+    except (ValueError, MemoryError):
+        return None
+    if result.x is None or result.status not in (0, 1):
+        return None
+
+    chosen = result.x > 0.5
+    semesters = {entry: sem for (entry, sem), col in x_index.items() if chosen[col]}
+    instructors = {entry: instructor_id for (entry, instructor_id, sem), col in y_index.items() if chosen[col]}
+    return MilpPlanSolution(
+        semesters=semesters,
+        instructors=instructors,
+        status="optimal" if result.status == 0 else "time_limit",
+        objective=float(result.fun),
+        elapsed_ms=round((time.perf_counter() - started) * 1000.0, 3),
+    )
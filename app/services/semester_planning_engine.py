@@ -18,7 +18,7 @@ from app.services.course_semester_availability_service import (
     validate_course_semester,
 )
 from app.services.course_type import build_elective_predicate
-from app.services.instructor_planning_service import check_instructor_feasibility
+from app.services.instructor_planning_service import check_instructor_feasibility, get_available_instructors
 from app.services.prerequisite_planning_service import (
     check_prerequisite_order,
     get_prerequisites,
@@ -26,6 +26,7 @@ from app.services.prerequisite_planning_service import (
 from app.services.resource_planning_service import (
     check_resource_feasibility,
     get_course_resource_requirements,
+    get_semester_resource_capacity,
 )
 from app.services.semester_balance_metrics_service import (
     calculate_plan_score,
@@ -34,12 +35,19 @@ from app.services.semester_balance_metrics_service import (
     estimate_course_demand,
     generate_balance_warnings,
 )
-from app.services.semester_planning_policy_service import resolve_policy
+from app.services.semester_milp_planner import (
+    DEFAULT_MILP_TIME_LIMIT_S,
+    MILP_SCENARIO_TYPE,
+    MilpPlanningProblem,
+    solve_semester_milp,
+)
+from app.services.semester_planning_policy_service import normalize_soft_weights, resolve_policy
 from app.services.semester_workload_service import (
     adjust_targets_by_required_load,
     get_required_course_load,
 )
-from app.services.time_conflict_planning_service import generate_conflict_warnings
+from app.services.time_conflict_index import TimeConflictIndex, TimeSlot
+from app.services.time_conflict_planning_service import generate_conflict_warnings, load_course_slots
 
 
 def _now() -> str:
@@ -343,28 +351,25 @@ def _semester_allowed(candidate: dict[str, Any], semester: str) -> bool:
     return bool(availability.get("allowed_spring") if semester == "spring" else availability.get("allowed_fall"))
 
 
-def _semester_capacity(assignments: list[dict[str, Any]], semester: str) -> int:
-    return len([a for a in assignments if a.get("assigned_semester") == semester])
-
-
-def _choose_semester(candidate: dict[str, Any], assignments: list[dict[str, Any]], policy: dict[str, Any], scenario_type: str) -> list[str]:
+def _choose_semester(
+    candidate: dict[str, Any],
+    semester_counts: dict[str, int],
+    semester_demand: dict[str, float],
+    policy: dict[str, Any],
+    scenario_type: str,
+) -> list[str]:
     preferred = str((candidate.get("availability") or {}).get("preferred_semester") or "either")
     allowed = [sem for sem in ("fall", "spring") if _semester_allowed(candidate, sem)]
     if preferred in allowed:
         allowed = [preferred] + [sem for sem in allowed if sem != preferred]
-    elif scenario_type == "balance_priority":
-        allowed = sorted(allowed, key=lambda sem: _semester_capacity(assignments, sem))
     elif scenario_type == "demand_priority":
-        allowed = sorted(allowed, key=lambda sem: sum(_float(a.get("expected_demand")) for a in assignments if a.get("assigned_semester") == sem))
+        allowed = sorted(allowed, key=lambda sem: semester_demand[sem])
     else:
-        allowed = sorted(allowed, key=lambda sem: _semester_capacity(assignments, sem))
+        allowed = sorted(allowed, key=lambda sem: semester_counts[sem])
     return allowed
 
 
-def _can_repeat(course_id: int, candidate: dict[str, Any], assignments: list[dict[str, Any]], policy: dict[str, Any]) -> tuple[bool, str | None]:
-    already = [a for a in assignments if int(a.get("course_id") or 0) == int(course_id) and a.get("assigned_semester") in {"fall", "spring"}]
-    if not already:
-        return True, None
+def _repeat_allowed(candidate: dict[str, Any], policy: dict[str, Any]) -> tuple[bool, str | None]:
     repeat_policy = str(policy.get("same_course_repeat_policy") or "disallow")
     if repeat_policy == "disallow":
         return False, "Aynı ders tekrar politikası bu dersin iki döneme yerleşmesini engelledi."
@@ -378,9 +383,15 @@ def _can_repeat(course_id: int, candidate: dict[str, Any], assignments: list[dic
     return False, "Aynı ders tekrar politikası geçersiz."
 
 
-def _fits_semester_counts(assignments: list[dict[str, Any]], semester: str, policy: dict[str, Any]) -> bool:
+def _can_repeat(course_id: int, candidate: dict[str, Any], selected_ids: set[int], policy: dict[str, Any]) -> tuple[bool, str | None]:
+    if int(course_id) not in selected_ids:
+        return True, None
+    return _repeat_allowed(candidate, policy)
+
+
+def _fits_semester_counts(semester_counts: dict[str, int], semester: str, policy: dict[str, Any]) -> bool:
     max_value = int(policy.get("fall_max" if semester == "fall" else "spring_max") or 0)
-    return _semester_capacity(assignments, semester) < max_value
+    return semester_counts[semester] < max_value
 
 
 def _assignment_explanation(candidate: dict[str, Any], semester: str, extra: list[str] | None = None) -> str:
@@ -410,6 +421,7 @@ def generate_semester_plan(
     scenario_type: str = "score_priority",
     generate_alternatives: bool = True,
     respect_existing_curriculum: bool = False,
+    milp_time_limit_s: float | None = None,
 ) -> dict[str, Any]:
     ensure_semester_planning_schema(conn, commit=False)
     year = int(year)
@@ -454,17 +466,113 @@ def generate_semester_plan(
     elif scenario_type == "balance_priority":
         sorted_candidates = sorted(candidates, key=lambda row: (_float(row.get("course_score")), -_float(row.get("expected_demand"))), reverse=True)
 
+    planner: dict[str, Any] = {"method": "greedy", "status": "completed", "fallback_used": False}
+    assignments: list[dict[str, Any]] | None = None
+    violations: list[dict[str, Any]] = []
+    if scenario_type == MILP_SCENARIO_TYPE:
+        milp_result = _milp_assign(conn, year, faculty_id, department_id, sorted_candidates, policy, milp_time_limit_s)
+        if milp_result is not None:
+            assignments, violations, planner = milp_result
+        else:
+            planner = {"method": "greedy", "status": "milp_unavailable", "fallback_used": True}
+            warnings.append("MILP çözücü süre sınırında uygun plan bulamadı; greedy plana dönüldü.")
+    if assignments is None:
+        assignments, violations = _greedy_assign(conn, year, faculty_id, department_id, sorted_candidates, policy, scenario_type)
+
+    if policy.get("consider_prerequisites"):
+        prereq_violations = check_prerequisite_order(assignments, get_prerequisites(conn))
+        violations.extend(prereq_violations)
+        _repair_prerequisites(assignments, prereq_violations, policy)
+
+    if policy.get("consider_time_conflicts"):
+        violations.extend(generate_conflict_warnings(conn, assignments, mode="combined"))
+
+    selected_assignments = [a for a in assignments if a.get("assigned_semester") in {"fall", "spring"}]
+    metrics = calculate_semester_balance_metrics(selected_assignments)
+    metrics["total_plan_score"] = calculate_plan_score(selected_assignments, policy)
+    warnings.extend(generate_balance_warnings(metrics, policy))
+    plan_score = float(metrics["total_plan_score"])
+
+    run_id = None
+    scenarios: list[dict[str, Any]] = []
+    if persist:
+        run_id = _persist_plan(
+            conn,
+            year=year,
+            faculty_id=faculty_id,
+            department_id=department_id,
+            policy=policy,
+            candidates=candidates,
+            assignments=assignments,
+            violations=violations,
+            metrics=metrics,
+            warnings=warnings,
+            plan_score=plan_score,
+            run_name=run_name,
+            created_by=created_by,
+        )
+    if generate_alternatives:
+        scenarios = _build_alternative_scenarios(conn, year, faculty_id, department_id, candidates, policy, run_id)
+    if persist and run_id is not None and scenarios:
+        _persist_scenarios(conn, int(run_id), scenarios)
+
+    fall = [a for a in selected_assignments if a["assigned_semester"] == "fall"]
+    spring = [a for a in selected_assignments if a["assigned_semester"] == "spring"]
+    unassigned = [a for a in assignments if a.get("assigned_semester") == "unassigned"]
+    return {
+        "ok": True,
+        "plan_id": run_id,
+        "year": year,
+        "faculty_id": faculty_id,
+        "department_id": department_id,
+        "policy": policy,
+        "policy_snapshot_json": _json(policy),
+        "fall_courses": fall,
+        "spring_courses": spring,
+        "fall_course_ids": [int(a["course_id"]) for a in fall],
+        "spring_course_ids": [int(a["course_id"]) for a in spring],
+        "unassigned_courses": unassigned,
+        "rejected_courses": unassigned,
+        "already_in_curriculum_ids": already_in_curriculum_ids,
+        "plan_score": plan_score,
+        "metrics": metrics,
+        "constraint_violations": violations,
+        "warnings": warnings,
+        "explanations": [a.get("explanation") for a in selected_assignments if a.get("explanation")],
+        "alternative_plans": scenarios,
+        "planner": planner,
+    }
+
+
+def _greedy_assign(
+    conn: sqlite3.Connection,
+    year: int,
+    faculty_id: int | None,
+    department_id: int | None,
+    sorted_candidates: list[dict[str, Any]],
+    policy: dict[str, Any],
+    scenario_type: str,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Sirali adaylari tek geciste yerlestirir; donem sayaclari O(1) tutulur."""
     assignments: list[dict[str, Any]] = []
     violations: list[dict[str, Any]] = []
     assigned_instructor_counts: dict[tuple[int, str], int] = {}
     seen_selected: set[int] = set()
+    semester_counts = {"fall": 0, "spring": 0}
+    semester_demand = {"fall": 0.0, "spring": 0.0}
     target_total = int(policy.get("total_elective_target") or 8)
+    # Saat cakismasi: donem basina artimli indeks; aday ders yerlestirilmeden once sorgulanir.
+    course_slots: dict[int, list[TimeSlot]] = {}
+    slot_index: dict[str, TimeConflictIndex] = {}
+    if policy.get("consider_time_conflicts") and str(policy.get("hard_constraint_policy")) == "strict":
+        course_slots = load_course_slots(conn, [int(row["course_id"]) for row in sorted_candidates])
+        slot_index = {"fall": TimeConflictIndex(), "spring": TimeConflictIndex()}
 
     for candidate in sorted_candidates:
-        if len([a for a in assignments if a.get("assigned_semester") in {"fall", "spring"}]) >= target_total:
+        if semester_counts["fall"] + semester_counts["spring"] >= target_total:
             break
         course_id = int(candidate["course_id"])
-        repeat_ok, repeat_reason = _can_repeat(course_id, candidate, assignments, policy)
+        repeat_ok, repeat_reason = _can_repeat(course_id, candidate, seen_selected, policy)
         if not repeat_ok:
             violations.append(
                 {
@@ -479,7 +587,7 @@ def generate_semester_plan(
         selected_semester = None
         selected_extra: list[str] = []
         blocked_reasons: list[dict[str, Any]] = []
-        for sem in _choose_semester(candidate, assignments, policy, scenario_type):
+        for sem in _choose_semester(candidate, semester_counts, semester_demand, policy, scenario_type):
             availability_result = validate_course_semester(conn, course_id, sem, year=year, department_id=department_id, faculty_id=faculty_id)
             if policy.get("consider_course_availability") and not availability_result["allowed"]:
                 blocked_reasons.append(
@@ -493,7 +601,7 @@ def generate_semester_plan(
                 )
                 if str(policy.get("hard_constraint_policy")) == "strict":
                     continue
-            if not _fits_semester_counts(assignments, sem, policy):
+            if not _fits_semester_counts(semester_counts, sem, policy):
                 blocked_reasons.append(
                     {
                         "course_id": course_id,
@@ -534,12 +642,31 @@ def generate_semester_plan(
                         for message in resource.get("violations", [])
                     )
                     continue
+            if slot_index and course_slots.get(course_id):
+                clashes = slot_index[sem].conflicts_for(course_slots[course_id])
+                if clashes:
+                    _, other = clashes[0]
+                    blocked_reasons.append(
+                        {
+                            "course_id": course_id,
+                            "constraint_type": "time_conflict",
+                            "severity": "error",
+                            "message": f"{display_semester(sem)}: {other.key} dersiyle {other.day} günü saat çakışması var.",
+                            "suggestion": "Derslerden birini diğer döneme taşıyın veya ders saatini değiştirin.",
+                        }
+                    )
+                    continue
             selected_semester = sem
             if repeat_reason:
                 selected_extra.append(repeat_reason)
             break
         if selected_semester:
             seen_selected.add(course_id)
+            if slot_index:
+                for slot in course_slots.get(course_id, ()):
+                    slot_index[selected_semester].insert(slot)
+            semester_counts[selected_semester] += 1
+            semester_demand[selected_semester] += _float(candidate.get("expected_demand"))
             assignments.append(
                 {
                     **candidate,
@@ -560,81 +687,163 @@ def generate_semester_plan(
                     "explanation": "Ders dönem hedefleri veya hard kısıtlar nedeniyle plana yerleşmedi.",
                 }
             )
+    return assignments, violations
 
-    if policy.get("consider_prerequisites"):
-        prereq_violations = check_prerequisite_order(assignments, get_prerequisites(conn))
-        violations.extend(prereq_violations)
-        _repair_prerequisites(assignments, prereq_violations, policy)
-
-    if policy.get("consider_time_conflicts"):
-        violations.extend(generate_conflict_warnings(conn, assignments))
-
-    selected_assignments = [a for a in assignments if a.get("assigned_semester") in {"fall", "spring"}]
-    metrics = calculate_semester_balance_metrics(selected_assignments)
-    metrics["total_plan_score"] = calculate_plan_score(selected_assignments, policy)
-    warnings.extend(generate_balance_warnings(metrics, policy))
-    plan_score = float(metrics["total_plan_score"])
 
-    run_id = None
-    scenarios: list[dict[str, Any]] = []
-    if persist:
-        run_id = _persist_plan(
-            conn,
-            year=year,
-            faculty_id=faculty_id,
-            department_id=department_id,
-            policy=policy,
-            candidates=candidates,
-            assignments=assignments,
-            violations=violations,
-            metrics=metrics,
-            warnings=warnings,
-            plan_score=plan_score,
-            run_name=run_name,
-            created_by=created_by,
-        )
-    if generate_alternatives:
-        scenarios = _build_alternative_scenarios(conn, year, faculty_id, department_id, candidates, policy, run_id)
-    if persist and run_id is not None and scenarios:
-        _persist_scenarios(conn, int(run_id), scenarios)
-
-    fall = [a for a in selected_assignments if a["assigned_semester"] == "fall"]
-    spring = [a for a in selected_assignments if a["assigned_semester"] == "spring"]
-    unassigned = [a for a in assignments if a.get("assigned_semester") == "unassigned"]
-    return {
-        "ok": True,
-        "plan_id": run_id,
-        "year": year,
-        "faculty_id": faculty_id,
-        "department_id": department_id,
-        "policy": policy,
-        "policy_snapshot_json": _json(policy),
-        "fall_courses": fall,
-        "spring_courses": spring,
-        "fall_course_ids": [int(a["course_id"]) for a in fall],
-        "spring_course_ids": [int(a["course_id"]) for a in spring],
-        "unassigned_courses": unassigned,
-        "rejected_courses": unassigned,
-        "already_in_curriculum_ids": already_in_curriculum_ids,
-        "plan_score": plan_score,
-        "metrics": metrics,
-        "constraint_violations": violations,
-        "warnings": warnings,
-        "explanations": [a.get("explanation") for a in selected_assignments if a.get("explanation")],
-        "alternative_plans": scenarios,
+def _milp_assign(
+    conn: sqlite3.Connection,
+    year: int,
+    faculty_id: int | None,
+    department_id: int | None,
+    sorted_candidates: list[dict[str, Any]],
+    policy: dict[str, Any],
+    time_limit_s: float | None,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], dict[str, Any]] | None:
+    """Adaylari MILP ile yerlestirir; cozum yoksa None (cagiran greedy'ye doner)."""
+    if not sorted_candidates:
+        return None
+    strict = str(policy.get("hard_constraint_policy")) == "strict"
+    weights = normalize_soft_weights(policy.get("soft_constraint_weights"))
+    problem = MilpPlanningProblem(
+        candidates=sorted_candidates,
+        allowed={},
+        fall_min=int(policy.get("fall_min") or 0),
+        fall_max=int(policy.get("fall_max") or 0),
+        spring_min=int(policy.get("spring_min") or 0),
+        spring_max=int(policy.get("spring_max") or 0),
+        total_target=int(policy.get("total_elective_target") or 8),
+        score_weight=weights.get("score", 0.0),
+        demand_weight=weights.get("demand_balance", 0.0) if policy.get("consider_expected_demand", True) else 0.0,
+        balance_weight=weights.get("semester_balance", 0.0),
+        require_instructor=bool(policy.get("consider_instructor_availability")) and strict,
+    )
+    blocked: dict[int, list[dict[str, Any]]] = {}
+    instructor_names: dict[int, str] = {}
+    for entry, candidate in enumerate(sorted_candidates):
+        course_id = int(candidate["course_id"])
+        repeat_ok, _reason = _repeat_allowed(candidate, policy)
+        problem.course_limits[course_id] = max(problem.course_limits.get(course_id, 1), 2 if repeat_ok else 1)
+        requirements = candidate.get("resource_requirements") or []
+        for sem in ("fall", "spring"):
+            if not _semester_allowed(candidate, sem):
+                if policy.get("consider_course_availability"):
+                    result = validate_course_semester(conn, course_id, sem, year=year, department_id=department_id, faculty_id=faculty_id)
+                    blocked.setdefault(entry, []).append(
+                        {
+                            "course_id": course_id,
+                            "constraint_type": "semester_availability",
+                            "severity": "error",
+                            "message": result["message"],
+                            "suggestion": result["suggestion"],
+                        }
+                    )
+                continue
+            if problem.require_instructor:
+                options = get_available_instructors(conn, course_id, year, sem)
+                if not options:
+                    blocked.setdefault(entry, []).append(
+                        {
+                            "course_id": course_id,
+                            "constraint_type": "instructor",
+                            "severity": "error",
+                            "message": "Bu ders için ilgili dönemde uygun öğretim üyesi bulunamadı.",
+                            "suggestion": "Öğretim üyesi uygunluğunu güncelleyin veya dersi diğer döneme taşıyın.",
+                        }
+                    )
+                    continue
+                problem.instructor_options[(entry, sem)] = [int(row["id"]) for row in options]
+                for row in options:
+                    problem.instructor_capacity[(int(row["id"]), sem)] = int(row.get("remaining_capacity") or 0)
+                    instructor_names[int(row["id"])] = str(row.get("name") or row["id"])
+            if policy.get("consider_resource_constraints") and strict and requirements:
+                missing = []
+                for req in requirements:
+                    resource_type = str(req.get("resource_type") or "")
+                    key = (resource_type, sem)
+                    if key not in problem.resource_limits:
+                        capacity, hours = get_semester_resource_capacity(conn, resource_type, year, sem)
+                        problem.resource_limits[key] = (float(capacity), float(hours))
+                    if not problem.resource_limits[key][0] and bool(req.get("hard_requirement")):
+                        missing.append(f"{resource_type} için uygun kaynak bulunamadı.")
+                if missing:
+                    blocked.setdefault(entry, []).extend(
+                        {
+                            "course_id": course_id,
+                            "constraint_type": "resource",
+                            "severity": "error",
+                            "message": message,
+                            "suggestion": "Kaynak kapasitesini artırın veya dersi diğer döneme taşıyın.",
+                        }
+                        for message in missing
+                    )
+                    continue
+                problem.resource_demand[entry] = [
+                    (str(req.get("resource_type") or ""), _float(req.get("required_capacity")), _float(req.get("required_hours")))
+                    for req in requirements
+                ]
+            problem.allowed[(entry, sem)] = True
+    if policy.get("consider_prerequisites"):
+        problem.prerequisite_pairs = [
+            (int(row.get("course_id") or 0), int(row.get("prerequisite_course_id") or 0))
+            for row in get_prerequisites(conn)
+            if str(row.get("prerequisite_type") or "hard") == "hard"
+        ]
+
+    solution = solve_semester_milp(problem, time_limit_s=DEFAULT_MILP_TIME_LIMIT_S if time_limit_s is None else float(time_limit_s))
+    if solution is None:
+        return None
+    assignments: list[dict[str, Any]] = []
+    violations: list[dict[str, Any]] = []
+    for entry, candidate in enumerate(sorted_candidates):
+        sem = solution.semesters.get(entry)
+        if sem:
+            extra = ["Yerleşim MILP optimizasyonu ile belirlendi."]
+            instructor_id = solution.instructors.get(entry)
+            if instructor_id is not None:
+                extra.append(f"{instructor_names.get(instructor_id, instructor_id)} {sem} dönemi için uygundur.")
+            assignments.append(
+                {
+                    **candidate,
+                    "assigned_semester": sem,
+                    "assignment_type": "selected",
+                    "constraint_status": "ok",
+                    "explanation": _assignment_explanation(candidate, sem, extra),
+                }
+            )
+        elif not any(problem.allowed.get((entry, s)) for s in ("fall", "spring")):
+            reasons = blocked.get(entry, [])
+            violations.extend(reasons[:2])
+            assignments.append(
+                {
+                    **candidate,
+                    "assigned_semester": "unassigned",
+                    "assignment_type": "rejected",
+                    "constraint_status": "violation" if reasons else "warning",
+                    "explanation": "Ders dönem hedefleri veya hard kısıtlar nedeniyle plana yerleşmedi.",
+                }
+            )
+    planner = {
+        "method": "milp",
+        "status": solution.status,
+        "fallback_used": False,
+        "objective": round(solution.objective, 6),
+        "elapsed_ms": solution.elapsed_ms,
     }
+    return assignments, violations, planner
 
 
 def _repair_prerequisites(assignments: list[dict[str, Any]], violations: list[dict[str, Any]], policy: dict[str, Any]) -> None:
     if not violations:
         return
     by_id = {int(a["course_id"]): a for a in assignments if a.get("assigned_semester") in {"fall", "spring"}}
+    spring_count = sum(1 for a in assignments if a.get("assigned_semester") == "spring")
     for violation in violations:
         if violation.get("severity") != "error":
             continue
         course_id = int(violation.get("course_id") or 0)
         item = by_id.get(course_id)
-        if item and item.get("assigned_semester") == "fall" and int(policy.get("spring_max", 0) or 0) > len([a for a in assignments if a.get("assigned_semester") == "spring"]):
+        if item and item.get("assigned_semester") == "fall" and int(policy.get("spring_max", 0) or 0) > spring_count:
+            spring_count += 1
             item["assigned_semester"] = "spring"
             item["constraint_status"] = "warning"
             item["explanation"] = f"{item.get('course_code') or course_id} bahara taşındı; ön koşul sırası ihlalini azaltmak için dönem onarımı uygulandı."
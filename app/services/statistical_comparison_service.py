@@ -4,29 +4,180 @@
 from __future__ import annotations
 
 import math
-import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from statistics import NormalDist
 from typing import Any, Iterable
 
+import numpy as np
 
-def bootstrap_confidence_interval(values: Iterable[float], confidence: float = 0.95, n_bootstrap: int = 1000) -> dict[str, Any]:
+BOOTSTRAP_METHODS = ("percentile", "bca")
+DEFAULT_SEED = 42
+DEFAULT_MAX_BLOCK_BYTES = 32 * 1024 * 1024
+
+
+def bootstrap_confidence_interval(
+    values: Iterable[float],
+    confidence: float = 0.95,
+    n_bootstrap: int = 1000,
+    *,
+    method: str = "percentile",
+    seed: int | None = DEFAULT_SEED,
+    max_workers: int | None = None,
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_BYTES,
+) -> dict[str, Any]:
+    """Ortalama icin bootstrap guven araligi (``percentile`` veya ``bca``).
+
+    Yeniden ornekler NumPy indeks matrisleriyle parca parca cekilir; parca
+    tohumlari ``seed``'den turetildigi icin sonuc ``max_workers``'tan bagimsizdir.
+    """
     vals = [float(v) for v in values if v is not None]
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(f"Bilinmeyen bootstrap yöntemi: {method}. Seçenekler: {BOOTSTRAP_METHODS}")
     if not vals:
         return {"mean": None, "lower": None, "upper": None, "confidence": confidence, "warning": "Güven aralığı için veri yok."}
     if len(vals) == 1:
         return {"mean": vals[0], "lower": vals[0], "upper": vals[0], "confidence": confidence, "warning": "Tek değer için CI bilgi verici değildir."}
-    rng = random.Random(42)
-    means = []
-    for _ in range(int(n_bootstrap)):
-        sample = [vals[rng.randrange(len(vals))] for _ in vals]
-        means.append(sum(sample) / len(sample))
-    means.sort()
+    data = np.asarray(vals, dtype=float)
+    means = np.sort(bootstrap_means(data, n_bootstrap, seed=seed, max_workers=max_workers, max_block_bytes=max_block_bytes))
     alpha = (1.0 - confidence) / 2.0
-    low_idx = int(alpha * len(means))
-    high_idx = min(len(means) - 1, int((1.0 - alpha) * len(means)) - 1)
-    return {"mean": sum(vals) / len(vals), "lower": means[low_idx], "upper": means[high_idx], "confidence": confidence}
+    low_q, high_q = alpha, 1.0 - alpha
+    result: dict[str, Any] = {"mean": float(data.mean()), "confidence": confidence, "method": method, "n_bootstrap": int(len(means))}
+    if method == "bca":
+        adjusted = _bca_quantiles(data, means, alpha)
+        if adjusted is None:
+            result["warning"] = "BCa düzeltmesi hesaplanamadı (dejenere dağılım); yüzdelik aralık kullanıldı."
+        else:
+            low_q, high_q = adjusted
+    low_idx = min(len(means) - 1, max(0, int(low_q * len(means))))
+    high_idx = min(len(means) - 1, max(low_idx, int(high_q * len(means)) - 1))
+    result["lower"] = float(means[low_idx])
+    result["upper"] = float(means[high_idx])
+    return result
+
+
+def bootstrap_means(
+    values: Iterable[float] | np.ndarray,
+    n_bootstrap: int = 1000,
+    *,
+    seed: int | None = DEFAULT_SEED,
+    max_workers: int | None = None,
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_BYTES,
+) -> np.ndarray:
+    """``n_bootstrap`` yeniden orneklemin ortalamalarini (sirasiz) dondurur."""
+    data = np.asarray(list(values) if not isinstance(values, np.ndarray) else values, dtype=float).reshape(-1)
+    total = max(0, int(n_bootstrap))
+    if data.size == 0 or total == 0:
+        return np.zeros(0, dtype=float)
+    # Indeks matrisi (int64) ve toplanan degerler (float64) ayni anda bellekte durur.
+    rows_per_chunk = max(1, int(max_block_bytes) // max(1, data.size * 16))
+    tasks = [("bootstrap", data, min(rows_per_chunk, total - start)) for start in range(0, total, rows_per_chunk)]
+    return np.concatenate(_run_resampling_tasks(tasks, seed, max_workers))
+
+
+def paired_permutation_test(
+    values_a: Iterable[float],
+    values_b: Iterable[float],
+    n_permutations: int = 10000,
+    *,
+    seed: int | None = DEFAULT_SEED,
+    max_workers: int | None = None,
+    max_block_bytes: int = DEFAULT_MAX_BLOCK_BYTES,
+) -> dict[str, Any]:
+    """Eslestirilmis farklar icin iki yonlu isaret-cevirme permutasyon testi.
+
+    ``2**n <= n_permutations`` ise tum isaret kombinasyonlari sayilir (kesin
+    test); aksi halde Monte Carlo p-degeri ``(k + 1) / (B + 1)`` raporlanir.
+    """
+    a = [float(v) for v in values_a]
+    b = [float(v) for v in values_b]
+    n = min(len(a), len(b))
+    if n == 0:
+        return {"test": "paired_permutation", "p_value": None, "significant": False, "warning": "Permütasyon testi için ortak değer yok."}
+    diff = np.asarray(a[:n], dtype=float) - np.asarray(b[:n], dtype=float)
+    observed = abs(float(diff.mean()))
+    tolerance = 1e-12 * max(1.0, observed)
+    total = max(1, int(n_permutations))
+    rows_per_chunk = max(1, int(max_block_bytes) // max(1, n * 16))
+    if n <= 20 and 2**n <= total:
+        # Isaret matrisi max_block_bytes sinirinda bloklar halinde uretilir.
+        extreme = 0
+        bits = np.arange(n)[None, :]
+        for start in range(0, 2**n, rows_per_chunk):
+            codes = np.arange(start, min(start + rows_per_chunk, 2**n))[:, None]
+            signs = 1.0 - 2.0 * ((codes >> bits) & 1)
+            permuted = np.abs(signs @ diff) / n
+            extreme += int(np.count_nonzero(permuted >= observed - tolerance))
+        p_value = extreme / float(2**n)
+        exact = True
+        used = 2**n
+    else:
+        tasks = [("sign_flip", diff, min(rows_per_chunk, total - start)) for start in range(0, total, rows_per_chunk)]
+        permuted = np.concatenate(_run_resampling_tasks(tasks, seed, max_workers))
+        extreme = int(np.count_nonzero(permuted >= observed - tolerance))
+        p_value = (extreme + 1) / float(total + 1)
+        exact = False
+        used = total
+    return {
+        "test": "paired_permutation",
+        "statistic": float(diff.mean()),
+        "p_value": float(p_value),
+        "significant": bool(p_value < 0.05),
+        "exact": exact,
+        "n_permutations": int(used),
+    }
+
+
+def _bca_quantiles(data: np.ndarray, sorted_means: np.ndarray, alpha: float) -> tuple[float, float] | None:
+    theta = float(data.mean())
+    below = float(np.count_nonzero(sorted_means < theta)) / len(sorted_means)
+    if below <= 0.0 or below >= 1.0:
+        return None
+    normal = NormalDist()
+    z0 = normal.inv_cdf(below)
+    # Ortalama icin jackknife degerleri tek adimda: (toplam - x_i) / (n - 1).
+    jackknife = (data.sum() - data) / (data.size - 1)
+    centered = jackknife.mean() - jackknife
+    denominator = 6.0 * float(np.sum(centered**2)) ** 1.5
+    acceleration = float(np.sum(centered**3)) / denominator if denominator > 0 else 0.0
+    quantiles = []
+    for q in (alpha, 1.0 - alpha):
+        z = normal.inv_cdf(q)
+        shifted = z0 + (z0 + z) / (1.0 - acceleration * (z0 + z))
+        quantiles.append(normal.cdf(shifted))
+    return quantiles[0], quantiles[1]
+
+
+def _run_resampling_tasks(tasks: list[tuple[str, np.ndarray, int]], seed: int | None, max_workers: int | None) -> list[np.ndarray]:
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    payloads = [(kind, data, rows, child) for (kind, data, rows), child in zip(tasks, seeds)]
+    if max_workers is None or int(max_workers) <= 1 or len(payloads) <= 1:
+        return [_resample_chunk(payload) for payload in payloads]
+    try:
+        with ProcessPoolExecutor(max_workers=int(max_workers)) as executor:
+            return list(executor.map(_resample_chunk, payloads))
+    except (OSError, BrokenProcessPool):
+        return [_resample_chunk(payload) for payload in payloads]
+
+
+def _resample_chunk(payload: tuple[str, np.ndarray, int, np.random.SeedSequence]) -> np.ndarray:
+    kind, data, rows, seed_sequence = payload
+    rng = np.random.default_rng(seed_sequence)
+    if kind == "bootstrap":
+        indices = rng.integers(0, data.size, size=(rows, data.size))
+        return data[indices].mean(axis=1)
+    signs = rng.choice(np.array([-1.0, 1.0]), size=(rows, data.size))
+    return np.abs(signs @ data) / data.size
 
 
-def compare_two_models(metric_values_a: Iterable[float], metric_values_b: Iterable[float], test_type: str = "auto") -> dict[str, Any]:
+def compare_two_models(
+    metric_values_a: Iterable[float],
+    metric_values_b: Iterable[float],
+    test_type: str = "auto",
+    *,
+    n_permutations: int = 10000,
+    seed: int | None = DEFAULT_SEED,
+) -> dict[str, Any]:
     a = [float(v) for v in metric_values_a]
     b = [float(v) for v in metric_values_b]
     n = min(len(a), len(b))
@@ -35,6 +186,17 @@ def compare_two_models(metric_values_a: Iterable[float], metric_values_b: Iterab
     a = a[:n]
     b = b[:n]
     effect = calculate_effect_size(a, b)
+    if test_type == "permutation":
+        permutation = paired_permutation_test(a, b, n_permutations=n_permutations, seed=seed)
+        return {
+            "test": "paired_permutation",
+            "p_value": permutation["p_value"],
+            "significant": permutation["significant"],
+            "effect_size": effect,
+            "exact": permutation["exact"],
+            "n_permutations": permutation["n_permutations"],
+            "summary": _comparison_summary(a, b, permutation["p_value"], permutation["significant"]),
+        }
     try:
         from scipy import stats
 
@@ -59,16 +221,17 @@ def compare_two_models(metric_values_a: Iterable[float], metric_values_b: Iterab
         }
     except Exception as exc:
         diff = [x - y for x, y in zip(a, b)]
-        ci = bootstrap_confidence_interval(diff)
+        ci = bootstrap_confidence_interval(diff, seed=seed)
+        permutation = paired_permutation_test(a, b, n_permutations=n_permutations, seed=seed)
         significant = bool(ci["lower"] is not None and (ci["lower"] > 0 or ci["upper"] < 0))
         return {
             "test": "bootstrap_fallback",
-            "p_value": None,
+            "p_value": permutation["p_value"],
             "significant": significant,
             "effect_size": effect,
             "confidence_interval": ci,
             "warning": f"scipy testi kullanılamadı; bootstrap fallback uygulandı: {exc}",
-            "summary": _comparison_summary(a, b, None, significant),
+            "summary": _comparison_summary(a, b, permutation["p_value"], significant),
         }
 
 
@@ -23,6 +23,7 @@ from typing import Any
 import openpyxl
 
 from app.db.schema_compat import ensure_criteria_import_schema
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
 from app.services.popularity_service import calculate_popularity_score
 
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
@@ -342,6 +343,7 @@ def auto_generate_criteria_from_student_dataset(
         except sqlite3.OperationalError:
             pass
     if not dry_run:
+        bump_decision_matrix_version(conn, "student_dataset_criteria")
         conn.commit()
     return {
         "eklenen": eklenen,
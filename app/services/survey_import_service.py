@@ -5,7 +5,7 @@ import os
 import sqlite3
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import pandas as pd
 from openpyxl.styles import Font
@@ -14,12 +14,14 @@ from app.core.config import resolve_sqlite_db_path
 from app.db.schema_compat import ensure_reporting_schema, ensure_survey_import_schema
 from app.db.sqlite_connection import connect_sqlite, is_database_locked_error
 from app.services.course_matcher import (
-    load_faculty_course_candidates,
-    match_course_row,
+    CourseMatchIndex,
     normalize_course_key,
     normalize_course_text,
 )
 from app.services.course_type import build_elective_predicate
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
+from app.services.excel_stream_reader import ExcelRowSource, ExcelStreamReader, SheetStream, open_excel_stream
+from app.services.excel_stream_reader import excel_column_letter as _excel_column_letter
 from app.services.import_audit_service import (
     calculate_row_hash,
     create_import_batch,
@@ -147,32 +149,24 @@ def _resolve_faculty_id_by_name(cur: sqlite3.Cursor, faculty_name: str | None) -
     return None
 
 
-def _filter_rows_for_faculty(rows: list[SurveyRow], faculty_name: str | None) -> list[SurveyRow]:
+def _filter_rows_for_faculty(rows: Iterable[SurveyRow], faculty_name: str | None) -> Iterable[SurveyRow]:
     """Belgedeki cok-fakulteli satirlardan yalnizca secili fakulteye ait olanlari tutar.
 
     Fakulte adi bos olan satirlar (eski tek-fakulteli sablonlar) secili fakulteye ait
-    kabul edilir; boylece geriye donuk uyumluluk korunur.
+    kabul edilir; boylece geriye donuk uyumluluk korunur. ``ExcelRowSource`` verilirse
+    satirlari bellege almadan suzen yeni bir kaynak dondurulur.
     """
     target = _normalize_text(faculty_name)
-    if not target:
-        return list(rows)
-    kept: list[SurveyRow] = []
-    for row in rows:
-        row_fac = _normalize_text(row.fakulte_adi)
-        if not row_fac or row_fac == target:
-            kept.append(row)
-    return kept
 
+    def belongs(row: SurveyRow) -> bool:
+        row_fac = _normalize_text(row.fakulte_adi)
+        return not row_fac or row_fac == target
 
-def _excel_column_letter(index_1_based: int) -> str:
-    if index_1_based < 1:
-        raise ValueError("Excel kolon indeksi 1 veya daha buyuk olmali.")
-    out = ""
-    current = int(index_1_based)
-    while current > 0:
-        current, remainder = divmod(current - 1, 26)
-        out = chr(65 + remainder) + out
-    return out
+    if isinstance(rows, ExcelRowSource):
+        return rows.filter(belongs) if target else rows
+    if not target:
+        return list(rows)
+    return [row for row in rows if belongs(row)]
 
 
 def _is_summary_row(ders_kodu: str | None, ders_adi: str | None) -> bool:
@@ -182,20 +176,20 @@ def _is_summary_row(ders_kodu: str | None, ders_adi: str | None) -> bool:
     return normalized_name in {"toplam", "geneltoplam"}
 
 
-def _read_meta_sheet(xls: pd.ExcelFile) -> dict[str, Any]:
-    meta_sheet = next((name for name in xls.sheet_names if _normalize_text(str(name)) == "meta"), None)
+def _read_meta_sheet(reader: ExcelStreamReader) -> dict[str, Any]:
+    meta_sheet = next((name for name in reader.sheet_names if _normalize_text(str(name)) == "meta"), None)
     if not meta_sheet:
         return {}
-    df = pd.read_excel(xls, sheet_name=meta_sheet)
-    if df.empty:
+    stream = reader.sheet(meta_sheet)
+    row = next(stream.rows(skip_blank=False), None)
+    if row is None:
         return {}
-    df.columns = [str(col).strip() for col in df.columns]
-    row = df.iloc[0].to_dict()
+    columns = stream.columns
     return {
-        "fakulte_adi": _clean_text(row.get(_find_col(list(df.columns), "fakulte_adi", "fakulte", "faculty"))),
-        "yil": _parse_year(row.get(_find_col(list(df.columns), "yil", "akademik_yil", "year"))),
-        "toplam_katilimci": _safe_int(row.get(_find_col(list(df.columns), "toplam_katilimci", "ankete_katilan_toplam_ogrenci", "total_participants"))),
-        "aciklama": _clean_text(row.get(_find_col(list(df.columns), "aciklama", "not", "notes"))),
+        "fakulte_adi": _clean_text(row.get(_find_col(columns, "fakulte_adi", "fakulte", "faculty"))),
+        "yil": _parse_year(row.get(_find_col(columns, "yil", "akademik_yil", "year"))),
+        "toplam_katilimci": _safe_int(row.get(_find_col(columns, "toplam_katilimci", "ankete_katilan_toplam_ogrenci", "total_participants"))),
+        "aciklama": _clean_text(row.get(_find_col(columns, "aciklama", "not", "notes"))),
     }
 
 
@@ -203,26 +197,36 @@ def parse_survey_excel(excel_path: str) -> dict[str, Any]:
     if not os.path.exists(excel_path):
         raise FileNotFoundError(f"Anket dosyasi bulunamadi: {excel_path}")
 
-    xls = pd.ExcelFile(excel_path)
-    meta = _read_meta_sheet(xls)
-    data_sheet = next(
-        (
-            name
-            for name in xls.sheet_names
-            if _normalize_text(str(name)) in {"anketsonuclari", "anket_sonuclari", "anket", "survey"}
-        ),
-        None,
-    )
-    if data_sheet is None:
-        non_meta_sheets = [name for name in xls.sheet_names if _normalize_text(str(name)) != "meta"]
-        if not non_meta_sheets:
-            raise ValueError("Anket veri sayfasi bulunamadi.")
-        data_sheet = non_meta_sheets[0]
+    with open_excel_stream(excel_path) as reader:
+        meta = _read_meta_sheet(reader)
+        data_sheet = next(
+            (
+                name
+                for name in reader.sheet_names
+                if _normalize_text(str(name)) in {"anketsonuclari", "anket_sonuclari", "anket", "survey"}
+            ),
+            None,
+        )
+        if data_sheet is None:
+            non_meta_sheets = [name for name in reader.sheet_names if _normalize_text(str(name)) != "meta"]
+            if not non_meta_sheets:
+                raise ValueError("Anket veri sayfasi bulunamadi.")
+            data_sheet = non_meta_sheets[0]
 
-    df = pd.read_excel(xls, sheet_name=data_sheet)
-    df.columns = [str(col).strip() for col in df.columns]
 
-    columns = list(df.columns)
+    # Satirlar bellekte tutulmaz; scan() kolonlari dogrular, sayar ve uyarilari toplar.
+    rows = ExcelRowSource(excel_path, [data_sheet], _parse_survey_stream).scan()
+    return {
+        "meta": meta,
+        "rows": rows,
+        "warnings": rows.warnings,
+        "sheet_name": data_sheet,
+        "template_version": SURVEY_TEMPLATE_VERSION,
+    }
+
+
+def _parse_survey_stream(stream: SheetStream, warnings: list[str]) -> Iterator[SurveyRow]:
+    columns = stream.columns
     col_code = _find_col(columns, "ders_kodu", "ders kodu", "kod", "course_code")
     col_name = _find_col(columns, "ders_adi", "ders adi", "ders adı", "course_name")
     col_pref = _find_col(
@@ -247,34 +251,34 @@ def parse_survey_excel(excel_path: str) -> dict[str, Any]:
     if not (col_code or col_name):
         raise ValueError("Ders tanimlayici gerekli: ders_kodu veya ders_adi")
 
-    rows: list[SurveyRow] = []
-    warnings: list[str] = []
-    for idx, row in df.iterrows():
-        ders_kodu = _clean_text(row.get(col_code)) if col_code else None
-        ders_adi = _clean_text(row.get(col_name)) if col_name else None
-        tercih_sayisi = _safe_int(row.get(col_pref))
-        aciklama = _clean_text(row.get(col_note)) if col_note else None
-        raw_faculte = _clean_text(row.get(col_faculty)) if col_faculty else None
-        raw_yil = _parse_year(row.get(col_year)) if col_year else None
-        raw_donem = _normalize_donem(row.get(col_donem)) if col_donem else None
-        total_katilimci = _safe_int(row.get(col_total)) if col_total else None
-
-        row_has_context = any([ders_kodu, ders_adi, aciklama, raw_faculte, raw_yil, total_katilimci])
-        if not row_has_context and tercih_sayisi is None:
-            continue
-        if not row_has_context and tercih_sayisi is not None:
-            # Sablondaki toplam/formul satiri gibi veri disi satirlari atla.
-            continue
-        if _is_summary_row(ders_kodu=ders_kodu, ders_adi=ders_adi):
-            continue
-
-        if tercih_sayisi is None:
-            warnings.append(f"Satir {int(str(idx)) + 2}: tercih_sayisi/oy_miktari bos veya gecersiz.")
-            tercih_sayisi = -1
+    for chunk in stream.iter_chunks():
+        for row in chunk:
+            ders_kodu = _clean_text(row.get(col_code)) if col_code else None
+            ders_adi = _clean_text(row.get(col_name)) if col_name else None
+            tercih_sayisi = _safe_int(row.get(col_pref))
+            aciklama = _clean_text(row.get(col_note)) if col_note else None
+            raw_faculte = _clean_text(row.get(col_faculty)) if col_faculty else None
+            raw_yil = _parse_year(row.get(col_year)) if col_year else None
+            raw_donem = _normalize_donem(row.get(col_donem)) if col_donem else None
+            total_katilimci = _safe_int(row.get(col_total)) if col_total else None
+
+            row_has_context = any([ders_kodu, ders_adi, aciklama, raw_faculte, raw_yil, total_katilimci])
+            if not row_has_context and tercih_sayisi is None:
+                continue
+            if not row_has_context and tercih_sayisi is not None:
+                # Sablondaki toplam/formul satiri gibi veri disi satirlari atla.
+                continue
+            if _is_summary_row(ders_kodu=ders_kodu, ders_adi=ders_adi):
+                continue
+
+            if tercih_sayisi is None:
+                warnings.append(
+                    f"Satir {row.row_no}: tercih_sayisi/oy_miktari bos veya gecersiz ({stream.cell_ref(col_pref, row.row_no)})."
+                )
+                tercih_sayisi = -1
 
-        rows.append(
-            SurveyRow(
-                row_no=int(str(idx)) + 2,
+            yield SurveyRow(
+                row_no=row.row_no,
                 ders_kodu=ders_kodu,
                 ders_adi=ders_adi,
                 tercih_sayisi=int(tercih_sayisi),
@@ -284,19 +288,10 @@ def parse_survey_excel(excel_path: str) -> dict[str, Any]:
                 toplam_katilimci=total_katilimci,
                 donem=raw_donem,
             )
-        )
-
-    return {
-        "meta": meta,
-        "rows": rows,
-        "warnings": warnings,
-        "sheet_name": data_sheet,
-        "template_version": SURVEY_TEMPLATE_VERSION,
-    }
 
 
 def validate_survey_rows(
-    rows: list[SurveyRow],
+    rows: Iterable[SurveyRow],
     faculty_name: str | None = None,
     year: int | None = None,
     declared_total_participants: int | None = None,
@@ -308,26 +303,21 @@ def validate_survey_rows(
         errors.append("Belge icinde aktarilabilir anket satiri yok.")
         return {"ok": False, "errors": errors, "warnings": warnings, "declared_total_participants": declared_total_participants}
 
-    repeated_totals = {
-        int(row.toplam_katilimci)
-        for row in rows
-        if row.toplam_katilimci is not None
-    }
-    if declared_total_participants is None and len(repeated_totals) == 1:
-        declared_total_participants = next(iter(repeated_totals))
-    elif len(repeated_totals) > 1:
-        errors.append("Belge satirlarindaki toplam_katilimci degerleri birbiriyle tutarsiz.")
-
+    # Satirlar tek geciste dolasilir (akis kaynaklarinda her gecis dosyayi yeniden okur).
+    repeated_totals: set[int] = set()
+    row_errors: list[str] = []
     seen_document_keys: dict[str, int] = {}
     for row in rows:
+        if row.toplam_katilimci is not None:
+            repeated_totals.add(int(row.toplam_katilimci))
         if not row.ders_kodu and not row.ders_adi:
-            errors.append(f"Satir {row.row_no}: ders_kodu veya ders_adi zorunlu.")
+            row_errors.append(f"Satir {row.row_no}: ders_kodu veya ders_adi zorunlu.")
         if row.tercih_sayisi < 0:
-            errors.append(f"Satir {row.row_no}: tercih_sayisi negatif veya gecersiz.")
+            row_errors.append(f"Satir {row.row_no}: tercih_sayisi negatif veya gecersiz.")
         # Not: cok-fakulteli belgelerde satirlar import oncesi secili fakulteye gore
         # filtrelendiginden burada fakulte uyusmazligi ayrica hata uretmez.
         if year is not None and row.yil is not None and int(row.yil) != int(year):
-            errors.append(f"Satir {row.row_no}: belge yili '{row.yil}' secili yil '{year}' ile uyusmuyor.")
+            row_errors.append(f"Satir {row.row_no}: belge yili '{row.yil}' secili yil '{year}' ile uyusmuyor.")
 
         course_key = normalize_course_text(row.ders_kodu) or f"ad:{normalize_course_key(row.ders_adi)}"
         # Ayni ders kodu farkli donemlerde (Güz/Bahar) gecebilir; donemi anahtara ekleyerek
@@ -336,12 +326,18 @@ def validate_survey_rows(
         dedupe_key = f"{donem_key}|{course_key}" if course_key else ""
         if dedupe_key:
             if dedupe_key in seen_document_keys:
-                errors.append(
+                row_errors.append(
                     f"Belgede ayni ders birden fazla kez geciyor: satir {seen_document_keys[dedupe_key]} ve {row.row_no}."
                 )
             else:
                 seen_document_keys[dedupe_key] = row.row_no
 
+    if declared_total_participants is None and len(repeated_totals) == 1:
+        declared_total_participants = next(iter(repeated_totals))
+    elif len(repeated_totals) > 1:
+        errors.append("Belge satirlarindaki toplam_katilimci degerleri birbiriyle tutarsiz.")
+    errors.extend(row_errors)
+
     return {
         "ok": len(errors) == 0,
         "errors": errors,
@@ -356,12 +352,12 @@ def compute_total_participants(rows: list[SurveyImportRowResult] | list[SurveyRo
 
 def match_courses(
     conn: sqlite3.Connection,
-    rows: list[SurveyRow],
+    rows: Iterable[SurveyRow],
     faculty_id: int,
     year: int,
 ) -> dict[str, Any]:
     cur = conn.cursor()
-    candidates = load_faculty_course_candidates(cur=cur, faculty_id=int(faculty_id), year=int(year))
+    index = CourseMatchIndex.for_faculty(cur, faculty_id=int(faculty_id), year=int(year))
 
     matched_rows: list[SurveyImportRowResult] = []
     unmatched_rows: list[SurveyImportRowResult] = []
@@ -369,7 +365,7 @@ def match_courses(
     errors: list[str] = []
 
     for row in rows:
-        result = match_course_row(candidates=candidates, ders_kodu=row.ders_kodu, ders_adi=row.ders_adi)
+        result = index.match(row.ders_kodu, row.ders_adi)
         row_result = SurveyImportRowResult(
             row_no=row.row_no,
             ders_kodu=row.ders_kodu,
@@ -647,6 +643,7 @@ def replace_existing_survey_data(
         # import_batch_id ile diff/rollback raporlarinda okunabilir kalir.
         deleted_row_count = 0
         cur.execute("DELETE FROM survey_import WHERE import_id = ?", (previous_import_id,))
+    bump_decision_matrix_version(conn, "survey_scope_replaced")
 
     return {
         "previous_import_deleted": 1 if previous_import_id is not None else 0,
@@ -861,6 +858,7 @@ def apply_survey_to_criteria(
                 is_locked=True,
                 deactivate_existing=True,
             )
+    bump_decision_matrix_version(conn, "survey_import_applied")
 
     return {
         "ok": True,
@@ -893,7 +891,7 @@ def _import_survey_all_faculties(
     except Exception as exc:
         return {"ok": False, "message": f"Anket dosyasi okunamadi: {exc}", "errors": [str(exc)]}
 
-    rows = list(parsed.get("rows") or [])
+    rows = parsed.get("rows") or []
     distinct_names = sorted({
         str(row.fakulte_adi).strip()
         for row in rows
@@ -1037,7 +1035,7 @@ def import_survey_excel(
             metadata = {
                 "sheet_names": [str(parsed.get("sheet_name") or "Anket")],
                 "columns": [],
-                "row_count": len(parsed.get("rows") or []),
+                "row_count": len(parsed.get("rows") or ()),
                 "column_count": 0,
             }
         batch = create_import_batch(
@@ -1047,7 +1045,7 @@ def import_survey_excel(
             file_path=excel_path,
             sheet_names=list(metadata.get("sheet_names") or []),
             columns=list(metadata.get("columns") or []),
-            row_count=int(metadata.get("row_count") or len(parsed.get("rows") or [])),
+            row_count=int(metadata.get("row_count") or len(parsed.get("rows") or ())),
             column_count=int(metadata.get("column_count") or 0),
             faculty_id=int(faculty_id),
             year=int(year),
@@ -1073,7 +1071,7 @@ def import_survey_excel(
 
         # Cok-fakulteli belgeyi secili fakulteye gore filtrele: yalnizca bu fakulteye ait
         # (veya fakulte bilgisi tasimayan) satirlar isleme alinir.
-        survey_rows = _filter_rows_for_faculty(list(parsed.get("rows") or []), faculty_name)
+        survey_rows = _filter_rows_for_faculty(parsed.get("rows") or [], faculty_name)
 
         meta = dict(parsed.get("meta") or {})
         declared_total = meta.get("toplam_katilimci")
@@ -1274,9 +1272,11 @@ def import_survey_excel(
             },
         )
         if auto_activate and status == "validated":
+            from app.services.calculation import refresh_topsis_scores_after_change
             from app.services.import_audit_service import activate_import
 
             activate_import(conn, import_batch_id, user=uploaded_by)
+            refresh_topsis_scores_after_change(conn, int(faculty_id), int(year))
         try:
             recalculate_import_diff(conn, import_batch_id)
         except Exception:
@@ -1369,6 +1369,10 @@ def apply_pending_survey_import(
     )
     mark_staging_decision(conn, int(import_batch_id), "applied", user=user)
     activate_import(conn, int(import_batch_id), user=user)
+    # Anket verisi fakulte+yil kapsaminda degistirildiginden durumdaki tum dersler yenilenir.
+    from app.services.calculation import refresh_topsis_scores_after_change
+
+    refresh_topsis_scores_after_change(conn, int(payload["faculty_id"]), int(payload["year"]))
     return {
         "ok": True,
         "message": f"Anket verileri onaylandı ve {len(rows)} satır canlı sisteme uygulandı.",
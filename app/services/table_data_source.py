@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Tablo görüntüleyici için SQL tabanlı veri kaynağı ve arka plan işçisi.
+
+Eski görüntüleyici tablonun tamamını (50.000 satıra kadar) belleğe alıp
+filtreyi/sıralamayı Python'da yapıyordu. ``TableDataSource`` arama, kolon
+filtreleri ve sıralamayı SQL'e iter; sayfalar keyset imleciyle okunur,
+yalnızca görünen sayfa bellekte tutulur. Toplam satır sayısı sınırlı bir
+sayımla (gerekirse tahmin) verilir.
+
+``TableBrowserWorker`` sorguları tek bir arka plan thread'inde, kendi
+salt-okunur bağlantısıyla çalıştırır. Yeni istek gelince süren sorgu
+``Connection.interrupt()`` ile iptal edilir ve eski sonuç atılır; UI
+sonuçları kuyruktan ``after()`` ile okur (Tk ana döngüsü bloklanmaz).
+"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from app.db.session import open_sqlite_connection
+from app.repositories.report_repository import ReportRepository
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_COUNT_CAP = 10000
+
+
+def readonly_connection_factory(db_path: str) -> Callable[[], sqlite3.Connection]:
+    """İşçi bağlantısı: ``PRAGMA query_only``; WAL'da yazıcıyı bloklamaz."""
+
+    def connect() -> sqlite3.Connection:
+        conn = open_sqlite_connection(db_path, row_factory=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    return connect
+
+
+@dataclass(frozen=True)
+class TableQuery:
+    table: str
+    search: str = ""
+    column_filters: tuple[tuple[str, str], ...] = ()
+    sort_col: str | None = None
+    sort_desc: bool = False
+
+    @classmethod
+    def build(
+        cls,
+        table: str,
+        search: str = "",
+        column_filters: dict[str, str] | None = None,
+        sort_col: str | None = None,
+        sort_desc: bool = False,
+    ) -> "TableQuery":
+        filters = tuple(
+            sorted((col, value.strip()) for col, value in (column_filters or {}).items() if (value or "").strip())
+        )
+        return cls(table, (search or "").strip(), filters, sort_col, bool(sort_desc))
+
+
+@dataclass
+class TablePage:
+    query: TableQuery
+    columns: list[str]
+    rows: list[tuple[Any, ...]]
+    cursor: tuple[Any, ...] | None
+    next_cursor: tuple[Any, ...] | None
+    total: int | None = None
+    total_exact: bool = True
+    keyset: bool = True
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+class TableDataSource:
+    """Tek bağlantı üzerinde sayfa/sayım sorguları (thread'ler arası paylaşılmaz)."""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        count_cap: int = DEFAULT_COUNT_CAP,
+    ):
+        self.conn = conn
+        self.repo = ReportRepository(conn)
+        self.page_size = max(1, int(page_size))
+        self.count_cap = max(1, int(count_cap))
+        self._layout: dict[str, tuple[list[str], bool]] = {}
+        self._numeric_text: dict[tuple[str, str], bool] = {}
+
+    def columns(self, table: str) -> list[str]:
+        return list(self._table_layout(table)[0])
+
+    def _table_layout(self, table: str) -> tuple[list[str], bool]:
+        layout = self._layout.get(table)
+        if layout is None:
+            layout = self._layout[table] = (self.repo.table_columns(table), self.repo.has_rowid(table))
+        return layout
+
+    def fetch_page(
+        self,
+        query: TableQuery,
+        cursor: tuple[Any, ...] | None = None,
+        *,
+        with_count: bool = False,
+    ) -> TablePage:
+        columns, keyset = self._table_layout(query.table)
+        filters = dict(query.column_filters)
+        numeric_text = False
+        if query.sort_col in columns:
+            key = (query.table, query.sort_col)
+            # İlk sayfada yeniden belirlenir; sonraki sayfalar imleçle aynı ifadeyi kullanır.
+            if cursor is None or key not in self._numeric_text:
+                self._numeric_text[key] = self.repo.is_numeric_text_column(query.table, query.sort_col)
+            numeric_text = self._numeric_text[key]
+        rows, next_cursor = self.repo.table_page(
+            query.table,
+            columns,
+            search=query.search,
+            column_filters=filters,
+            sort_col=query.sort_col,
+            sort_desc=query.sort_desc,
+            cursor=cursor,
+            limit=self.page_size,
+            keyset=keyset,
+            numeric_text=numeric_text,
+        )
+        page = TablePage(query, columns, rows, cursor, next_cursor, keyset=keyset)
+        if with_count:
+            page.total, page.total_exact = self.repo.count_rows(
+                query.table, columns, search=query.search, column_filters=filters, cap=self.count_cap
+            )
+        return page
+
+
+@dataclass
+class _PageRequest:
+    ticket: int
+    query: TableQuery
+    cursor: tuple[Any, ...] | None
+    with_count: bool
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+class TableBrowserWorker:
+    """Sayfa isteklerini arka planda çalıştırır; yalnızca en son istek geçerlidir.
+
+    ``connect`` işçi thread'inde çağrılır (SQLite bağlantısı thread'e bağlıdır).
+    Sonuçlar ``results`` kuyruğuna ``(ticket, TablePage | None, hata | None,
+    extra)`` olarak düşer; ``ticket`` son ``submit`` değerinden farklıysa
+    sonuç bayattır ve atılmalıdır.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        count_cap: int = DEFAULT_COUNT_CAP,
+    ):
+        self._connect = connect
+        self._page_size = page_size
+        self._count_cap = count_cap
+        self.results: "queue.Queue[tuple[int, TablePage | None, str | None, dict[str, Any]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending: _PageRequest | None = None
+        self._ticket = 0
+        self._busy_ticket: int | None = None
+        self._conn: sqlite3.Connection | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name="table-browser", daemon=True)
+        self._thread.start()
+
+    @property
+    def latest_ticket(self) -> int:
+        with self._lock:
+            return self._ticket
+
+    def submit(
+        self,
+        query: TableQuery,
+        cursor: tuple[Any, ...] | None = None,
+        *,
+        with_count: bool = False,
+        extra: dict[str, Any] | None = None,
+    ) -> int:
+        """Yeni istek; bekleyen istek değiştirilir, süren sorgu iptal edilir."""
+        with self._lock:
+            self._ticket += 1
+            self._pending = _PageRequest(self._ticket, query, cursor, with_count, dict(extra or {}))
+            if self._busy_ticket is not None and self._conn is not None:
+                self._conn.interrupt()
+            self._wakeup.notify()
+            return self._ticket
+
+    def cancel(self) -> None:
+        """Bekleyen ve süren isteği iptal eder (sonuçları bayat sayılır)."""
+        with self._lock:
+            self._ticket += 1
+            self._pending = None
+            if self._busy_ticket is not None and self._conn is not None:
+                self._conn.interrupt()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._pending = None
+            if self._busy_ticket is not None and self._conn is not None:
+                self._conn.interrupt()
+            self._wakeup.notify()
+
+    def _loop(self) -> None:
+        source: TableDataSource | None = None
+        try:
+            while True:
+                with self._lock:
+                    while self._pending is None and not self._closed:
+                        self._wakeup.wait()
+                    if self._closed:
+                        return
+                    request, self._pending = self._pending, None
+                    self._busy_ticket = request.ticket
+                page, error = None, None
+                try:
+                    if source is None:
+                        conn = self._connect()
+                        with self._lock:
+                            self._conn = conn
+                        source = TableDataSource(conn, page_size=self._page_size, count_cap=self._count_cap)
+                    page = source.fetch_page(request.query, request.cursor, with_count=request.with_count)
+                except sqlite3.OperationalError as exc:
+                    if "interrupt" not in str(exc).lower():
+                        error = str(exc)
+                except Exception as exc:  # noqa: BLE001 - hata UI'a mesaj olarak gider
+                    error = f"{type(exc).__name__}: {exc}"
+                with self._lock:
+                    self._busy_ticket = None
+                    stale = request.ticket != self._ticket
+                if not stale and (page is not None or error is not None):
+                    self.results.put((request.ticket, page, error, request.extra))
+        finally:
+            with self._lock:
+                conn, self._conn = self._conn, None
+            if conn is not None:
+                conn.close()
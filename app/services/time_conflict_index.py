@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Gun/saat cakisma tespiti: saatler bir kez dakikaya cevrilir, gunlere gore sweep-line.
+
+``find_time_conflicts`` her gun icin araliklari baslangica gore siralar ve
+bitis zamanina gore bir min-heap ile aktif araliklari tutar; toplam maliyet
+O(n log n + k) olur (k = cakisan cift sayisi). Cakisma kurali eski ikili
+karsilastirmayla aynidir: ``not (bit1 <= bas2 or bit2 <= bas1)``, yani
+uc uca degen dersler cakismaz.
+
+``TimeConflictIndex`` planlayicinin "X dersini eklersem cakisir mi?" sorusu
+icin artimli (insert/remove) bir indekstir; sorgu ikili arama ile yapilir.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from typing import Any, Hashable, Iterable, NamedTuple
+
+
+class TimeSlot(NamedTuple):
+    key: Hashable
+    day: str
+    start: int
+    end: int
+
+
+def parse_clock_minutes(value: Any) -> int:
+    """"HH:MM" / "HH" / 9.0 -> gun icindeki dakika; bos veya okunamayan deger 0."""
+    if not value:
+        return 0
+    text = str(value).strip()
+    try:
+        if ":" in text:
+            parts = text.split(":")
+            return int(parts[0] or 0) * 60 + int(parts[1] or 0)
+        return int(float(text)) * 60
+    except (ValueError, TypeError):
+        return 0
+
+
+def normalize_day(value: Any) -> str:
+    return str(value or "").strip()
+
+
+def build_slot(key: Hashable, day: Any, start: Any, end: Any) -> TimeSlot:
+    return TimeSlot(key, normalize_day(day), parse_clock_minutes(start), parse_clock_minutes(end))
+
+
+def find_time_conflicts(slots: Iterable[TimeSlot]) -> list[tuple[int, int]]:
+    """Cakisan slot ciftlerinin (i, j) indeksleri; i < j ve girdi sirasina gore sirali."""
+    by_day: dict[str, list[tuple[int, int, int]]] = defaultdict(list)
+    inverted: dict[str, list[tuple[int, int, int]]] = defaultdict(list)
+    for pos, slot in enumerate(slots):
+        target = inverted if slot.end < slot.start else by_day
+        target[slot.day].append((slot.start, slot.end, pos))
+
+    pairs: list[tuple[int, int]] = []
+    for day, items in by_day.items():
+        # Esit baslangicta kisa aralik once gelir; boylece [5,5] ile [5,9] cakismaz.
+        items.sort()
+        active: list[tuple[int, int]] = []  # (bitis, pozisyon)
+        for start, end, pos in items:
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, other in active:
+                pairs.append((other, pos) if other < pos else (pos, other))
+            heapq.heappush(active, (end, pos))
+
+        # Bitisi baslangictan once olan (hatali) kayitlar eski kuralla tek tek denetlenir.
+        for start, end, pos in inverted.get(day, ()):
+            for other_start, other_end, other in items:
+                if end > other_start and other_end > start:
+                    pairs.append((other, pos) if other < pos else (pos, other))
+    pairs.sort()
+    return pairs
+
+
+class TimeConflictIndex:
+    """Gun bazinda baslangica gore sirali slot listesi; artimli ekleme/cikarma.
+
+    Sorgu, bitisi sorgu baslangicindan sonra olabilecek adaylari ikili arama ile
+    ``[bas - en_uzun_sure, bit)`` penceresine daraltir: O(log n + pencere).
+    """
+
+    def __init__(self, slots: Iterable[TimeSlot] = ()) -> None:
+        self._days: dict[str, list[tuple[int, int, int]]] = defaultdict(list)
+        self._max_length: dict[str, int] = defaultdict(int)
+        self._slots: dict[int, TimeSlot] = {}
+        self._next_id = 0
+        for slot in slots:
+            self.insert(slot)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def insert(self, slot: TimeSlot) -> int:
+        slot_id = self._next_id
+        self._next_id += 1
+        self._slots[slot_id] = slot
+        insort(self._days[slot.day], (slot.start, slot.end, slot_id))
+        self._max_length[slot.day] = max(self._max_length[slot.day], slot.end - slot.start)
+        return slot_id
+
+    def remove(self, slot_id: int) -> TimeSlot | None:
+        slot = self._slots.pop(slot_id, None)
+        if slot is None:
+            return None
+        items = self._days[slot.day]
+        pos = bisect_left(items, (slot.start, slot.end, slot_id))
+        if pos < len(items) and items[pos][2] == slot_id:
+            del items[pos]
+        return slot
+
+    def remove_key(self, key: Hashable) -> int:
+        ids = [slot_id for slot_id, slot in self._slots.items() if slot.key == key]
+        for slot_id in ids:
+            self.remove(slot_id)
+        return len(ids)
+
+    def overlapping(self, query: TimeSlot) -> list[TimeSlot]:
+        items = self._days.get(query.day)
+        if not items:
+            return []
+        if query.end < query.start:
+            candidates = items
+        else:
+            lo = bisect_left(items, (query.start - self._max_length[query.day], -(1 << 62), -1))
+            hi = bisect_right(items, (query.end, 1 << 62, 1 << 62))
+            candidates = items[lo:hi]
+        return [
+            self._slots[slot_id]
+            for other_start, other_end, slot_id in candidates
+            if not (query.end <= other_start or other_end <= query.start)
+        ]
+
+    def conflicts_for(self, slots: Iterable[TimeSlot]) -> list[tuple[TimeSlot, TimeSlot]]:
+        """Eklenmek istenen slotlarin indeksteki (farkli anahtarli) cakismalari."""
+        found: list[tuple[TimeSlot, TimeSlot]] = []
+        for slot in slots:
+            for other in self.overlapping(slot):
+                if other.key != slot.key:
+                    found.append((slot, other))
+        return found
+
+    def would_conflict(self, slots: Iterable[TimeSlot]) -> bool:
+        return bool(self.conflicts_for(slots))
@@ -1,12 +1,28 @@
 # -*- coding: utf-8 -*-
-"""Hafif saat cakisma riski analizi."""
+"""Saat cakisma riski analizi.
+
+Iki mod vardir:
+
+* ``group``: ``course_time_constraints.conflict_group`` sezgiseli; ayni gruptaki
+  derslerin ayni doneme yigilmasi risk sayilir.
+* ``slots``: ``ders_ogretim`` tablosundaki gun/baslangic/bitis saatleri ile gercek
+  slot cakismasi (sweep-line, bkz. ``time_conflict_index``).
+
+``combined`` ikisini birlikte uygular.
+"""
 
 from __future__ import annotations
 
 import sqlite3
+from collections import defaultdict
 from typing import Any
 
 from app.db.schema_compat import ensure_semester_planning_schema
+from app.services.course_semester_availability_service import display_semester
+from app.services.time_conflict_index import TimeSlot, build_slot, find_time_conflicts
+
+CONFLICT_MODES = ("group", "slots", "combined")
+_SLOT_QUERY_CHUNK = 500
 
 
 def _row_to_dict(row: sqlite3.Row | tuple[Any, ...] | None, columns: list[str] | None = None) -> dict[str, Any] | None:
@@ -30,7 +46,85 @@ def get_time_constraints(conn: sqlite3.Connection, course_id: int | None = None)
     return [_row_to_dict(row, cols) or {} for row in cur.fetchall()]
 
 
-def estimate_conflict_risk(conn: sqlite3.Connection, plan: list[dict[str, Any]]) -> dict[str, Any]:
+def _table_exists(cur: sqlite3.Cursor, table: str) -> bool:
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    return cur.fetchone() is not None
+
+
+def _format_minutes(value: int) -> str:
+    return f"{value // 60:02d}:{value % 60:02d}"
+
+
+def load_course_slots(conn: sqlite3.Connection, course_ids: list[int]) -> dict[int, list[TimeSlot]]:
+    """Derslerin haftalik gun/saat slotlari (saatler bir kez dakikaya cevrilir)."""
+    cur = conn.cursor()
+    ids = sorted({int(course_id) for course_id in course_ids})
+    if not ids or not _table_exists(cur, "ders_ogretim"):
+        return {}
+    slots: dict[int, list[TimeSlot]] = defaultdict(list)
+    for offset in range(0, len(ids), _SLOT_QUERY_CHUNK):
+        chunk = ids[offset : offset + _SLOT_QUERY_CHUNK]
+        placeholders = ",".join("?" for _ in chunk)
+        cur.execute(
+            f"""
+            SELECT DISTINCT ders_id, gun, baslangic_saati, bitis_saati
+            FROM ders_ogretim
+            WHERE ders_id IN ({placeholders})
+              AND COALESCE(TRIM(gun), '') <> ''
+              AND COALESCE(TRIM(baslangic_saati), '') <> ''
+            ORDER BY ders_id, gun, baslangic_saati
+            """,
+            tuple(chunk),
+        )
+        for course_id, day, start, end in cur.fetchall():
+            slots[int(course_id)].append(build_slot(int(course_id), day, start, end))
+    return dict(slots)
+
+
+def _semester_courses(plan: list[dict[str, Any]]) -> dict[str, list[int]]:
+    by_semester: dict[str, list[int]] = defaultdict(list)
+    for item in plan:
+        semester = str(item.get("assigned_semester") or "")
+        course_id = int(item.get("course_id") or 0)
+        if not course_id or semester in {"", "unassigned"}:
+            continue
+        by_semester[semester].append(course_id)
+    return by_semester
+
+
+def find_slot_conflicts(
+    conn: sqlite3.Connection,
+    plan: list[dict[str, Any]],
+    course_slots: dict[int, list[TimeSlot]] | None = None,
+) -> list[dict[str, Any]]:
+    """Ayni doneme atanmis ve haftalik saatleri ortusen ders ciftleri."""
+    by_semester = _semester_courses(plan)
+    if course_slots is None:
+        course_slots = load_course_slots(conn, [cid for ids in by_semester.values() for cid in ids])
+    conflicts: list[dict[str, Any]] = []
+    for semester, course_ids in by_semester.items():
+        slots = [slot for course_id in dict.fromkeys(course_ids) for slot in course_slots.get(course_id, [])]
+        seen: set[tuple[int, int]] = set()
+        for i, j in find_time_conflicts(slots):
+            a, b = slots[i], slots[j]
+            pair = (min(int(a.key), int(b.key)), max(int(a.key), int(b.key)))
+            if pair[0] == pair[1] or pair in seen:
+                continue
+            seen.add(pair)
+            conflicts.append(
+                {
+                    "semester": semester,
+                    "course_a": pair[0],
+                    "course_b": pair[1],
+                    "day": a.day,
+                    "start": _format_minutes(max(a.start, b.start)),
+                    "end": _format_minutes(min(a.end, b.end)),
+                }
+            )
+    return conflicts
+
+
+def _estimate_group_risk(conn: sqlite3.Connection, plan: list[dict[str, Any]]) -> dict[str, Any]:
     constraints = {int(row["course_id"]): row for row in get_time_constraints(conn) if row.get("course_id") is not None}
     groups: dict[tuple[str, str], int] = {}
     for item in plan:
@@ -48,15 +142,44 @@ def estimate_conflict_risk(conn: sqlite3.Connection, plan: list[dict[str, Any]])
     return {"risk_level": level, "risky_groups": risky}
 
 
-def generate_conflict_warnings(conn: sqlite3.Connection, plan: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    risk = estimate_conflict_risk(conn, plan)
-    if risk["risk_level"] == "low":
-        return []
-    return [
-        {
-            "constraint_type": "time_conflict",
-            "severity": "warning" if risk["risk_level"] == "medium" else "error",
-            "message": "Aynı öğrenci kitlesinin alabileceği dersler aynı döneme yığılmış olabilir.",
-            "suggestion": "Conflict group içindeki yüksek talep dersleri dönemlere dağıtın.",
-        }
-    ]
+def estimate_conflict_risk(conn: sqlite3.Connection, plan: list[dict[str, Any]], mode: str = "group") -> dict[str, Any]:
+    if mode not in CONFLICT_MODES:
+        raise ValueError(f"Bilinmeyen cakisma modu: {mode}")
+    if mode == "group":
+        return _estimate_group_risk(conn, plan)
+    risk = _estimate_group_risk(conn, plan) if mode == "combined" else {"risk_level": "low", "risky_groups": {}}
+    slot_conflicts = find_slot_conflicts(conn, plan)
+    if slot_conflicts:
+        risk["risk_level"] = "high"
+    risk["slot_conflicts"] = slot_conflicts
+    risk["mode"] = mode
+    return risk
+
+
+def generate_conflict_warnings(conn: sqlite3.Connection, plan: list[dict[str, Any]], mode: str = "group") -> list[dict[str, Any]]:
+    risk = estimate_conflict_risk(conn, plan, mode=mode)
+    warnings: list[dict[str, Any]] = []
+    if risk["risky_groups"]:
+        group_level = "high" if any(count >= 3 for count in risk["risky_groups"].values()) else "medium"
+        warnings.append(
+            {
+                "constraint_type": "time_conflict",
+                "severity": "warning" if group_level == "medium" else "error",
+                "message": "Aynı öğrenci kitlesinin alabileceği dersler aynı döneme yığılmış olabilir.",
+                "suggestion": "Conflict group içindeki yüksek talep dersleri dönemlere dağıtın.",
+            }
+        )
+    for conflict in risk.get("slot_conflicts", []):
+        warnings.append(
+            {
+                "course_id": conflict["course_b"],
+                "constraint_type": "time_conflict",
+                "severity": "error",
+                "message": (
+                    f"{display_semester(conflict['semester'])}: {conflict['course_a']} ve {conflict['course_b']} "
+                    f"dersleri {conflict['day']} {conflict['start']}-{conflict['end']} saatinde çakışıyor."
+                ),
+                "suggestion": "Derslerden birini diğer döneme taşıyın veya ders saatini değiştirin.",
+            }
+        )
+    return warnings
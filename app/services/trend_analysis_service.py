@@ -255,6 +255,11 @@ def analyze_course_trend(
     return analyze_trend_values(values, target_year=int(year), first_seen_year=first_seen)
 
 
+def _finalized_score_ratio(score: Any) -> float:
+    numeric = _safe_float(score)
+    return max(0.0, min(1.0, numeric / 100.0 if numeric > 1.0 else numeric))
+
+
 def fetch_finalized_score_values(
     cur: sqlite3.Cursor,
     course_id: int,
@@ -278,8 +283,7 @@ def fetch_finalized_score_values(
             (int(course_id), int(source_year)),
         )
         for year, score in cur.fetchall():
-            numeric = _safe_float(score)
-            values[int(year)] = max(0.0, min(1.0, numeric / 100.0 if numeric > 1.0 else numeric))
+            values[int(year)] = _finalized_score_ratio(score)
         if values:
             return values, "skor.skor_top"
     except sqlite3.OperationalError:
@@ -297,8 +301,7 @@ def fetch_finalized_score_values(
             (int(course_id), int(source_year)),
         )
         for year, score in cur.fetchall():
-            numeric = _safe_float(score)
-            values[int(year)] = max(0.0, min(1.0, numeric / 100.0 if numeric > 1.0 else numeric))
+            values[int(year)] = _finalized_score_ratio(score)
         if values:
             return values, "havuz.skor"
     except sqlite3.OperationalError:
@@ -306,19 +309,95 @@ def fetch_finalized_score_values(
     return {}, "yok"
 
 
+def has_final_score_tables(cur: sqlite3.Cursor) -> bool:
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name IN ('skor','havuz')")
+    return bool(cur.fetchall())
+
+
+def fetch_finalized_score_values_bulk(
+    cur: sqlite3.Cursor,
+    course_ids: list[int] | set[int],
+    source_year: int,
+) -> dict[int, tuple[dict[int, float], str]]:
+    """fetch_finalized_score_values'in cok dersli, kume tabanli karsiligi.
+
+    skor tablosunda puani olmayan dersler icin havuz.skor fallback'i ayni
+    sirayla uygulanir. Sonucta her ders icin (values, source) cifti doner.
+    """
+    ids = sorted({int(course_id) for course_id in course_ids})
+    out: dict[int, tuple[dict[int, float], str]] = {course_id: ({}, "yok") for course_id in ids}
+    chunk_size = 900  # SQLite degisken limitine takilmamak icin.
+
+    skor_values: dict[int, dict[int, float]] = {}
+    try:
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i : i + chunk_size]
+            placeholders = ",".join("?" for _ in chunk)
+            cur.execute(
+                f"""
+                SELECT ders_id, akademik_yil, skor_top
+                FROM skor
+                WHERE ders_id IN ({placeholders}) AND akademik_yil < ? AND skor_top IS NOT NULL
+                ORDER BY ders_id, akademik_yil
+                """,
+                (*chunk, int(source_year)),
+            )
+            for course_id, year, score in cur.fetchall():
+                skor_values.setdefault(int(course_id), {})[int(year)] = _finalized_score_ratio(score)
+    except sqlite3.OperationalError:
+        pass
+    for course_id, values in skor_values.items():
+        out[course_id] = (values, "skor.skor_top")
+
+    remaining = [course_id for course_id in ids if course_id not in skor_values]
+    try:
+        for i in range(0, len(remaining), chunk_size):
+            chunk = remaining[i : i + chunk_size]
+            placeholders = ",".join("?" for _ in chunk)
+            cur.execute(
+                f"""
+                SELECT CAST(ders_id AS INTEGER), yil, MAX(skor)
+                FROM havuz
+                WHERE CAST(ders_id AS INTEGER) IN ({placeholders}) AND yil < ? AND skor IS NOT NULL
+                GROUP BY CAST(ders_id AS INTEGER), yil
+                ORDER BY 1, yil
+                """,
+                (*chunk, int(source_year)),
+            )
+            havuz_values: dict[int, dict[int, float]] = {}
+            for course_id, year, score in cur.fetchall():
+                havuz_values.setdefault(int(course_id), {})[int(year)] = _finalized_score_ratio(score)
+            for course_id, values in havuz_values.items():
+                out[course_id] = (values, "havuz.skor")
+    except sqlite3.OperationalError:
+        pass
+    return out
+
+
 def analyze_course_finalized_score_trend(
     cur: sqlite3.Cursor,
     course_id: int,
     source_year: int,
+    *,
+    prefetched: tuple[dict[int, float], str] | None = None,
+    has_final_score_storage: bool | None = None,
 ) -> dict[str, Any]:
-    """Yalniz onceki yillarin kesinlesme puanlariyla trend girdisi uretir."""
-    values, source = fetch_finalized_score_values(cur, course_id, source_year)
+    """Yalniz onceki yillarin kesinlesme puanlariyla trend girdisi uretir.
+
+    ``prefetched`` verilirse (fetch_finalized_score_values_bulk ciktisi) skor
+    sorgusu atlanir; ``has_final_score_storage`` verilirse sema yoklamasi da
+    atlanir. Toplu cagiranlar ikisini de bir kez hesaplayip gecirir.
+    """
+    if prefetched is not None:
+        values, source = dict(prefetched[0]), prefetched[1]
+    else:
+        values, source = fetch_finalized_score_values(cur, course_id, source_year)
     if not values:
         # Eski snapshot/test semalarinda skor ve havuz tablolari hic yoksa,
         # migration uyumlulugu icin tarihsel basari serisine geri dusulur.
         # Uretim semasinda bu tablolar vardir ve kaynak yil puani kullanilmaz.
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name IN ('skor','havuz')")
-        has_final_score_storage = bool(cur.fetchall())
+        if has_final_score_storage is None:
+            has_final_score_storage = has_final_score_tables(cur)
         if has_final_score_storage:
             result = analyze_trend_values({}, target_year=source_year)
         else:
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Surec izolasyonlu benchmark kosucusu: seri ile ayni metrikler, zaman asimi kaydi, paylasilan tablo."""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.benchmark import parallel
+from app.benchmark.result_store import ResultStore
+from app.benchmark.runner import ExperimentRunner
+from app.benchmark.scenarios import BenchmarkScenario
+from app.datasets.entities import DatasetBundle
+
+pytestmark = pytest.mark.benchmark
+
+
+def _dataset() -> DatasetBundle:
+    rng = np.random.default_rng(3)
+    rows = 120
+    table = pd.DataFrame(
+        {
+            "course_id": rng.integers(1, 13, size=rows),
+            "student_id": np.arange(rows),
+            "gpa": rng.uniform(1.5, 4.0, size=rows),
+            "success_rate": rng.uniform(0, 1, size=rows),
+            "trend": rng.normal(size=rows),
+            "department": rng.choice(["BM", "EE", "ME"], size=rows),
+        }
+    )
+    return DatasetBundle(dataset_name="parallel_test", raw_real={}, derived={"student_course_features": table})
+
+
+def _scenario() -> BenchmarkScenario:
+    return BenchmarkScenario(name="parallel_ranking", description="test", problem_type="ranking", algorithm_names=["TOPSIS", "VIKOR", "AHP"])
+
+
+def _metric_rows(result: dict) -> list[tuple[str, str, str, float]]:
+    return [
+        (m["algorithm_name"], m["metric_group"], m["metric_name"], m["metric_value"])
+        for m in result["run"]["metrics"]
+        if m["metric_group"] != "performance"
+    ]
+
+
+def test_shared_table_round_trip(tmp_path):
+    frame = pd.DataFrame({"a": np.arange(5, dtype=np.int64), "b": [0.5, np.nan, 1.0, 2.0, 3.0], "c": list("vwxyz"), 7: [True, False, True, True, False]})
+    handle = parallel.export_table(frame, tmp_path / "t0")
+    loaded = parallel.load_table(handle)
+    pd.testing.assert_frame_equal(loaded, frame)
+
+
+def test_parallel_run_matches_serial_metrics_and_order(tmp_path):
+    dataset, scenario = _dataset(), _scenario()
+    serial = ExperimentRunner(result_store=ResultStore(tmp_path / "serial")).run(dataset, scenario)
+    isolated = ExperimentRunner(result_store=ResultStore(tmp_path / "parallel"), max_workers=2).run(dataset, scenario)
+
+    assert _metric_rows(isolated) == _metric_rows(serial)
+    assert list(isolated["results"]) == ["TOPSIS", "VIKOR", "AHP"]
+    for name in scenario.algorithm_names:
+        assert isolated["results"][name]["status"] == "ok"
+        assert isolated["results"][name]["output"]["recommendations"] == serial["results"][name]["output"]["recommendations"]
+
+
+def test_repeated_seeds_are_averaged_in_seed_order(tmp_path):
+    runner = ExperimentRunner(result_store=ResultStore(tmp_path))
+    result = runner.run(_dataset(), _scenario(), ["TOPSIS"], seeds=[1, 2, 3])
+    entry = result["results"]["TOPSIS"]
+    assert [repeat["seed"] for repeat in entry["repeats"]] == [1, 2, 3]
+    assert all(m["metadata"] == {"seeds": [1, 2, 3]} for m in result["run"]["metrics"])
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="monkeypatch child processes'a yalnizca fork ile gecer")
+def test_timeout_is_recorded_without_aborting_other_algorithms(tmp_path, monkeypatch):
+    original = ExperimentRunner._run_algorithm
+
+    def slow_vikor(self, dataset, scenario, algorithm, seed=42):
+        if algorithm.name == "VIKOR":
+            time.sleep(30)
+        return original(self, dataset, scenario, algorithm, seed=seed)
+
+    monkeypatch.setattr(ExperimentRunner, "_run_algorithm", slow_vikor)
+    runner = ExperimentRunner(result_store=ResultStore(tmp_path), max_workers=2, timeout_s=3.0)
+    started = time.perf_counter()
+    result = runner.run(_dataset(), _scenario())
+
+    assert time.perf_counter() - started < 25
+    assert result["results"]["VIKOR"]["status"] == "timeout"
+    assert result["results"]["VIKOR"]["output"] is None
+    assert result["results"]["TOPSIS"]["status"] == "ok"
+    assert {m["algorithm_name"] for m in result["run"]["metrics"]} == {"TOPSIS", "AHP"}
@@ -87,6 +87,12 @@ def _create_base_schema(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+@pytest.fixture(autouse=True)
+def _isolated_ml_artifacts(tmp_path_factory, monkeypatch):
+    """Model artifact'lari test basina gecici klasore yazilir (data/ altina asla)."""
+    monkeypatch.setenv("ML_ARTIFACT_DIR", str(tmp_path_factory.mktemp("ml_artifacts")))
+
+
 @pytest.fixture
 def empty_db(tmp_path):
     """Temiz, bos SQLite veritabani (gecici dosya)."""
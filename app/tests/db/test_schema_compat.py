@@ -149,6 +149,46 @@ class TestSchemaCompat:
             cur.execute("INSERT INTO decision_policies (scope_type, is_active) VALUES ('global', 1)")
 
 
+class TestSchemaCompatFingerprint:
+    """ensure_reporting_schema parmak izi — saglikli semada zincir ve log yazimi atlanir."""
+
+    def test_second_call_skips_chain_without_writes(self, empty_db):
+        from app.db.schema_compat import ensure_reporting_schema, schema_compat_fingerprint_matches
+
+        first = ensure_reporting_schema(empty_db)
+        assert "architecture" in first
+        assert schema_compat_fingerprint_matches(empty_db)
+        logs = empty_db.execute("SELECT COUNT(*) FROM schema_compat_logs").fetchone()[0]
+
+        statements = []
+        empty_db.set_trace_callback(statements.append)
+        before = empty_db.total_changes
+        second = ensure_reporting_schema(empty_db)
+        empty_db.set_trace_callback(None)
+
+        assert second["schema_compat"]["fingerprint_hit"] == 1
+        assert not any("sqlite_master" in sql or "table_info" in sql for sql in statements)
+        assert empty_db.total_changes == before
+        assert empty_db.execute("SELECT COUNT(*) FROM schema_compat_logs").fetchone()[0] == logs
+
+    def test_ddl_or_version_bump_reruns_chain(self, empty_db, monkeypatch):
+        from app.db import schema_compat
+        from app.db.schema_compat import ensure_reporting_schema, schema_compat_fingerprint_matches
+
+        ensure_reporting_schema(empty_db)
+        empty_db.execute("DROP INDEX IF EXISTS ix_schema_compat_logs_created")
+        assert not schema_compat_fingerprint_matches(empty_db)
+        assert "architecture" in ensure_reporting_schema(empty_db)
+        indexes = {row[1] for row in empty_db.execute("PRAGMA index_list(schema_compat_logs)")}
+        assert "ix_schema_compat_logs_created" in indexes
+        assert schema_compat_fingerprint_matches(empty_db)
+
+        monkeypatch.setattr(schema_compat, "SCHEMA_COMPAT_VERSION", schema_compat.SCHEMA_COMPAT_VERSION + 1)
+        assert not schema_compat_fingerprint_matches(empty_db)
+        assert "architecture" in ensure_reporting_schema(empty_db)
+        assert "architecture" in ensure_reporting_schema(empty_db, force=True)
+
+
 class TestTransactionRollback:
     """Hata durumunda transaction rollback ediyor mu."""
 
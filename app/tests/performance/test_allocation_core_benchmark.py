@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""100k ogrenci x 10 tercih: heap tabanli Gale-Shapley saniyeler icinde bitmeli."""
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.algorithms.allocation import GaleShapleyAllocator
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+
+def test_gale_shapley_scales_to_100k_students(record_property):
+    rng = np.random.default_rng(0)
+    n, m, k = 100_000, 400, 10
+    students = pd.DataFrame({"student_id": np.arange(1, n + 1), "gpa": rng.uniform(0, 4, n)})
+    courses = pd.DataFrame({"course_id": np.arange(1, m + 1), "capacity": rng.integers(100, 300, m)})
+    choices = np.argsort(rng.random((n, m)), axis=1)[:, :k] + 1
+    preferences = pd.DataFrame(
+        {"student_id": np.repeat(students["student_id"].to_numpy(), k), "course_id": choices.ravel(), "rank": np.tile(np.arange(1, k + 1), n)}
+    )
+
+    start = time.perf_counter()
+    output = GaleShapleyAllocator().allocate(students, courses, preferences)
+    elapsed = time.perf_counter() - start
+
+    record_property("gale_shapley_s", round(elapsed, 2))
+    assert len(output.assignments) == n
+    assert elapsed < 10.0
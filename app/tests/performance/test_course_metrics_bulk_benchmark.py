@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Fakulte basina metrik okuma: ders-ders sorgu vs toplu yukleyici."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.services.calculation import (
+    KararMotoru,
+    _load_course_metrics_bulk,
+    _read_course_metrics,
+)
+from app.tests.fixtures.test_db_builders import (
+    create_empty_test_db,
+    seed_large_synthetic_dataset,
+)
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+
+def test_bulk_metrics_loader_is_faster_than_per_course_reads(record_property):
+    """1500 derslik fakultede toplu yukleyici ders-ders okumadan hizli olmali."""
+    n = 1500
+    conn = create_empty_test_db()
+    seed_large_synthetic_dataset(conn, size=n)
+    cur = conn.cursor()
+    for i in range(1, n + 1):
+        cur.execute(
+            "INSERT INTO performans (ders_id, akademik_yil, basari_orani, ortalama_not) VALUES (?, 2024, 0.7, 70.0)",
+            (i,),
+        )
+    conn.commit()
+    ids = list(range(1, n + 1))
+    motor = KararMotoru()
+
+    start = time.perf_counter()
+    legacy = {d: _read_course_metrics(cur, d, 2024, "Guz", motor) for d in ids}
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = _load_course_metrics_bulk(cur, ids, 2024, "Guz").to_metric_map()
+    bulk_elapsed = time.perf_counter() - start
+    conn.close()
+
+    record_property("per_course_ms", round(legacy_elapsed * 1000, 1))
+    record_property("bulk_ms", round(bulk_elapsed * 1000, 1))
+    assert bulk_elapsed < legacy_elapsed
+    assert bulk[n]["basari"] == pytest.approx(legacy[n]["basari"])
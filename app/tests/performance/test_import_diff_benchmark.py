@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""50k satirlik import batch'leri: toplu staging yazimi ve hash-first diff."""
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from app.db.schema_compat import ensure_import_governance_schema
+from app.services.import_audit_service import calculate_row_hash, create_import_batch
+from app.services.import_diff_service import recalculate_import_diff
+from app.services.import_staging_service import ensure_import_staging_schema, stage_import
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+ROWS = 50_000
+CHANGED_EVERY = 100
+
+
+def _rows(version: int) -> list[dict]:
+    rows = []
+    for i in range(1, ROWS + 1):
+        changed = version == 2 and i % CHANGED_EVERY == 0
+        rows.append(
+            {
+                "row_no": i + 1,
+                "ders_kodu": f"DRS{i:05d}",
+                "ders_adi": f"Ders {i}",
+                "matched_ders_id": i,
+                "toplam_ogrenci": 80 + (1 if changed else 0),
+                "gecen_ogrenci": 60,
+                "basari_ortalamasi": 71.5,
+            }
+        )
+    return rows
+
+
+def _per_row_stage(conn: sqlite3.Connection, batch_id: int, rows: list[dict]) -> None:
+    """Eski yol: satir basina bir conn.execute."""
+    for index, row in enumerate(rows, start=1):
+        conn.execute(
+            """
+            INSERT INTO import_staging_rows
+                (import_batch_id, import_type, row_number, normalized_row_json,
+                 row_hash, row_status, matched_ders_id, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                batch_id,
+                "curriculum",
+                int(row.get("row_no") or index),
+                json.dumps(row, ensure_ascii=False, sort_keys=True, default=str),
+                calculate_row_hash(row),
+                "matched",
+                row.get("matched_ders_id"),
+                "2026-01-01T00:00:00+00:00",
+            ),
+        )
+
+
+def test_bulk_staging_and_hash_first_diff_on_50k_rows(record_property):
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    ensure_import_governance_schema(conn)
+    ensure_import_staging_schema(conn)
+    previous = create_import_batch(conn, "curriculum", faculty_id=1, year=2026, status="active")
+    current = create_import_batch(conn, "curriculum", faculty_id=1, year=2026, status="validated")
+    scratch = create_import_batch(conn, "curriculum", faculty_id=2, year=2026, status="uploaded")
+    old_rows, new_rows = _rows(1), _rows(2)
+
+    start = time.perf_counter()
+    _per_row_stage(conn, int(scratch["id"]), old_rows)
+    per_row_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stage_import(conn, import_batch_id=previous["id"], import_type="curriculum", payload={}, rows=old_rows)
+    bulk_elapsed = time.perf_counter() - start
+    stage_import(conn, import_batch_id=current["id"], import_type="curriculum", payload={}, rows=new_rows)
+    conn.commit()
+
+    start = time.perf_counter()
+    diff = recalculate_import_diff(conn, current["id"], compared_to_import_batch_id=previous["id"])
+    diff_elapsed = time.perf_counter() - start
+    conn.close()
+
+    record_property("per_row_stage_ms", round(per_row_elapsed * 1000))
+    record_property("bulk_stage_ms", round(bulk_elapsed * 1000))
+    record_property("diff_ms", round(diff_elapsed * 1000))
+    assert bulk_elapsed < per_row_elapsed
+    assert diff["changed_count"] == ROWS // CHANGED_EVERY
+    assert diff["unchanged_count"] == ROWS - ROWS // CHANGED_EVERY
+    assert diff["added_count"] == diff["removed_count"] == 0
+    assert {item["field_name"] for item in diff["items"] if item["change_type"] == "changed"} == {"toplam_ogrenci"}
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Matris tabanli AHP duyarlilik analizi ve Monte Carlo modu."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from app.db.schema_compat import ensure_ahp_governance_schema
+from app.services.ahp_profile_service import seed_default_profile
+from app.services.ahp_sensitivity_service import (
+    DECISION_BUCKETS,
+    _decision_bucket_codes,
+    perturb_weights,
+    run_monte_carlo_sensitivity,
+    run_weight_sensitivity_analysis,
+)
+from app.services.decision_run_service import create_decision_run
+
+
+@pytest.fixture()
+def conn():
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = sqlite3.Row
+    ensure_ahp_governance_schema(connection)
+    yield connection
+    connection.close()
+
+
+def _weighted(raw, weights):
+    values = np.array([raw[key] for key in weights], dtype=float)
+    values = np.where(values <= 1.0, values * 100.0, values)
+    return float(np.clip(values @ np.array(list(weights.values()), dtype=float), 0.0, 100.0))
+
+
+def _bucket(score):
+    return DECISION_BUCKETS[int(_decision_bucket_codes(np.array([score]))[0])]
+
+
+def _seed_run(conn, course_count=40):
+    profile = seed_default_profile(conn)
+    cur = conn.cursor()
+    run_id = create_decision_run(
+        cur,
+        run_name="Sensitivity engine",
+        year=2026,
+        faculty_id=1,
+        department_id=10,
+        semester="Guz",
+        ahp_profile_id=profile["id"],
+        decision_policy_id=None,
+        input_data_hash="hash",
+        ahp_profile_version=profile["version"],
+        ahp_weights_snapshot=profile["weights"],
+        ahp_consistency_ratio=profile["consistency_ratio"],
+        ahp_profile_status_at_run=profile["status"],
+        ahp_profile_source=profile["source"],
+    )
+    rng = np.random.default_rng(3)
+    raw_rows = {}
+    for course_id in range(1, course_count + 1):
+        # 0-1 ve 0-100 olcekli degerler karisik gelir.
+        raw = {key: float(rng.uniform(0.2, 1.0)) for key in profile["weights"]}
+        if course_id % 5 == 0:
+            raw[next(iter(raw))] = float(rng.uniform(20.0, 90.0))
+        raw_rows[course_id] = raw
+        final_score = _weighted(raw, profile["weights"])
+        cur.execute(
+            """
+            INSERT INTO course_score_breakdowns (
+                decision_run_id, course_id, year, faculty_id, department_id,
+                raw_values_json, normalized_values_json, weighted_values_json,
+                weights_json, positive_distance, negative_distance,
+                closeness_coefficient, final_score, contribution_json
+            )
+            VALUES (?, ?, 2026, 1, 10, ?, '{}', '{}', ?, 0.1, 0.9, 0.9, ?, '{}')
+            """,
+            (run_id, course_id, json.dumps(raw), json.dumps(profile["weights"]), final_score),
+        )
+    conn.commit()
+    return run_id, profile["weights"], raw_rows
+
+
+def test_matrix_sensitivity_matches_per_variation_loop(conn):
+    run_id, weights, raw_rows = _seed_run(conn)
+    result = run_weight_sensitivity_analysis(conn, run_id, variation_percent=0.1)
+    items = {int(item["course_id"]): item for item in result["items"]}
+    assert sorted(items) == sorted(raw_rows)
+    for course_id, raw in raw_rows.items():
+        base = _weighted(raw, weights)
+        scores = [base] + [_weighted(raw, perturb_weights(weights, key, delta)) for key in weights for delta in (0.1, -0.1)]
+        item = items[course_id]
+        assert item["min_score"] == pytest.approx(min(scores))
+        assert item["max_score"] == pytest.approx(max(scores))
+        assert item["base_decision"] == _bucket(base)
+        changed = sorted({_bucket(s) for s in scores if _bucket(s) != _bucket(base)})
+        assert item["changed_decision"] == (", ".join(changed) if changed else None)
+        assert item["rank_reversal_probability"] is None
+    assert result["analysis_mode"] == "one_at_a_time"
+    assert result["sample_count"] == 2 * len(weights)
+
+
+def test_monte_carlo_is_seeded_and_independent_of_worker_count(conn):
+    run_id, _, _ = _seed_run(conn)
+    serial = run_monte_carlo_sensitivity(conn, run_id, sample_count=1200, seed=11, max_workers=1)
+    parallel = run_monte_carlo_sensitivity(conn, run_id, sample_count=1200, seed=11, max_workers=2)
+    assert serial["analysis_mode"] == "monte_carlo"
+    assert serial["sample_count"] == 1200
+    for left, right in zip(serial["items"], parallel["items"]):
+        assert left["rank_reversal_probability"] == right["rank_reversal_probability"]
+        assert left["decision_change_probability"] == right["decision_change_probability"]
+        assert left["min_score"] == right["min_score"]
+    ranks = sorted(int(item["base_rank"]) for item in serial["items"])
+    assert ranks == list(range(1, len(ranks) + 1))
+    for item in serial["items"]:
+        assert 0.0 <= item["rank_reversal_probability"] <= 1.0
+        assert 0.0 <= item["decision_change_probability"] <= 1.0
+        assert item["min_score"] <= item["base_score"] <= item["max_score"]
+
+
+def test_monte_carlo_concentration_controls_spread(conn):
+    run_id, _, _ = _seed_run(conn, course_count=25)
+    tight = run_monte_carlo_sensitivity(conn, run_id, sample_count=600, concentration=5000.0, seed=1, max_workers=1)
+    loose = run_monte_carlo_sensitivity(conn, run_id, sample_count=600, concentration=5.0, seed=1, max_workers=1)
+    tight_reversal = sum(item["rank_reversal_probability"] for item in tight["items"])
+    loose_reversal = sum(item["rank_reversal_probability"] for item in loose["items"])
+    assert tight_reversal < loose_reversal
+    with pytest.raises(ValueError):
+        run_monte_carlo_sensitivity(conn, run_id, sample_count=0)
+
+
+def test_monte_carlo_decisions_use_weighted_sum_thresholds(conn):
+    run_id, weights, raw_rows = _seed_run(conn, course_count=20)
+    # final_score TOPSIS yakinlik katsayisi olabilir; karar esikleri agirlikli toplama uygulanir.
+    conn.execute("UPDATE course_score_breakdowns SET final_score = 0.5 WHERE decision_run_id=?", (run_id,))
+    conn.commit()
+    result = run_monte_carlo_sensitivity(conn, run_id, sample_count=200, concentration=1e7, seed=5, max_workers=2)
+    for item in result["items"]:
+        assert item["base_decision"] == _bucket(_weighted(raw_rows[int(item["course_id"])], weights))
+        assert item["decision_change_probability"] < 0.5
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Indeksli benchmark sonuc deposu: listeleme/filtreleme JSON okumadan yapilmali."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import pytest
+
+from app.benchmark import result_store as result_store_module
+from app.benchmark.result_store import ResultStore
+from app.datasets.entities import BenchmarkRun
+
+
+def _save(store, run_id, scenario, metrics, started="2026-05-01T10:00:00"):
+    run = BenchmarkRun(
+        run_id=run_id,
+        scenario_name=scenario,
+        dataset_name="ds",
+        started_at=datetime.fromisoformat(started),
+        status="completed",
+        algorithms=list(metrics),
+    )
+    payload = {
+        "scenario": {"name": scenario, "problem_type": "allocation"},
+        "results": {name: {"output": {"assignments": [1] * 50}, "metrics": groups} for name, groups in metrics.items()},
+    }
+    return store.save_run(run, payload)
+
+
+def test_list_runs_reads_index_not_json(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path), columnar_backend="sqlite")
+    _save(store, "run_a", "alloc", {"GaleShapley": {"fairness": {"envy_score": 0.1, "ci": "[0.1, 0.2]"}}})
+    _save(store, "run_b", "alloc", {"GaleShapley": {"fairness": {"envy_score": 0.3}}, "Greedy": {}})
+
+    original_loads = json.loads
+    parsed = []
+    monkeypatch.setattr(
+        result_store_module.json,
+        "loads",
+        lambda text, *a, **k: (parsed.append(len(text)), original_loads(text, *a, **k))[1],
+    )
+    runs = store.list_runs(limit=10)
+    assert max(parsed) < 500  # yalniz kucuk indeks JSON kolonlari cozuldu
+    assert [blob["run"]["run_id"] for blob in runs][0] in {"run_a", "run_b"}
+    by_id = {blob["run"]["run_id"]: blob for blob in runs}
+    assert by_id["run_a"]["payload"]["results"]["GaleShapley"]["metrics"]["fairness"] == {"envy_score": 0.1, "ci": "[0.1, 0.2]"}
+    assert by_id["run_b"]["payload"]["results"]["Greedy"] == {"metrics": {}}
+    assert by_id["run_b"]["payload"]["scenario"]["problem_type"] == "allocation"
+
+
+def test_metric_filter_and_cross_run_aggregation(tmp_path):
+    store = ResultStore(str(tmp_path), columnar_backend="sqlite")
+    _save(store, "run_a", "alloc", {"GaleShapley": {"fairness": {"envy_score": 0.1}}, "Greedy": {"fairness": {"envy_score": 0.5}}})
+    _save(store, "run_b", "alloc", {"GaleShapley": {"fairness": {"envy_score": 0.3}}})
+    _save(store, "run_c", "ml", {"GaleShapley": {"fairness": {"envy_score": 0.9}}})
+
+    rows = store.query_metrics(algorithm_name="GaleShapley", metric_name="envy_score", scenario_name="alloc")
+    assert sorted(rows["metric_value"]) == pytest.approx([0.1, 0.3])
+    summary = store.aggregate_metrics(scenario_name="alloc", metric_name="envy_score").set_index("algorithm_name")
+    assert summary.loc["GaleShapley", "mean"] == pytest.approx(0.2)
+    assert summary.loc["Greedy", "count"] == 1
+
+
+def test_legacy_json_files_are_migrated_once(tmp_path):
+    legacy = {
+        "run": {"run_id": "run_old", "scenario_name": "alloc", "started_at": "2026-01-02T00:00:00", "algorithms": ["GaleShapley"]},
+        "payload": {"scenario": {"name": "alloc"}, "results": {"GaleShapley": {"metrics": {"fairness": {"envy_score": 0.4}}}}},
+    }
+    (tmp_path / "run_old.json").write_text(json.dumps(legacy), encoding="utf-8")
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    store = ResultStore(str(tmp_path), columnar_backend="sqlite")
+    assert store.sync_index() == 1
+    assert store.sync_index() == 0
+    assert store.query_metrics(run_ids=["run_old"])["run_date"].tolist() == ["2026-01-02"]
+    assert store.load_run("run_old")["run"]["run_id"] == "run_old"
+    assert store.rebuild_index() == 1
+    with pytest.raises(FileNotFoundError):
+        store.load_run("missing")
+
+
+def test_arrow_fragments_round_trip_and_follow_repartitioning(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = ResultStore(str(tmp_path), columnar_backend="arrow")
+    _save(store, "run_a", "alloc", {"GaleShapley": {"fairness": {"envy_score": 0.1, "ci": "[0.1, 0.2]"}}})
+    _save(store, "run_b", "ml", {"Greedy": {"fairness": {"envy_score": 0.7}}}, started="2026-05-02T09:00:00")
+
+    rows = store.query_metrics(run_ids=["run_a"]).set_index("metric_name")
+    assert rows.loc["envy_score", "metric_value"] == pytest.approx(0.1)
+    assert rows.loc["ci", "metric_text"] == "[0.1, 0.2]"
+    assert rows.loc["envy_score", "scenario_name"] == "alloc"
+    assert str(rows.loc["envy_score", "run_date"]) == "2026-05-01"
+
+    # Ayni kosu farkli senaryo/tarihle yeniden kaydedilince eski bolumdeki parca kalmamali.
+    _save(store, "run_a", "ml", {"GaleShapley": {"fairness": {"envy_score": 0.2}}}, started="2026-05-03T10:00:00")
+    fragments = sorted(path.relative_to(store.metrics_root).as_posix() for path in store.metrics_root.rglob("*.arrow"))
+    assert fragments == ["scenario=ml/date=2026-05-02/run_b.arrow", "scenario=ml/date=2026-05-03/run_a.arrow"]
+    rows = store.query_metrics(run_ids=["run_a"])
+    assert rows["metric_value"].tolist() == pytest.approx([0.2])
+    assert store.query_metrics(scenario_name="alloc").empty
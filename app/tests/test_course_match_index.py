@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""CourseMatchIndex: hash tabanli katmanlar eski taramayla ayni sonucu verir, fuzzy katman yalnizca oneri uretir."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from app.services import course_matcher
+from app.services.course_matcher import CourseCandidate, CourseMatchIndex, match_course_row
+from app.services.curriculum_import_service import _find_course_id, _load_course_index
+
+
+def _candidates() -> list[CourseCandidate]:
+    return [
+        CourseCandidate(1, "BIL101", "Programlamaya Giriş", True),
+        CourseCandidate(2, "MAT201", "Olasılık ve İstatistik", True),
+        CourseCandidate(3, "TAR105", "Sanat Tarihi", False),
+        CourseCandidate(4, "TAR106", "Sanat Tarihi", False),
+        CourseCandidate(5, "FIZ110", "Fizik-I", False),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("kod", "ad", "ders_id", "method"),
+    [
+        ("bil101", None, 1, "ders_kodu"),
+        (None, "programlamaya giris", 1, "ders_adi"),
+        (None, "OLASILIK VE İSTATİSTİK", 2, "ders_adi_normalized"),
+        (None, "Fizik I", 5, "ders_adi_normalized"),
+        ("YOK999", "Programlamaya  giriş", 1, "ders_adi"),
+    ],
+)
+def test_index_tiers_match_by_code_name_and_loose_name(kod, ad, ders_id, method):
+    result = CourseMatchIndex(_candidates()).match(kod, ad)
+    assert (result.matched, result.ders_id, result.match_method) == (True, ders_id, method)
+
+
+def test_ambiguous_name_is_reported_not_guessed():
+    result = CourseMatchIndex(_candidates()).match(None, "sanat tarihi")
+    assert result.matched is False
+    assert result.error == "Ders adi eslemesi belirsiz: Birden fazla ders bulundu."
+
+
+def test_fuzzy_tier_only_suggests():
+    result = CourseMatchIndex(_candidates()).match(None, "Olasilik ve Istatistk")
+    assert result.matched is False and result.ders_id is None
+    assert [item.ders_id for item in result.suggestions] == [2]
+    assert result.error.startswith("Sistemde eslesen ders bulunamadi.")
+    assert "MAT201" in result.error
+    assert CourseMatchIndex(_candidates()).match(None, "Biyokimya").suggestions == ()
+
+
+def test_candidates_are_normalized_once_per_index(monkeypatch):
+    index = CourseMatchIndex(_candidates() * 40)
+    calls = []
+    original = course_matcher.normalize_course_text
+    monkeypatch.setattr(course_matcher, "normalize_course_text", lambda v: calls.append(v) or original(v))
+    for _ in range(50):
+        index.match("XYZ", "Fizik I")
+    assert len(calls) <= 2 * 50 * 2
+    assert match_course_row(_candidates(), "TAR105", None).ders_id == 3
+
+
+def test_curriculum_lookup_keeps_sqlite_lower_and_like_semantics():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
+        """
+        CREATE TABLE ders (ders_id INTEGER PRIMARY KEY, kod TEXT, ad TEXT, fakulte_id INTEGER, bolum_id INTEGER, tip TEXT);
+        INSERT INTO ders VALUES (1, 'FTR611S', 'Manuel Terapi', 1, 10, 'Secmeli');
+        INSERT INTO ders VALUES (2, 'Fizyoterapi SEC2', 'Manuel Terapi', 1, 10, 'Secmeli');
+        INSERT INTO ders VALUES (3, 'ÇEV101', 'Çevre Bilimi', 1, 10, 'Secmeli');
+        INSERT INTO ders VALUES (4, 'MAT101', 'Matematik', 2, 20, 'Secmeli');
+        """
+    )
+    cur = conn.cursor()
+    index = _load_course_index(cur, faculty_id=1, department_id=10)
+
+    assert _find_course_id(cur, "manuel terapi", None, index=index) == 1
+    assert _find_course_id(cur, None, "ftr611s ", index=index) == 1
+    assert _find_course_id(cur, "evre bil", None, index=index) == 3
+    # SQLite lower() yalnizca ASCII harfleri kucultur.
+    assert _find_course_id(cur, "çevre bilimi", None, index=index) is None
+    assert _find_course_id(cur, "Matematik", None, index=index) is None
+    assert _find_course_id(cur, "Matematik", None, faculty_id=2, department_id=20) == 4
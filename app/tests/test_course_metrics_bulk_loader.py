@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Toplu ders metrik yukleyicisi, tek ders okuyucusuyla ayni sonucu vermeli."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.services.calculation import (
+    KararMotoru,
+    _load_course_metrics_bulk,
+    _read_course_metrics,
+)
+from app.tests.fixtures.test_db_builders import (
+    create_empty_test_db,
+    seed_large_synthetic_dataset,
+)
+
+
+@pytest.fixture()
+def conn():
+    connection = create_empty_test_db()
+    seed_large_synthetic_dataset(connection, size=60)
+    cur = connection.cursor()
+    cur.execute("ALTER TABLE populerlik ADD COLUMN ham_puan REAL")
+    for column in ("katilim_sayisi REAL", "toplam_hafta INTEGER", "katilim_yuzdesi REAL", "devamsiz_ogrenci_sayisi INTEGER"):
+        cur.execute(f"ALTER TABLE ders_kriterleri ADD COLUMN {column}")
+    # 61: yalniz onceki yil kriteri; 62: yalniz performans/populerlik;
+    # 63: mevcut yil verisi yok, gecmis performans var (propagasyon);
+    # 64: anket_secen > anket_katilimci (notr 0.5); 65: hic veri yok.
+    for ders_id in range(61, 66):
+        cur.execute("INSERT INTO ders VALUES (?, ?, ?, 3, 5, 1, 10, 'secmeli', 'secmeli')", (ders_id, f"X{ders_id}", f"Ders {ders_id}"))
+    cur.execute(
+        "INSERT INTO ders_kriterleri (ders_id, yil, donem, toplam_ogrenci, gecen_ogrenci, basari_ortalamasi, kontenjan, kayitli_ogrenci) "
+        "VALUES (61, 2023, 'Guz', 40, 30, 70.0, 50, 40)"
+    )
+    cur.execute("INSERT INTO performans (ders_id, akademik_yil, basari_orani, ortalama_not) VALUES (62, 2024, 0.7, 68.0)")
+    cur.execute("INSERT INTO populerlik (ders_id, akademik_yil, doluluk_orani, ham_puan) VALUES (62, 2024, 0.4, 0.55)")
+    cur.execute("INSERT INTO performans (ders_id, akademik_yil, basari_orani, ortalama_not) VALUES (63, 2022, 0.5, 61.0)")
+    cur.execute("INSERT INTO performans (ders_id, akademik_yil, basari_orani, ortalama_not) VALUES (63, 2023, 0.6, 64.0)")
+    cur.execute("INSERT INTO populerlik (ders_id, akademik_yil, doluluk_orani) VALUES (63, 2023, 0.35)")
+    cur.execute(
+        "INSERT INTO ders_kriterleri (ders_id, yil, donem, toplam_ogrenci, gecen_ogrenci, basari_ortalamasi, kontenjan, kayitli_ogrenci, anket_katilimci, anket_dersi_secen) "
+        "VALUES (64, 2024, 'Guz', 40, 30, 70.0, 50, 40, 10, 25)"
+    )
+    for ders_id, year, score in ((1, 2022, 70.0), (1, 2023, 80.0), (2, 2023, 55.0)):
+        cur.execute("INSERT INTO skor (ders_id, akademik_yil, skor_top) VALUES (?, ?, ?)", (ders_id, year, score))
+    cur.execute("INSERT INTO havuz (ders_id, yil, skor, fakulte_id) VALUES ('3', 2023, 62.0, 1)")
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+def test_bulk_loader_matches_single_course_reader(conn):
+    cur = conn.cursor()
+    ids = list(range(1, 66))
+    columns = _load_course_metrics_bulk(cur, ids, 2024, "Guz")
+    bulk = columns.to_metric_map()
+    motor = KararMotoru()
+    assert sorted(bulk) == ids
+    for ders_id in ids:
+        single = _read_course_metrics(cur, ders_id, 2024, "Guz", motor)
+        for key in ("basari", "trend", "populerlik", "anket", "ortalama_not"):
+            assert bulk[ders_id][key] == pytest.approx(single[key]), (ders_id, key)
+
+
+def test_columnar_output_feeds_topsis(conn):
+    cur = conn.cursor()
+    columns = _load_course_metrics_bulk(cur, [5, 3, 1, 999], 2024, "Guz")
+    assert columns.ders_ids.tolist() == [1, 3, 5, 999]
+    subset = columns.subset([5, 1])
+    assert subset.ders_ids.tolist() == [5, 1]
+    assert subset.matrix().shape == (2, 4)
+    assert subset.matrix().dtype == np.float64
+    frame = subset.to_frame(names={1: "A", 5: "E"})
+    df_sonuc, meta = KararMotoru().topsis_calistir(frame, [0.25, 0.25, 0.25, 0.25])
+    assert set(df_sonuc["ders_id"]) == {1, 5}
+    assert set(df_sonuc["Ders"]) == {"A", "E"}
+    assert meta["sutunlar"] == ["basari", "trend", "populerlik", "anket"]
+
+
+def test_empty_candidate_list_returns_empty_columns(conn):
+    columns = _load_course_metrics_bulk(conn.cursor(), [], 2024, "Guz")
+    assert len(columns) == 0
+    assert columns.matrix().shape == (0, 4)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Materyalize secmeli/zorunlu bayraklari: eski LIKE kuraliyla esdegerlik, tetik bakimi ve indeksli predicate."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from app.db.schema_compat import ensure_course_type_flag_schema
+from app.services.course_type import (
+    build_elective_predicate,
+    build_elective_predicate_from_columns,
+    build_required_predicate,
+    build_required_predicate_from_columns,
+    get_existing_type_columns,
+)
+
+TYPE_VALUES = [
+    ("Seçmeli", None),
+    ("SEÇMELİ", None),
+    ("  ", "Secmeli Ders"),
+    ("Zorunlu", "Secmeli"),
+    (None, "ELECTIVE"),
+    ("Mecburi", None),
+    ("core course", None),
+    ("", ""),
+    (None, None),
+    ("Alan Seçmeli", "Zorunlu"),
+]
+
+
+@pytest.fixture()
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE ders (ders_id INTEGER PRIMARY KEY, ad TEXT, fakulte_id INTEGER, DersTipi TEXT, tip TEXT)")
+    conn.executemany(
+        "INSERT INTO ders (ders_id, ad, fakulte_id, DersTipi, tip) VALUES (?, ?, 1, ?, ?)",
+        [(i + 1, f"Ders {i + 1}", a, b) for i, (a, b) in enumerate(TYPE_VALUES)],
+    )
+    yield conn
+    conn.close()
+
+
+def _ids(conn, predicate):
+    return [r[0] for r in conn.execute(f"SELECT d.ders_id FROM ders d WHERE {predicate} ORDER BY 1")]
+
+
+def test_backfilled_flags_match_legacy_predicates(conn):
+    legacy_elective = build_elective_predicate(conn.cursor(), alias="d")
+    legacy_required = build_required_predicate(conn.cursor(), alias="d")
+    assert "LIKE" in legacy_elective
+
+    result = ensure_course_type_flag_schema(conn)
+    assert result["columns_added"] == 2 and result["rows_backfilled"] == len(TYPE_VALUES)
+
+    elective = build_elective_predicate(conn.cursor(), alias="d")
+    assert elective == "d.is_elective IS 1"
+    assert build_required_predicate(conn.cursor(), alias="d") == "d.is_required IS 1"
+    assert _ids(conn, elective) == _ids(conn, legacy_elective) == [1, 2, 3, 5, 10]
+    assert _ids(conn, "d.is_required IS 1") == _ids(conn, legacy_required)
+    plan = " ".join(str(row[-1]) for row in conn.execute(f"EXPLAIN QUERY PLAN SELECT ders_id FROM ders d WHERE {elective} AND d.fakulte_id = 1"))
+    assert "ix_ders_is_elective" in plan
+    assert ensure_course_type_flag_schema(conn) == {
+        "tables_created": 0, "columns_added": 0, "indexes_created": 0, "triggers_created": 0, "rows_backfilled": 0,
+    }
+
+
+def test_triggers_keep_flags_current_on_insert_and_update(conn):
+    ensure_course_type_flag_schema(conn)
+    conn.execute("INSERT INTO ders (ders_id, ad, DersTipi) VALUES (50, 'Yeni', 'seçmeli')")
+    conn.execute("UPDATE ders SET DersTipi = 'Zorunlu', tip = NULL WHERE ders_id = 1")
+    conn.execute("UPDATE ders SET ad = 'Yeniden adlandirildi' WHERE ders_id = 2")
+    elective = _ids(conn, "d.is_elective IS 1")
+    assert 50 in elective and 1 not in elective and 2 in elective
+    assert _ids(conn, "d.is_elective IS 1") == _ids(conn, build_elective_predicate_from_columns(["DersTipi", "tip"]))
+    assert _ids(conn, "d.is_required IS 1") == _ids(conn, build_required_predicate_from_columns(["DersTipi", "tip"]))
+    # LEFT JOIN'de eslesmeyen satir NOT (...) ile eskisi gibi "secmeli degil" sayilir.
+    conn.execute("CREATE TABLE havuz (ders_id INTEGER)")
+    conn.executemany("INSERT INTO havuz VALUES (?)", [(1,), (2,), (999,)])
+    rows = conn.execute(
+        f"SELECT h.ders_id FROM havuz h LEFT JOIN ders d ON d.ders_id = h.ders_id "
+        f"WHERE NOT ({build_elective_predicate(conn.cursor(), alias='d')}) ORDER BY 1"
+    ).fetchall()
+    assert [r[0] for r in rows] == [1, 999]
+
+
+def test_new_type_column_falls_back_until_triggers_are_rebuilt(conn):
+    ensure_course_type_flag_schema(conn)
+    conn.execute("ALTER TABLE ders ADD COLUMN tur TEXT")
+    conn.execute("UPDATE ders SET tur = 'secmeli' WHERE ders_id = 9")
+    assert get_existing_type_columns(conn.cursor()) == ["DersTipi", "tip", "tur"]
+    assert "LIKE" in build_elective_predicate(conn.cursor(), alias="d")
+
+    result = ensure_course_type_flag_schema(conn)
+    assert result["triggers_created"] == 2 and result["rows_backfilled"] == len(TYPE_VALUES)
+    assert build_elective_predicate(conn.cursor(), alias="d") == "d.is_elective IS 1"
+    assert 9 in _ids(conn, "d.is_elective IS 1")
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Karar matrisi goruntuleri: ayni veri surumunde yeniden kullanim, yazim/AHP/import sonrasi gecersizlesme."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+
+import numpy as np
+import pytest
+
+from app.db.schema_compat import ensure_decision_matrix_version_schema
+from app.services import calculation
+from app.services.calculation import get_faculty_year_topsis_results
+from app.services.decision_matrix_snapshot_service import (
+    bump_decision_matrix_version,
+    clear_snapshot_memory_cache,
+    get_decision_matrix_data_version,
+    load_decision_matrix_snapshot,
+)
+from app.services.incremental_topsis import invalidate_topsis_states
+from app.tests.test_pool_rules import _build_pool_db
+
+
+@pytest.fixture()
+def snapshot_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DECISION_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    path = _build_pool_db()
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    ensure_decision_matrix_version_schema(conn)
+    clear_snapshot_memory_cache()
+    yield conn
+    conn.close()
+    clear_snapshot_memory_cache()
+    invalidate_topsis_states()
+    os.unlink(path)
+
+
+def _count_bulk_loads(monkeypatch):
+    calls = []
+    original = calculation._load_course_metrics_bulk
+
+    def counting(*args, **kwargs):
+        calls.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(calculation, "_load_course_metrics_bulk", counting)
+    return calls
+
+
+def test_second_run_reuses_snapshot_with_identical_scores(snapshot_db, monkeypatch):
+    calls = _count_bulk_loads(monkeypatch)
+    cur = snapshot_db.cursor()
+    first = get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    assert first["decision_matrix_snapshot"]["hit"] is False and len(calls) == 1
+
+    clear_snapshot_memory_cache()  # diskteki .npy dosyasindan mmap ile okunmali
+    second = get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="Guz")
+    assert second["decision_matrix_snapshot"]["hit"] is True and len(calls) == 1
+    assert second["scores"] == pytest.approx(first["scores"])
+    assert second["metric_map"] == first["metric_map"]
+
+    snapshot = load_decision_matrix_snapshot(cur, 1, 2024, "g")
+    assert isinstance(snapshot.array, np.memmap)
+    curriculum = snapshot.curriculum_mask
+    assert set(first["faculty_curriculum_ids"]) == snapshot.curriculum_ids()
+    assert np.allclose(np.sum(np.square(snapshot.normalized[curriculum]), axis=0)[snapshot.raw[curriculum, :4].any(axis=0)], 1.0)
+    assert np.isnan(snapshot.normalized[~curriculum]).all()
+
+
+def test_source_writes_and_explicit_bumps_invalidate(snapshot_db, monkeypatch):
+    calls = _count_bulk_loads(monkeypatch)
+    cur = snapshot_db.cursor()
+    before = get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    version = get_decision_matrix_data_version(cur)
+
+    # Satir tetigi yok: surumu yazan servis, yazim sonunda bir kez artirir.
+    cur.execute("UPDATE ders_kriterleri SET gecen_ogrenci = 99, basari_ortalamasi = 95 WHERE ders_id = 102")
+    cur.execute("UPDATE performans SET ortalama_not = 10 WHERE ders_id = 102")
+    assert get_decision_matrix_data_version(cur) == version
+    bump_decision_matrix_version(snapshot_db, "criteria_saved")
+    assert get_decision_matrix_data_version(cur).version == version.version + 1
+    fresh = get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    assert fresh["decision_matrix_snapshot"]["hit"] is False and len(calls) == 2
+    assert fresh["metric_map"][102] != before["metric_map"][102]
+
+    bump_decision_matrix_version(snapshot_db, "ahp_profile_activated")
+    get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    assert len(calls) == 3
+    get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    assert len(calls) == 3
+
+
+def test_new_epoch_and_missing_version_table_disable_stale_snapshots(snapshot_db):
+    cur = snapshot_db.cursor()
+    get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    before = get_decision_matrix_data_version(cur)
+    after = bump_decision_matrix_version(snapshot_db, "backup_restored", new_epoch=True)
+    assert after.epoch != before.epoch
+    assert load_decision_matrix_snapshot(cur, 1, 2024, "g") is None
+
+    cur.execute("DROP TABLE decision_matrix_versions")
+    assert get_decision_matrix_data_version(cur) is None
+    assert get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")["decision_matrix_snapshot"] == {
+        "data_version": None,
+        "hit": False,
+    }
+
+
+def test_schema_compat_drops_legacy_row_triggers(snapshot_db):
+    cur = snapshot_db.cursor()
+    cur.execute(
+        """
+        CREATE TRIGGER trg_decision_matrix_version_performans_update
+        AFTER UPDATE ON performans
+        BEGIN
+            UPDATE decision_matrix_versions SET version = version + 1;
+        END
+        """
+    )
+    version = get_decision_matrix_data_version(cur)
+    changed = ensure_decision_matrix_version_schema(snapshot_db)
+    assert changed["triggers_dropped"] == 1
+    assert get_decision_matrix_data_version(cur).version == version.version + 1
+
+    cur.execute("UPDATE performans SET ortalama_not = 10")
+    assert get_decision_matrix_data_version(cur).version == version.version + 1
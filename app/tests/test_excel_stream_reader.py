@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""openpyxl read-only akis okuyucusu: pandas ile ayni degerler, ayni satir numaralari, hucre konumlu uyarilar."""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from app.services.criteria_import_service import parse_criteria_excel
+from app.services.curriculum_import_service import parse_curriculum_excel
+from app.services.excel_stream_reader import ExcelRowSource, excel_column_letter, open_excel_stream
+from app.services.import_staging_service import list_staged_rows, stage_import
+from app.services.survey_import_service import parse_survey_excel
+
+
+def _save(tmp_path, sheets: dict[str, list[list]]) -> str:
+    wb = Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    path = tmp_path / "kitap.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+def test_stream_matches_pandas_values_and_row_numbers(tmp_path):
+    path = _save(
+        tmp_path,
+        {
+            "Veri": [
+                [" kod ", None, "kod", 2022, "not"],
+                ["BIL101", 1.0, "x", 3.5, "NA"],
+                [None, None, None, None, None],
+                ["", 7, None, "#DIV/0!", "metin"],
+            ]
+        },
+    )
+    df = pd.read_excel(path, sheet_name="Veri")
+    with open_excel_stream(path) as reader:
+        stream = reader.sheet("Veri")
+        rows = list(stream.rows(skip_blank=False))
+
+    assert stream.columns == ["kod", "Unnamed: 1", "kod.1", "2022", "not"]
+    assert [row.row_no for row in rows] == [int(idx) + 2 for idx in df.index]
+    for row, (_, expected) in zip(rows, df.iterrows()):
+        assert list(row.values) == [None if isinstance(v, float) and math.isnan(v) else v for v in expected.tolist()]
+    assert rows[0].get("kod") == "BIL101" and rows[0].get("Unnamed: 1") == 1
+    assert rows[0].get(None) is None and rows[0].get("yok", "x") == "x"
+
+
+def test_iter_chunks_bounds_chunk_size_and_skips_blank_rows(tmp_path):
+    data = [["a", "b"]] + [[i, None] if i % 5 else [None, None] for i in range(1, 26)]
+    path = _save(tmp_path, {"S": data})
+    with open_excel_stream(path) as reader:
+        chunks = list(reader.sheet("S").iter_chunks(chunk_size=4))
+
+    assert all(len(chunk) <= 4 for chunk in chunks)
+    flat = [row for chunk in chunks for row in chunk]
+    assert [row.row_no for row in flat] == [i + 1 for i in range(1, 26) if i % 5]
+
+
+def test_cell_ref_uses_excel_column_letters(tmp_path):
+    path = _save(tmp_path, {"S": [[f"c{i}" for i in range(30)]]})
+    with open_excel_stream(path) as reader:
+        stream = reader.sheet("S")
+    assert stream.cell_ref("c0", 2) == "A2"
+    assert stream.cell_ref("c27", 15) == "AB15"
+    assert excel_column_letter(703) == "AAA"
+    with pytest.raises(ValueError):
+        excel_column_letter(0)
+
+
+def test_parsers_report_cell_locations_for_invalid_values(tmp_path):
+    criteria_path = _save(
+        tmp_path,
+        {
+            "Kriter": [
+                ["ders_kodu", "ders_adi", "toplam_ogrenci", "gecen_ogrenci", "basari_ortalamasi", "kontenjan"],
+                ["BIL101", "Ders", 40, 30, 70.5, 50],
+                [None, None, None, None, None, None],
+                ["BIL102", "Ders 2", "abc", 30, None, 50],
+            ]
+        },
+    )
+    parsed = parse_criteria_excel(criteria_path)
+    assert [row.row_no for row in parsed["rows"]] == [2, 4]
+    assert parsed["warnings"] == ["Satir 4: zorunlu sayisal alanlardan biri bos veya gecersiz (C4, E4)."]
+
+    (tmp_path / "kitap.xlsx").unlink()
+    survey_path = _save(tmp_path, {"Anket": [["ders_kodu", "ders_adi", "tercih_sayisi"], ["BIL101", "Ders", None]]})
+    survey = parse_survey_excel(survey_path)
+    assert next(iter(survey["rows"])).tercih_sayisi == -1
+    assert survey["warnings"] == ["Satir 2: tercih_sayisi/oy_miktari bos veya gecersiz (C2)."]
+
+    (tmp_path / "kitap.xlsx").unlink()
+    curriculum_path = _save(
+        tmp_path,
+        {"Bahar": [["Fakulte", "Bolum", "Yil", "Ders Adi"], ["Muh", "Bil", 2022.0, "Yapay Zeka"], ["Muh", "Bil", "yok", "X"]]},
+    )
+    rows, warnings = parse_curriculum_excel(curriculum_path)
+    assert [(row["yil"], row["donem"], row["ders_adi"]) for row in rows] == [(2022, "Bahar", "Yapay Zeka")]
+    assert warnings == ["Bahar[1]: yil parse edilemedi -> yok (C3)"]
+
+
+def test_parsed_rows_are_restreamed_not_materialized(tmp_path):
+    path = _save(
+        tmp_path,
+        {
+            "Anket": [
+                ["ders_kodu", "ders_adi", "tercih_sayisi", "fakulte_adi"],
+                *[[f"BIL{i}", f"Ders {i}", i, "Muh" if i % 2 else "Fen"] for i in range(1, 12)],
+            ]
+        },
+    )
+    survey = parse_survey_excel(path)
+    rows = survey["rows"]
+
+    assert isinstance(rows, ExcelRowSource) and not hasattr(rows, "__getitem__")
+    assert len(rows) == 11 and bool(rows)
+    assert [row.row_no for row in rows] == [row.row_no for row in rows] == list(range(2, 13))
+    muh = rows.filter(lambda row: row.fakulte_adi == "Muh")
+    assert len(muh) == 6
+    assert [len(chunk) for chunk in muh.iter_chunks(chunk_size=4)] == [4, 2]
+
+    conn = sqlite3.connect(":memory:")
+    staged = stage_import(
+        conn,
+        import_batch_id=1,
+        import_type="survey",
+        payload={},
+        rows=({"row_no": row.row_no, "ders_kodu": row.ders_kodu} for row in muh),
+    )
+    assert staged["staged_row_count"] == 6
+    assert [row["row_no"] for row in list_staged_rows(conn, 1)] == [2, 4, 6, 8, 10, 12]
@@ -119,3 +119,144 @@ def test_repair_mode_safe(tmp_db_path):
             HealthStatus.WARNING.value,
         }
     )
+
+
+def test_parallel_run_keeps_order_and_times_out_slow_check(monkeypatch, tmp_db_path):
+    import threading
+    import time
+
+    from app.health import health_runner as runner_module
+
+    release = threading.Event()
+    threads: list[str] = []
+
+    class SlowCheck(BaseHealthCheck):
+        name = "Takılan kontrol"
+        category = "Test Paketi"
+        timeout_s = 0.2
+
+        def run(self, context):
+            release.wait(5)
+            return self.ok("Geç bitti.")
+
+    class FastCheck(BaseHealthCheck):
+        category = "Test Paketi"
+
+        def __init__(self, label, parallel_safe=True):
+            self.name = label
+            self.parallel_safe = parallel_safe
+
+        def run(self, context):
+            threads.append(threading.current_thread().name)
+            time.sleep(0.05)
+            return self.ok(f"{self.name} bitti.")
+
+    checks = [FastCheck("a"), SlowCheck(), FastCheck("b"), FastCheck("seri", parallel_safe=False), FastCheck("c")]
+    monkeypatch.setattr(runner_module, "all_checks", lambda: checks)
+
+    started = time.perf_counter()
+    report = HealthRunner(db_path=tmp_db_path, max_workers=4).run("full")
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    assert [r.name for r in report.results] == ["a", "Takılan kontrol", "b", "seri", "c"]
+    slow = report.results[1]
+    assert slow.status == HealthStatus.FAILED.value and slow.metadata["timed_out"] is True
+    assert [r.status for r in report.results if r.name != "Takılan kontrol"] == [HealthStatus.OK.value] * 4
+    assert elapsed < 4.0  # takılan kontrol 5 sn bekler; runner onu beklemez
+    # Paralel kontroller havuzda, parallel_safe=False olan havuzdan sonra tek başına çalışır.
+    assert sum(name.startswith("health-check_") for name in threads) == 3
+    assert threads[-1] == "health-check-serial"
+
+
+def test_serial_check_times_out_on_daemon_thread(monkeypatch, tmp_db_path):
+    import threading
+    import time
+
+    from app.health import health_runner as runner_module
+
+    release = threading.Event()
+    workers: list[threading.Thread] = []
+
+    class SlowSerialCheck(BaseHealthCheck):
+        name = "Takılan süre ölçümü"
+        category = "Test Paketi"
+        parallel_safe = False
+        timeout_s = 0.2
+
+        def run(self, context):
+            workers.append(threading.current_thread())
+            release.wait(5)
+            return self.ok("Geç bitti.")
+
+    monkeypatch.setattr(runner_module, "all_checks", lambda: [SlowSerialCheck()])
+
+    started = time.perf_counter()
+    report = HealthRunner(db_path=tmp_db_path, max_workers=1).run("full")
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    result = report.results[0]
+    assert result.status == HealthStatus.FAILED.value and result.metadata["timed_out"] is True
+    assert elapsed < 4.0
+    # Takılan thread daemon: yorumlayıcı çıkışında beklenmez.
+    assert workers[0].daemon and workers[0] is not threading.current_thread()
+
+
+def test_cached_quick_report_serves_stale_and_refreshes_in_background(monkeypatch, tmp_db_path):
+    import time
+
+    from app.health import health_runner as runner_module
+    from app.services import health_service
+
+    calls: list[int] = []
+
+    class CountingCheck(BaseHealthCheck):
+        name = "Sayaçlı hızlı kontrol"
+        category = "Test Paketi"
+
+        def run(self, context):
+            calls.append(len(calls) + 1)
+            return self.ok("Çalıştı.", detail=f"run={calls[-1]}")
+
+    monkeypatch.setattr(runner_module, "quick_checks", lambda: [CountingCheck()])
+    health_service.clear_quick_health_cache()
+    try:
+        first = health_service.get_cached_quick_health_report(db_path=tmp_db_path, ttl_s=60)
+        assert health_service.get_cached_quick_health_report(db_path=tmp_db_path, ttl_s=60) is first
+        assert calls == [1]
+
+        # TTL dolmuş: eski rapor anında döner, yenileme arka planda yapılır.
+        stale = health_service.get_cached_quick_health_report(db_path=tmp_db_path, ttl_s=0)
+        assert stale is first
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            fresh = health_service.get_cached_quick_health_report(db_path=tmp_db_path, ttl_s=60)
+            if fresh is not first:
+                break
+            time.sleep(0.01)
+        assert fresh is not first and fresh.results[0].detail == "run=2"
+    finally:
+        health_service.clear_quick_health_cache()
+
+
+def test_dependency_scan_rereads_only_changed_files(tmp_path):
+    import os
+
+    from app.core.file_scan_cache import clear_file_scan_cache, file_scan_cache_stats
+    from app.health.dependency_scanner import _collect_imports
+
+    (tmp_path / "a.py").write_text("import numpy\n", encoding="utf-8")
+    (tmp_path / "b.py").write_text("from pandas import DataFrame\n", encoding="utf-8")
+    clear_file_scan_cache()
+    assert _collect_imports(tmp_path) == {"numpy", "pandas"}
+    assert _collect_imports(tmp_path) == {"numpy", "pandas"}
+    assert file_scan_cache_stats()["misses"] == 2 and file_scan_cache_stats()["hits"] == 2
+
+    changed = tmp_path / "b.py"
+    changed.write_text("import scipy\n", encoding="utf-8")
+    stamp = changed.stat()
+    os.utime(changed, ns=(stamp.st_atime_ns, stamp.st_mtime_ns + 1_000_000))
+    assert _collect_imports(tmp_path) == {"numpy", "scipy"}
+    assert file_scan_cache_stats()["misses"] == 3
+    clear_file_scan_cache()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Artimli TOPSIS: tam hesapla ayni skorlar, fakulte+yil durumunun tek ders duzenlemesiyle yenilenmesi."""
+
+from __future__ import annotations
+
+import os
+import random
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.calculation import (
+    KararMotoru,
+    get_faculty_year_topsis_results,
+    refresh_faculty_year_topsis_scores,
+)
+from app.services.incremental_topsis import IncrementalTopsisState, invalidate_topsis_states
+from app.tests.test_pool_rules import _build_pool_db
+
+KEYS = ("basari", "trend", "populerlik", "anket")
+
+
+def _full_scores(ids, matrix, weights, benefit):
+    df = pd.DataFrame(matrix, columns=list(KEYS))
+    df.insert(0, "ders_id", ids)
+    result, _ = KararMotoru().topsis_calistir(df, weights, criteria_keys=list(KEYS), benefit_map=dict(zip(KEYS, benefit)))
+    return {int(r["ders_id"]): float(r["Kesinlesme_Puani"]) for _, r in result.iterrows()}
+
+
+def test_incremental_updates_match_full_recomputation():
+    rnd = random.Random(5)
+    for _ in range(30):
+        n = rnd.randint(1, 25)
+        ids = list(range(1, n + 1))
+        matrix = np.array([[rnd.choice([0.0, 0.5, 1.0, rnd.random()]) for _ in KEYS] for _ in ids])
+        weights = [rnd.random() for _ in KEYS]
+        benefit = [rnd.random() > 0.25 for _ in KEYS]
+        state = IncrementalTopsisState(ids, matrix, weights, benefit)
+        for _ in range(15):
+            target = rnd.choice(ids)
+            values = [rnd.choice([0.0, 1.0, 2.0, rnd.random()]) for _ in KEYS]
+            state.update(target, values)
+            matrix[target - 1] = values
+        expected = _full_scores(ids, matrix, weights, benefit)
+        got = state.score_map()
+        assert got.keys() == expected.keys()
+        for d_id, score in expected.items():
+            assert got[d_id] == pytest.approx(score, abs=1e-9)
+
+
+def test_update_reports_changed_extremes_only():
+    state = IncrementalTopsisState([1, 2, 3], [[0.2, 0, 0, 0], [0.5, 0, 0, 0], [0.9, 0, 0, 0]], [1, 1, 1, 1], [True] * 4)
+    assert state.update(2, [0.6, 0, 0, 0]) == []
+    assert state.update(3, [0.4, 0, 0, 0]) == ["basari"]
+    assert state.ideal_recompute_count == 1 and state.update_count == 2
+
+
+@pytest.fixture()
+def pool_db():
+    path = _build_pool_db()
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+    invalidate_topsis_states()
+    os.unlink(path)
+
+
+def test_refresh_after_single_course_edit_matches_full_run(pool_db):
+    cur = pool_db.cursor()
+    assert refresh_faculty_year_topsis_scores(cur, 1, 2024, [102], donem="G") is None
+
+    first = get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    assert first["ok"] and first["score_methods"][102] == "topsis"
+    cur.execute("UPDATE performans SET basari_orani = 0.99, ortalama_not = 95 WHERE ders_id = 102")
+    cur.execute("UPDATE ders_kriterleri SET gecen_ogrenci = 99, basari_ortalamasi = 95 WHERE ders_id = 102")
+    cur.execute("UPDATE ders_kriterleri SET anket_dersi_secen = 5 WHERE ders_id = 112")
+
+    refreshed = refresh_faculty_year_topsis_scores(cur, 1, 2024, [102, 112, 999], donem="Guz")
+    assert refreshed["mode"] == "incremental"
+    term = refreshed["terms"]["g"]
+    assert term["updated_course_ids"] == [102, 112]
+
+    full = get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    for d_id, method in full["score_methods"].items():
+        if d_id in term["scores"]:
+            assert term["score_methods"][d_id] == method
+            assert term["scores"][d_id] == pytest.approx(full["scores"][d_id], abs=1e-9)
+    assert 112 in term["scores"]
+
+
+def test_memory_database_keeps_no_state():
+    path = _build_pool_db()
+    conn = sqlite3.connect(path)
+    memory = sqlite3.connect(":memory:")
+    conn.backup(memory)
+    conn.close()
+    os.unlink(path)
+    cur = memory.cursor()
+    assert get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")["ok"]
+    assert refresh_faculty_year_topsis_scores(cur, 1, 2024, [102], donem="G") is None
+
+
+def test_state_is_dropped_after_curriculum_or_weight_change(pool_db, monkeypatch):
+    from app.services import calculation
+
+    cur = pool_db.cursor()
+    assert get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")["ok"]
+    assert refresh_faculty_year_topsis_scores(cur, 1, 2024, [102], donem="G") is not None
+
+    original = calculation.resolve_topsis_weight_context
+
+    def shifted(*args, **kwargs):
+        context = original(*args, **kwargs)
+        return {**context, "weights": [0.7, 0.1, 0.1, 0.1]}
+
+    monkeypatch.setattr(calculation, "resolve_topsis_weight_context", shifted)
+    assert refresh_faculty_year_topsis_scores(cur, 1, 2024, [102], donem="G") is None
+    monkeypatch.setattr(calculation, "resolve_topsis_weight_context", original)
+    assert refresh_faculty_year_topsis_scores(cur, 1, 2024, [102], donem="G") is None  # durum atildi
+
+    assert get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")["ok"]
+    cur.execute("DELETE FROM mufredat_ders WHERE ders_id = 102")
+    assert refresh_faculty_year_topsis_scores(cur, 1, 2024, [102], donem="G") is None
+
+
+def test_refresh_after_change_persists_scores_to_pool(pool_db):
+    from app.services.calculation import refresh_topsis_scores_after_change
+
+    cur = pool_db.cursor()
+    assert refresh_topsis_scores_after_change(pool_db, 1, 2024, [102], donem="G") is None
+    assert get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")["ok"]
+    cur.execute("UPDATE performans SET basari_orani = 0.99, ortalama_not = 95 WHERE ders_id = 102")
+    cur.execute("UPDATE ders_kriterleri SET gecen_ogrenci = 99, basari_ortalamasi = 95 WHERE ders_id = 102")
+
+    refreshed = refresh_topsis_scores_after_change(pool_db, 1, 2024, ders_ids=None)
+    term = refreshed["terms"]["g"]
+    assert term["persisted"] and 102 in term["updated_course_ids"]
+    full = get_faculty_year_topsis_results(cur, fakulte_id=1, akademik_yil=2024, donem="G")
+    stored = {
+        int(row["ders_id"]): row["skor"]
+        for row in cur.execute("SELECT ders_id, skor FROM havuz WHERE fakulte_id = 1 AND yil = 2024").fetchall()
+        if row["skor"] is not None
+    }
+    for d_id in term["scores"]:
+        if d_id in stored:
+            assert stored[d_id] == pytest.approx(full["scores"][d_id], abs=1e-9)
+    assert 102 in stored
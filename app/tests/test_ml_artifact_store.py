@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""Model artifact deposu: hash'li kayıt, diskten tembel yükleme ve HavuzAIEngine paket yeniden kullanımı."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services import ml_prediction_service
+from app.services.ml_artifact_store import (
+    ArtifactIntegrityError,
+    WarmArtifactCache,
+    file_sha256,
+    get_warm_cache,
+    prune_superseded_artifacts,
+    read_artifact,
+    write_artifact,
+)
+from app.services.ml_model_cache import get_model_cache, model_spec_hash
+from app.services.ml_prediction_service import predict_batch
+from app.services.ml_training_service import train_model_run
+from app.tests.test_ml_governance import _conn, _temp_db
+
+
+@pytest.fixture()
+def db():
+    get_model_cache().clear()
+    get_warm_cache().clear()
+    path = _temp_db(rows=120)
+    conn = _conn(path)
+    yield conn
+    conn.close()
+    os.unlink(path)
+    get_model_cache().clear()
+    get_warm_cache().clear()
+
+
+def _run_row(conn, run_id: int):
+    return conn.execute(
+        "SELECT artifact_path, artifact_sha256, artifact_version, artifact_size_bytes, data_fingerprint FROM ml_model_runs WHERE id=?",
+        (run_id,),
+    ).fetchone()
+
+
+def _spec_hash(conn, run_id: int):
+    return conn.execute("SELECT model_spec_hash FROM ml_model_runs WHERE id=?", (run_id,)).fetchone()[0]
+
+
+def test_trained_run_records_versioned_hashed_artifact(db):
+    results = predict_batch(db, algorithm_key="decision_tree", course_ids=[1001, 1002], year=2026, faculty_id=1)
+    run_id = results[0]["model_run_id"]
+    path, sha256, version, size, fingerprint = _run_row(db, run_id)
+
+    assert Path(path).is_file() and Path(path).parent.name == "decision_tree"
+    assert sha256 == file_sha256(path)
+    assert size == Path(path).stat().st_size
+    assert version.startswith(f"decision_tree-run{run_id}-")
+    assert fingerprint and fingerprint[:12] in Path(path).name
+
+
+def test_fresh_process_cache_loads_artifact_instead_of_retraining(db, monkeypatch):
+    first = predict_batch(db, algorithm_key="decision_tree", course_ids=[1001, 1004], year=2026, faculty_id=1)
+    get_model_cache().clear()
+    get_warm_cache().clear()
+    monkeypatch.setattr(ml_prediction_service, "_train_cached_model", lambda cfg, ds: pytest.fail("model yeniden egitildi"))
+
+    again = predict_batch(db, algorithm_key="decision_tree", course_ids=[1001, 1004], year=2026, faculty_id=1)
+
+    assert [r["predicted_value_text"] for r in again] == [r["predicted_value_text"] for r in first]
+    assert again[0]["model_run"]["artifact_loaded"] is True
+    assert _run_row(db, again[0]["model_run_id"])[0] == _run_row(db, first[0]["model_run_id"])[0]
+
+
+def test_training_service_artifact_is_reused_by_prediction(db, monkeypatch):
+    algorithm_key = "decision_tree"
+    trained = train_model_run(db, algorithm_key=algorithm_key, year=2026, faculty_id=1)
+    assert trained["status"] == "trained" and trained["artifact_path"]
+    monkeypatch.setattr(ml_prediction_service, "_train_cached_model", lambda cfg, ds: pytest.fail("model yeniden egitildi"))
+
+    result = predict_batch(db, algorithm_key=algorithm_key, course_ids=[1001], year=2026, faculty_id=1)[0]
+
+    assert result["fallback_used"] is False
+    assert result["model_run"]["artifact_path"] == trained["artifact_path"]
+    # Yeniden kullanim yalniz ayni hiperparametrelerle kurulmus model icin olur.
+    loaded = get_warm_cache().load(ml_prediction_service.find_latest_artifact_run(db, algorithm_key)["record"])
+    assert _spec_hash(db, result["model_run_id"]) == _spec_hash(db, trained["id"]) == model_spec_hash(loaded["model"])
+
+
+def test_artifact_with_different_model_spec_is_not_reused(db, monkeypatch):
+    from sklearn.tree import DecisionTreeClassifier
+
+    trained = train_model_run(db, algorithm_key="decision_tree", year=2026, faculty_id=1)
+    monkeypatch.setattr(ml_prediction_service, "_build_model", lambda key, n_samples=0: DecisionTreeClassifier(max_depth=2, random_state=0))
+
+    result = predict_batch(db, algorithm_key="decision_tree", course_ids=[1001], year=2026, faculty_id=1)[0]
+
+    assert result["fallback_used"] is False
+    assert result["model_run"]["artifact_loaded"] is False
+    assert result["model_run"]["artifact_path"] != trained["artifact_path"]
+    assert _spec_hash(db, result["model_run_id"]) != _spec_hash(db, trained["id"])
+
+
+def test_tampered_artifact_is_rejected(tmp_path):
+    record = write_artifact(tmp_path / "m.joblib", {"model": [1, 2, 3]}, version="t")
+    assert read_artifact(record.path, sha256=record.sha256)["model"] == [1, 2, 3]
+    with open(record.path, "ab") as handle:
+        handle.write(b"x")
+    with pytest.raises(ArtifactIntegrityError):
+        read_artifact(record.path, sha256=record.sha256)
+
+
+def test_warm_cache_is_bounded_lru(tmp_path):
+    cache = WarmArtifactCache(maxsize=2)
+    records = [write_artifact(tmp_path / f"m{i}.joblib", {"model": i}, version="t") for i in range(3)]
+    cache.load(records[0])
+    cache.load(records[1])
+    cache.load(records[0])
+    cache.load(records[2])
+    assert len(cache) == 2
+    assert cache._get(records[0].path) is not None and cache._get(records[1].path) is None
+
+
+def test_content_addressed_bundle_is_hash_checked_and_pruned(tmp_path):
+    cache = WarmArtifactCache()
+    builds = []
+    build = lambda: builds.append(1) or {"model": len(builds)}  # noqa: E731
+    path = tmp_path / "bundle_a.joblib"
+    assert cache.load_or_build(path, build, version="t")["model"] == 1
+    assert (tmp_path / "bundle_a.joblib.sha256").read_text() == file_sha256(path)
+
+    with open(path, "ab") as handle:
+        handle.write(b"x")
+    cache.clear()
+    assert cache.load_or_build(path, build, version="t")["model"] == 2
+
+    for name in ("bundle_b", "bundle_c"):
+        cache.load_or_build(tmp_path / f"{name}.joblib", build, version="t", keep=2)
+    assert sorted(item.name for item in tmp_path.glob("*.joblib")) == ["bundle_b.joblib", "bundle_c.joblib"]
+    assert not (tmp_path / "bundle_a.joblib.sha256").exists()
+
+
+def test_superseded_artifact_runs_are_removed_from_disk(db):
+    paths = []
+    for _ in range(3):
+        trained = train_model_run(db, algorithm_key="decision_tree", year=2026, faculty_id=1)
+        paths.append((trained["id"], trained["artifact_path"]))
+
+    assert prune_superseded_artifacts(db, "decision_tree", keep=1) == 2
+    newest_id, newest_path = paths[-1]
+    assert Path(newest_path).is_file()
+    for run_id, path in paths[:-1]:
+        assert not Path(path).exists()
+        assert _run_row(db, run_id)[0] is None
+    assert ml_prediction_service.find_latest_artifact_run(db, "decision_tree")["run_id"] == newest_id
+
+
+def test_corrupt_artifact_falls_back_to_training(db):
+    first = predict_batch(db, algorithm_key="decision_tree", course_ids=[1001], year=2026, faculty_id=1)[0]
+    with open(first["model_run"]["artifact_path"], "ab") as handle:
+        handle.write(b"x")
+    get_model_cache().clear()
+    get_warm_cache().clear()
+
+    again = predict_batch(db, algorithm_key="decision_tree", course_ids=[1001], year=2026, faculty_id=1)[0]
+
+    assert again["fallback_used"] is False
+    assert again["model_run"]["artifact_loaded"] is False
+    assert again["predicted_value_text"] == first["predicted_value_text"]
+
+
+def test_havuz_engine_reuses_bundle_across_instances_and_from_disk(monkeypatch, tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.services import ai_engine
+    from app.tests.test_ai_engine import _build_ai_test_db
+
+    get_model_cache().clear()
+    get_warm_cache().clear()
+    monkeypatch.setenv("ML_ARTIFACT_DIR", str(tmp_path))
+    db_path = _build_ai_test_db(total_rows=12, curriculum_rows=4)
+    session = sessionmaker(bind=create_engine(f"sqlite:///{db_path}"))()
+    fits = []
+    original = ai_engine._fit_bundle
+    monkeypatch.setattr(ai_engine, "_fit_bundle", lambda *a: fits.append(1) or original(*a))
+    try:
+        first = ai_engine.HavuzAIEngine(session).predict_all_courses(fakulte_id=4, yil=2022)
+        second = ai_engine.HavuzAIEngine(session).predict_all_courses(fakulte_id=4, yil=2022)
+        get_model_cache().clear()
+        get_warm_cache().clear()
+        third = ai_engine.HavuzAIEngine(session).predict_all_courses(fakulte_id=4, yil=2022)
+    finally:
+        session.close()
+        os.unlink(db_path)
+        get_model_cache().clear()
+        get_warm_cache().clear()
+
+    assert len(fits) == 1
+    assert list((tmp_path / "havuz_ai").glob("bundle_*.joblib"))
+    for other in (second, third):
+        assert other[["lr_tahmin", "rf_tahmin", "dt_tahmin"]].equals(first[["lr_tahmin", "rf_tahmin", "dt_tahmin"]])
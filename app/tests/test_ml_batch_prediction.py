@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""predict_batch: tek eğitim, tek model run satırı, vektörel skorlama ve LRU model önbelleği."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from app.services import ml_prediction_service
+from app.services.ml_model_cache import MLModelCache, ModelCacheKey, dataset_fingerprint, get_model_cache
+from app.services.ml_prediction_service import predict_batch, predict_course
+from app.tests.test_ml_governance import _conn, _temp_db
+
+
+@pytest.fixture()
+def big_db():
+    get_model_cache().clear()
+    path = _temp_db(rows=120)
+    conn = _conn(path)
+    yield conn
+    conn.close()
+    os.unlink(path)
+    get_model_cache().clear()
+
+
+def _count(conn, table: str) -> int:
+    return int(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+
+
+def test_batch_trains_once_and_writes_one_model_run(big_db, monkeypatch):
+    calls = []
+    original = ml_prediction_service._train_cached_model
+    monkeypatch.setattr(ml_prediction_service, "_train_cached_model", lambda cfg, ds: calls.append(1) or original(cfg, ds))
+    course_ids = [1001, 1002, 1003, 1004, 1005, 999999]
+
+    results = predict_batch(big_db, algorithm_key="decision_tree", course_ids=course_ids, year=2026, faculty_id=1)
+
+    assert [int(r["course_id"]) for r in results] == course_ids
+    assert len(calls) == 1
+    assert _count(big_db, "ml_model_runs") == 1
+    assert all(r["fallback_used"] is False for r in results[:5])
+    assert results[-1]["fallback_used"] is True
+    assert len({r["model_run_id"] for r in results[:5]}) == 1
+
+
+def test_second_batch_reuses_cached_model(big_db, monkeypatch):
+    predict_batch(big_db, algorithm_key="decision_tree", course_ids=[1001, 1002], year=2026, faculty_id=1)
+    monkeypatch.setattr(ml_prediction_service, "_train_cached_model", lambda cfg, ds: pytest.fail("model yeniden egitildi"))
+
+    again = predict_course(big_db, algorithm_key="decision_tree", course_id=1003, year=2026, faculty_id=1)
+
+    assert again["fallback_used"] is False
+    assert again["model_run"]["model_cache_hit"] is True
+    assert _count(big_db, "ml_model_runs") == 2
+
+
+def test_batch_matches_single_course_predictions(big_db):
+    batch = predict_batch(big_db, algorithm_key="decision_tree", course_ids=[1004, 1007], year=2026, faculty_id=1)
+    get_model_cache().clear()
+    single = [predict_course(big_db, algorithm_key="decision_tree", course_id=c, year=2026, faculty_id=1) for c in (1004, 1007)]
+    for a, b in zip(batch, single):
+        assert a["predicted_value_text"] == b["predicted_value_text"]
+        assert a["confidence_score"] == pytest.approx(b["confidence_score"])
+
+
+def test_lru_evicts_least_recently_used_and_fingerprint_tracks_data():
+    import pandas as pd
+
+    cache = MLModelCache(maxsize=2)
+    keys = [ModelCacheKey("dt", "v1", "scope", str(i)) for i in range(3)]
+    cache.put(keys[0], "a")  # type: ignore[arg-type]
+    cache.put(keys[1], "b")  # type: ignore[arg-type]
+    assert cache.get(keys[0]) == "a"
+    cache.put(keys[2], "c")  # type: ignore[arg-type]
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "a" and cache.get(keys[2]) == "c"
+
+    X = pd.DataFrame({"a": [1.0, 2.0]})
+    assert dataset_fingerprint(X, pd.Series([0, 1])) == dataset_fingerprint(X.copy(), pd.Series([0, 1]))
+    assert dataset_fingerprint(X, pd.Series([0, 1])) != dataset_fingerprint(X.assign(a=[1.0, 2.5]), pd.Series([0, 1]))
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Paralel yillik calistirma: seri modla ayni sonuc/DB durumu, ilerleme ve salt-okunur isci."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from app.services.calculation import resolve_topsis_weight_context, run_all_algorithms_for_year
+from app.services.faculty_parallel_runner import FacultyScoreJob, iter_prescored_faculties, score_faculty_year_readonly
+from app.tests.test_yearly_criteria_workflow import _build_two_faculty_algorithm_db
+
+
+@pytest.fixture()
+def db_pair():
+    first = _build_two_faculty_algorithm_db()
+    second = first + ".parallel"
+    shutil.copyfile(first, second)
+    yield first, second
+    for path in (first, second):
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.unlink(path + suffix)
+            except OSError:
+                pass
+
+
+def _next_year_state(path):
+    conn = sqlite3.connect(path)
+    try:
+        curricula = conn.execute(
+            """
+            SELECT m.bolum_id, md.ders_id
+            FROM mufredat m JOIN mufredat_ders md ON md.mufredat_id = m.mufredat_id
+            WHERE m.akademik_yil = 2023
+            ORDER BY 1, 2
+            """
+        ).fetchall()
+        pool = conn.execute("SELECT fakulte_id, ders_id, statu, sayac FROM havuz WHERE yil = 2023 ORDER BY 1, 2").fetchall()
+    finally:
+        conn.close()
+    return curricula, pool
+
+
+def test_parallel_mode_matches_sequential_results_and_writes(db_pair):
+    sequential_path, parallel_path = db_pair
+    sequential = run_all_algorithms_for_year(yil=2022, db_path=sequential_path, donem="G")
+    events = []
+    parallel = run_all_algorithms_for_year(
+        yil=2022, db_path=parallel_path, donem="G", parallel=True, max_workers=2, progress_callback=events.append
+    )
+
+    assert parallel["mode"] == "parallel" and sequential["mode"] == "sequential"
+    assert parallel["ok"] == sequential["ok"]
+    assert parallel["messages"] == sequential["messages"]
+    assert [p["fakulte_id"] for p in parallel["processed"]] == [p["fakulte_id"] for p in sequential["processed"]] == [1]
+    assert [s["reason"] for s in parallel["skipped"]] == [s["reason"] for s in sequential["skipped"]]
+    assert _next_year_state(parallel_path) == _next_year_state(sequential_path)
+
+    assert [(t["fakulte_id"], t["status"]) for t in parallel["timings"]] == [(1, "processed"), (2, "skipped")]
+    assert all(t["prescored"] and t["score_ms"] >= 0 and t["write_ms"] >= 0 for t in parallel["timings"])
+    assert [(e["done"], e["total"], e["fakulte_id"]) for e in events] == [(1, 2, 1), (2, 2, 2)]
+
+
+def test_readonly_worker_uses_writer_weight_context(db_pair):
+    path, _ = db_pair
+    conn = sqlite3.connect(path)
+    context = resolve_topsis_weight_context(conn.cursor(), 1, 2022)
+    conn.commit()
+    conn.close()
+
+    # Baglam olmadan salt-okunur isci AHP profilini tohumlayamaz; paket yaziciya birakilir.
+    blind = score_faculty_year_readonly((path, FacultyScoreJob(1, 2022, "G")))
+    assert blind.score_pack is None and blind.error
+
+    scored = score_faculty_year_readonly((path, FacultyScoreJob(1, 2022, "G", weight_context=context)))
+    assert scored.score_pack["ok"] and scored.score_pack["ahp_fallback_used"] is False
+    assert set(scored.score_pack["scores"]) >= {101, 102}
+
+    jobs = [FacultyScoreJob(2, 2022, "G", weight_context=context), FacultyScoreJob(1, 2022, "G", weight_context=context)]
+    assert [r.job.fakulte_id for r in iter_prescored_faculties(path, jobs, max_workers=1)] == [2, 1]
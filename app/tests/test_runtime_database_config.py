@@ -1,7 +1,7 @@
 import json
 import os
 
-from app.core.config import load_app_config, resolve_sqlite_db_path
+from app.core.config import get_app_config, load_app_config, resolve_sqlite_db_path
 from app.db.sqlite_db import Database
 
 
@@ -30,3 +30,23 @@ def test_database_runtime_target_updates_sqlite_environment(tmp_path, monkeypatc
 
     assert os.environ["SQLITE_DB_PATH"] == str(db_path.resolve())
     assert os.environ["DATABASE_URL"] == f"sqlite:///{db_path.resolve().as_posix()}"
+
+
+def test_cached_app_config_reloads_on_file_mtime_and_env_change(tmp_path, monkeypatch):
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    monkeypatch.delenv("API_PORT", raising=False)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"log_level": "info", "api_port": 8100}), encoding="utf-8")
+
+    first = get_app_config(str(config_path))
+    assert get_app_config(str(config_path)) is first
+    assert first.api_port == 8100
+
+    config_path.write_text(json.dumps({"log_level": "info", "api_port": 8200}), encoding="utf-8")
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = get_app_config(str(config_path))
+    assert reloaded is not first and reloaded.api_port == 8200
+
+    monkeypatch.setenv("LOG_LEVEL", "debug")
+    assert get_app_config(str(config_path)).log_level == "DEBUG"
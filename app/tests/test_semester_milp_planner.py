@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""MILP donem yerlestirmesi: saf cozucu kisitlari ve motor entegrasyonu (greedy geri donusu dahil)."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("scipy.optimize", reason="MILP icin scipy gerekli")
+
+from app.services import semester_planning_engine
+from app.services.instructor_planning_service import (
+    assign_course_instructor,
+    create_instructor,
+    upsert_instructor_availability,
+)
+from app.services.semester_milp_planner import MilpPlanningProblem, solve_semester_milp
+from app.services.semester_planning_engine import generate_semester_plan
+from app.services.semester_planning_policy_service import create_policy, seed_default_policy
+from app.tests.test_semester_planning_governance import _conn
+
+
+def _candidates(scores):
+    return [{"course_id": idx + 1, "course_score": score, "expected_demand": 10.0} for idx, score in enumerate(scores)]
+
+
+def _all_allowed(n):
+    return {(entry, sem): True for entry in range(n) for sem in ("fall", "spring")}
+
+
+def test_solver_respects_targets_prerequisites_and_instructor_capacity():
+    candidates = _candidates([90, 80, 70, 60, 50])
+    allowed = _all_allowed(5)
+    allowed[(0, "spring")] = False
+    problem = MilpPlanningProblem(
+        candidates=candidates,
+        allowed=allowed,
+        fall_min=2,
+        fall_max=2,
+        spring_min=2,
+        spring_max=2,
+        total_target=4,
+        prerequisite_pairs=[(2, 3)],
+        require_instructor=True,
+        instructor_options={key: [7] for key in allowed if allowed[key]},
+        instructor_capacity={(7, "fall"): 2, (7, "spring"): 2},
+    )
+    solution = solve_semester_milp(problem)
+    assert solution is not None and solution.status == "optimal"
+    sems = solution.semesters
+    assert sorted(sems) == [0, 1, 2, 3]
+    assert sems[0] == "fall"
+    assert list(sems.values()).count("fall") == 2 and list(sems.values()).count("spring") == 2
+    # ders 2'nin on kosulu ders 3: ders 2 guzde ise ders 3 baharda olamaz.
+    assert not (sems[1] == "fall" and sems[2] == "spring")
+    assert set(solution.instructors.values()) == {7}
+
+
+def test_solver_fills_what_it_can_when_minimums_are_unreachable():
+    problem = MilpPlanningProblem(
+        candidates=_candidates([50, 40]),
+        allowed=_all_allowed(2),
+        fall_min=2,
+        fall_max=2,
+        spring_min=2,
+        spring_max=2,
+        total_target=4,
+        course_limits={},
+    )
+    solution = solve_semester_milp(problem)
+    assert solution is not None
+    assert sorted(solution.semesters.values()) == ["fall", "spring"]
+
+
+def test_engine_milp_scenario_matches_targets_and_reports_planner():
+    conn = _conn()
+    result = generate_semester_plan(conn, year=2026, faculty_id=1, department_id=10, scenario_type="milp_optimal", persist=False, generate_alternatives=False)
+    assert result["planner"]["method"] == "milp" and result["planner"]["fallback_used"] is False
+    assert len(result["fall_course_ids"]) == 4 and len(result["spring_course_ids"]) == 4
+    assert len(set(result["fall_course_ids"] + result["spring_course_ids"])) == 8
+    assert all("MILP" in text for text in result["explanations"])
+
+    greedy = generate_semester_plan(conn, year=2026, faculty_id=1, department_id=10, persist=False, generate_alternatives=False)
+    assert greedy["planner"] == {"method": "greedy", "status": "completed", "fallback_used": False}
+
+
+def test_engine_milp_respects_strict_instructor_capacity():
+    conn = _conn()
+    policy = create_policy(
+        conn,
+        name="Hoca kontrollü",
+        scope_type="department",
+        faculty_id=1,
+        department_id=10,
+        year=2026,
+        consider_instructor_availability=True,
+    )
+    instructor = create_instructor(conn, "Dr. Ada", faculty_id=1, department_id=10)
+    for course_id in (1, 2):
+        assign_course_instructor(conn, course_id, instructor["id"])
+    upsert_instructor_availability(conn, instructor["id"], 2026, "fall", available=False, max_elective_courses=1)
+    upsert_instructor_availability(conn, instructor["id"], 2026, "spring", available=True, max_elective_courses=1)
+    result = generate_semester_plan(
+        conn, year=2026, faculty_id=1, department_id=10, policy=policy, scenario_type="milp_optimal", persist=False, generate_alternatives=False
+    )
+    assert result["planner"]["method"] == "milp"
+    selected = result["fall_course_ids"] + result["spring_course_ids"]
+    assert 1 not in result["fall_course_ids"] and 2 not in result["fall_course_ids"]
+    assert len({1, 2} & set(selected)) <= 1
+
+
+def test_engine_falls_back_to_greedy_when_solver_returns_nothing(monkeypatch):
+    conn = _conn()
+    seed_default_policy(conn)
+    monkeypatch.setattr(semester_planning_engine, "solve_semester_milp", lambda problem, time_limit_s: None)
+    result = generate_semester_plan(conn, year=2026, faculty_id=1, department_id=10, scenario_type="milp_optimal", persist=False, generate_alternatives=False)
+    assert result["planner"] == {"method": "greedy", "status": "milp_unavailable", "fallback_used": True}
+    assert len(result["fall_course_ids"]) == 4 and len(result["spring_course_ids"]) == 4
+    assert any("greedy" in warning for warning in result["warnings"])
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""SQLite baglanti havuzu: yeniden kullanim, salt-okunur okuyucular, sinir/zaman asimi ve API dependency."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from app.db.schema_compat import schema_compat_fingerprint_matches
+from app.db.sqlite_pool import PoolTimeoutError, SQLitePool
+from app.tests.conftest import _create_base_schema
+
+
+@pytest.fixture()
+def pool(tmp_path):
+    path = str(tmp_path / "pool.db")
+    conn = sqlite3.connect(path)
+    _create_base_schema(conn)
+    conn.execute("INSERT INTO fakulte (fakulte_id, ad) VALUES (1, 'Muhendislik')")
+    conn.commit()
+    conn.close()
+    pool = SQLitePool(path, max_readers=2, acquire_timeout=0.2)
+    yield pool
+    pool.close()
+
+
+def test_readers_are_reused_read_only_and_schema_is_prepared_once(pool):
+    with pool.reader() as conn:
+        first_id = id(conn)
+        assert conn.execute("SELECT ad FROM fakulte").fetchone()["ad"] == "Muhendislik"
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM fakulte")
+        assert schema_compat_fingerprint_matches(conn)
+    with pool.reader() as conn:
+        assert id(conn) == first_id
+
+    with pool.writer() as conn:
+        conn.execute("INSERT INTO fakulte (fakulte_id, ad) VALUES (2, 'Fen')")
+    with pytest.raises(RuntimeError):
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO fakulte (fakulte_id, ad) VALUES (3, 'Tip')")
+            raise RuntimeError("rollback")
+    with pool.reader() as conn:
+        assert [r[0] for r in conn.execute("SELECT fakulte_id FROM fakulte ORDER BY 1")] == [1, 2]
+
+    metrics = pool.metrics()
+    assert metrics["connections_opened"] == 2 and metrics["schema_ensures"] == 1
+    assert metrics["reader_acquired"] == 3 and metrics["writer_acquired"] == 3
+
+
+def test_reader_limit_blocks_then_times_out(pool):
+    release = threading.Event()
+    held = threading.Barrier(3, timeout=10)
+
+    # Ilk okuyucu sema hazirligini yazici uzerinden yapar; 0.2 sn'lik sinirla
+    # iki soguk okuyucu yazici icin yarisip zaman asimina dusmesin.
+    with pool.reader():
+        pass
+
+    def hold():
+        with pool.reader():
+            held.wait()
+            release.wait(5)
+
+    threads = [threading.Thread(target=hold) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    held.wait()
+    try:
+        with pytest.raises(PoolTimeoutError):
+            with pool.reader():
+                pass
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+    metrics = pool.metrics()
+    assert metrics["timeouts"] == 1 and metrics["idle_readers"] == 2
+
+
+def test_api_read_dependency_uses_pool(pool, monkeypatch):
+    fastapi = pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from app.api import routes
+
+    monkeypatch.setattr(routes, "get_sqlite_pool", lambda _path: pool)
+    monkeypatch.setattr(routes, "_existing_db_path", lambda: pool.db_path)
+    monkeypatch.setattr(routes, "_open_connection", lambda: pytest.fail("salt-okunur uc havuz disi baglanti acti"))
+    app = fastapi.FastAPI()
+    app.include_router(routes.router, prefix="/api/v1")
+
+    client = TestClient(app)
+    assert client.get("/api/v1/dersler").status_code == 200
+    assert client.get("/api/v1/havuz", params={"yil": 2022}).json()["data"] == []
+    assert client.get("/api/v1/fakulteler").json()["data"][0][:2] == [1, "Muhendislik"]
+    assert client.get("/api/v1/akademik-plan", params={"fakulte_id": 1, "yil": 2022}).json()["guz_count"] == 0
+    for path in ("/api/v1/health", "/api/v1/system/schema-health", "/api/v1/system/sql-console/audit-logs"):
+        response = client.get(path)
+        assert response.status_code == 200 and response.json()["success"], path
+    metrics = pool.metrics()
+    assert metrics["reader_acquired"] == 7 and metrics["writer_acquired"] <= 1 and metrics["idle_readers"] == 1
+
+
+def test_replaced_database_file_retires_pooled_connections(pool, tmp_path):
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM fakulte").fetchone()[0] == 1
+
+    replacement = str(tmp_path / "restored.db")
+    conn = sqlite3.connect(replacement)
+    _create_base_schema(conn)
+    conn.executemany("INSERT INTO fakulte (fakulte_id, ad) VALUES (?, ?)", [(1, "A"), (2, "B"), (3, "C")])
+    conn.commit()
+    conn.close()
+    # Ayni yolda yeniden olusturulan dosya (eski baglantilar silinmis inode'u okumaya devam eder).
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(pool.db_path + suffix):
+            os.unlink(pool.db_path + suffix)
+    os.replace(replacement, pool.db_path)
+
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM fakulte").fetchone()[0] == 3
+    metrics = pool.metrics()
+    assert metrics["file_changes"] == 1 and metrics["generation"] == 1 and metrics["schema_ensures"] == 2
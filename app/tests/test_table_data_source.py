@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Tablo goruntuleyici veri kaynagi: SQL filtre/siralama, keyset sayfalama, sayim ve iptal edilebilir isci."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import pytest
+
+from app.services.table_data_source import TableBrowserWorker, TableDataSource, TableQuery
+
+
+def _rows():
+    rows = []
+    for i in range(1, 58):
+        puan = None if i % 7 == 0 else float(i % 5)  # tekrarlar + NULL'lar
+        ad = f"Ders_{i:02d}" if i % 3 else f"Secmeli %{i}"
+        rows.append((i, ad, puan))
+    return rows
+
+
+@pytest.fixture()
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE ders (ders_id INTEGER PRIMARY KEY, ad TEXT, puan REAL)")
+    conn.executemany("INSERT INTO ders VALUES (?, ?, ?)", _rows())
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _all_pages(source, query):
+    pages, cursor = [], None
+    while True:
+        page = source.fetch_page(query, cursor)
+        pages.append(page.rows)
+        if not page.has_next:
+            return pages
+        cursor = page.next_cursor
+
+
+@pytest.mark.parametrize("desc", [False, True])
+def test_keyset_pages_match_full_sort_with_nulls_and_ties(conn, desc):
+    source = TableDataSource(conn, page_size=10)
+    pages = _all_pages(source, TableQuery.build("ders", sort_col="puan", sort_desc=desc))
+
+    assert all(len(rows) == 10 for rows in pages[:-1]) and len(pages) == 6
+    flat = [row for rows in pages for row in rows]
+    # Eski UI gibi: artan sirada NULL'lar sonda, azalanda basta; esitlikte rowid.
+    expected = sorted(_rows(), key=lambda r: (r[2] is None, r[2] or 0.0, r[0]), reverse=desc)
+    assert flat == expected
+
+
+def test_search_and_column_filters_run_in_sql(conn):
+    source = TableDataSource(conn, page_size=100)
+    query = TableQuery.build("ders", search="secmeli %", column_filters={"puan": "2", "ad": "  "})
+    page = source.fetch_page(query, with_count=True)
+
+    expected = [r for r in _rows() if "secmeli %" in r[1].lower() and r[2] is not None and "2" in str(r[2])]
+    assert page.rows == expected and page.total == len(expected) and page.total_exact
+    # LIKE joker karakterleri kacirilir: "e_s" "Ders" ile eslesmez (yalnizca gercek alt cizgi).
+    assert source.fetch_page(TableQuery.build("ders", search="e_s")).rows == []
+    assert page.columns == ["ders_id", "ad", "puan"]
+
+
+def test_count_is_capped_and_estimated_for_large_tables(conn):
+    source = TableDataSource(conn, page_size=5, count_cap=20)
+    unfiltered = source.fetch_page(TableQuery.build("ders"), with_count=True)
+    assert (unfiltered.total, unfiltered.total_exact) == (57, False)  # MAX(rowid) tahmini
+    filtered = source.fetch_page(TableQuery.build("ders", search="Ders_"), with_count=True)
+    assert (filtered.total, filtered.total_exact) == (20, False)
+    assert len(unfiltered.rows) == 5
+
+
+def test_worker_cancels_running_query_and_only_delivers_latest(tmp_path):
+    path = str(tmp_path / "browser.db")
+    setup = sqlite3.connect(path)
+    setup.execute("CREATE TABLE log (id INTEGER PRIMARY KEY, mesaj TEXT)")
+    setup.executemany("INSERT INTO log (mesaj) VALUES (?)", ((f"kayit {i}",) for i in range(20000)))
+    setup.commit()
+    setup.close()
+
+    def connect():
+        conn = sqlite3.connect(path)
+        # Her 1000 VM adiminda bekle: iptal edilmezse tam tarama ~4 sn surer.
+        conn.set_progress_handler(lambda: time.sleep(0.01) or 0, 1000)
+        return conn
+
+    worker = TableBrowserWorker(connect, page_size=10)
+    try:
+        slow = worker.submit(TableQuery.build("log", search="bulunmayan"), with_count=True)
+        time.sleep(0.2)  # yavas sorgu calisiyor
+        started = time.perf_counter()
+        fast = worker.submit(TableQuery.build("log"), extra={"page": 0})
+        ticket, page, error, extra = worker.results.get(timeout=10)
+        elapsed = time.perf_counter() - started
+    finally:
+        worker.close()
+
+    assert slow != fast and ticket == fast == worker.latest_ticket
+    assert error is None and extra == {"page": 0}
+    assert [row[0] for row in page.rows] == list(range(1, 11)) and page.has_next
+    assert elapsed < 2.0  # yavas tarama tamamlanmayi beklemedi
+    assert worker.results.empty()
+
+
+@pytest.mark.parametrize("desc", [False, True])
+def test_numeric_text_column_sorts_as_numbers_across_pages(desc):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE kod (id INTEGER PRIMARY KEY, deger TEXT, etiket TEXT)")
+    values = [None if i % 6 == 0 else str(i % 13) for i in range(1, 31)]
+    conn.executemany("INSERT INTO kod VALUES (?, ?, ?)", [(i, v, f"x{v}") for i, v in enumerate(values, 1)])
+    source = TableDataSource(conn, page_size=4)
+
+    flat = [row for rows in _all_pages(source, TableQuery.build("kod", sort_col="deger", sort_desc=desc)) for row in rows]
+    # Eski UI gibi float karsilastirma: "10" > "9"; NULL'lar artanda sonda.
+    expected = sorted(
+        ((i, v, f"x{v}") for i, v in enumerate(values, 1)),
+        key=lambda r: (r[1] is None, float(r[1] or 0), r[0]),
+        reverse=desc,
+    )
+    assert flat == expected
+    # Sayisal olmayan metin kolonlari sozluk sirasinda kalir.
+    assert not source.repo.is_numeric_text_column("kod", "etiket")
+    conn.close()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Sweep-line saat cakisma motoru, artimli indeks ve planlamadaki slot modu."""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+
+import pytest
+
+from app.services.calculation import ders_cakisma_kontrolu
+from app.services.semester_planning_engine import generate_semester_plan
+from app.services.semester_planning_policy_service import create_policy
+from app.services.time_conflict_index import TimeConflictIndex, build_slot, find_time_conflicts, parse_clock_minutes
+from app.services.time_conflict_planning_service import (
+    estimate_conflict_risk,
+    find_slot_conflicts,
+    generate_conflict_warnings,
+)
+from app.tests.test_semester_planning_governance import _conn
+
+
+def _pairwise(ders_listesi):
+    """Eski O(n^2) referans: ayni gun ve not (bit1 <= bas2 or bit2 <= bas1)."""
+    out = []
+    for i in range(len(ders_listesi)):
+        for j in range(i + 1, len(ders_listesi)):
+            a, b = ders_listesi[i], ders_listesi[j]
+            if (a[1] or "").strip() != (b[1] or "").strip():
+                continue
+            a1, a2, b1, b2 = (parse_clock_minutes(v) for v in (a[2], a[3], b[2], b[3]))
+            if not (a2 <= b1 or b2 <= a1):
+                out.append((a[0], b[0]))
+    return out
+
+
+def test_parse_clock_minutes_matches_legacy_formats():
+    assert parse_clock_minutes("09:30") == 570
+    assert parse_clock_minutes(" 9 ") == 540
+    assert parse_clock_minutes(13.0) == 780
+    assert parse_clock_minutes(None) == 0
+    assert parse_clock_minutes("abc") == 0
+
+
+def test_sweep_matches_pairwise_reference_including_edge_cases():
+    rnd = random.Random(11)
+    days = ["Pazartesi", " Pazartesi", "Sali", None]
+    clocks = [None, "08:00", "09:00", "09:30", "10:00", "10", "12:15", "13:00", "9:00"]
+    for _ in range(200):
+        lessons = [(idx, rnd.choice(days), rnd.choice(clocks), rnd.choice(clocks)) for idx in range(rnd.randint(0, 25))]
+        assert ders_cakisma_kontrolu(lessons) == _pairwise(lessons)
+
+
+def test_touching_slots_do_not_conflict():
+    lessons = [(1, "Pzt", "09:00", "10:00"), (2, "Pzt", "10:00", "11:00"), (3, "Pzt", "10:00", "10:00"), (4, "Pzt", "09:59", "10:01")]
+    assert ders_cakisma_kontrolu(lessons) == [(1, 4), (2, 4), (3, 4)]
+    assert find_time_conflicts([]) == []
+
+
+def test_incremental_index_insert_query_remove():
+    index = TimeConflictIndex([build_slot("A", "Pzt", "09:00", "11:00"), build_slot("B", "Pzt", "13:00", "14:00")])
+    candidate = [build_slot("X", "Pzt", "10:30", "12:00")]
+    assert [other.key for _, other in index.conflicts_for(candidate)] == ["A"]
+    assert not index.would_conflict([build_slot("X", "Sal", "10:30", "12:00")])
+
+    slot_id = index.insert(build_slot("C", "Pzt", "11:30", "13:30"))
+    assert sorted(other.key for _, other in index.conflicts_for(candidate)) == ["A", "C"]
+    assert index.remove(slot_id).key == "C"
+    assert index.remove_key("A") == 1
+    assert not index.would_conflict(candidate)
+    assert len(index) == 1
+
+
+@pytest.fixture()
+def planning_conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE ders_ogretim (ders_id INTEGER, gun TEXT, baslangic_saati TEXT, bitis_saati TEXT)")
+    conn.executemany(
+        "INSERT INTO ders_ogretim VALUES (?, ?, ?, ?)",
+        [
+            (1, "Pazartesi", "09:00", "11:00"),
+            (1, "Pazartesi", "09:00", "11:00"),
+            (2, "Pazartesi", "10:00", "12:00"),
+            (3, "Pazartesi", "11:00", "12:00"),
+            (4, "Sali", "09:00", "10:00"),
+        ],
+    )
+    yield conn
+    conn.close()
+
+
+def test_slot_mode_reports_real_overlaps_per_semester(planning_conn):
+    plan = [
+        {"course_id": 1, "assigned_semester": "fall"},
+        {"course_id": 2, "assigned_semester": "fall"},
+        {"course_id": 3, "assigned_semester": "spring"},
+        {"course_id": 4, "assigned_semester": "fall"},
+        {"course_id": 2, "assigned_semester": "unassigned"},
+    ]
+    conflicts = find_slot_conflicts(planning_conn, plan)
+    assert conflicts == [{"semester": "fall", "course_a": 1, "course_b": 2, "day": "Pazartesi", "start": "10:00", "end": "11:00"}]
+
+    assert estimate_conflict_risk(planning_conn, plan) == {"risk_level": "low", "risky_groups": {}}
+    risk = estimate_conflict_risk(planning_conn, plan, mode="slots")
+    assert risk["risk_level"] == "high" and risk["slot_conflicts"] == conflicts
+    warnings = generate_conflict_warnings(planning_conn, plan, mode="combined")
+    assert [(w["course_id"], w["severity"]) for w in warnings] == [(2, "error")]
+    assert "Güz" in warnings[0]["message"]
+    with pytest.raises(ValueError):
+        estimate_conflict_risk(planning_conn, plan, mode="sweep")
+
+
+def test_greedy_planner_moves_clashing_course_to_other_semester():
+    conn = _conn()
+    conn.execute("CREATE TABLE ders_ogretim (ders_id INTEGER, gun TEXT, baslangic_saati TEXT, bitis_saati TEXT)")
+    conn.executemany(
+        "INSERT INTO ders_ogretim VALUES (?, ?, ?, ?)",
+        [(1, "Pazartesi", "09:00", "11:00"), (3, "Pazartesi", "10:00", "12:00")],
+    )
+    baseline = generate_semester_plan(conn, year=2026, faculty_id=1, department_id=10, persist=False, generate_alternatives=False)
+    assert {1, 3} <= set(baseline["fall_course_ids"])  # sayac dengesi ikisini de guze koyar
+
+    policy = create_policy(
+        conn, name="Saat kontrollu", scope_type="department", faculty_id=1, department_id=10, year=2026, consider_time_conflicts=True
+    )
+    result = generate_semester_plan(
+        conn, year=2026, faculty_id=1, department_id=10, policy=policy, persist=False, generate_alternatives=False
+    )
+    assert 1 in result["fall_course_ids"] and 3 in result["spring_course_ids"]
+    assert len(result["fall_course_ids"]) == 4 and len(result["spring_course_ids"]) == 4
+    assert not [v for v in result["constraint_violations"] if v["constraint_type"] == "time_conflict"]
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""CSR tercih indeksi ve heap tabanli Gale-Shapley birim testleri."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.algorithms.allocation import (
+    FCFSAllocator,
+    GaleShapleyAllocator,
+    MinimumRegretAllocator,
+)
+from app.algorithms.allocation.core import UNKNOWN_COURSE, build_preference_index
+
+pytestmark = pytest.mark.unit
+
+
+def _reference_gale_shapley(students, courses, preferences):
+    """Eski liste tabanli uygulama: min(current) + list.remove."""
+    capacities = {int(c): max(0, int(cap)) for c, cap in zip(courses["course_id"], courses["capacity"])}
+    pref_map = {}
+    ordered = preferences.assign(_row=range(len(preferences))).sort_values(["rank", "_row"], kind="stable")
+    for sid, cid, rank in zip(ordered["student_id"], ordered["course_id"], ordered["rank"]):
+        pref_map.setdefault(int(sid), []).append((int(cid), int(rank)))
+    gpa = {int(s): (0.0 if np.isnan(g) else float(g)) for s, g in zip(students["student_id"], students["gpa"])}
+    student_ids = [int(s) for s in students["student_id"]]
+    unmatched = set(student_ids)
+    proposal_idx = {sid: 0 for sid in student_ids}
+    matches = {cid: [] for cid in capacities}
+    assigned = {sid: None for sid in student_ids}
+    while unmatched:
+        sid = unmatched.pop()
+        prefs = pref_map.get(sid, [])
+        if proposal_idx[sid] >= len(prefs):
+            continue
+        cid, rank = prefs[proposal_idx[sid]]
+        proposal_idx[sid] += 1
+        current = matches.setdefault(cid, [])
+        cap = capacities.get(cid, 0)
+        if cap <= 0:
+            unmatched.add(sid)
+        elif len(current) < cap:
+            current.append(sid)
+            assigned[sid] = cid
+        else:
+            worst = min(current, key=gpa.get)
+            if gpa[sid] > gpa[worst]:
+                current.remove(worst)
+                assigned[worst] = None
+                if proposal_idx[worst] < len(pref_map.get(worst, [])):
+                    unmatched.add(worst)
+                current.append(sid)
+                assigned[sid] = cid
+            elif proposal_idx[sid] < len(prefs):
+                unmatched.add(sid)
+    return assigned
+
+
+def _dataset(seed, n=300, m=12, k=5):
+    rng = np.random.default_rng(seed)
+    student_ids = rng.permutation(np.arange(1, n + 1) * 7)
+    gpa = rng.integers(0, 5, n).astype(float)  # cok sayida esit oncelik
+    gpa[rng.random(n) < 0.05] = np.nan
+    students = pd.DataFrame({"student_id": student_ids, "gpa": gpa})
+    courses = pd.DataFrame({"course_id": np.arange(1, m + 1), "capacity": rng.integers(0, 25, m)})
+    rows = [
+        (sid, cid, rank + 1)
+        for sid in student_ids
+        for rank, cid in enumerate(rng.choice(np.arange(1, m + 3), size=k, replace=False))  # m+1, m+2 bilinmeyen ders
+    ]
+    preferences = pd.DataFrame([rows[i] for i in rng.permutation(len(rows))], columns=["student_id", "course_id", "rank"])
+    return students, courses, preferences
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_heap_gale_shapley_matches_list_reference(seed):
+    students, courses, preferences = _dataset(seed)
+    expected = _reference_gale_shapley(students, courses, preferences)
+    output = GaleShapleyAllocator().allocate(students, courses, preferences)
+    assert {a["student_id"]: a["course_id"] for a in output.assignments} == expected
+
+
+def test_matching_respects_capacity_and_stability():
+    students, courses, preferences = _dataset(11)
+    output = GaleShapleyAllocator().allocate(students, courses, preferences)
+    capacity = dict(zip(courses["course_id"], courses["capacity"]))
+    load = pd.Series([a["course_id"] for a in output.assignments if a["allocated"]]).value_counts()
+    assert all(load[c] <= capacity[c] for c in load.index)
+    gpa = dict(zip(students["student_id"], np.nan_to_num(students["gpa"])))
+    assigned = {a["student_id"]: (a["course_id"], a["rank_received"]) for a in output.assignments}
+    worst_in_course = {c: min(gpa[s] for s, (cc, _) in assigned.items() if cc == c) for c in load.index}
+    for sid, cid, rank in preferences.itertuples(index=False):
+        own = assigned[sid][1]
+        prefers = own is None or rank < own
+        if prefers and cid in load.index and load[cid] == capacity[cid]:
+            assert gpa[sid] <= worst_in_course[cid]  # engelleyen cift yok
+
+
+def test_preference_index_is_rank_sorted_csr():
+    students = pd.DataFrame({"student_id": [2, 1, 3]})
+    courses = pd.DataFrame({"course_id": [10, 20], "capacity": [1, None]})
+    preferences = pd.DataFrame(
+        {"student_id": [1, 1, 2, 9, 1], "course_id": [20, 10, 10, 10, 30], "rank": [2, 1, None, 1, 2]}
+    )
+    index = build_preference_index(students, courses, preferences)
+    assert index.student_ids.tolist() == [2, 1, 3]
+    assert index.capacities.tolist() == [1, 0]
+    assert index.offsets.tolist() == [0, 1, 4, 4]
+    courses_of_1, ranks_of_1 = index.preferences_of(1)
+    assert courses_of_1.tolist() == [0, 1, UNKNOWN_COURSE]
+    assert ranks_of_1.tolist() == [1, 2, 2]
+    assert index.preferences_of(0)[1].tolist() == [999]
+
+
+def test_fcfs_and_minimum_regret_on_small_case():
+    students = pd.DataFrame({"student_id": [1, 2, 3]})
+    courses = pd.DataFrame({"course_id": [10, 20], "capacity": [1, 1]})
+    preferences = pd.DataFrame({"student_id": [1, 1, 2, 3], "course_id": [10, 20, 10, 20], "rank": [2, 1, 1, 2]})
+    fcfs = FCFSAllocator().allocate(students, courses, preferences).assignments
+    assert [a["course_id"] for a in fcfs] == [20, 10, None]
+    regret = MinimumRegretAllocator().allocate(students, courses, preferences)
+    assert [a["rank_received"] for a in regret.assignments] == [1, 1, None]
+    assert regret.artifacts["mean_rank_regret"] == pytest.approx(1.0)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Ortak DecisionMatrix: tek seferlik donusum, argpartition top-k ve DataFrame ile ayni siralama."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.algorithms.mcdm import (
+    AHPRanker,
+    DecisionMatrix,
+    EntropyWeightRanker,
+    PROMETHEERanker,
+    TOPSISRanker,
+    VIKORRanker,
+)
+from app.algorithms.mcdm._shared import get_criteria_columns, top_k_rows
+
+pytestmark = pytest.mark.unit
+
+
+def _frame(n: int = 30) -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    return pd.DataFrame(
+        {
+            "item_id": np.arange(500, 500 + n),
+            "basari": rng.uniform(size=n),
+            "kontenjan": rng.integers(10, 60, size=n).astype(str),
+            "trend": rng.normal(size=n),
+            "ad": ["ders"] * n,
+        }
+    )
+
+
+def test_from_frame_detects_criteria_once_and_fills_missing():
+    frame = _frame()
+    frame.loc[2, "basari"] = np.nan
+    matrix = DecisionMatrix.from_frame(frame)
+    assert matrix.criteria == ("basari", "kontenjan", "trend")
+    assert list(matrix.criteria) == get_criteria_columns(frame)
+    assert matrix.values.dtype == np.float64 and matrix.shape == (30, 3)
+    assert matrix.values[2, 0] == 0.0
+    assert not matrix.values.flags.writeable
+    assert matrix.item_label(0) == 500
+
+
+def test_item_label_falls_back_to_index_without_item_id():
+    frame = _frame(3).drop(columns="item_id")
+    frame.index = ["a", "b", "c"]
+    assert DecisionMatrix.from_frame(frame).item_label(1) == "b"
+
+
+@pytest.mark.parametrize("k", [0, 1, 4, 30, 100])
+def test_top_k_rows_matches_stable_sort_with_ties_and_nan(k):
+    scores = np.array([0.3, np.nan, 0.9, 0.3, 0.9, 0.1, 0.3, np.nan, 0.5])
+    expected = pd.Series(scores).sort_values(ascending=False, kind="mergesort").index.to_numpy()[:k]
+    assert top_k_rows(scores, k).tolist() == expected.tolist()
+    expected_asc = pd.Series(scores).sort_values(ascending=True, kind="mergesort").index.to_numpy()[:k]
+    assert top_k_rows(scores, k, ascending=True).tolist() == expected_asc.tolist()
+
+
+@pytest.mark.parametrize("ranker_cls", [AHPRanker, TOPSISRanker, VIKORRanker, PROMETHEERanker, EntropyWeightRanker])
+def test_rankers_give_same_output_for_frame_and_shared_matrix(ranker_cls):
+    frame = _frame()
+    matrix = DecisionMatrix.from_frame(frame)
+    from_frame = ranker_cls().fit(frame).recommend(frame, top_k=7)
+    from_matrix = ranker_cls().fit(matrix).recommend(matrix, top_k=7)
+    assert from_matrix.recommendations == from_frame.recommendations
+    assert from_matrix.artifacts == from_frame.artifacts
+    assert len(from_frame.recommendations) == 7
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Seyrek tasima problemi olarak optimal rank-regret yerlestirme testleri."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.algorithms.allocation import MinimumRegretAllocator, OptimalRegretAllocator
+from app.benchmark.registry import AlgorithmRegistry
+
+pytestmark = pytest.mark.unit
+
+
+def _dataset(seed, n=30, m=5, k=3):
+    rng = np.random.default_rng(seed)
+    students = pd.DataFrame({"student_id": np.arange(1, n + 1)})
+    courses = pd.DataFrame({"course_id": np.arange(1, m + 1), "capacity": rng.integers(1, 8, m)})
+    rows = [
+        (sid, cid, rank + 1)
+        for sid in range(1, n + 1)
+        for rank, cid in enumerate(rng.choice(np.arange(1, m + 1), size=k, replace=False))
+    ]
+    return students, courses, pd.DataFrame(rows, columns=["student_id", "course_id", "rank"])
+
+
+def _hungarian_optimum(students, courses, preferences, penalty):
+    """Koltuk bazinda acilmis yogun maliyet matrisiyle referans optimum."""
+    from scipy.optimize import linear_sum_assignment
+
+    seats = [cid for cid, cap in zip(courses["course_id"], courses["capacity"]) for _ in range(int(cap))]
+    n = len(students)
+    cost = np.full((n, len(seats) + n), 1e6)
+    for sid, cid, rank in preferences.itertuples(index=False):
+        for j, seat in enumerate(seats):
+            if seat == cid:
+                cost[sid - 1, j] = rank - 1
+    cost[np.arange(n), len(seats) + np.arange(n)] = penalty
+    rows, cols = linear_sum_assignment(cost)
+    return float(cost[rows, cols].sum())
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_objective_matches_seat_expanded_hungarian(seed):
+    students, courses, preferences = _dataset(seed)
+    output = OptimalRegretAllocator().allocate(students, courses, preferences)
+    # Varsayilan ceza: en kotu sira (3) + 1 -> regret 3, arti 1.
+    assert output.artifacts["objective"] == pytest.approx(_hungarian_optimum(students, courses, preferences, penalty=4.0))
+    assert output.artifacts["objective"] <= output.artifacts["warm_start_objective"]
+    load = pd.Series([a["course_id"] for a in output.assignments if a["allocated"]]).value_counts()
+    capacity = dict(zip(courses["course_id"], courses["capacity"]))
+    assert all(load[c] <= capacity[c] for c in load.index)
+
+
+def test_beats_greedy_low_rank_on_crafted_case():
+    students = pd.DataFrame({"student_id": [1, 2]})
+    courses = pd.DataFrame({"course_id": [10, 20], "capacity": [1, 1]})
+    # Acgozlu: 1 -> 10 (sira 1), 2 bos kalir. Optimum: 1 -> 20, 2 -> 10.
+    preferences = pd.DataFrame({"student_id": [1, 1, 2], "course_id": [10, 20, 10], "rank": [1, 2, 1]})
+    greedy = MinimumRegretAllocator().allocate(students, courses, preferences)
+    optimal = OptimalRegretAllocator().allocate(students, courses, preferences)
+    assert [a["course_id"] for a in greedy.assignments] == [10, None]
+    assert [a["course_id"] for a in optimal.assignments] == [20, 10]
+    assert optimal.artifacts["solver_status"] == "optimal"
+
+
+def test_time_budget_falls_back_to_warm_start(monkeypatch):
+    import scipy.optimize
+
+    students, courses, preferences = _dataset(7)
+    monkeypatch.setattr(scipy.optimize, "linprog", lambda *args, **kwargs: SimpleNamespace(status=1, x=None))
+    output = OptimalRegretAllocator(time_budget_s=0.01).allocate(students, courses, preferences)
+    greedy = MinimumRegretAllocator().allocate(students, courses, preferences)
+    assert output.artifacts["solver_status"] == "time_limit"
+    assert output.artifacts["used_warm_start"] is True
+    assert [a["course_id"] for a in output.assignments] == [a["course_id"] for a in greedy.assignments]
+
+
+def test_registered_for_benchmarks_and_validates_regret():
+    registry = AlgorithmRegistry()
+    assert "OptimalRegretAllocation" in {row["name"] for row in registry.list_algorithms("allocation")}
+    assert isinstance(registry.create("OptimalRegretAllocation"), OptimalRegretAllocator)
+    with pytest.raises(ValueError):
+        OptimalRegretAllocator(regret="cubic")
@@ -0,0 +1,59 @@
+"""PerformanceTracker modes and repeated-run latency statistics."""
+
+from __future__ import annotations
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from app.metrics.performance import PerformanceTracker
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("mode", ["timing", "rss", "tracemalloc"])
+def test_single_run_snapshot_has_legacy_keys(mode):
+    with PerformanceTracker(workload_size=10, mode=mode) as tracker:
+        np.ones((200, 200)).sum()
+    payload = tracker.snapshot().as_dict()
+    assert {"latency_ms", "throughput_per_sec", "cpu_ms"} <= set(payload)
+    assert payload["memory_mode"] == mode
+    assert "latency_p95_ms" not in payload
+    assert payload["latency_ms"] >= 0.0
+    # memory_peak_mb yalniz tracemalloc tepe degeridir; RSS buyumesi ayri alanda tutulur.
+    assert ("memory_peak_mb" in payload) == (mode == "tracemalloc")
+    if mode == "timing":
+        assert "rss_peak_mb" not in payload
+
+
+def test_tracemalloc_mode_reports_allocation_peak_and_stops_tracing():
+    with PerformanceTracker(mode="tracemalloc") as tracker:
+        block = bytearray(4 * 1024 * 1024)
+    del block
+    assert tracker.snapshot().memory_peak_mb >= 3.5
+    assert not tracemalloc.is_tracing()
+
+
+def test_rss_mode_does_not_enable_tracemalloc():
+    with PerformanceTracker(mode="rss") as tracker:
+        assert not tracemalloc.is_tracing()
+    snapshot = tracker.snapshot()
+    assert snapshot.memory_peak_mb is None
+    assert snapshot.mode == "rss"
+
+
+def test_measure_reports_min_median_p95_over_warm_runs():
+    calls = []
+    result, tracker = PerformanceTracker.measure(lambda: calls.append(1) or len(calls), workload_size=5, repeats=7, warmup=2, mode="timing")
+    snapshot = tracker.snapshot()
+    assert result == 9
+    assert snapshot.runs == 7
+    assert snapshot.latency_min_ms <= snapshot.latency_median_ms <= snapshot.latency_p95_ms
+    assert snapshot.latency_ms == snapshot.latency_median_ms
+    assert snapshot.as_dict()["runs"] == 7.0
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        PerformanceTracker(mode="perf")
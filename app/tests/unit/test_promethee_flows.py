@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""PROMETHEE-II dongusuz akis motoru birim testleri."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.algorithms.mcdm.promethee import PROMETHEERanker
+from app.algorithms.mcdm.promethee_flows import compute_promethee_flows
+
+pytestmark = pytest.mark.unit
+
+
+def _reference_flows(matrix, weights, preference_fn, divisor):
+    n = matrix.shape[0]
+    pref = np.zeros((n, n), dtype=float)
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                pref[i, j] = float(np.dot(weights, preference_fn(matrix[i] - matrix[j])))
+    leaving = pref.sum(axis=1) / divisor
+    entering = pref.sum(axis=0) / divisor
+    return leaving, entering
+
+
+def _matrix(n=40, m=4, seed=7):
+    rng = np.random.default_rng(seed)
+    matrix = rng.uniform(0, 100, size=(n, m)).round(0)  # yuvarlama esit degerler uretir
+    weights = rng.uniform(0.1, 1.0, size=m)
+    return matrix, weights / weights.sum()
+
+
+@pytest.mark.parametrize(
+    "preference,kwargs,fn",
+    [
+        ("usual", {}, lambda d: (d > 0).astype(float)),
+        ("difference", {}, lambda d: np.clip(d, 0.0, None)),
+        ("v_shape", {"p": 30.0}, lambda d: np.clip(d / 30.0, 0.0, 1.0)),
+        ("linear", {"q": 5.0, "p": 20.0}, lambda d: np.clip((d - 5.0) / 15.0, 0.0, 1.0)),
+        ("gaussian", {"s": 12.0}, lambda d: np.where(d > 0, 1.0 - np.exp(-(d * d) / (2 * 144.0)), 0.0)),
+    ],
+)
+def test_flows_match_pairwise_reference(preference, kwargs, fn):
+    matrix, weights = _matrix()
+    flows = compute_promethee_flows(matrix, weights, preference=preference, **kwargs)
+    leaving, entering = _reference_flows(matrix, weights, fn, divisor=matrix.shape[0] - 1)
+    np.testing.assert_allclose(flows.leaving, leaving, atol=1e-9)
+    np.testing.assert_allclose(flows.entering, entering, atol=1e-9)
+    np.testing.assert_allclose(flows.net, leaving - entering, atol=1e-9)
+
+
+def test_memory_cap_chunks_without_changing_result():
+    matrix, weights = _matrix(n=97)
+    full = compute_promethee_flows(matrix, weights, preference="linear", q=2.0, p=25.0)
+    tiny = compute_promethee_flows(matrix, weights, preference="linear", q=2.0, p=25.0, max_block_bytes=1)
+    np.testing.assert_allclose(tiny.net, full.net, atol=1e-12)
+
+
+def test_per_criterion_thresholds_and_validation():
+    matrix, weights = _matrix(m=3)
+    flows = compute_promethee_flows(matrix, weights, preference="linear", q=[0.0, 5.0, 10.0], p=[10.0, 20.0, 40.0])
+    assert flows.net.shape == (matrix.shape[0],)
+    assert flows.net.sum() == pytest.approx(0.0, abs=1e-9)
+    with pytest.raises(ValueError):
+        compute_promethee_flows(matrix, weights, preference="linear", q=5.0, p=5.0)
+    with pytest.raises(ValueError):
+        compute_promethee_flows(matrix, weights, preference="gaussian")
+    with pytest.raises(ValueError):
+        compute_promethee_flows(matrix, weights, preference="level")
+
+
+def test_ranker_keeps_legacy_mean_flows():
+    matrix, weights = _matrix(n=12, m=3)
+    df = pd.DataFrame(matrix, columns=["k1", "k2", "k3"])
+    df.insert(0, "item_id", range(1, 13))
+    output = PROMETHEERanker(weights=weights.tolist()).rank(df, top_k=12)
+    leaving, entering = _reference_flows(matrix, weights, lambda d: np.clip(d, 0.0, None), divisor=12)
+    np.testing.assert_allclose(output.artifacts["net_flow"], leaving - entering, atol=1e-9)
+    assert [rec["rank"] for rec in output.recommendations] == list(range(1, 13))
+
+
+def test_ranker_gaussian_mode_is_configurable():
+    df = pd.DataFrame({"item_id": [1, 2, 3], "k1": [0.9, 0.5, 0.1], "k2": [0.8, 0.6, 0.2]})
+    output = PROMETHEERanker(weights=[0.5, 0.5], preference_function="gaussian", s=0.2).rank(df, top_k=3)
+    assert [rec["item_id"] for rec in output.recommendations] == [1, 2, 3]
+    assert output.parameters["preference_function"] == "gaussian"
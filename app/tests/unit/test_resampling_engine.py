@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""NumPy bootstrap / permutasyon motoru birim testleri."""
+
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pytest
+
+from app.services.statistical_comparison_service import (
+    bootstrap_confidence_interval,
+    bootstrap_means,
+    compare_two_models,
+    paired_permutation_test,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _values(n=60, seed=5):
+    return np.random.default_rng(seed).gamma(2.0, 1.5, size=n).tolist()
+
+
+def test_bootstrap_is_deterministic_across_chunks_and_workers():
+    values = _values()
+    base = bootstrap_means(values, 3000, seed=9)
+    np.testing.assert_array_equal(base, bootstrap_means(values, 3000, seed=9))
+    chunked = bootstrap_means(values, 3000, seed=9, max_block_bytes=60 * 16 * 400)
+    pooled = bootstrap_means(values, 3000, seed=9, max_workers=2, max_block_bytes=60 * 16 * 400)
+    np.testing.assert_array_equal(chunked, pooled)
+    assert chunked.shape == (3000,)
+    assert not np.array_equal(base, bootstrap_means(values, 3000, seed=10))
+
+
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_interval_covers_mean_and_tracks_normal_theory(method):
+    values = _values(n=200)
+    ci = bootstrap_confidence_interval(values, n_bootstrap=4000, method=method)
+    assert ci["method"] == method
+    assert ci["lower"] < ci["mean"] < ci["upper"]
+    half_width = 1.96 * np.std(values, ddof=1) / np.sqrt(len(values))
+    assert (ci["upper"] - ci["lower"]) / 2 == pytest.approx(half_width, rel=0.15)
+
+
+def test_bca_shifts_interval_for_skewed_data():
+    values = np.random.default_rng(2).lognormal(0.0, 1.0, size=40).tolist()
+    percentile = bootstrap_confidence_interval(values, n_bootstrap=4000, method="percentile")
+    bca = bootstrap_confidence_interval(values, n_bootstrap=4000, method="bca")
+    assert bca["upper"] > percentile["upper"]
+
+
+def test_degenerate_inputs():
+    assert bootstrap_confidence_interval([])["mean"] is None
+    assert bootstrap_confidence_interval([0.5])["lower"] == 0.5
+    constant = bootstrap_confidence_interval([1.0, 1.0, 1.0], method="bca")
+    assert constant["lower"] == constant["upper"] == 1.0
+    assert "warning" in constant
+    with pytest.raises(ValueError):
+        bootstrap_confidence_interval([1.0, 2.0], method="studentized")
+
+
+def test_exact_permutation_matches_enumeration():
+    a = [0.81, 0.79, 0.84, 0.80, 0.83, 0.78]
+    b = [0.78, 0.80, 0.79, 0.76, 0.80, 0.77]
+    diff = np.subtract(a, b)
+    observed = abs(diff.mean())
+    extreme = sum(
+        abs(np.mean(diff * np.array(signs))) >= observed - 1e-12 for signs in itertools.product([-1.0, 1.0], repeat=len(a))
+    )
+    result = paired_permutation_test(a, b)
+    assert result["exact"] is True
+    assert result["p_value"] == pytest.approx(extreme / 2 ** len(a))
+    # Birkac satirlik bloklarla sayim ayni p-degerini vermeli.
+    blocked = paired_permutation_test(a, b, max_block_bytes=len(a) * 16 * 5)
+    assert blocked["p_value"] == result["p_value"]
+
+
+def test_monte_carlo_permutation_is_seeded():
+    rng = np.random.default_rng(4)
+    a = rng.normal(0.8, 0.02, size=30)
+    b = a - 0.01 + rng.normal(0.0, 0.01, size=30)
+    first = paired_permutation_test(a, b, n_permutations=5000, seed=3)
+    second = paired_permutation_test(a, b, n_permutations=5000, seed=3, max_workers=2, max_block_bytes=30 * 16 * 700)
+    assert first["exact"] is False
+    assert first["p_value"] == second["p_value"]
+    assert first["significant"] is True
+    comparison = compare_two_models(a, b, test_type="permutation", n_permutations=5000, seed=3)
+    assert comparison["test"] == "paired_permutation"
+    assert comparison["p_value"] == first["p_value"]
@@ -18,7 +18,7 @@ from app.ui.benchmark.widgets import (
     run_async,
 )
 
-ALLOCATION_ALGORITHMS = ["GaleShapley", "RandomAllocation", "GreedyAllocation", "MinimumRegretAllocation"]
+ALLOCATION_ALGORITHMS = ["GaleShapley", "RandomAllocation", "GreedyAllocation", "MinimumRegretAllocation", "OptimalRegretAllocation"]
 PRIORITY_RULES = {
     "GPA önceliği": "gpa_priority",
     "Tercih sırası": "preference_rank",
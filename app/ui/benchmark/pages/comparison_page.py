@@ -90,7 +90,7 @@ class ComparisonPage(ttk.Frame):
         self._live_label_to_key = {
             "MCDM Ders Önerisi (Gerçek Veri)": ("real_mcdm_recommendation", ["AHP", "TOPSIS", "VIKOR", "PROMETHEE_II"]),
             "ML Ders Seçimi Tahmini (Gerçek Veri)": ("real_ml_prediction", ["NaiveBayes", "LogisticRegression", "RandomForest", "XGBoostLike"]),
-            "Yerleştirme Adaleti Karşılaştırması": ("allocation_fairness", ["GaleShapley", "GreedyAllocation", "RandomAllocation", "FirstComeFirstServed", "MinimumRegretAllocation"]),
+            "Yerleştirme Adaleti Karşılaştırması": ("allocation_fairness", ["GaleShapley", "GreedyAllocation", "RandomAllocation", "FirstComeFirstServed", "MinimumRegretAllocation", "OptimalRegretAllocation"]),
             "Öğrenci & Ders Kümelemesi (Keşif)": ("clustering_exploration", ["KMeans", "HierarchicalClustering", "DBSCAN"]),
         }
         ttk.Button(
@@ -31,6 +31,7 @@ from app.services.criteria_import_service import (
 )
 from app.services.criteria_override_service import list_overrides, request_override
 from app.services.criteria_task_service import generate_tasks_for_missing_criteria
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version
 from app.services.popularity_service import calculate_popularity_score
 from app.services.yearly_workflow import mark_criteria_status
 
@@ -1753,6 +1754,7 @@ class CriteriaPage:
                 ),
             )
 
+            bump_decision_matrix_version(self.db.conn, "criteria_saved")
             self.db.conn.commit()
             try:
                 from app.utils.logger import log_operation
@@ -5,10 +5,13 @@
 # Veritabanindaki TUM tablolari listeleyip inceleme imkani sunar.
 # Sol sidebar: tablo listesi + satir sayilari
 # Sag panel: secili tablonun verisi (kolon bazli filtreleme, global arama,
-#            siralama, sayfalama)
+#            siralama, sayfalama). Filtre/siralama SQL'de yapilir; sayfalar
+#            keyset imleciyle arka plan thread'inde okunur, yalnizca gorunen
+#            sayfa bellekte tutulur (table_data_source).
 # SQL Runner: serbest SQL sorgusu calistirma penceresi
 # =============================================================================
-import math
+import os
+import queue
 import sqlite3
 import tkinter as tk
 from tkinter import messagebox, ttk
@@ -16,9 +19,16 @@ from tkinter import messagebox, ttk
 from app.core.config import load_app_config
 from app.core.permissions import UserContext, can
 from app.services.report_table_service import ReportTableService
+from app.services.table_data_source import (
+    TableBrowserWorker,
+    TableDataSource,
+    TableQuery,
+    readonly_connection_factory,
+)
 from app.ui.table_catalog import display_name, get_table_info, physical_from_display
 
 PAGE_SIZE = 100
+POLL_MS = 40
 
 
 class ViewTab(ttk.Frame):
@@ -38,13 +48,23 @@ class ViewTab(ttk.Frame):
         self._table_service_override = table_service
 
         self.current_table = None
-        self._all_rows = []
-        self._filtered_rows = []
         self._columns = []
         self._page = 0
         self._sort_col = None
         self._sort_desc = False
         self._col_filters = {}
+        # Keyset sayfalama: _page_cursors[i] = i. sayfanin baslangic imleci.
+        self._query = None
+        self._page_cursors = [None]
+        self._page_rows = []
+        self._next_cursor = None
+        self._total = None
+        self._total_exact = True
+        self._worker = None
+        self._worker_db_path = None
+        self._sync_source = None
+        self._pending_ticket = None
+        self._polling = False
 
         self._build_ui()
 
@@ -233,29 +253,131 @@ class ViewTab(ttk.Frame):
         self._lbl_table_usage.config(text=f"📍 Nerede kullanılır:  {info['usage']}")
 
     def _load_table(self, table: str):
-        """Secilen tabloyu veritabanindan okuyup filtreleme/siralama icin hafizaya alir."""
+        """Secilen tablonun ilk sayfasini (ve satir sayisini) arka planda ister."""
         self._page = 0
         self._sort_col = None
         self._sort_desc = False
         self._search_var.set("")
         self._col_filters = {}
+        self._columns = []
+        self._build_column_filters()
+        self._lbl_row_count.config(text="")
+        self._query = TableQuery.build(table)
+        self._request_page(None, with_count=True)
 
+    # =========================================================
+    #  VERI KAYNAGI (SQL + keyset, arka plan thread'i)
+    # =========================================================
+    def _browser_db_path(self):
+        """Isci baglantisi icin DB dosyasi; bellek ici/bilinmiyorsa None."""
+        conn = getattr(self.db, "conn", None)
+        try:
+            for row in conn.execute("PRAGMA database_list").fetchall():
+                if row[1] == "main":
+                    # Bos dosya adi: bellek ici DB; app.db_path baska bir dosya olabilir.
+                    return row[2] if row[2] and os.path.exists(row[2]) else None
+        except Exception:
+            pass
+        path = getattr(self.app, "db_path", None)
+        return path if path and os.path.exists(str(path)) else None
+
+    def _ensure_data_source(self):
+        db_path = self._browser_db_path()
+        if db_path is not None:
+            if self._worker is None or self._worker_db_path != db_path:
+                self._close_worker()
+                self._worker = TableBrowserWorker(readonly_connection_factory(db_path), page_size=PAGE_SIZE)
+                self._worker_db_path = db_path
+            return self._worker
+        # Bellek ici DB (test/ozel kurulum): ayni baglanti uzerinde senkron.
+        conn = getattr(self._table_service_override, "conn", None) or getattr(self.db, "conn", None)
+        if conn is None:
+            raise RuntimeError(self._friendly_backend_error())
+        if self._sync_source is None or self._sync_source.conn is not conn:
+            self._sync_source = TableDataSource(conn, page_size=PAGE_SIZE)
+        return self._sync_source
+
+    def _close_worker(self):
+        if self._worker is not None:
+            self._worker.close()
+        self._worker = None
+        self._worker_db_path = None
+        self._pending_ticket = None
+
+    def destroy(self):
+        self._close_worker()
+        super().destroy()
+
+    def _request_page(self, cursor, *, page=0, with_count=False):
+        """``page`` numarali sayfayi ister; onceki bekleyen/suren sorgu iptal edilir."""
+        if self._query is None:
+            return
         try:
-            data = self._service().table_head(table, limit=50000).unwrap()
-            cols, rows = data["columns"], data["rows"]
+            source = self._ensure_data_source()
         except Exception:
             messagebox.showerror("Hata", self._friendly_backend_error())
             return
+        extra = {"page": page, "with_count": with_count}
+        if isinstance(source, TableBrowserWorker):
+            self._pending_ticket = source.submit(self._query, cursor, with_count=with_count, extra=extra)
+            self._statusbar.config(text=f"{self._query.table}: yukleniyor...")
+            if not self._polling:
+                self._polling = True
+                self.after(POLL_MS, self._poll_pages)
+            return
+        try:
+            page = source.fetch_page(self._query, cursor, with_count=with_count)
+        except Exception as exc:
+            self._statusbar.config(text=f"Sorgu hatasi: {exc}")
+            return
+        self._on_page(page, extra)
 
-        self._columns = list(cols)
-        self._all_rows = [list(r) if not isinstance(r, (list, tuple)) else list(r) for r in rows]
-        self._filtered_rows = list(self._all_rows)
-        self._lbl_row_count.config(text=f"{len(self._all_rows)} satir")
-
-        self._build_column_filters()
-        self._setup_tree_columns()
+    def _poll_pages(self):
+        worker = self._worker
+        if worker is None or self._pending_ticket is None:
+            self._polling = False
+            return
+        latest = None
+        try:
+            while True:
+                item = worker.results.get_nowait()
+                if item[0] == self._pending_ticket:
+                    latest = item
+        except queue.Empty:
+            pass
+        if latest is None:
+            self.after(POLL_MS, self._poll_pages)
+            return
+        self._polling = False
+        self._pending_ticket = None
+        _ticket, page, error, extra = latest
+        if error is not None:
+            self._statusbar.config(text=f"Sorgu hatasi: {error}")
+            return
+        self._on_page(page, extra)
+
+    def _on_page(self, page, extra):
+        if page.columns != self._columns:
+            self._columns = list(page.columns)
+            self._build_column_filters()
+            self._setup_tree_columns()
+        if extra.get("with_count"):
+            self._total, self._total_exact = page.total, page.total_exact
+            if not (page.query.search or page.query.column_filters):
+                self._lbl_row_count.config(text=f"{self._format_total()} satir")
+        # Sayfa durumu yalnizca sonuc gelince degisir (iptal/hata tutarsizlik birakmaz).
+        self._page = int(extra.get("page", 0))
+        del self._page_cursors[self._page:]
+        self._page_cursors.append(page.cursor)
+        self._page_rows = page.rows
+        self._next_cursor = page.next_cursor
         self._render_page()
 
+    def _format_total(self) -> str:
+        if self._total is None:
+            return "?"
+        return f"{self._total}" if self._total_exact else f"~{self._total}"
+
     def _setup_tree_columns(self):
         self.tree["columns"] = self._columns
         for c in self._columns:
@@ -287,44 +409,27 @@ class ViewTab(ttk.Frame):
     # =========================================================
     #  FILTERING + SORTING + PAGINATION
     # =========================================================
+    def _current_filters(self):
+        return {col: var.get() for col, var in self._filter_entries.items()}
+
     def _apply_filters(self):
-        """Global arama ve kolon bazli filtreleri uygulayarak sonuclari gunceller."""
-        global_q = self._search_var.get().strip().lower()
-        col_queries = {}
-        for col, var in self._filter_entries.items():
-            v = var.get().strip().lower()
-            if v:
-                col_queries[col] = v
-
-        result = []
-        for row in self._all_rows:
-            if global_q:
-                if not any(global_q in str(cell).lower() for cell in row):
-                    continue
-            if col_queries:
-                skip = False
-                for col, q in col_queries.items():
-                    idx = self._columns.index(col) if col in self._columns else -1
-                    if idx < 0 or idx >= len(row):
-                        continue
-                    if q not in str(row[idx]).lower():
-                        skip = True
-                        break
-                if skip:
-                    continue
-            result.append(row)
-
-        self._filtered_rows = result
-        self._page = 0
-        self._render_page()
+        """Global arama ve kolon bazli filtreleri SQL sorgusuna cevirip ilk sayfayi ister."""
+        if self.current_table is None:
+            return
+        self._query = TableQuery.build(
+            self.current_table,
+            search=self._search_var.get(),
+            column_filters=self._current_filters(),
+            sort_col=self._sort_col,
+            sort_desc=self._sort_desc,
+        )
+        self._request_page(None, with_count=True)
 
     def _clear_filters(self):
         self._search_var.set("")
         for var in self._filter_entries.values():
             var.set("")
-        self._filtered_rows = list(self._all_rows)
-        self._page = 0
-        self._render_page()
+        self._apply_filters()
 
     def _sort_by(self, col: str):
         """Belirtilen kolona gore siralama yapar. Ayni kolona tekrar tiklanirsa yonu tersine cevirir."""
@@ -333,21 +438,17 @@ class ViewTab(ttk.Frame):
         else:
             self._sort_col = col
             self._sort_desc = False
-
-        idx = self._columns.index(col) if col in self._columns else 0
-
-        def sort_key(row):
-            val = row[idx] if idx < len(row) else ""
-            if val is None:
-                return (1, "")
-            try:
-                return (0, float(val))
-            except (ValueError, TypeError):
-                return (0, str(val).lower())
-
-        self._filtered_rows.sort(key=sort_key, reverse=self._sort_desc)
-        self._page = 0
-        self._render_page()
+        if self._query is None:
+            return
+        # Eslesen satir kumesi degismez; sayim yeniden yapilmaz.
+        self._query = TableQuery.build(
+            self._query.table,
+            search=self._query.search,
+            column_filters=dict(self._query.column_filters),
+            sort_col=col,
+            sort_desc=self._sort_desc,
+        )
+        self._request_page(None)
 
         arrow = " v" if self._sort_desc else " ^"
         for c in self._columns:
@@ -355,22 +456,17 @@ class ViewTab(ttk.Frame):
             self.tree.heading(c, text=display)
 
     def _change_page(self, delta: int):
-        total_pages = max(1, math.ceil(len(self._filtered_rows) / PAGE_SIZE))
-        new_page = self._page + delta
-        if 0 <= new_page < total_pages:
-            self._page = new_page
-            self._render_page()
+        if self._pending_ticket is not None:
+            return  # onceki sayfa henuz gelmedi; imlec belirsiz
+        if delta > 0 and self._next_cursor is not None:
+            self._request_page(self._next_cursor, page=self._page + 1)
+        elif delta < 0 and self._page > 0:
+            self._request_page(self._page_cursors[self._page - 1], page=self._page - 1)
 
     def _render_page(self):
-        """Filtrelenmis ve siralanmis verinin gecerli sayfasini Treeview'a basar."""
+        """Gecerli sayfayi (yalnizca gorunen satirlar) Treeview'a basar."""
         self.tree.delete(*self.tree.get_children())
-        total = len(self._filtered_rows)
-        total_pages = max(1, math.ceil(total / PAGE_SIZE))
-        start = self._page * PAGE_SIZE
-        end = min(start + PAGE_SIZE, total)
-        page_rows = self._filtered_rows[start:end]
-
-        for row in page_rows:
+        for row in self._page_rows:
             vals = []
             for cell in row:
                 if isinstance(cell, float):
@@ -381,12 +477,16 @@ class ViewTab(ttk.Frame):
                     vals.append(str(cell))
             self.tree.insert("", tk.END, values=vals)
 
-        self._lbl_page.config(
-            text=f"Sayfa {self._page + 1}/{total_pages}  ({total} kayit)"
-        )
+        total = self._format_total()
+        if self._total is not None and self._total_exact:
+            total_pages = max(1, -(-self._total // PAGE_SIZE))
+            page_text = f"Sayfa {self._page + 1}/{total_pages}"
+        else:
+            page_text = f"Sayfa {self._page + 1}" + ("+" if self._next_cursor is not None else "")
+        self._lbl_page.config(text=f"{page_text}  ({total} kayit)")
         self._statusbar.config(
-            text=f"{self.current_table or '?'}: {total} kayit gosteriliyor "
-                 f"(toplam {len(self._all_rows)})"
+            text=f"{self.current_table or '?'}: {len(self._page_rows)} satir gosteriliyor "
+                 f"(eslesen {total})"
         )
 
     # =========================================================
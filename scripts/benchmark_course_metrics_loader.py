@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Fakulte basina TOPSIS metrik okuma gecikmesini karsilastir.
+
+Eski yol (`_read_course_metrics` ile ders basina 5+ sorgu) ile toplu yukleyici
+(`_load_course_metrics_bulk`) ayni aday ders kumesi uzerinde olculur. Aday kume
+`get_faculty_year_topsis_results` ciktisindaki metric_map anahtarlaridir.
+
+Kullanim:
+    python -m scripts.benchmark_course_metrics_loader
+    python -m scripts.benchmark_course_metrics_loader --yil 2023 --donem Bahar
+    python -m scripts.benchmark_course_metrics_loader --db data/adil_secmeli.db --tekrar 5
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+KOK = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(KOK))
+
+from app.services.calculation import (  # noqa: E402
+    KararMotoru,
+    _load_course_metrics_bulk,
+    _read_course_metrics,
+    get_faculty_year_topsis_results,
+)
+from app.services.db import get_raw_connection  # noqa: E402
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ders metrik yukleyici benchmark")
+    parser.add_argument("--yil", type=int, default=2022)
+    parser.add_argument("--donem", default="Guz", choices=["Guz", "Bahar"])
+    parser.add_argument("--db", default=None, help="SQLite yolu (None = config)")
+    parser.add_argument("--tekrar", type=int, default=3, help="Olcum tekrar sayisi (medyan raporlanir)")
+    args = parser.parse_args()
+
+    conn = get_raw_connection(args.db)
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT fakulte_id, ad FROM fakulte ORDER BY fakulte_id")
+        faculties = [(int(r[0]), str(r[1] or "")) for r in cur.fetchall()]
+        motor = KararMotoru()
+        print(f"{'fakulte':<32} {'ders':>6} {'ders-ders ms':>14} {'toplu ms':>10} {'hizlanma':>9}")
+        toplam_eski = toplam_yeni = 0.0
+        for fakulte_id, ad in faculties:
+            result = get_faculty_year_topsis_results(cur, fakulte_id, args.yil, donem=args.donem)
+            ids = sorted(result.get("metric_map") or {})
+            if not ids:
+                continue
+            eski = _median_ms(lambda: [_read_course_metrics(cur, d, args.yil, args.donem, motor) for d in ids], args.tekrar)
+            yeni = _median_ms(lambda: _load_course_metrics_bulk(cur, ids, args.yil, args.donem), args.tekrar)
+            toplam_eski += eski
+            toplam_yeni += yeni
+            print(f"{ad[:32]:<32} {len(ids):>6} {eski:>14.1f} {yeni:>10.1f} {eski / max(yeni, 1e-9):>8.1f}x")
+        if toplam_yeni > 0:
+            print(f"{'TOPLAM':<32} {'':>6} {toplam_eski:>14.1f} {toplam_yeni:>10.1f} {toplam_eski / toplam_yeni:>8.1f}x")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
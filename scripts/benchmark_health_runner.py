@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Saglik runner'i icin sirali / paralel karsilastirma.
+
+Her mod ve isci sayisi icin ayri bir Python sureci acilir (import maliyeti
+adil dagilsin). Surec icinde rapor iki kez uretilir: ilk (soguk) calisma
+modulleri import eder ve tarayicilari doldurur; ikinci (sicak) calisma
+mtime onbellegindeki tarama sonuclarini ve yuklenmis modulleri kullanir.
+
+Kullanim:
+    python -m scripts.benchmark_health_runner
+    python -m scripts.benchmark_health_runner --mod audit full --isci 1 8 --db data/adil_secmeli.db
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+KOK = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(KOK))
+
+_CHILD = """
+import json, sys, time
+from app.health.health_runner import HealthRunner
+mode, workers, db_path = sys.argv[1], int(sys.argv[2]), sys.argv[3] or None
+out = []
+for _ in range(2):
+    started = time.perf_counter()
+    report = HealthRunner(db_path=db_path, max_workers=workers).run(mode)
+    out.append({"ms": (time.perf_counter() - started) * 1000.0, "checks": report.total_checks,
+                "score": report.score, "failed": report.failed_count})
+print(json.dumps(out))
+"""
+
+
+def _measure(mode: str, workers: int, db_path: str | None) -> list[dict]:
+    env = dict(os.environ, PYTHONPATH=str(KOK))
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD, mode, str(workers), db_path or ""],
+        cwd=str(KOK),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Saglik runner sirali/paralel benchmark")
+    parser.add_argument("--mod", nargs="+", default=["quick", "audit", "full"], help="Olculecek modlar")
+    parser.add_argument("--isci", nargs="+", type=int, default=[1, 8], help="Isci sayilari (1 = sirali)")
+    parser.add_argument("--db", default=None, help="SQLite yolu (None = config)")
+    args = parser.parse_args()
+
+    print(f"{'mod':<7} {'isci':>4} {'kontrol':>8} {'soguk ms':>9} {'sicak ms':>9} {'skor':>6} {'failed':>6}")
+    for mode in args.mod:
+        for workers in args.isci:
+            cold, warm = _measure(mode, workers, args.db)
+            print(
+                f"{mode:<7} {workers:>4} {cold['checks']:>8} {cold['ms']:>9.0f} {warm['ms']:>9.0f} "
+                f"{cold['score']:>6.1f} {cold['failed']:>6}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+API baglantisi basina sema uyumluluk maliyetini karsilastir.
+
+`_open_connection` her istekte `ensure_reporting_schema` cagirir. Eski yol
+(`force=True`: tum ensure_* zinciri) ile parmak izi yolu (`force=False`)
+ayni veritabani kopyasi uzerinde olculur; istek basina sure, calisan SQL
+ifadesi ve yazim (total_changes) sayisi raporlanir.
+
+Kullanim:
+    python -m scripts.benchmark_schema_compat
+    python -m scripts.benchmark_schema_compat --db data/adil_secmeli.db --istek 200
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+KOK = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(KOK))
+
+from app.core.config import load_app_config  # noqa: E402
+from app.db.schema_compat import ensure_reporting_schema  # noqa: E402
+from app.db.sqlite_connection import connect_sqlite  # noqa: E402
+
+
+def _measure(db_path: str, requests: int, force: bool) -> dict[str, float]:
+    samples = []
+    statements = 0
+    writes = 0
+    for _ in range(max(1, requests)):
+        counter = [0]
+        start = time.perf_counter()
+        conn = connect_sqlite(db_path, row_factory=True)
+        try:
+            conn.set_trace_callback(lambda _sql: counter.__setitem__(0, counter[0] + 1))
+            ensure_reporting_schema(conn, force=force)
+            writes += conn.total_changes
+        finally:
+            conn.close()
+        samples.append((time.perf_counter() - start) * 1000.0)
+        statements += counter[0]
+    n = max(1, requests)
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": sorted(samples)[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "statements": statements / n,
+        "writes": writes / n,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sema uyumluluk parmak izi benchmark")
+    parser.add_argument("--db", default=None, help="SQLite yolu (None = config)")
+    parser.add_argument("--istek", type=int, default=100, help="Olculen istek (baglanti) sayisi")
+    args = parser.parse_args()
+
+    source = args.db or load_app_config().sqlite_db_path
+    if not os.path.exists(source):
+        print(f"Veritabani bulunamadi: {source}")
+        return 1
+    # ensure zinciri yazim yapar; kaynak veritabani degil, gecici kopya olculur.
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "schema_compat_bench.db")
+        shutil.copyfile(source, db_path)
+        warmup = connect_sqlite(db_path)
+        try:
+            ensure_reporting_schema(warmup, force=True)
+        finally:
+            warmup.close()
+
+        print(f"{'yol':<22} {'medyan ms':>10} {'p95 ms':>8} {'SQL/istek':>10} {'yazim/istek':>12}")
+        results = {}
+        for label, force in (("tam zincir (eski)", True), ("parmak izi", False)):
+            results[label] = row = _measure(db_path, args.istek, force)
+            print(f"{label:<22} {row['median_ms']:>10.2f} {row['p95_ms']:>8.2f} {row['statements']:>10.1f} {row['writes']:>12.1f}")
+        old, new = results["tam zincir (eski)"], results["parmak izi"]
+        print(f"hizlanma: {old['median_ms'] / max(new['median_ms'], 1e-9):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+FastAPI okuma uclari icin yerel yuk testi (/api/v1/dersler, /api/v1/havuz).
+
+Varsayilan olarak uygulama surec icinde (FastAPI TestClient) calistirilir;
+``--url`` verilirse calisan bir sunucuya (uvicorn) HTTP istegi atilir.
+Esanli istemci sayisi, toplam istek, saniyedeki istek (RPS), p50/p95 gecikme
+ve test sonundaki SQLite havuz metrikleri raporlanir.
+
+Kullanim:
+    python -m scripts.load_test_api --db data/adil_secmeli.db --yil 2022
+    python -m scripts.load_test_api --url http://127.0.0.1:8000 --istemci 16 --istek 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+KOK = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(KOK))
+
+
+def _http_getter(base_url: str):
+    def get(path: str) -> tuple[int, bytes]:
+        try:
+            with urllib.request.urlopen(base_url.rstrip("/") + path, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+    return get
+
+
+def _inprocess_getter():
+    from fastapi.testclient import TestClient
+
+    from app.api.main import app
+
+    local = threading.local()
+
+    def get(path: str) -> tuple[int, bytes]:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = TestClient(app)
+        response = client.get(path)
+        return response.status_code, response.content
+
+    return get
+
+
+def _percentile(samples: list[float], ratio: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="API okuma uclari yuk testi")
+    parser.add_argument("--url", default=None, help="Calisan sunucu (None = surec ici TestClient)")
+    parser.add_argument("--db", default=None, help="Surec ici mod icin SQLite yolu (SQLITE_DB_PATH)")
+    parser.add_argument("--yil", type=int, default=2022, help="/havuz icin yil")
+    parser.add_argument("--fakulte", type=int, default=None, help="Uclari tek fakulteye daralt (kucuk yanit)")
+    parser.add_argument("--istemci", type=int, default=8, help="Esanli istemci (thread) sayisi")
+    parser.add_argument("--istek", type=int, default=1000, help="Toplam istek sayisi")
+    args = parser.parse_args()
+
+    if args.db:
+        os.environ["SQLITE_DB_PATH"] = str(Path(args.db).resolve())
+    get = _http_getter(args.url) if args.url else _inprocess_getter()
+    paths = ["/api/v1/dersler", f"/api/v1/havuz?yil={args.yil}"]
+    if args.fakulte is not None:
+        paths = [f"/api/v1/dersler?fakulte_id={args.fakulte}", f"/api/v1/havuz?yil={args.yil}&fakulte_id={args.fakulte}"]
+
+    status, _ = get(paths[0])  # isinma: havuz + sema parmak izi hazirlanir
+    if status != 200:
+        print(f"Isinma istegi basarisiz: HTTP {status}")
+        return 1
+
+    def one(index: int) -> tuple[str, int, float]:
+        path = paths[index % len(paths)]
+        started = time.perf_counter()
+        code, _ = get(path)
+        return path, code, (time.perf_counter() - started) * 1000.0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.istemci)) as executor:
+        results = list(executor.map(one, range(max(1, args.istek))))
+    elapsed = time.perf_counter() - started
+
+    print(f"{'uc':<40} {'istek':>6} {'hata':>5} {'p50 ms':>8} {'p95 ms':>8}")
+    for path in paths:
+        samples = [ms for p, _, ms in results if p == path]
+        errors = sum(1 for p, code, _ in results if p == path and code != 200)
+        print(f"{path:<40} {len(samples):>6} {errors:>5} {statistics.median(samples):>8.2f} {_percentile(samples, 0.95):>8.2f}")
+    print(f"toplam: {len(results)} istek, {elapsed:.2f} sn, {len(results) / elapsed:.1f} istek/sn, istemci={args.istemci}")
+
+    status, body = get("/api/v1/system/db-pool")
+    if status == 200:
+        for pool in (json.loads(body).get("data") or {}).get("pools") or []:
+            print("havuz:", json.dumps(pool, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
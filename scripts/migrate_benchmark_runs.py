@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+reports/benchmark_runs/*.json dosyalarini kolonsal sonuc deposuna tasir.
+
+Her JSON belgesi yerinde kalir (load_run detay gorunumu icin); calisma
+metadatasi `_index.sqlite3` indeksine, metrikler kolonsal depoya (pyarrow varsa
+Arrow IPC bolumleri, yoksa indeks icindeki run_metrics tablosu) yazilir.
+Islem idempotenttir; --rebuild indeksi ve metrik bolumlerini sifirdan kurar.
+
+Kullanim:
+    python -m scripts.migrate_benchmark_runs
+    python -m scripts.migrate_benchmark_runs --root reports/benchmark_runs --rebuild
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+KOK = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(KOK))
+
+from app.benchmark.result_store import ResultStore  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON calismalarini indeksli depoya tasi")
+    parser.add_argument("--root", default="reports/benchmark_runs", help="Benchmark calisma klasoru")
+    parser.add_argument("--backend", default=None, choices=["arrow", "sqlite"], help="Metrik deposu (varsayilan: pyarrow varsa arrow)")
+    parser.add_argument("--rebuild", action="store_true", help="Indeksi ve metrik bolumlerini sifirdan olustur")
+    args = parser.parse_args()
+
+    store = ResultStore(args.root, columnar_backend=args.backend)
+    start = time.perf_counter()
+    added = store.rebuild_index() if args.rebuild else store.sync_index()
+    elapsed = time.perf_counter() - start
+    total = len(list(Path(args.root).glob("*.json")))
+    print(f"{added} calisma indekslendi ({total} JSON belgesi, {elapsed:.2f} s, backend={store.columnar_backend}).")
+
+    start = time.perf_counter()
+    runs = store.list_runs(limit=100)
+    print(f"list_runs(100): {len(runs)} calisma, {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
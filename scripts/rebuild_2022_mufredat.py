@@ -15,6 +15,7 @@ Adımlar:
 import os
 import shutil
 import sqlite3
+import sys
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
@@ -23,6 +24,10 @@ import openpyxl
 from openpyxl import Workbook
 
 KOK = Path(__file__).parent.parent
+if str(KOK) not in sys.path:
+    sys.path.insert(0, str(KOK))
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version  # noqa: E402
+
 DB = KOK / "data" / "adil_secmeli.db"
 OGR = KOK / "data" / "2022_ogrenci_not_veri_seti.xlsx"
 MUF = KOK / "data" / "2022_Mufredat.xlsx"
@@ -240,6 +245,7 @@ def main():
              anket_kat, kayit, now),
         )
         krit_sayisi += 1
+    bump_decision_matrix_version(conn, "rebuild_2022_mufredat")
     conn.commit()
     print(f"   {krit_sayisi} ders_kriterleri satiri olusturuldu")
 
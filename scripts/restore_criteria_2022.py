@@ -5,12 +5,17 @@ Sadece ders_kriterleri'ne dokunur (mufredat/havuz/ders korunur).
 Eslesme ders.kod ile yapilir.
 """
 import sqlite3
+import sys
 from datetime import datetime
 from pathlib import Path
 
 import openpyxl
 
 KOK = Path(__file__).parent.parent
+if str(KOK) not in sys.path:
+    sys.path.insert(0, str(KOK))
+from app.services.decision_matrix_snapshot_service import bump_decision_matrix_version  # noqa: E402
+
 DB = KOK / "data" / "adil_secmeli.db"
 OGR = KOK / "data" / "2022_ogrenci_not_veri_seti.xlsx"
 YIL = 2022
@@ -65,6 +70,7 @@ def main():
              60, s["kayit"], anket_kat, s["kayit"], now),
         )
         n += 1
+    bump_decision_matrix_version(conn, "restore_criteria_2022")
     conn.commit()
     cur.execute("SELECT COUNT(*) FROM ders_kriterleri WHERE yil=?", (YIL,))
     print(f"ders_kriterleri 2022 yeniden uretildi: {n} satir "